@@ -93,6 +93,8 @@ Application options
   -v, --version                          Show versions
   -S, --safe                             Start Gramps in 'Safe mode'
                                           (temporarily use default settings)
+  --rebuild-plugin-cache                 Execute all plugin registration files
+                                          again instead of using the cache
   -D, --default=[APXFE]                  Reset settings to default;
                  A - addons are cleared
                  P - Preferences to default
@@ -178,6 +180,7 @@ class ArgParser:
     -y, --yes                       Don't ask to confirm dangerous actions
     -q, --quiet                     Suppress progress indication output
     -v, --version                   Show versions
+    --rebuild-plugin-cache          Rebuild the plugin registration cache
     -h, --help                      Display the help
     --usage                         Display usage information
 
@@ -414,6 +417,11 @@ class ArgParser:
                 self.quiet = True
             elif option in ["-S", "--safe"]:
                 cleandbg += [opt_ix]
+            elif option in ["--rebuild-plugin-cache"]:
+                from gramps.gen.plug import PluginRegister
+
+                PluginRegister.get_instance().clear_cache()
+                cleandbg += [opt_ix]
             elif option in ["-D", "--default"]:
 
                 def rmtree(path):
@@ -201,9 +201,12 @@ register("database.compress-backup", True)
 register("database.backup-path", USER_HOME)
 register("database.backup-on-exit", True)
 register("database.autobackup", 0)
+register("database.cache-size", 2000)
 register("database.path", os.path.join(USER_DATA, "grampsdb"))
 register("database.host", "")
 register("database.port", "")
+register("database.undo-memory", 10)
+register("database.undo-size", 500)
 
 register(
     "export.proxy-order",
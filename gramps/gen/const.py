@@ -346,6 +346,7 @@ LONGOPTS = [
     "sm-config-prefix=",
     "sm-disable",
     "sync",
+    "rebuild-plugin-cache",
     "remove=",
     "usage",
     "version",
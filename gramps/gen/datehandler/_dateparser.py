@@ -51,6 +51,7 @@ log = logging.getLogger(".DateParser")
 from ..lib.date import Date, DateError, Today
 from ..const import GRAMPS_LOCALE as glocale
 from ..utils.grampslocale import GrampsLocale
+from ..utils.lru import LRU
 from ._datestrings import DateStrings
 
 # -------------------------------------------------------------------------
@@ -61,6 +62,27 @@ from ._datestrings import DateStrings
 _max_days = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
 _leap_days = [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
 
+# Number of parsed dates remembered by each parser
+_CACHE_SIZE = 10000
+
+# Methods of the full parser; a subclass which overrides any of them does not
+# use the fast path
+_FULL_PARSER_METHODS = (
+    "init_strings",
+    "_parse_subdate",
+    "_parse_gregorian",
+    "_parse_calendar",
+    "match_calendar_newyear",
+    "match_newyear",
+    "match_calendar",
+    "match_quality",
+    "match_span",
+    "match_range",
+    "match_quarter",
+    "match_bce",
+    "match_modifier",
+)
+
 
 def gregorian_valid(date_tuple):
     """Checks if date_tuple is a valid date in Gregorian Calendar"""
@@ -454,6 +476,58 @@ class DateParser:
             self.ymd = False
             self._ddmy = False
 
+        self._cache = LRU(_CACHE_SIZE)
+        self._today_word = re.compile(self._today_str, re.IGNORECASE)
+        self.__init_fast_path()
+
+    def __init_fast_path(self):
+        """
+        Compile the patterns of the most common shapes of dates, such as
+        "1 JAN 1850", "ABT 1850", "BET 1850 AND 1860" and "1850-01-01",
+        which set_date recognizes before trying the full parser.
+
+        The fast path is only used where it gives the same dates as the full
+        parser: not for a subclass which changes the full parser, for the
+        year-month-day formats, or if a month name could be taken for a
+        quality, a span, a range or another part of a date.
+        """
+        self._fast = self._fast_date = None
+        if self.ymd or self._ddmy or self.modifier_after_to_int:
+            return
+        if not self.month_to_int:
+            return
+        for name in _FULL_PARSER_METHODS:
+            if getattr(type(self), name) is not getattr(DateParser, name):
+                return
+        patterns = (
+            self._qual,
+            self._bce_re,
+            self._span,
+            self._range,
+            self._quarter,
+            self._abt2,
+        )
+        for month in list(self.month_to_int):
+            texts = ("%s 1850" % month, "1 %s 1850" % month)
+            for text in texts + tuple(text.upper() for text in texts):
+                if any(pattern.match(text) for pattern in patterns):
+                    return
+
+        # the words are looked up in the tables of modifiers and months
+        word = r"[^\W\d_][^\s\d]*"
+        date_str = (
+            r"(?:\d{1,4}-\d{1,2}(?:-\d{1,2})?|(?:(?:\d{1,2}\s+)?%s\s+)?\d{1,4})" % word
+        )
+        self._fast = re.compile(
+            r"(?:(?P<mod>%s)\s+|(?:bet|between)\s+(?P<start>%s)\s+and\s+)?"
+            r"(?P<date>%s)$" % (word, date_str, date_str),
+            re.IGNORECASE,
+        )
+        self._fast_date = re.compile(
+            r"(\d{1,4})-(\d{1,2})(?:-(\d{1,2}))?$"
+            r"|(?:(?:(\d{1,2})\s+)?(%s)\s+)?(\d{1,4})$" % word
+        )
+
     def dhformat_changed(self):
         """Allow overriding so a subclass can modify it"""
         pass
@@ -1048,12 +1122,81 @@ class DateParser:
             return True
         return False
 
+    def match_fast(self, text, date):
+        """
+        Try matching the most common shapes of dates with a single pattern.
+
+        On success, set the date and return True. On failure return False.
+        """
+        if self._fast is None:
+            return False
+        match = self._fast.match(text)
+        if not match:
+            return False
+        mod = Date.MOD_NONE
+        subtext = match.group("date")
+        if match.group("mod") is not None:
+            mod = self.modifier_to_int.get(match.group("mod").lower())
+            if mod is None:  # maybe the month of the date
+                mod = Date.MOD_NONE
+                subtext = text
+        subdate = self._parse_fast(subtext)
+        if subdate == Date.EMPTY:
+            return False
+        if match.group("start") is not None:
+            start = self._parse_fast(match.group("start"))
+            if start == Date.EMPTY:
+                return False
+            date.set(
+                Date.QUAL_NONE,
+                Date.MOD_RANGE,
+                Date.CAL_GREGORIAN,
+                start + subdate,
+                newyear=Date.NEWYEAR_JAN1,
+            )
+            return True
+        date.set(
+            Date.QUAL_NONE,
+            mod,
+            Date.CAL_GREGORIAN,
+            subdate,
+            newyear=Date.NEWYEAR_JAN1,
+        )
+        return True
+
+    def _parse_fast(self, text):
+        """
+        Convert the date portion of a date matched by the fast path.
+        """
+        match = self._fast_date.match(text)
+        if not match:
+            return Date.EMPTY
+        groups = match.groups()
+        if groups[0] is not None:  # ISO
+            y = int(groups[0])
+            m = int(groups[1])
+            d = self._get_int(groups[2])
+        else:
+            y = int(groups[5])
+            d = self._get_int(groups[3])
+            if groups[4] is None:
+                m = 0
+            else:
+                m = self.month_to_int.get(groups[4].lower())
+                if m is None:
+                    return Date.EMPTY
+        if not gregorian_valid((d, m, y)):
+            return Date.EMPTY
+        return (d, m, y, False)
+
     def set_date(self, date, text):
         """
         Parses the text and sets the date according to the parsing.
         """
         text = text.strip()  # otherwise spaces can make it a bad date
         date.set_text_value(text)
+        if self.match_fast(text, date):
+            return
         qual = Date.QUAL_NONE
         cal = Date.CAL_GREGORIAN
         newyear = Date.NEWYEAR_JAN1
@@ -1096,10 +1239,33 @@ class DateParser:
     def parse(self, text):
         """
         Parses the text, returning a :class:`.Date` object.
+
+        The parsed dates are cached, except dates relative to today.
         """
+        if text in self._cache:
+            return Date(self._cache[text])
         new_date = Date()
         try:
             self.set_date(new_date, text)
         except DateError:
             new_date.set_as_text(text)
+        if not self._today_word.search(text):
+            self._cache[text] = Date(new_date)
         return new_date
+
+    def parse_many(self, texts):
+        """
+        Parses each of the texts, such as a column of an imported file,
+        returning a list of :class:`.Date` objects.
+
+        Each distinct text is only parsed once.
+        """
+        parsed = {}
+        dates = []
+        for text in texts:
+            if text in parsed:
+                dates.append(Date(parsed[text]))
+            else:
+                parsed[text] = self.parse(text)
+                dates.append(parsed[text])
+        return dates
@@ -117,6 +117,48 @@ class DateParserTest(unittest.TestCase):
         self.assertEqual(date.get_quality(), Date.QUAL_CALCULATED)
         self.assertEqual(date.get_calendar(), Date.CAL_JULIAN)
 
+    def test_fast_path_same_as_full_parser(self):
+        texts = [
+            "1 JAN 1850",
+            "jan 1850",
+            "1850",
+            "ABT 1850",
+            "bef. 3 mar 1850",
+            "to 1850-02",
+            "BET 1850 AND 1 JUN 1860",
+            "between 1850-01-02 and 1860",
+            "1852-02-29",
+            "30 FEB 1850",
+            "1850-13-01",
+            "BET 1850",
+            "foo 1850",
+            "jan 1 1850",
+        ]
+        self.assertIsNotNone(self.parser._fast)
+        for text in texts:
+            with self.subTest(text=text):
+                date = Date()
+                self.parser.set_date(date, text)
+                fast_path = self.parser._fast
+                self.parser._fast = None
+                full_date = Date()
+                self.parser.set_date(full_date, text)
+                self.parser._fast = fast_path
+                self.assertTrue(date.is_equal(full_date))
+                self.assertEqual(date.get_text(), full_date.get_text())
+
+    def test_parse_cache(self):
+        date = self.parser.parse("abt 1850")
+        date.set_quality(Date.QUAL_ESTIMATED)
+        self.assertEqual(self.parser.parse("abt 1850").get_quality(), Date.QUAL_NONE)
+        self.assertIsNot(self.parser.parse("abt 1850"), self.parser.parse("abt 1850"))
+
+    def test_parse_many(self):
+        dates = self.parser.parse_many(["1850", "abt 1850", "1850"])
+        self.assertEqual([date.get_year() for date in dates], [1850, 1850, 1850])
+        self.assertEqual(dates[1].get_modifier(), Date.MOD_ABOUT)
+        self.assertIsNot(dates[0], dates[2])
+
 
 class Test_generate_variants(unittest.TestCase):
     def setUp(self):
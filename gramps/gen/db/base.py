@@ -42,6 +42,10 @@ from ..db.dbconst import DBLOGNAME
 from ..lib.childref import ChildRef
 from ..lib.childreftype import ChildRefType
 from .exceptions import DbTransactionCancel
+from .graph import GraphIndex
+from .snapshot import PersonSnapshot
+from .statistics import TreeStatistics
+from .summary import SUMMARY_KINDS, get_event_summary
 from .txn import DbTxn
 
 _ = glocale.translation.gettext
@@ -669,8 +673,10 @@ class DbReadBase:
         Return a list of database handles, one handle for each Person in
         the database.
 
-        :param sort_handles: If True, the list is sorted by surnames.
-        :type sort_handles: bool
+        :param sort_handles: If True, the list is sorted by surnames.  If
+            "birth" or "death", it is sorted by the date of birth or death,
+            then by surnames.
+        :type sort_handles: bool or str
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
 
@@ -1437,6 +1443,207 @@ class DbReadBase:
         """
         return False
 
+    def get_graph_index(self):
+        """
+        Return a :py:class:`.GraphIndex` of the parent/child links between
+        the people and families of the database.
+
+        The index returned here is only valid until the database changes.
+        Databases that emit change signals return a shared index that is
+        kept up to date.
+        """
+        return GraphIndex(self.get_person_from_handle, self.get_family_from_handle)
+
+    def get_statistics(self):
+        """
+        Return the :py:class:`.TreeStatistics` of the people and media of
+        the database, used by the dashboard gramplets.
+
+        The statistics returned here are counted once, and are only valid
+        until the database changes.  Databases that emit change signals
+        return shared statistics that are kept up to date.
+        """
+        return TreeStatistics(self)
+
+    def get_person_snapshot(self):
+        """
+        Return a :py:class:`.PersonSnapshot` of the people, families and
+        events of the database, used by the reports which compute statistics
+        about all the people.
+
+        The snapshot is only valid until the database changes.  Databases
+        may return the same snapshot until they change.
+        """
+        return PersonSnapshot(self)
+
+    def get_cache_stats(self):
+        """
+        Return statistics about the cache of objects read by the
+        get_*_from_handle methods.
+
+        :returns: A dict keyed by class name of dicts with the number of
+                  "hits", "misses" and cached objects ("size").
+        :rtype: dict
+        """
+        return {}
+
+    def get_backup_watermark(self):
+        """
+        Return the time of the last backup of the database, as recorded by
+        :py:meth:`set_backup_watermark`, or None if there is none.
+
+        :returns: Time in seconds since the epoch, or None.
+        :rtype: int
+        """
+        return None
+
+    def set_backup_watermark(self, watermark):
+        """
+        Record the time of a backup of the database.  From then on, the
+        database logs the changes that can't be found from the change times
+        of the objects: deletions, undo and redo, and commits with an earlier
+        change time.
+
+        :param watermark: Time in seconds since the epoch.
+        :type watermark: int
+        """
+        raise NotImplementedError
+
+    def get_logged_changes(self, since):
+        """
+        Return the objects that have been deleted, or changed without
+        updating their change time, at or after a given time.  Nothing is
+        logged before a backup watermark has been set.
+
+        :param since: Time in seconds since the epoch.
+        :type since: int
+        :returns: List of (class name, handle) pairs.
+        :rtype: list
+        """
+        return []
+
+    def select_handles(self, obj_class, where, values):
+        """
+        Return the set of handles of the primary objects that satisfy an SQL
+        condition, or None if the backend cannot evaluate it.
+
+        The condition is evaluated against a row of the primary object table,
+        with the object available as JSON in the json_data column.
+
+        :param obj_class: Class name of the primary object, e.g. "Person".
+        :type obj_class: str
+        :param where: SQL condition with "?" placeholders.
+        :type where: str
+        :param values: Values for the placeholders.
+        :type values: list
+        :returns: Set of matching handles, or None.
+        :rtype: set
+        """
+        return None
+
+    def search_text(self, obj_type, text):
+        """
+        Return the set of handles of the primary objects with a field of
+        indexed text that contains a substring, or None if the backend has no
+        text index.
+
+        The search ignores case as ``str.upper`` does.  The indexed text is
+        the text of notes, the name fields matched by the SearchName rule,
+        the title and names of places, the title of sources and the page of
+        citations.
+
+        :param obj_type: Class name of the primary object, e.g. "Note".
+        :type obj_type: str
+        :param text: Substring to search for.
+        :type text: str
+        :returns: Set of matching handles, or None.
+        :rtype: set
+        """
+        return None
+
+    def get_person_summary(self, handle):
+        """
+        Return the summaries of the birth and death of a person, as shown by
+        the person views.
+
+        Backends may store the summaries, which saves loading the events of
+        each person to sort the views.
+
+        :param handle: Handle of the person.
+        :type handle: str
+        :returns: Tuple of the birth and death :class:`.EventSummary`.
+        :rtype: tuple
+        """
+        person = self.get_person_from_handle(handle)
+        return tuple(get_event_summary(self, person, kind) for kind in SUMMARY_KINDS)
+
+    def get_sort_index(self, obj_class, column, sort_key):
+        """
+        Return the handles of the primary objects of a type, sorted by the
+        backend on a sort key computed from a secondary column, or None if
+        the backend cannot sort them.
+
+        The result is a sized object, kept up to date by its owner, with
+        the methods:
+
+        - ``get_range(start, count)``: list of (sort key, handle) tuples.
+        - ``get_position(handle)``: position of an object, or None.
+        - ``get_sort_key(handle)``: sort key of an object, or None.
+        - ``update(handle)``: add an object, or update its sort key.
+        - ``remove(handle)``: remove an object.
+        - ``close()``: release the resources held by the backend.
+
+        :param obj_class: Class name of the primary object, e.g. "Event".
+        :type obj_class: str
+        :param column: Name of the secondary column, or "birth" or "death"
+                       to sort people on the :class:`.EventSummary` of
+                       their birth or death.
+        :type column: str
+        :param sort_key: Function giving the sort key of a column value, or
+                         of an :class:`.EventSummary`.
+        :type sort_key: callable
+        :returns: Sorted handles, or None.
+        """
+        return None
+
+    def iter_reference_map(self):
+        """
+        Return an iterator over the (obj_class, obj_handle, ref_class,
+        ref_handle) tuples of the reference map, or None if the backend
+        cannot list it.
+
+        Each tuple records that the obj_handle object refers to the
+        ref_handle object, whether or not either object exists.
+        """
+        return None
+
+    def find_missing_references(self, ref_class=None):
+        """
+        Return the references of the reference map to objects which are not
+        in the database, or None if the backend cannot find them without
+        loading every object.
+
+        :param ref_class: Class name of the referenced objects, e.g. "Note",
+                          or None for every class.
+        :type ref_class: str
+        :returns: List of (obj_class, obj_handle, ref_class, ref_handle)
+                  tuples, or None.
+        """
+        return None
+
+    def find_duplicated_gramps_ids(self, obj_class):
+        """
+        Return the handles of the primary objects of a type which share their
+        Gramps ID with another object of the type, or None if the backend
+        cannot find them without loading every object.
+
+        :param obj_class: Class name of the primary object, e.g. "Event".
+        :type obj_class: str
+        :returns: List of the lists of the handles of the objects that have
+                  the same Gramps ID, or None.
+        """
+        return None
+
     def method(self, fmt, *args):
         """
         Convenience function to return database methods.
@@ -1624,6 +1831,13 @@ class DbWriteBase(DbReadBase):
         """
         raise NotImplementedError
 
+    def commit_many(self, objects, transaction, change_time=None):
+        """
+        Commit a sequence of primary objects, which may be of mixed types, to
+        the database, storing the changes as part of the transaction.
+        """
+        raise NotImplementedError
+
     def commit_note(self, note, transaction, change_time=None):
         """
         Commit the specified Note to the database, storing the changes as part
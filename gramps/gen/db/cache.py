@@ -0,0 +1,122 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Bounded cache of the primary objects read from a database.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+from collections import OrderedDict
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .dbconst import KEY_TO_CLASS_MAP
+
+
+# -------------------------------------------------------------------------
+#
+# ObjectCache
+#
+# -------------------------------------------------------------------------
+class ObjectCache:
+    """
+    Least recently used cache of the decoded data of primary objects, with
+    one bounded table per object type.
+
+    The decoded data is cached rather than the objects themselves, as
+    callers are free to modify the objects they get.  The database must
+    call :meth:`invalidate` for each object it writes.
+
+    :param size: Maximum number of objects cached per object type, or 0 to
+                 disable the cache.
+    :type size: int
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tables = {obj_key: OrderedDict() for obj_key in KEY_TO_CLASS_MAP}
+        self.hits = dict.fromkeys(KEY_TO_CLASS_MAP, 0)
+        self.misses = dict.fromkeys(KEY_TO_CLASS_MAP, 0)
+
+    def get(self, obj_key, handle):
+        """
+        Return the cached data of an object, or None if it is not cached.
+        """
+        table = self.tables[obj_key]
+        data = table.get(handle)
+        if data is None:
+            self.misses[obj_key] += 1
+        else:
+            table.move_to_end(handle)
+            self.hits[obj_key] += 1
+        return data
+
+    def put(self, obj_key, handle, data):
+        """
+        Cache the data of an object, dropping the least recently used one
+        if the table is full.
+        """
+        if self.size <= 0:
+            return
+        table = self.tables[obj_key]
+        table[handle] = data
+        if len(table) > self.size:
+            table.popitem(last=False)
+
+    def invalidate(self, obj_key, handle):
+        """
+        Drop an object that has been changed or removed from the cache.
+        """
+        self.tables[obj_key].pop(handle, None)
+
+    def clear(self):
+        """
+        Drop all objects from the cache.
+        """
+        for table in self.tables.values():
+            table.clear()
+
+    def get_stats(self):
+        """
+        Return the number of hits, misses and cached objects per object
+        type, as a dict keyed by class name.
+        """
+        return {
+            KEY_TO_CLASS_MAP[obj_key]: {
+                "hits": self.hits[obj_key],
+                "misses": self.misses[obj_key],
+                "size": len(table),
+            }
+            for obj_key, table in self.tables.items()
+        }
+
+    def reset_stats(self):
+        """
+        Reset the hit and miss counters.
+        """
+        for obj_key in self.tables:
+            self.hits[obj_key] = 0
+            self.misses[obj_key] = 0
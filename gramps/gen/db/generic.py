@@ -45,6 +45,7 @@ from typing import Any, Generator, Type
 # Gramps modules
 #
 # ------------------------------------------------------------------------
+from ..config import config
 from ..const import GRAMPS_LOCALE as glocale
 from ..errors import HandleError
 from ..lib import (
@@ -115,6 +116,11 @@ from . import (
     DbWriteBase,
 )
 from .bookmarks import DbBookmarks
+from .cache import ObjectCache
+from .graph import GraphIndex
+from .snapshot import PersonSnapshot
+from .statistics import TreeStatistics
+from .undolog import UndoLog
 from .exceptions import DbUpgradeRequiredError, DbVersionError
 from .utils import clear_lock_file, write_lock_file
 
@@ -145,51 +151,97 @@ SIGBASE = (
 class DbGenericUndo(DbUndo):
     """
     Generic undo/redo handler
+
+    The undo records are stored in an :class:`.UndoLog`.  Only the records
+    of the most recent transactions are held in memory, and the oldest
+    transactions are dropped when the history grows beyond its maximum size.
     """
 
     def __init__(self, grampsdb, path):
         super().__init__(grampsdb)
-        self.undodb = []
+        self.undodb = UndoLog(path)
+        self.memory_transactions = config.get("database.undo-memory")
+        self.max_size = config.get("database.undo-size") * 1024 * 1024
 
     def open(self, value=None):
         """
-        Open the backing storage.  Needs to be overridden in the derived
-        class.
+        Open the backing storage.
         """
+        self.undodb.open()
 
     def close(self):
         """
-        Close the backing storage.  Needs to be overridden in the derived
-        class.
+        Close the backing storage.
+        """
+        self.undodb.close()
+
+    def clear(self):
+        """
+        Clear the undo/redo list and the records of its transactions.
         """
+        super().clear()
+        self.undodb.clear()
 
     def append(self, value):
         """
-        Add a new entry on the end.  Needs to be overridden in the derived
-        class.
+        Add a new entry on the end, and return its index number.
         """
-        self.undodb.append(value)
+        return self.undodb.append(value)
 
     def __getitem__(self, index):
         """
-        Returns an entry by index number.  Needs to be overridden in the
-        derived class.
+        Returns an entry by index number.
         """
         return self.undodb[index]
 
     def __setitem__(self, index, value):
         """
-        Set an entry to a value.  Needs to be overridden in the derived class.
+        Set an entry to a value.
         """
         self.undodb[index] = value
 
     def __len__(self):
         """
-        Returns the number of entries.  Needs to be overridden in the derived
-        class.
+        Returns the number of entries.
         """
         return len(self.undodb)
 
+    def abort(self, txn):
+        """
+        Discard the records of an aborted transaction.
+        """
+        if txn.first is not None:
+            self.undodb.discard(txn.first, txn.last)
+
+    def _after_commit(self, transaction):
+        """
+        Discard the undone transactions, which can't be redone after a new
+        transaction, write the records of the older transactions to the
+        backing storage, and drop the oldest transactions if the history is
+        too large.
+        """
+        if transaction.first is not None:
+            while self.redoq:
+                txn = self.redoq.pop()
+                if txn.first is not None:
+                    self.undodb.discard(txn.first, txn.last)
+
+        kept = 0
+        before = len(self.undodb)
+        for txn in reversed(self.undoq):
+            if kept >= self.memory_transactions:
+                break
+            if txn.first is not None:
+                before = txn.first
+                kept += 1
+        self.undodb.flush(before)
+
+        if self.max_size:
+            while self.undodb.size > self.max_size and len(self.undoq) > 1:
+                txn = self.undoq.popleft()
+                if txn.first is not None:
+                    self.undodb.discard(txn.first, txn.last)
+
     def _redo(self, update_history):
         """
         Access the last undone transaction, and revert the data to the state
@@ -658,6 +710,12 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self._bm_changes = 0
         self.has_changed = 0  # Also gives commits since startup
         self.surname_list = []
+        self._graph_index = None
+        self._statistics = None
+        self._saved_statistics = False
+        self._person_snapshot = None
+        self._object_cache = ObjectCache(config.get("database.cache-size"))
+        self._backup_watermark = None
         self.genderStats = GenderStats()  # can pass in loaded stats as dict
         self.owner = Researcher()
         if directory:
@@ -746,6 +804,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         # Load metadata
         self.name_formats = self._get_metadata("name_formats")
         self.owner = self._get_metadata("researcher", default=Researcher())
+        self._backup_watermark = self._get_metadata("backup_watermark", None)
 
         # Load bookmarks
         self.bookmarks.load(self._get_metadata("bookmarks"))
@@ -782,7 +841,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
         self._set_save_path(directory)
 
-        if self._directory and self._directory != ":memory:":
+        if self._directory and self._directory != ":memory:" and not self.readonly:
             self.undolog = os.path.join(self._directory, DBUNDOFN)
         else:
             self.undolog = None
@@ -817,6 +876,11 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             self.has_changed = 0  # number of commits
 
         self.db_is_open = True
+        self._object_cache.clear()
+        self._person_snapshot = None
+        self._saved_statistics = not self.readonly
+        if self._graph_index:
+            self._graph_index.clear()
 
         # Check on db version to see if we need upgrade or too new
         dbversion = int(self._get_metadata("version", default="0"))
@@ -830,6 +894,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             )
             if force_schema_upgrade:
                 self._gramps_upgrade(dbversion, directory, callback)
+                self._object_cache.clear()
             else:
                 self.close(update=False)
                 raise DbUpgradeRequiredError(dbversion, self.VERSION[0])
@@ -858,6 +923,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
                 filename = os.path.join(self._directory, "meta_data.db")
                 Path(filename).touch()
                 self._set_all_metadata()
+                self._save_statistics()
 
             self._close()
 
@@ -867,9 +933,18 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
                 pass
         else:
             self._close()
+        if self.undodb is not None:
+            self.undodb.close()
 
         self.db_is_open = False
         self._directory = None
+        self._object_cache.clear()
+        self._person_snapshot = None
+        if self._graph_index:
+            self._graph_index.clear()
+        if self._statistics:
+            self._statistics.disconnect_signals()
+            self._statistics = None
 
     def is_open(self):
         return self.db_is_open
@@ -990,6 +1065,26 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.transaction = transaction
         return transaction
 
+    def _save_statistics(self):
+        """
+        Save the person statistics, or forget the saved statistics if they
+        may be out of date.
+        """
+        if self._statistics and self._statistics.is_loaded():
+            self._set_metadata("statistics", self._statistics.get_data())
+        elif self.has_changed:
+            self._set_metadata("statistics", None)
+
+    def _forget_saved_statistics(self):
+        """
+        Forget the saved person statistics in the first transaction that
+        changes the database, so that they are not used again if the
+        database is not closed properly.  They are saved again on close.
+        """
+        if self._saved_statistics:
+            self._set_metadata("statistics", None, use_txn=False)
+            self._saved_statistics = False
+
     def _get_metadata_keys(self):
         """
         Get all of the metadata setting names from the
@@ -1454,7 +1549,11 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             raise HandleError("Handle is None")
         if not handle:
             raise HandleError("Handle is empty")
-        data = self._get_raw_data(obj_key, handle)
+        data = self._object_cache.get(obj_key, handle)
+        if data is None:
+            data = self._get_raw_data(obj_key, handle)
+            if data:
+                self._object_cache.put(obj_key, handle, data)
         if data:
             return self.serializer.data_to_object(data, obj_class)
 
@@ -2302,10 +2401,27 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             ]
         )
 
+    def commit_many(self, objects, transaction, change_time=None):
+        """
+        Commit a sequence of primary objects, which may be of mixed types, to
+        the database, storing the changes as part of the transaction.
+
+        Backends may override this to write the objects in bulk.
+        """
+        for obj in objects:
+            commit_func = self._get_table_func(obj.__class__.__name__, "commit_func")
+            commit_func(obj, transaction, change_time)
+
     def _after_commit(self, transaction):
         """
         Post-transaction commit processing
         """
+        self._person_snapshot = None
+        if transaction.batch and self._graph_index:
+            # Batch transactions don't emit signals
+            self._graph_index.clear()
+        if transaction.batch and self._statistics:
+            self._statistics.clear()
         # Reset callbacks if necessary
         if transaction.batch or not len(transaction):
             return
@@ -2563,6 +2679,53 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     #
     ################################################################
 
+    def get_graph_index(self):
+        """
+        Return a :py:class:`.GraphIndex` of the parent/child links between
+        the people and families of the database, which is kept up to date
+        using the database signals.
+        """
+        if self._graph_index is None:
+            self._graph_index = GraphIndex(
+                self.get_raw_person_data, self.get_raw_family_data
+            )
+            self._graph_index.connect(self)
+        return self._graph_index
+
+    def get_statistics(self):
+        """
+        Return the :py:class:`.TreeStatistics` of the people and media of
+        the database, which are kept up to date using the database signals,
+        and saved when the database is closed.
+        """
+        if self._statistics is None:
+            self._statistics = TreeStatistics(
+                self, lambda: self._get_metadata("statistics", None)
+            )
+            self._statistics.connect_signals()
+        return self._statistics
+
+    def get_person_snapshot(self):
+        """
+        Return a :py:class:`.PersonSnapshot` of the people, families and
+        events of the database, which is shared until the database changes.
+        """
+        if self._person_snapshot is None:
+            self._person_snapshot = PersonSnapshot(self)
+        return self._person_snapshot
+
+    def get_backup_watermark(self):
+        """
+        Return the time of the last backup of the database, or None.
+        """
+        return self._backup_watermark
+
+    def get_cache_stats(self):
+        """
+        Return the hits, misses and size of the object cache, per class name.
+        """
+        return self._object_cache.get_stats()
+
     def get_default_handle(self):
         return self._get_metadata("default-person-handle", None)
 
@@ -2686,9 +2849,11 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         return self.undodb
 
     def undo(self, update_history=True):
+        self._person_snapshot = None
         return self.undodb.undo(update_history)
 
     def redo(self, update_history=True):
+        self._person_snapshot = None
         return self.undodb.redo(update_history)
 
     def get_summary(self):
@@ -0,0 +1,358 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Parent/child adjacency index used for ancestry and descendancy queries.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from typing import Callable, Iterable, Iterator, List, Set
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..types import FamilyHandle, PersonHandle
+
+# Node states
+UNKNOWN = 0
+LOADED = 1
+MISSING = 2
+
+NONE = -1
+EMPTY = array("l")
+
+
+# -------------------------------------------------------------------------
+#
+# GraphIndex class
+#
+# -------------------------------------------------------------------------
+class GraphIndex:
+    """
+    Compact parent/child adjacency index of the people and families of a
+    database.
+
+    People and families are given integer ids when they are first seen, and
+    the links between them are held in arrays of those ids.  A node is read
+    from the database the first time it is needed, so the cost of a query
+    is proportional to the part of the tree that it visits.  Nodes that are
+    changed in the database must be invalidated, see :meth:`connect`.
+
+    :param get_person: Function returning a person, or its raw data, from a
+                       handle.
+    :type get_person: callable
+    :param get_family: Function returning a family, or its raw data, from a
+                       handle.
+    :type get_family: callable
+    """
+
+    def __init__(
+        self,
+        get_person: Callable,
+        get_family: Callable,
+    ):
+        self.get_person = get_person
+        self.get_family = get_family
+        self.clear()
+
+    def clear(self):
+        """
+        Forget all nodes.
+        """
+        self._person_ids: dict[PersonHandle, int] = {}
+        self._person_handles: List[PersonHandle] = []
+        self._person_state = bytearray()
+        self._parent_families: List[array] = []
+        self._families: List[array] = []
+
+        self._family_ids: dict[FamilyHandle, int] = {}
+        self._family_handles: List[FamilyHandle] = []
+        self._family_state = bytearray()
+        self._fathers = array("l")
+        self._mothers = array("l")
+        self._children: List[array] = []
+
+    def connect(self, db):
+        """
+        Invalidate nodes when the database emits change signals.
+        """
+        for signal in ("add", "update", "delete"):
+            db.connect("person-" + signal, self.invalidate_people)
+            db.connect("family-" + signal, self.invalidate_families)
+        db.connect("person-rebuild", self.clear)
+        db.connect("family-rebuild", self.clear)
+
+    def invalidate_people(self, handles: Iterable[PersonHandle]):
+        """
+        Mark people as changed, so that they are read again when needed.
+        """
+        for handle in handles:
+            pid = self._person_ids.get(handle)
+            if pid is not None:
+                self._person_state[pid] = UNKNOWN
+
+    def invalidate_families(self, handles: Iterable[FamilyHandle]):
+        """
+        Mark families as changed, so that they are read again when needed.
+        """
+        for handle in handles:
+            fid = self._family_ids.get(handle)
+            if fid is not None:
+                self._family_state[fid] = UNKNOWN
+
+    # ---------------------------------------------------------------------
+    #
+    # Node management
+    #
+    # ---------------------------------------------------------------------
+
+    def _person_id(self, handle: PersonHandle) -> int:
+        pid = self._person_ids.get(handle)
+        if pid is None:
+            pid = len(self._person_handles)
+            self._person_ids[handle] = pid
+            self._person_handles.append(handle)
+            self._person_state.append(UNKNOWN)
+            self._parent_families.append(EMPTY)
+            self._families.append(EMPTY)
+        return pid
+
+    def _family_id(self, handle: FamilyHandle) -> int:
+        fid = self._family_ids.get(handle)
+        if fid is None:
+            fid = len(self._family_handles)
+            self._family_ids[handle] = fid
+            self._family_handles.append(handle)
+            self._family_state.append(UNKNOWN)
+            self._fathers.append(NONE)
+            self._mothers.append(NONE)
+            self._children.append(EMPTY)
+        return fid
+
+    def _load_person(self, pid: int) -> bool:
+        state = self._person_state[pid]
+        if state == UNKNOWN:
+            person = self.get_person(self._person_handles[pid])
+            if person:
+                self._parent_families[pid] = array(
+                    "l", [self._family_id(h) for h in person.parent_family_list]
+                )
+                self._families[pid] = array(
+                    "l", [self._family_id(h) for h in person.family_list]
+                )
+                state = LOADED
+            else:
+                self._parent_families[pid] = EMPTY
+                self._families[pid] = EMPTY
+                state = MISSING
+            self._person_state[pid] = state
+        return state == LOADED
+
+    def _load_family(self, fid: int) -> bool:
+        state = self._family_state[fid]
+        if state == UNKNOWN:
+            family = self.get_family(self._family_handles[fid])
+            if family:
+                father = family.father_handle
+                mother = family.mother_handle
+                self._fathers[fid] = self._person_id(father) if father else NONE
+                self._mothers[fid] = self._person_id(mother) if mother else NONE
+                self._children[fid] = array(
+                    "l",
+                    [self._person_id(ref.ref) for ref in family.child_ref_list],
+                )
+                state = LOADED
+            else:
+                self._fathers[fid] = NONE
+                self._mothers[fid] = NONE
+                self._children[fid] = EMPTY
+                state = MISSING
+            self._family_state[fid] = state
+        return state == LOADED
+
+    def _parents(self, fid: int) -> Iterator[int]:
+        if self._load_family(fid):
+            for pid in (self._fathers[fid], self._mothers[fid]):
+                if pid != NONE:
+                    yield pid
+
+    def _parent_ids(self, pid: int, all_families: bool) -> Iterator[int]:
+        if self._load_person(pid):
+            families = self._parent_families[pid]
+            if not all_families:
+                families = families[:1]
+            for fid in families:
+                yield from self._parents(fid)
+
+    def _child_ids(self, pid: int) -> Iterator[int]:
+        if self._load_person(pid):
+            for fid in self._families[pid]:
+                if self._load_family(fid):
+                    yield from self._children[fid]
+
+    def _closure(
+        self,
+        handles: Iterable[PersonHandle],
+        neighbours: Callable[[int], Iterable[int]],
+        inclusive: bool,
+        max_steps: int | None,
+    ) -> Set[PersonHandle]:
+        """
+        Breadth first search from the given people.
+        """
+        start = [self._person_id(handle) for handle in handles]
+        found = set(start) if inclusive else set()
+        seen = set()
+        queue = deque((pid, 0) for pid in start)
+        if max_steps is not None and max_steps < 1:
+            queue.clear()
+        while queue:
+            pid, steps = queue.popleft()
+            if pid in seen:
+                continue
+            seen.add(pid)
+            steps += 1
+            for next_pid in neighbours(pid):
+                found.add(next_pid)
+                if max_steps is None or steps < max_steps:
+                    queue.append((next_pid, steps))
+        return {self._person_handles[pid] for pid in found if self._load_person(pid)}
+
+    # ---------------------------------------------------------------------
+    #
+    # Queries
+    #
+    # ---------------------------------------------------------------------
+
+    def has_person(self, handle: PersonHandle) -> bool:
+        """
+        Return True if the person exists.
+        """
+        return self._load_person(self._person_id(handle))
+
+    def has_family(self, handle: FamilyHandle) -> bool:
+        """
+        Return True if the family exists.
+        """
+        return self._load_family(self._family_id(handle))
+
+    def get_parent_families(self, handle: PersonHandle) -> List[FamilyHandle]:
+        """
+        Return the handles of the families in which the person is a child.
+        """
+        pid = self._person_id(handle)
+        self._load_person(pid)
+        return [self._family_handles[fid] for fid in self._parent_families[pid]]
+
+    def get_families(self, handle: PersonHandle) -> List[FamilyHandle]:
+        """
+        Return the handles of the families in which the person is a parent.
+        """
+        pid = self._person_id(handle)
+        self._load_person(pid)
+        return [self._family_handles[fid] for fid in self._families[pid]]
+
+    def get_parents(self, handle: FamilyHandle) -> List[PersonHandle]:
+        """
+        Return the handles of the father and mother of a family, if any.
+        """
+        return [
+            self._person_handles[pid] for pid in self._parents(self._family_id(handle))
+        ]
+
+    def get_spouse(
+        self, family_handle: FamilyHandle, handle: PersonHandle
+    ) -> PersonHandle | None:
+        """
+        Return the handle of the other parent of a family.  If the person is
+        not the father, the father is assumed to be the spouse.
+        """
+        fid = self._family_id(family_handle)
+        if not self._load_family(fid):
+            return None
+        if self._fathers[fid] == self._person_ids.get(handle, NONE):
+            spouse = self._mothers[fid]
+        else:
+            spouse = self._fathers[fid]
+        return self._person_handles[spouse] if spouse != NONE else None
+
+    def get_children(self, handle: FamilyHandle) -> List[PersonHandle]:
+        """
+        Return the handles of the children of a family.
+        """
+        fid = self._family_id(handle)
+        self._load_family(fid)
+        return [self._person_handles[pid] for pid in self._children[fid]]
+
+    def get_ancestors(
+        self,
+        handles: Iterable[PersonHandle],
+        inclusive: bool = False,
+        max_generations: int | None = None,
+        all_families: bool = False,
+    ) -> Set[PersonHandle]:
+        """
+        Return the handles of the ancestors of the given people.
+
+        :param handles: Handles of the people to start from.
+        :type handles: iterable
+        :param inclusive: Include the starting people in the result.
+        :type inclusive: bool
+        :param max_generations: Maximum number of generations to go up, or
+                                None for no limit.
+        :type max_generations: int
+        :param all_families: Follow all parent families of a person, rather
+                             than only the main one.
+        :type all_families: bool
+        """
+        return self._closure(
+            handles,
+            lambda pid: self._parent_ids(pid, all_families),
+            inclusive,
+            max_generations,
+        )
+
+    def get_descendants(
+        self,
+        handles: Iterable[PersonHandle],
+        inclusive: bool = False,
+        max_generations: int | None = None,
+    ) -> Set[PersonHandle]:
+        """
+        Return the handles of the descendants of the given people.
+
+        :param handles: Handles of the people to start from.
+        :type handles: iterable
+        :param inclusive: Include the starting people in the result.
+        :type inclusive: bool
+        :param max_generations: Maximum number of generations to go down, or
+                                None for no limit.
+        :type max_generations: int
+        """
+        return self._closure(handles, self._child_ids, inclusive, max_generations)
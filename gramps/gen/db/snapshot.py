@@ -0,0 +1,294 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+A read-only snapshot of the people, families and events of a database, in
+columns, for reports which compute statistics about all the people.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+from array import array
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..lib import ChildRefType, Date, EventRoleType, EventType, Person
+from ..lib.json_utils import data_to_object
+
+_DEATH_FALLBACKS = (
+    EventType.STILLBIRTH,
+    EventType.BURIAL,
+    EventType.CREMATION,
+    EventType.CAUSE_DEATH,
+    EventType.PROBATE,
+)
+_FAMILY_ROLES = (EventRoleType.FAMILY, EventRoleType.PRIMARY)
+
+
+# -------------------------------------------------------------------------
+#
+# PersonSnapshot class
+#
+# -------------------------------------------------------------------------
+class PersonSnapshot:
+    """
+    The facts about the people of a database used by the statistics and
+    records reports, read in one pass over the raw data of the people,
+    families and events.
+
+    The people, families and events are numbered, and each fact is a column
+    indexed by these numbers.  References to other objects are numbers, or
+    -1 if there is no reference.  For example, the birth date of the person
+    with handle ``handle`` is::
+
+        event = snapshot.birth[snapshot.index[handle]]
+        if event != -1:
+            date = snapshot.get_event_date(event)
+
+    The numeric columns are :class:`array.array` objects, which
+    ``numpy.frombuffer`` can use without a copy.
+
+    People:
+
+    - ``handles``, ``index``: the person handles, and their numbers.
+    - ``gender``: the gender.
+    - ``birth``, ``death``: the events of the birth and death references.
+    - ``death_fallback``: if there is no death reference, the first event
+      of the person which is a fallback for the death, such as a burial.
+    - ``birth_sortval``, ``death_sortval``: the sort values of the dates of
+      the birth and death events, or 0.
+    - ``events``: tuples of the events the person refers to.
+    - ``families``: tuples of the families where the person is a parent.
+    - ``family_count``: the number of these families.
+    - ``child_count``: the number of children in these families.
+
+    Families:
+
+    - ``family_handles``, ``family_index``: the family handles, and their
+      numbers.
+    - ``father``, ``mother``: the parents.
+    - ``relationship``: the value of the relationship type.
+    - ``children``: tuples of the children.
+    - ``father_birth_children``, ``mother_birth_children``: tuples of the
+      children who are birth children of the father, or of the mother.
+    - ``marriages``, ``divorces``: tuples of the marriage and divorce events
+      of the family.
+
+    Events:
+
+    - ``event_handles``, ``event_index``: the event handles, and their
+      numbers.
+    - ``event_type``: the value of the event type.
+    - ``event_sortval``: the sort value of the date.
+
+    The snapshot is not updated when the database changes.
+
+    :param db: Database to read.
+    :type db: :class:`.DbReadBase`
+    """
+
+    def __init__(self, db):
+        self.__read_events(db)
+        self.__read_people(db)
+        self.__read_families(db)
+        self.__count_children()
+
+    def __read_events(self, db):
+        self.event_handles = []
+        self.event_index = {}
+        self.event_type = array("l")
+        self.event_sortval = array("l")
+        self.__custom_types = {}
+        self.__date_data = []
+        with db.get_event_cursor() as cursor:
+            for handle, data in cursor:
+                self.event_index[handle] = len(self.event_handles)
+                self.event_handles.append(handle)
+                if data.type.value == EventType.CUSTOM:
+                    self.__custom_types[len(self.event_type)] = data.type.string
+                self.event_type.append(data.type.value)
+                self.event_sortval.append(data.date.sortval if data.date else 0)
+                self.__date_data.append(data.date)
+        self.__dates = [None] * len(self.event_handles)
+
+    def __read_people(self, db):
+        self.handles = []
+        self.index = {}
+        self.gender = array("b")
+        self.birth = array("l")
+        self.death = array("l")
+        self.death_fallback = array("l")
+        self.birth_sortval = array("l")
+        self.death_sortval = array("l")
+        self.events = []
+        self.family_count = array("l")
+        family_lists = []
+        with db.get_person_cursor() as cursor:
+            for handle, data in cursor:
+                self.index[handle] = len(self.handles)
+                self.handles.append(handle)
+                self.gender.append(data.gender)
+
+                events = []
+                birth = death = fallback = -1
+                for position, event_ref in enumerate(data.event_ref_list):
+                    event = self.event_index.get(event_ref.ref, -1)
+                    if event == -1:
+                        continue
+                    events.append(event)
+                    if position == data.birth_ref_index:
+                        birth = event
+                    if position == data.death_ref_index:
+                        death = event
+                    if (
+                        fallback == -1
+                        and event_ref.role.value == EventRoleType.PRIMARY
+                        and self.event_type[event] in _DEATH_FALLBACKS
+                    ):
+                        fallback = event
+                self.events.append(tuple(events))
+                self.birth.append(birth)
+                self.death.append(death)
+                self.death_fallback.append(fallback if death == -1 else -1)
+                self.birth_sortval.append(
+                    self.event_sortval[birth] if birth != -1 else 0
+                )
+                self.death_sortval.append(
+                    self.event_sortval[death] if death != -1 else 0
+                )
+                family_lists.append(data.family_list)
+                self.family_count.append(len(data.family_list))
+        self.families = family_lists
+
+    def __read_families(self, db):
+        self.family_handles = []
+        self.family_index = {}
+        self.father = array("l")
+        self.mother = array("l")
+        self.relationship = array("l")
+        self.children = []
+        self.father_birth_children = []
+        self.mother_birth_children = []
+        self.marriages = []
+        self.divorces = []
+        with db.get_family_cursor() as cursor:
+            for handle, data in cursor:
+                self.family_index[handle] = len(self.family_handles)
+                self.family_handles.append(handle)
+                self.father.append(self.index.get(data.father_handle, -1))
+                self.mother.append(self.index.get(data.mother_handle, -1))
+                self.relationship.append(data.type.value)
+
+                children = []
+                father_children = []
+                mother_children = []
+                for child_ref in data.child_ref_list:
+                    child = self.index.get(child_ref.ref, -1)
+                    if child == -1:
+                        continue
+                    children.append(child)
+                    if child_ref.frel.value == ChildRefType.BIRTH:
+                        father_children.append(child)
+                    if child_ref.mrel.value == ChildRefType.BIRTH:
+                        mother_children.append(child)
+                self.children.append(tuple(children))
+                self.father_birth_children.append(tuple(father_children))
+                self.mother_birth_children.append(tuple(mother_children))
+
+                marriages = []
+                divorces = []
+                for event_ref in data.event_ref_list:
+                    event = self.event_index.get(event_ref.ref, -1)
+                    if event == -1 or event_ref.role.value not in _FAMILY_ROLES:
+                        continue
+                    if self.event_type[event] == EventType.MARRIAGE:
+                        marriages.append(event)
+                    elif self.event_type[event] == EventType.DIVORCE:
+                        divorces.append(event)
+                self.marriages.append(tuple(marriages))
+                self.divorces.append(tuple(divorces))
+
+    def __count_children(self):
+        self.child_count = array("l")
+        for person, family_list in enumerate(self.families):
+            families = tuple(
+                self.family_index[handle]
+                for handle in family_list
+                if handle in self.family_index
+            )
+            self.families[person] = families
+            self.child_count.append(
+                sum(len(self.children[family]) for family in families)
+            )
+
+    def get_event_date(self, event):
+        """
+        Return the date of an event, as a :class:`.Date` object which is
+        shared and must not be changed.
+
+        :param event: Number of the event.
+        :type event: int
+        """
+        date = self.__dates[event]
+        if date is None:
+            data = self.__date_data[event]
+            date = data_to_object(data) if data else Date()
+            self.__dates[event] = date
+        return date
+
+    def get_event_type(self, event):
+        """
+        Return the type of an event, as an :class:`.EventType` object.
+
+        :param event: Number of the event.
+        :type event: int
+        """
+        value = self.event_type[event]
+        if value == EventType.CUSTOM:
+            return EventType((value, self.__custom_types[event]))
+        return EventType(value)
+
+    def get_birth_children(self, person):
+        """
+        Return the numbers of the birth children of a person, in the order
+        of their families, without duplicates.  Only the children of men and
+        women are known.
+
+        :param person: Number of the person.
+        :type person: int
+        """
+        gender = self.gender[person]
+        if gender == Person.MALE:
+            birth_children = self.father_birth_children
+        elif gender == Person.FEMALE:
+            birth_children = self.mother_birth_children
+        else:
+            return []
+        children = []
+        for family in self.families[person]:
+            for child in birth_children[family]:
+                if child not in children:
+                    children.append(child)
+        return children
@@ -0,0 +1,637 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Statistics about the people and media of a database, kept up to date from
+the database signals.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import os
+from collections import Counter, defaultdict, namedtuple
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..errors import HandleError
+from ..lib import ChildRefType
+from ..utils.callback import Callback
+from ..utils.file import media_path_full
+
+# Version of the stored statistics
+STATISTICS_VERSION = 1
+
+# Number of people updated between two steps of iter_update()
+_YIELD_INTERVAL = 200
+
+# Fields of the record of a person
+(
+    GENDER,
+    GROUP_NAMES,
+    PRIMARY_GROUP,
+    SURNAMES,
+    GIVEN_NAMES,
+    INCOMPLETE_NAMES,
+    MEDIA_REFS,
+    DISCONNECTED,
+    MISSING_BIRTH,
+    AGE,
+    MOTHER_AGE,
+    FATHER_AGE,
+) = range(12)
+
+PersonCounts = namedtuple(
+    "PersonCounts",
+    [
+        "incomplete_names",
+        "missing_birth",
+        "disconnected",
+        "with_media",
+        "media_references",
+    ],
+)
+
+
+# -------------------------------------------------------------------------
+#
+# Functions
+#
+# -------------------------------------------------------------------------
+def _get_event(db, event_ref):
+    if event_ref:
+        try:
+            return db.get_event_from_handle(event_ref.ref)
+        except HandleError:
+            pass
+    return None
+
+
+def _get_valid_date(db, event_ref):
+    event = _get_event(db, event_ref)
+    if event:
+        date = event.get_date_object()
+        if date.is_valid():
+            return date
+    return None
+
+
+def _get_person(db, handle):
+    try:
+        return db.get_person_from_handle(handle)
+    except HandleError:
+        return None
+
+
+def _get_family(db, handle):
+    try:
+        return db.get_family_from_handle(handle)
+    except HandleError:
+        return None
+
+
+def _get_birth_parents(db, person):
+    """
+    Return the handles of the biological mother and father of a person.
+    """
+    m_handle = None
+    f_handle = None
+    for family_handle in person.get_parent_family_handle_list():
+        family = _get_family(db, family_handle)
+        if family:
+            for ref in family.get_child_ref_list():
+                if ref.ref == person.handle:
+                    if ref.get_mother_relation() == ChildRefType.BIRTH:
+                        m_handle = family.get_mother_handle()
+                    if ref.get_father_relation() == ChildRefType.BIRTH:
+                        f_handle = family.get_father_handle()
+                    break
+    return m_handle, f_handle
+
+
+def _get_given_names(names):
+    """
+    Return the parts of the given names, as shown in the given name cloud.
+    """
+    given_names = []
+    for givenname in sorted(set(name.get_first_name().strip() for name in names)):
+        nbsp = givenname.split("\u00a0")
+        if len(nbsp) > 1:  # there was an NBSP, a non-breaking space
+            given_names.append(nbsp[0] + "\u00a0" + nbsp[1].split()[0])
+            givenname = " ".join(nbsp[1].split()[1:])
+        given_names.extend(givenname.split())
+    return given_names
+
+
+def get_person_record(db, person):
+    """
+    Return the contribution of a person to the statistics, as a list that
+    can be stored in the database metadata.
+    """
+    primary_name = person.get_primary_name()
+    names = [primary_name] + person.get_alternate_names()
+
+    incomplete_names = 0
+    for name in names:
+        if name.get_first_name().strip() == "":
+            incomplete_names += 1
+        elif name.get_surname_list():
+            for surname in name.get_surname_list():
+                if surname.get_surname().strip() == "":
+                    incomplete_names += 1
+        else:
+            incomplete_names += 1
+
+    birth = _get_event(db, person.get_birth_ref())
+    missing_birth = birth is None or birth.get_date_object().is_empty()
+
+    age = mother_age = father_age = None
+    birth_date = _get_valid_date(db, person.get_birth_ref())
+    if birth_date:
+        death_date = _get_valid_date(db, person.get_death_ref())
+        if death_date:
+            diff = (death_date - birth_date).tuple()[0]
+            if diff >= 0:
+                age = diff
+        parent_ages = []
+        for parent_handle in _get_birth_parents(db, person):
+            parent_age = None
+            parent = _get_person(db, parent_handle) if parent_handle else None
+            if parent:
+                parent_birth = _get_valid_date(db, parent.get_birth_ref())
+                if parent_birth:
+                    diff = (birth_date - parent_birth).tuple()[0]
+                    if diff >= 0:
+                        parent_age = [parent_handle, diff]
+            parent_ages.append(parent_age)
+        mother_age, father_age = parent_ages
+
+    return [
+        person.get_gender(),
+        sorted(set(name.get_group_name().strip() for name in names)),
+        primary_name.get_group_name().strip(),
+        sorted(set(name.get_surname().strip() for name in names) - {""}),
+        _get_given_names(names),
+        incomplete_names,
+        len(person.get_media_list()),
+        not person.get_main_parents_family_handle()
+        and not person.get_family_handle_list(),
+        missing_birth,
+        age,
+        mother_age,
+        father_age,
+    ]
+
+
+def get_media_record(db, media):
+    """
+    Return the path of a media object, and the size of its file, or None if
+    the file is missing.
+    """
+    path = media.get_path()
+    try:
+        size = os.path.getsize(media_path_full(db, path))
+    except OSError:
+        size = None
+    return [path, size]
+
+
+def _tally(counter, key, sign):
+    counter[key] += sign
+    if not counter[key]:
+        del counter[key]
+
+
+def _tally_nested(counters, key, handle, sign):
+    _tally(counters[key], handle, sign)
+    if not counters[key]:
+        del counters[key]
+
+
+# -------------------------------------------------------------------------
+#
+# TreeStatistics class
+#
+# -------------------------------------------------------------------------
+class TreeStatistics(Callback):
+    """
+    Counters about the people and media of a database, such as surname and
+    gender frequencies and age distributions.
+
+    The contribution of each person is recorded, so that the counters can
+    be updated from the handles of the objects that changed, see
+    :meth:`connect_signals`.  The changes are applied when the statistics
+    are next read.  The ``statistics-changed`` signal is emitted when the
+    statistics may have changed.
+
+    :param db: Database to count.
+    :type db: :class:`.DbReadBase`
+    :param load: Function returning the statistics saved by
+                 :meth:`get_data`, or None.
+    :type load: callable
+    """
+
+    __signals__ = {"statistics-changed": None}
+
+    def __init__(self, db, load=None):
+        Callback.__init__(self)
+        self.db = db
+        self.__load = load
+        self.__signal_keys = []
+        self.__updater = None
+        self._records = None
+        self._media = None
+        self._dirty_people = set()
+        self._dirty_families = set()
+        self._dirty_events = set()
+        self._dirty_media = set()
+
+    def connect_signals(self):
+        """
+        Update the statistics when the database emits change signals.
+        """
+        for signal, dirty in (
+            ("person", self._dirty_people),
+            ("family", self._dirty_families),
+            ("event", self._dirty_events),
+            ("media", self._dirty_media),
+        ):
+            for action in ("add", "update", "delete"):
+                self.__signal_keys.append(
+                    self.db.connect(
+                        "%s-%s" % (signal, action),
+                        lambda handles, dirty=dirty: self.__changed(dirty, handles),
+                    )
+                )
+            self.__signal_keys.append(self.db.connect(signal + "-rebuild", self.clear))
+
+    def disconnect_signals(self):
+        """
+        Stop following the changes of the database.
+        """
+        for key in self.__signal_keys:
+            self.db.disconnect(key)
+        self.__signal_keys = []
+
+    def __changed(self, dirty, handles):
+        dirty.update(handles)
+        self.emit("statistics-changed")
+
+    def clear(self, *args):
+        """
+        Forget the statistics, so that they are counted again when needed.
+        """
+        if self.__updater is not None:
+            self.__updater.close()
+            self.__updater = None
+        self.__load = None
+        self._records = None
+        self._media = None
+        for dirty in (
+            self._dirty_people,
+            self._dirty_families,
+            self._dirty_events,
+            self._dirty_media,
+        ):
+            dirty.clear()
+        self.emit("statistics-changed")
+
+    def is_loaded(self):
+        """
+        Return True if the statistics have been counted or loaded.
+        """
+        return self._records is not None
+
+    # ---------------------------------------------------------------------
+    #
+    # Updates
+    #
+    # ---------------------------------------------------------------------
+
+    def iter_update(self):
+        """
+        Bring the statistics up to date, yielding at regular intervals so
+        that the caller can process events.
+        """
+        while True:
+            if self.__updater is None:
+                if self._records is not None and not self.__is_dirty():
+                    return
+                self.__updater = self.__update_steps()
+            updater = self.__updater
+            try:
+                next(updater)
+            except StopIteration:
+                if self.__updater is updater:
+                    self.__updater = None
+                continue
+            yield True
+
+    def update(self):
+        """
+        Bring the statistics up to date.
+        """
+        for _ in self.iter_update():
+            pass
+
+    def __is_dirty(self):
+        return (
+            self._dirty_people
+            or self._dirty_families
+            or self._dirty_events
+            or self._dirty_media
+        )
+
+    def __update_steps(self):
+        if self._records is None:
+            data = self.__load() if self.__load else None
+            self.__load = None
+            if not self.__set_data(data):
+                yield from self.__count_all()
+        yield from self.__apply_changes()
+
+    def __reset(self):
+        self._records = {}
+        self._media = {}
+        self._genders = Counter()
+        self._surname_people = defaultdict(Counter)
+        self._surnames = Counter()
+        self._given_names = Counter()
+        self._counts = Counter()
+        self._ages = defaultdict(Counter)
+        self._mother_ages = defaultdict(Counter)
+        self._father_ages = defaultdict(Counter)
+        self._media_bytes = 0
+        self._missing_media = 0
+
+    def __count_all(self):
+        self.__reset()
+        self._dirty_people.clear()
+        self._dirty_families.clear()
+        self._dirty_events.clear()
+        self._dirty_media.clear()
+        for count, handle in enumerate(list(self.db.get_person_handles()), 1):
+            self.__update_person(handle)
+            if not count % _YIELD_INTERVAL:
+                yield
+        for handle in list(self.db.get_media_handles()):
+            self.__update_media(handle)
+
+    def __apply_changes(self):
+        count = 0
+        while self.__is_dirty():
+            children = set()
+            while self._dirty_families:
+                family = _get_family(self.db, self._dirty_families.pop())
+                if family:
+                    children.update(ref.ref for ref in family.get_child_ref_list())
+            while self._dirty_events:
+                handle = self._dirty_events.pop()
+                self._dirty_people.update(
+                    obj_handle
+                    for obj_class, obj_handle in self.db.find_backlink_handles(
+                        handle, ["Person"]
+                    )
+                )
+            # The ages of the parents of the children of a person depend on
+            # the birth of the person
+            while self._dirty_people:
+                person = self.__update_person(self._dirty_people.pop())
+                if person:
+                    for family_handle in person.get_family_handle_list():
+                        family = _get_family(self.db, family_handle)
+                        if family:
+                            children.update(
+                                ref.ref for ref in family.get_child_ref_list()
+                            )
+                count += 1
+                if not count % _YIELD_INTERVAL:
+                    yield
+            while children:
+                self.__update_person(children.pop())
+                count += 1
+                if not count % _YIELD_INTERVAL:
+                    yield
+            while self._dirty_media:
+                self.__update_media(self._dirty_media.pop())
+
+    def __update_person(self, handle):
+        record = self._records.pop(handle, None)
+        if record:
+            self.__count(handle, record, -1)
+        person = _get_person(self.db, handle)
+        if person:
+            record = get_person_record(self.db, person)
+            self._records[handle] = record
+            self.__count(handle, record, 1)
+        return person
+
+    def __count(self, handle, record, sign):
+        self._genders[record[GENDER]] += sign
+        for surname in record[GROUP_NAMES]:
+            _tally_nested(self._surname_people, surname, handle, sign)
+        for surname in record[SURNAMES]:
+            _tally(self._surnames, surname, sign)
+        for given_name in record[GIVEN_NAMES]:
+            _tally(self._given_names, given_name, sign)
+        self._counts["incomplete_names"] += sign * record[INCOMPLETE_NAMES]
+        self._counts["missing_birth"] += sign * record[MISSING_BIRTH]
+        self._counts["disconnected"] += sign * record[DISCONNECTED]
+        self._counts["with_media"] += sign * (record[MEDIA_REFS] > 0)
+        self._counts["media_references"] += sign * record[MEDIA_REFS]
+        if record[AGE] is not None:
+            _tally_nested(self._ages, record[AGE], handle, sign)
+        if record[MOTHER_AGE]:
+            mother_handle, age = record[MOTHER_AGE]
+            _tally_nested(self._mother_ages, age, mother_handle, sign)
+        if record[FATHER_AGE]:
+            father_handle, age = record[FATHER_AGE]
+            _tally_nested(self._father_ages, age, father_handle, sign)
+
+    def __update_media(self, handle):
+        record = self._media.pop(handle, None)
+        if record:
+            self.__count_media(record, -1)
+        try:
+            media = self.db.get_media_from_handle(handle)
+        except HandleError:
+            return
+        if media:
+            record = get_media_record(self.db, media)
+            self._media[handle] = record
+            self.__count_media(record, 1)
+
+    def __count_media(self, record, sign):
+        if record[1] is None:
+            self._missing_media += sign
+        else:
+            self._media_bytes += sign * record[1]
+
+    # ---------------------------------------------------------------------
+    #
+    # Storage
+    #
+    # ---------------------------------------------------------------------
+
+    def __get_sizes(self):
+        return [
+            self.db.get_number_of_people(),
+            self.db.get_number_of_families(),
+            self.db.get_number_of_events(),
+            self.db.get_number_of_media(),
+        ]
+
+    def get_data(self):
+        """
+        Return the statistics, up to date, as a dict that can be stored in
+        the database metadata.
+        """
+        self.update()
+        return {
+            "version": STATISTICS_VERSION,
+            "sizes": self.__get_sizes(),
+            "people": self._records,
+            "media": self._media,
+        }
+
+    def __set_data(self, data):
+        """
+        Use statistics returned by :meth:`get_data`.  Return False if they
+        are not for the current database.
+        """
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != STATISTICS_VERSION
+            or list(data.get("sizes", [])) != self.__get_sizes()
+        ):
+            return False
+        self.__reset()
+        self._records = data["people"]
+        self._media = data["media"]
+        for handle, record in self._records.items():
+            self.__count(handle, record, 1)
+        for record in self._media.values():
+            self.__count_media(record, 1)
+        return True
+
+    # ---------------------------------------------------------------------
+    #
+    # Queries
+    #
+    # ---------------------------------------------------------------------
+
+    def get_number_of_people(self):
+        """
+        Return the number of people counted.
+        """
+        self.update()
+        return len(self._records)
+
+    def get_gender_counts(self):
+        """
+        Return the number of people of each gender, keyed by gender.
+        """
+        self.update()
+        return dict(self._genders)
+
+    def get_surname_counts(self):
+        """
+        Return the number of people with each surname, keyed by the group
+        names of their primary and alternate names.
+        """
+        self.update()
+        return {
+            surname: len(people) for surname, people in self._surname_people.items()
+        }
+
+    def get_surname_representative(self, surname):
+        """
+        Return the handle of a person with a surname, given as a group name,
+        preferring people for whom it is the surname of their primary name.
+        Return None if no person has the surname.
+        """
+        self.update()
+        people = sorted(self._surname_people.get(surname, ()))
+        for handle in people:
+            if self._records[handle][PRIMARY_GROUP] == surname:
+                return handle
+        return people[0] if people else None
+
+    def get_number_of_surnames(self):
+        """
+        Return the number of different surnames of the names of the people.
+        """
+        self.update()
+        return len(self._surnames)
+
+    def get_given_name_counts(self):
+        """
+        Return the number of times each part of a given name is used, keyed
+        by the part.
+        """
+        self.update()
+        return dict(self._given_names)
+
+    def get_person_counts(self):
+        """
+        Return a :class:`PersonCounts` tuple with the number of incomplete
+        names, of people missing a birth date, of disconnected people, of
+        people with media, and of media references of people.
+        """
+        self.update()
+        return PersonCounts(*(self._counts[field] for field in PersonCounts._fields))
+
+    def get_media_size(self):
+        """
+        Return the total size in bytes of the media files, and the number of
+        media objects whose file is missing.
+        """
+        self.update()
+        return self._media_bytes, self._missing_media
+
+    def __get_handles(self, name):
+        self.update()
+        ages = getattr(self, name)
+        return {age: list(handles.elements()) for age, handles in ages.items()}
+
+    def get_lifespans(self):
+        """
+        Return the handles of the people with known birth and death dates,
+        keyed by their age at death.
+        """
+        return self.__get_handles("_ages")
+
+    def get_mother_ages(self):
+        """
+        Return the handles of the birth mothers of people, keyed by their
+        age at the birth.  A mother is listed once for each child.
+        """
+        return self.__get_handles("_mother_ages")
+
+    def get_father_ages(self):
+        """
+        Return the handles of the birth fathers of people, keyed by their
+        age at the birth.  A father is listed once for each child.
+        """
+        return self.__get_handles("_father_ages")
@@ -0,0 +1,154 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Summary of the birth and death of a person, as shown by the person views.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+from collections import namedtuple
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ..errors import HandleError
+from ..lib.eventroletype import EventRoleType
+
+# -------------------------------------------------------------------------
+#
+# EventSummary
+#
+# -------------------------------------------------------------------------
+EventSummary = namedtuple(
+    "EventSummary",
+    [
+        "event",
+        "fallback",
+        "sort_key",
+        "valid",
+        "place_event",
+        "place_fallback",
+        "place",
+    ],
+)
+EventSummary.__doc__ = """
+Birth or death of a person.
+
+``event`` is the handle of the event whose date is shown, ``fallback`` is
+True if it is a fallback event like a baptism, and ``sort_key`` and
+``valid`` are the sort value and validity of its date.  ``place_event`` is
+the handle of the event whose place is shown, which may be a fallback event
+even if ``event`` is not, and ``place`` is the handle of that place.
+"""
+
+EMPTY_SUMMARY = EventSummary(None, False, None, True, None, False, None)
+
+# Kinds of summaries, in the order of the result of get_person_summary
+SUMMARY_KINDS = ("birth", "death")
+
+
+def get_event_summary(db, person, kind):
+    """
+    Return the :class:`EventSummary` of the birth or death of a person.
+
+    The birth or death event is used if the person has one.  Otherwise the
+    first fallback event, where the person has the primary role, with a
+    date gives the date and the first one with a place gives the place.  A
+    birth or death event without a place also takes its place from the
+    fallbacks.
+
+    :param db: Database holding the events of the person.
+    :type db: :class:`.DbReadBase`
+    :param person: Person to summarize.
+    :type person: :class:`.Person`
+    :param kind: "birth" or "death".
+    :type kind: str
+    :rtype: :class:`EventSummary`
+    """
+    if kind == "birth":
+        index = person.birth_ref_index
+    else:
+        index = person.death_ref_index
+    event_ref_list = person.get_event_ref_list()
+
+    events = {}
+
+    def get_event(handle):
+        if handle not in events:
+            try:
+                events[handle] = db.get_event_from_handle(handle)
+            except HandleError:
+                events[handle] = None
+        return events[handle]
+
+    date_event = place_event = None
+    date_fallback = place_fallback = False
+    if index != -1:
+        if index >= len(event_ref_list):
+            return EMPTY_SUMMARY
+        date_event = get_event(event_ref_list[index].ref)
+        if date_event is None:
+            return EMPTY_SUMMARY
+        if date_event.get_place_handle():
+            place_event = date_event
+
+    if date_event is None or place_event is None:
+        for event_ref in event_ref_list:
+            if event_ref.get_role() != EventRoleType.PRIMARY:
+                continue
+            event = get_event(event_ref.ref)
+            if event is None:
+                continue
+            event_type = event.get_type()
+            if kind == "birth":
+                is_fallback = event_type.is_birth_fallback()
+            else:
+                is_fallback = event_type.is_death_fallback()
+            if not is_fallback:
+                continue
+            if date_event is None and not event.get_date_object().is_empty():
+                date_event = event
+                date_fallback = True
+            if place_event is None and event.get_place_handle():
+                place_event = event
+                place_fallback = True
+            if date_event is not None and place_event is not None:
+                break
+
+    sort_key = None
+    valid = True
+    if date_event is not None:
+        date = date_event.get_date_object()
+        sort_key = date.get_sort_key()
+        valid = date.get_valid()
+    return EventSummary(
+        date_event.get_handle() if date_event is not None else None,
+        date_fallback,
+        sort_key,
+        valid,
+        place_event.get_handle() if place_event is not None else None,
+        place_fallback,
+        place_event.get_place_handle() if place_event is not None else None,
+    )
@@ -0,0 +1,124 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the object cache of the database.
+"""
+
+import unittest
+
+from gramps.gen.db import DbTxn, PERSON_KEY
+from gramps.gen.db.cache import ObjectCache
+from gramps.gen.db.utils import make_database
+from gramps.gen.errors import HandleError
+from gramps.gen.lib import Person
+
+
+class ObjectCacheTest(unittest.TestCase):
+    """
+    Test the LRU tables.
+    """
+
+    def test_lru(self):
+        cache = ObjectCache(2)
+        cache.put(PERSON_KEY, "a", 1)
+        cache.put(PERSON_KEY, "b", 2)
+        self.assertEqual(cache.get(PERSON_KEY, "a"), 1)
+        # "b" is now the least recently used
+        cache.put(PERSON_KEY, "c", 3)
+        self.assertIsNone(cache.get(PERSON_KEY, "b"))
+        self.assertEqual(cache.get(PERSON_KEY, "c"), 3)
+        cache.invalidate(PERSON_KEY, "c")
+        cache.invalidate(PERSON_KEY, "x")
+        self.assertIsNone(cache.get(PERSON_KEY, "c"))
+        self.assertEqual(
+            cache.get_stats()["Person"], {"hits": 2, "misses": 2, "size": 1}
+        )
+
+    def test_disabled(self):
+        cache = ObjectCache(0)
+        cache.put(PERSON_KEY, "a", 1)
+        self.assertIsNone(cache.get(PERSON_KEY, "a"))
+
+
+class DbCacheTest(unittest.TestCase):
+    """
+    Test that the cache of a database follows its changes.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add", self.db) as trans:
+            self.handle = self.db.add_person(Person(), trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def get_gender(self):
+        return self.db.get_person_from_handle(self.handle).get_gender()
+
+    def set_gender(self, gender):
+        with DbTxn("Edit", self.db) as trans:
+            person = self.db.get_person_from_handle(self.handle)
+            person.set_gender(gender)
+            self.db.commit_person(person, trans)
+
+    def test_hits(self):
+        stats = self.db.get_cache_stats()["Person"]
+        self.get_gender()
+        self.get_gender()
+        new_stats = self.db.get_cache_stats()["Person"]
+        self.assertEqual(new_stats["hits"], stats["hits"] + 1)
+        self.assertEqual(new_stats["misses"], stats["misses"] + 1)
+
+    def test_copies(self):
+        person = self.db.get_person_from_handle(self.handle)
+        person.set_gender(Person.FEMALE)
+        self.assertEqual(self.get_gender(), Person.UNKNOWN)
+
+    def test_commit_and_undo(self):
+        self.assertEqual(self.get_gender(), Person.UNKNOWN)
+        self.set_gender(Person.MALE)
+        self.assertEqual(self.get_gender(), Person.MALE)
+        self.db.undo()
+        self.assertEqual(self.get_gender(), Person.UNKNOWN)
+        self.db.redo()
+        self.assertEqual(self.get_gender(), Person.MALE)
+
+    def test_remove(self):
+        self.get_gender()
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_person(self.handle, trans)
+        self.assertRaises(HandleError, self.get_gender)
+
+    def test_abort(self):
+        self.get_gender()
+        with self.assertRaises(ValueError):
+            with DbTxn("Edit", self.db, batch=True) as trans:
+                person = self.db.get_person_from_handle(self.handle)
+                person.set_gender(Person.MALE)
+                self.db.commit_person(person, trans)
+                self.assertEqual(self.get_gender(), Person.MALE)
+                raise ValueError
+        self.assertEqual(self.get_gender(), Person.UNKNOWN)
+
+
+if __name__ == "__main__":
+    unittest.main()
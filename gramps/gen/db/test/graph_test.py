@@ -0,0 +1,133 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Unittest for the parent/child graph index"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import ChildRef, Family, Person
+
+
+# -------------------------------------------------------------------------
+#
+# GraphIndexTest class
+#
+# -------------------------------------------------------------------------
+class GraphIndexTest(unittest.TestCase):
+    """
+    Tests for the graph index of a database.
+    """
+
+    GENERATIONS = 1100
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        # A single line of descent, deeper than the recursion limit
+        with DbTxn("Pedigree", self.db, batch=True) as trans:
+            parents = None
+            for gen in range(self.GENERATIONS):
+                parents = self.add_couple(gen, parents, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_couple(self, gen, parents, trans):
+        person = Person()
+        person.set_handle("P%d" % gen)
+        spouse = Person()
+        spouse.set_handle("S%d" % gen)
+        family = Family()
+        family.set_handle("F%d" % gen)
+        family.set_father_handle(person.handle)
+        family.set_mother_handle(spouse.handle)
+        person.add_family_handle(family.handle)
+        spouse.add_family_handle(family.handle)
+        if parents:
+            person.add_parent_family_handle(parents.handle)
+            child_ref = ChildRef()
+            child_ref.set_reference_handle(person.handle)
+            parents.add_child_ref(child_ref)
+            self.db.commit_family(parents, trans)
+        self.db.add_person(person, trans)
+        self.db.add_person(spouse, trans)
+        self.db.add_family(family, trans)
+        return family
+
+    def test_ancestors(self):
+        graph = self.db.get_graph_index()
+        last = "P%d" % (self.GENERATIONS - 1)
+        ancestors = graph.get_ancestors([last])
+        self.assertEqual(len(ancestors), 2 * (self.GENERATIONS - 1))
+        self.assertNotIn(last, ancestors)
+        self.assertIn(last, graph.get_ancestors([last], inclusive=True))
+        self.assertEqual(
+            graph.get_ancestors([last], max_generations=2),
+            {"P1097", "S1097", "P1098", "S1098"},
+        )
+
+    def test_descendants(self):
+        graph = self.db.get_graph_index()
+        descendants = graph.get_descendants(["S0"])
+        self.assertEqual(len(descendants), self.GENERATIONS - 1)
+        self.assertEqual(graph.get_descendants(["P0"], max_generations=1), {"P1"})
+        self.assertEqual(graph.get_spouse("F0", "P0"), "S0")
+        self.assertEqual(graph.get_spouse("F0", "S0"), "P0")
+
+    def test_update(self):
+        graph = self.db.get_graph_index()
+        self.assertIs(graph, self.db.get_graph_index())
+        self.assertEqual(graph.get_descendants(["P1097"]), {"P1098", "P1099"})
+
+        # Detach the last generation from its parents
+        with DbTxn("Update", self.db) as trans:
+            family = self.db.get_family_from_handle("F1098")
+            family.set_child_ref_list([])
+            self.db.commit_family(family, trans)
+            person = self.db.get_person_from_handle("P1099")
+            person.clear_parent_family_handle_list()
+            self.db.commit_person(person, trans)
+        self.assertEqual(graph.get_descendants(["P1097"]), {"P1098"})
+        self.assertEqual(graph.get_ancestors(["P1099"]), set())
+
+        # Batch transactions don't emit signals
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            parents = self.db.get_family_from_handle("F1098")
+            self.add_couple(self.GENERATIONS, parents, trans)
+        self.assertEqual(graph.get_descendants(["P1098"]), {"P1100"})
+
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_person("P1100", trans)
+        self.assertEqual(graph.get_descendants(["P1098"]), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
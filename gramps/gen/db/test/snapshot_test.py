@@ -0,0 +1,178 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Unittest for the snapshot of the people of a database"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    ChildRef,
+    ChildRefType,
+    Date,
+    Event,
+    EventRef,
+    EventRoleType,
+    EventType,
+    Family,
+    FamilyRelType,
+    Person,
+)
+
+
+# -------------------------------------------------------------------------
+#
+# PersonSnapshotTest class
+#
+# -------------------------------------------------------------------------
+class PersonSnapshotTest(unittest.TestCase):
+    """
+    Tests for the columns of the snapshot of a database.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add", self.db) as trans:
+            self.add_event("BF", EventType.BIRTH, 1850, trans)
+            self.add_event("DF", EventType.BURIAL, 1920, trans)
+            self.add_event("BM", EventType.BIRTH, 1855, trans)
+            self.add_event("BC", EventType.BIRTH, 1880, trans)
+            self.add_event("M", EventType.MARRIAGE, 1878, trans)
+            self.add_event("X", EventType.CUSTOM, 1890, trans)
+            self.add_person("F", Person.MALE, ["BF", "DF"], trans)
+            self.add_person("M", Person.FEMALE, ["BM"], trans)
+            self.add_person("C", Person.FEMALE, ["BC", "X"], trans)
+            self.add_person("A", Person.MALE, [], trans)
+
+            family = Family()
+            family.set_handle("FAM")
+            family.set_father_handle("F")
+            family.set_mother_handle("M")
+            family.set_relationship(FamilyRelType.MARRIED)
+            event_ref = EventRef()
+            event_ref.set_reference_handle("M")
+            event_ref.set_role(EventRoleType.FAMILY)
+            family.add_event_ref(event_ref)
+            for handle, mother_relation in (
+                ("C", ChildRefType.BIRTH),
+                ("A", ChildRefType.ADOPTED),
+            ):
+                child_ref = ChildRef()
+                child_ref.set_reference_handle(handle)
+                child_ref.set_mother_relation(mother_relation)
+                family.add_child_ref(child_ref)
+            self.db.add_family(family, trans)
+            for handle, attr in (
+                ("F", "add_family_handle"),
+                ("M", "add_family_handle"),
+                ("C", "add_parent_family_handle"),
+                ("A", "add_parent_family_handle"),
+            ):
+                person = self.db.get_person_from_handle(handle)
+                getattr(person, attr)("FAM")
+                self.db.commit_person(person, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_event(self, handle, event_type, year, trans):
+        event = Event()
+        event.set_handle(handle)
+        if event_type == EventType.CUSTOM:
+            event.set_type((event_type, "Graduation"))
+        else:
+            event.set_type(event_type)
+        date = Date()
+        date.set_yr_mon_day(year, 1, 1)
+        event.set_date_object(date)
+        self.db.add_event(event, trans)
+
+    def add_person(self, handle, gender, events, trans):
+        person = Person()
+        person.set_handle(handle)
+        person.set_gender(gender)
+        for event_handle in events:
+            event_ref = EventRef()
+            event_ref.set_reference_handle(event_handle)
+            if event_handle.startswith("B"):
+                person.set_birth_ref(event_ref)
+            else:
+                person.add_event_ref(event_ref)
+        self.db.add_person(person, trans)
+
+    def test_columns(self):
+        snapshot = self.db.get_person_snapshot()
+        father, mother, child, adopted = (
+            snapshot.index[handle] for handle in ("F", "M", "C", "A")
+        )
+        self.assertEqual(snapshot.gender[mother], Person.FEMALE)
+        self.assertEqual(snapshot.event_handles[snapshot.birth[father]], "BF")
+        self.assertEqual(snapshot.death[father], -1)
+        self.assertEqual(snapshot.event_handles[snapshot.death_fallback[father]], "DF")
+        self.assertEqual(snapshot.birth[adopted], -1)
+        self.assertEqual(
+            snapshot.birth_sortval[child], Date(1880, 1, 1).get_sort_value()
+        )
+        self.assertEqual(
+            snapshot.get_event_date(snapshot.birth[mother]).get_year(), 1855
+        )
+        self.assertEqual(
+            str(snapshot.get_event_type(snapshot.events[child][1])), "Graduation"
+        )
+
+        family = snapshot.family_index["FAM"]
+        self.assertEqual(snapshot.families[father], (family,))
+        self.assertEqual(snapshot.family_count[mother], 1)
+        self.assertEqual(snapshot.child_count[mother], 2)
+        self.assertEqual(
+            (snapshot.father[family], snapshot.mother[family]), (father, mother)
+        )
+        self.assertEqual(snapshot.children[family], (child, adopted))
+        self.assertEqual(snapshot.marriages[family], (snapshot.event_index["M"],))
+        self.assertEqual(snapshot.get_birth_children(father), [child, adopted])
+        self.assertEqual(snapshot.get_birth_children(mother), [child])
+        self.assertEqual(snapshot.get_birth_children(child), [])
+
+    def test_cache(self):
+        snapshot = self.db.get_person_snapshot()
+        self.assertIs(self.db.get_person_snapshot(), snapshot)
+        with DbTxn("Edit", self.db) as trans:
+            self.db.remove_person("A", trans)
+        self.assertIsNot(self.db.get_person_snapshot(), snapshot)
+        self.assertNotIn("A", self.db.get_person_snapshot().index)
+
+        snapshot = self.db.get_person_snapshot()
+        self.db.undo()
+        self.assertIn("A", self.db.get_person_snapshot().index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Unittest for the statistics of the people of a database"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import tempfile
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DBMODE_R, DbTxn
+from gramps.gen.db.statistics import TreeStatistics
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    ChildRef,
+    Date,
+    Event,
+    EventRef,
+    EventType,
+    Family,
+    Name,
+    Person,
+    Surname,
+)
+
+
+# -------------------------------------------------------------------------
+#
+# TreeStatisticsTest class
+#
+# -------------------------------------------------------------------------
+class TreeStatisticsTest(unittest.TestCase):
+    """
+    Tests for the statistics of a database, updated from its signals.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add", self.db) as trans:
+            self.add_person("F", "Webb", "John", Person.MALE, 1850, trans)
+            self.add_person("M", "Allen", "Mary", Person.FEMALE, 1855, trans)
+            self.add_person("C", "Webb", "Ann Lee", Person.FEMALE, 1880, trans)
+            family = Family()
+            family.set_handle("FAM")
+            family.set_father_handle("F")
+            family.set_mother_handle("M")
+            child_ref = ChildRef()
+            child_ref.set_reference_handle("C")
+            family.add_child_ref(child_ref)
+            self.db.add_family(family, trans)
+            for handle, attr in (
+                ("F", "add_family_handle"),
+                ("M", "add_family_handle"),
+                ("C", "add_parent_family_handle"),
+            ):
+                person = self.db.get_person_from_handle(handle)
+                getattr(person, attr)("FAM")
+                self.db.commit_person(person, trans)
+        self.stats = self.db.get_statistics()
+        self.signals = []
+        self.stats.connect("statistics-changed", lambda: self.signals.append(1))
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_person(self, handle, surname, first_name, gender, year, trans):
+        event = Event()
+        event.set_handle("B" + handle)
+        event.set_type(EventType.BIRTH)
+        date = Date()
+        date.set_yr_mon_day(year, 1, 1)
+        event.set_date_object(date)
+        self.db.add_event(event, trans)
+        person = Person()
+        person.set_handle(handle)
+        person.set_gender(gender)
+        name = Name()
+        name.set_first_name(first_name)
+        name_surname = Surname()
+        name_surname.set_surname(surname)
+        name.add_surname(name_surname)
+        person.set_primary_name(name)
+        event_ref = EventRef()
+        event_ref.set_reference_handle(event.handle)
+        person.set_birth_ref(event_ref)
+        self.db.add_person(person, trans)
+
+    def assert_counted(self):
+        """
+        The updated statistics are the same as counting them again.
+        """
+        self.assertEqual(self.stats.get_data(), TreeStatistics(self.db).get_data())
+
+    def test_counts(self):
+        self.assertEqual(self.stats.get_number_of_people(), 3)
+        self.assertEqual(
+            self.stats.get_gender_counts(), {Person.MALE: 1, Person.FEMALE: 2}
+        )
+        self.assertEqual(self.stats.get_surname_counts(), {"Webb": 2, "Allen": 1})
+        self.assertEqual(self.stats.get_surname_representative("Webb"), "C")
+        self.assertEqual(
+            self.stats.get_given_name_counts(),
+            {"John": 1, "Mary": 1, "Ann": 1, "Lee": 1},
+        )
+        self.assertEqual(self.stats.get_person_counts().disconnected, 0)
+        self.assertEqual(self.stats.get_mother_ages(), {25: ["M"]})
+        self.assertEqual(self.stats.get_father_ages(), {30: ["F"]})
+        self.assertEqual(self.stats.get_media_size(), (0, 0))
+
+    def test_updates(self):
+        self.stats.update()
+        with DbTxn("Edit", self.db) as trans:
+            event = self.db.get_event_from_handle("BM")
+            event.get_date_object().set_yr_mon_day(1860, 1, 1)
+            self.db.commit_event(event, trans)
+            person = self.db.get_person_from_handle("F")
+            person.get_primary_name().get_surname_list()[0].set_surname("Allen")
+            self.db.commit_person(person, trans)
+        self.assertTrue(self.signals)
+        self.assertEqual(self.stats.get_mother_ages(), {20: ["M"]})
+        self.assertEqual(self.stats.get_surname_counts(), {"Webb": 1, "Allen": 2})
+        self.assert_counted()
+
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_family_relationships("FAM", trans)
+            self.db.remove_person("M", trans)
+        self.assertEqual(self.stats.get_mother_ages(), {})
+        self.assertEqual(self.stats.get_person_counts().disconnected, 2)
+        self.assert_counted()
+
+    def test_batch(self):
+        self.stats.update()
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            self.db.remove_person("C", trans)
+        self.assertFalse(self.stats.is_loaded())
+        self.assertEqual(self.stats.get_number_of_people(), 2)
+
+    def test_saved(self):
+        data = self.stats.get_data()
+        stats = TreeStatistics(self.db, lambda: data)
+        self.assertEqual(stats.get_number_of_people(), 3)
+        self.assertIs(stats.get_data()["people"], data["people"])
+
+        # Statistics saved for a different database are counted again
+        data["sizes"][0] += 1
+        stats = TreeStatistics(self.db, lambda: data)
+        self.assertEqual(stats.get_number_of_people(), 3)
+        self.assertIsNot(stats.get_data()["people"], data["people"])
+
+
+class SavedStatisticsTest(unittest.TestCase):
+    """
+    Tests for the statistics saved when a database is closed.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+        with DbTxn("Add", self.db) as trans:
+            self.add_person("Smith", trans)
+        self.db.get_statistics().update()
+        self.db.close()
+        self.db.load(self.tmpdir.name)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def add_person(self, surname, trans):
+        person = Person()
+        person.set_handle("P")
+        name = Name()
+        name_surname = Surname()
+        name_surname.set_surname(surname)
+        name.add_surname(name_surname)
+        person.set_primary_name(name)
+        self.db.add_person(person, trans)
+
+    def test_unclean_exit(self):
+        with DbTxn("Edit", self.db) as trans:
+            person = self.db.get_person_from_handle("P")
+            person.get_primary_name().get_surname_list()[0].set_surname("Jones")
+            self.db.commit_person(person, trans)
+        # Another session, while this one has not saved its statistics
+        reader = make_database("sqlite")
+        reader.load(self.tmpdir.name, mode=DBMODE_R)
+        self.assertEqual(reader.get_statistics().get_surname_counts(), {"Jones": 1})
+        reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
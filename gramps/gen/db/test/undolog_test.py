@@ -0,0 +1,178 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the storage of the undo history.
+"""
+
+import os
+import tempfile
+import unittest
+
+from gramps.gen.config import config
+from gramps.gen.db import DBMODE_R, DbTxn
+from gramps.gen.db.undolog import UndoLog
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person
+
+
+class UndoLogTest(unittest.TestCase):
+    """
+    Test the records held in memory and in the file.
+    """
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            log = UndoLog(os.path.join(tmpdirname, "undo.db"))
+            log.open()
+            path = log.path
+            self.assertTrue(os.path.exists(path))
+            for recno in range(5):
+                self.assertEqual(log.append(b"record %d" % recno), recno)
+            log.flush(3)
+            self.assertEqual(len(log), 5)
+            self.assertEqual(log.size, 5 * 8)
+            self.assertEqual(
+                [log[recno] for recno in range(5)],
+                [
+                    b"record 0",
+                    b"record 1",
+                    b"record 2",
+                    b"record 3",
+                    b"record 4",
+                ],
+            )
+            log[1] = b"changed"
+            self.assertEqual(log[1], b"changed")
+            self.assertEqual(log.size, 4 * 8 + 7)
+
+            log.discard(0, 3)
+            self.assertEqual(log.size, 8)
+            with self.assertRaises(IndexError):
+                log[2]
+            self.assertEqual(log[4], b"record 4")
+            log.clear()
+            self.assertEqual(log.append(b"record 5"), 5)
+
+            log.close()
+            self.assertFalse(os.path.exists(path))
+
+    def test_memory(self):
+        log = UndoLog()
+        log.open()
+        log.append(b"record 0")
+        log.flush(1)
+        self.assertEqual(log[0], b"record 0")
+        log.close()
+
+
+class DbUndoTest(unittest.TestCase):
+    """
+    Test undo and redo with a limited undo history.
+    """
+
+    def setUp(self):
+        self.memory = config.get("database.undo-memory")
+        self.tmpdir = tempfile.TemporaryDirectory()
+        config.set("database.undo-memory", 1)
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+        config.set("database.undo-memory", self.memory)
+
+    def add_people(self, count):
+        handles = []
+        for index in range(count):
+            with DbTxn("Add %d" % index, self.db) as trans:
+                person = Person()
+                person.set_gramps_id("I%d" % index)
+                handles.append(self.db.add_person(person, trans))
+        return handles
+
+    def test_undo_redo(self):
+        handles = self.add_people(3)
+        path = self.db.undodb.undodb.path
+        self.assertTrue(os.path.exists(path))
+        # Undo the transactions written to the file
+        self.assertTrue(self.db.undo())
+        self.assertTrue(self.db.undo())
+        self.assertTrue(self.db.undo())
+        self.assertFalse(self.db.undo())
+        self.assertEqual(self.db.get_number_of_people(), 0)
+        self.assertTrue(self.db.redo())
+        self.assertTrue(self.db.redo())
+        self.assertEqual(set(self.db.get_person_handles()), set(handles[:2]))
+        self.db.close()
+        self.assertFalse(os.path.exists(path))
+        self.db.load(self.tmpdir.name)
+
+    def assert_size(self):
+        """
+        Only the records of the transactions in the undo history count.
+        """
+        undodb = self.db.undodb
+        self.assertEqual(
+            undodb.undodb.size,
+            sum(
+                len(undodb[recno]) for txn in undodb.undoq for recno in txn.get_recnos()
+            ),
+        )
+
+    def test_discarded_records(self):
+        self.add_people(3)
+        self.assertTrue(self.db.undo())
+        self.add_people(1)
+        # The undone transaction can't be redone, and its records are removed
+        self.assertEqual(self.db.undodb.redo_count, 0)
+        self.assert_size()
+
+        with self.assertRaises(ValueError):
+            with DbTxn("Aborted", self.db) as trans:
+                person = Person()
+                person.set_gramps_id("I9")
+                self.db.add_person(person, trans)
+                raise ValueError
+        self.assert_size()
+
+    def test_read_only(self):
+        self.add_people(3)
+        reader = make_database("sqlite")
+        reader.load(self.tmpdir.name, mode=DBMODE_R)
+        self.assertIsNone(reader.undodb.undodb.path)
+        reader.close()
+        # The history of the writer is kept
+        self.assertTrue(self.db.undo())
+        self.assertTrue(self.db.undo())
+        self.assertTrue(self.db.undo())
+
+    def test_max_size(self):
+        self.db.undodb.max_size = 1
+        self.add_people(3)
+        # Only the last transaction is kept
+        self.assertEqual(self.db.undodb.undo_count, 1)
+        self.assertTrue(self.db.undo())
+        self.assertFalse(self.db.undo())
+        self.assertEqual(self.db.get_number_of_people(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -59,6 +59,7 @@ class DbTxn(defaultdict):
         "commitdb",
         "db",
         "batch",
+        "bulk",
         "first",
         "last",
         "start_time",
@@ -100,7 +101,7 @@ class DbTxn(defaultdict):
 
         return False
 
-    def __init__(self, msg, grampsdb, batch=False, **kwargs):
+    def __init__(self, msg, grampsdb, batch=False, bulk=False, **kwargs):
         """
         Create a new transaction.
 
@@ -113,10 +114,15 @@ class DbTxn(defaultdict):
 
         The grampsdb parameter is a reference to the DbWrite object to which
         this transaction will be applied.
+
         grampsdb.get_undodb() should return a list-like interface that
         stores the commit data. This could be a simple list, or a RECNO-style
         database object.
 
+        A bulk transaction is a batch transaction during which the database
+        may defer maintenance of the reference map and of indices until the
+        reference map is queried or the transaction is committed.
+
         The data structure used to handle the transactions (see the add method)
         is a Python dictionary where:
 
@@ -149,7 +155,7 @@ class DbTxn(defaultdict):
             _LOG.debug(
                 "%sDbTxn %s instantiated for '%s'. Called from file %s, "
                 "line %s, in %s",
-                ("Batch " if batch else ""),
+                ("Batch " if batch or bulk else ""),
                 hex(id(self)),
                 msg,
                 os.path.split(caller_frame[1])[1],
@@ -161,7 +167,8 @@ class DbTxn(defaultdict):
         self.msg = msg
         self.commitdb = grampsdb.get_undodb()
         self.db = grampsdb
-        self.batch = batch
+        self.batch = batch or bulk
+        self.bulk = bulk
         for key, value in kwargs.items():
             setattr(self, key, value)
         self.first = None
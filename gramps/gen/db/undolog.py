@@ -0,0 +1,225 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Storage of the undo records of a database.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import os
+import sqlite3
+import tempfile
+import zlib
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from .dbconst import DBLOGNAME
+
+LOG = logging.getLogger(DBLOGNAME)
+
+# zlib compression level of the records written to the file
+COMPRESSION = 1
+
+# Number of records held in memory before the oldest are written to the file
+MEMORY_RECORDS = 10000
+
+
+# -------------------------------------------------------------------------
+#
+# UndoLog
+#
+# -------------------------------------------------------------------------
+class UndoLog:
+    """
+    List of the undo records of a database, numbered from 0 in the order
+    they are appended.
+
+    The most recent records are held in memory.  Older records are
+    compressed and written to a SQLite file, and read back when they are
+    needed to undo or redo a transaction.  The file only lasts as long as
+    the database is open.  Without a file, every record is held in memory.
+
+    Each list has its own file, named after the given path with a unique
+    part added, so that other processes which open the same database don't
+    share or remove it.
+
+    :param path: Path the name of the file is based on, or None.
+    :type path: str
+    """
+
+    def __init__(self, path=None):
+        self.base_path = path
+        self.path = None
+        self.size = 0
+        self._memory = {}
+        self._count = 0
+        self._conn = None
+
+    def open(self):
+        """
+        Start a new, empty list.
+        """
+        self.close()
+        self._count = 0
+        if self.base_path is None:
+            return
+        directory, name = os.path.split(self.base_path)
+        prefix, suffix = os.path.splitext(name)
+        try:
+            handle, self.path = tempfile.mkstemp(
+                suffix=suffix, prefix=prefix + "-", dir=directory
+            )
+            os.close(handle)
+            self._conn = sqlite3.connect(self.path)
+            # The file is discarded when the database is closed
+            self._conn.execute("PRAGMA journal_mode = OFF")
+            self._conn.execute("PRAGMA synchronous = OFF")
+            self._conn.execute(
+                "CREATE TABLE undo ("
+                "recno INTEGER PRIMARY KEY, "
+                "size INTEGER NOT NULL, "
+                "data BLOB NOT NULL)"
+            )
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as err:
+            LOG.warning(
+                "Undo history kept in memory, %s not used: %s", self.base_path, err
+            )
+            self.close()
+
+    def close(self):
+        """
+        Discard the list and remove its file.
+        """
+        self._memory.clear()
+        self.size = 0
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+    def append(self, record):
+        """
+        Add a record on the end, and return its number.
+
+        :param record: Pickled undo record.
+        :type record: bytes
+        :rtype: int
+        """
+        recno = self._count
+        self._count += 1
+        self._memory[recno] = record
+        self.size += len(record)
+        if self._conn is not None and len(self._memory) > MEMORY_RECORDS:
+            # A large transaction: keep the most recent half in memory
+            self.flush(recno + 1 - MEMORY_RECORDS // 2)
+        return recno
+
+    def __getitem__(self, recno):
+        record = self._memory.get(recno)
+        if record is not None:
+            return record
+        if self._conn is not None:
+            row = self._conn.execute(
+                "SELECT data FROM undo WHERE recno = ?", [recno]
+            ).fetchone()
+            if row is not None:
+                return zlib.decompress(row[0])
+        raise IndexError(recno)
+
+    def __setitem__(self, recno, record):
+        self.discard(recno, recno)
+        self._memory[recno] = record
+        self.size += len(record)
+
+    def __len__(self):
+        return self._count
+
+    def flush(self, before):
+        """
+        Write the records held in memory which are numbered below a given
+        record to the file.
+
+        :param before: Number of the oldest record kept in memory.
+        :type before: int
+        """
+        if self._conn is None:
+            return
+        recnos = [recno for recno in self._memory if recno < before]
+        if not recnos:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO undo (recno, size, data) VALUES (?, ?, ?)",
+            (
+                (
+                    recno,
+                    len(self._memory[recno]),
+                    zlib.compress(self._memory[recno], COMPRESSION),
+                )
+                for recno in recnos
+            ),
+        )
+        self._conn.commit()
+        for recno in recnos:
+            del self._memory[recno]
+
+    def discard(self, first, last):
+        """
+        Remove the records numbered from first to last.  They can't be read
+        anymore.
+        """
+        for recno in range(first, last + 1):
+            record = self._memory.pop(recno, None)
+            if record is not None:
+                self.size -= len(record)
+        if self._conn is not None:
+            (size,) = self._conn.execute(
+                "SELECT SUM(size) FROM undo WHERE recno BETWEEN ? AND ?",
+                [first, last],
+            ).fetchone()
+            if size:
+                self._conn.execute(
+                    "DELETE FROM undo WHERE recno BETWEEN ? AND ?", [first, last]
+                )
+                self._conn.commit()
+                self.size -= size
+
+    def clear(self):
+        """
+        Remove all of the records.  Records appended later keep being
+        numbered after the removed ones.
+        """
+        self._memory.clear()
+        self.size = 0
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM undo")
+            self._conn.commit()
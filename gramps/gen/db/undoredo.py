@@ -139,6 +139,11 @@ class DbUndo(metaclass=ABCMeta):
         Post-transaction commit processing.
         """
 
+    def abort(self, txn):
+        """
+        Discard the records of an aborted transaction.
+        """
+
     def undo(self, update_history=True):
         """
         Undo a previously committed transaction
@@ -27,6 +27,7 @@ Class handling displaying of places.
 #
 # ---------------------------------------------------------------
 import os
+import weakref
 import xml.dom.minidom
 
 # -------------------------------------------------------------------------
@@ -41,6 +42,12 @@ from ..config import config
 from ..utils.location import get_location_list
 from ..lib import PlaceType
 
+# Signals of the changes which invalidate the cached place hierarchies
+PLACE_SIGNALS = ("place-add", "place-update", "place-delete", "place-rebuild")
+
+# Number of cached place hierarchies of a database before they are discarded
+CACHE_SIZE = 100000
+
 
 # -------------------------------------------------------------------------
 #
@@ -62,7 +69,16 @@ class PlaceFormat:
 #
 # -------------------------------------------------------------------------
 class PlaceDisplay:
+    """
+    Display the title of a place, built from its place hierarchy.
+
+    The names of the places enclosing each place are cached for each
+    database, until a place of the database changes.
+    """
+
     def __init__(self):
+        self.__caches = weakref.WeakKeyDictionary()
+        self.__connected = weakref.WeakSet()
         self.place_formats = []
         self.default_format = config.get("preferences.place-format")
         if os.path.exists(PLACE_FORMATS):
@@ -94,7 +110,7 @@ class PlaceDisplay:
                 fmt = config.get("preferences.place-format")
             pf = self.place_formats[fmt]
             lang = pf.language
-            all_places = get_location_list(db, place, date, lang)
+            all_places = get_location_list(db, place, date, lang, self.__get_cache(db))
 
             # Apply format string to place list
             index = _find_populated_place(all_places)
@@ -144,6 +160,42 @@ class PlaceDisplay:
             # TODO for Arabic, should the next line's comma be translated?
             return ", ".join(names)
 
+    def display_all(self, db, fmt=-1):
+        """
+        Return the titles of all of the places of a database, keyed by
+        handle.  The names of each enclosing place are only found once.
+        """
+        return {
+            place.handle: self.display(db, place, fmt=fmt) for place in db.iter_places()
+        }
+
+    def __get_cache(self, db):
+        """
+        Return the cache of the place hierarchies of a database, or None if
+        the database doesn't tell when its places change.
+        """
+        cache = self.__caches.get(db)
+        if cache is None:
+            # Proxies show the places of the database they are built on
+            basedb = getattr(db, "basedb", db)
+            if basedb not in self.__connected:
+                if not hasattr(basedb, "connect"):
+                    return None
+                for signal in PLACE_SIGNALS:
+                    basedb.connect(signal, self.clear_cache)
+                self.__connected.add(basedb)
+            cache = self.__caches[db] = {}
+        elif len(cache) > CACHE_SIZE:
+            cache.clear()
+        return cache
+
+    def clear_cache(self, *args):
+        """
+        Discard the cached place hierarchies.
+        """
+        for cache in self.__caches.values():
+            cache.clear()
+
     def get_formats(self):
         return self.place_formats
 
@@ -0,0 +1,123 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+import unittest
+
+from gramps.gen.config import config
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.display.place import PlaceDisplay
+from gramps.gen.lib import Date, Place, PlaceName, PlaceRef, PlaceType
+
+
+class PlaceDisplayTest(unittest.TestCase):
+    """
+    Test the titles of places built from cached place hierarchies.
+    """
+
+    def setUp(self):
+        self.place_auto = config.get("preferences.place-auto")
+        config.set("preferences.place-auto", True)
+        self.place_display = PlaceDisplay()
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add", self.db) as trans:
+            self.add_place("C", "England", PlaceType.COUNTRY, [], trans)
+            self.add_place("K", "Kent", PlaceType.COUNTY, ["C"], trans)
+            self.add_place("S", "Sussex", PlaceType.COUNTY, ["C"], trans)
+            # Tonbridge moved from Kent to Sussex in 1900
+            place = self.add_place("T", "Tonbridge", PlaceType.TOWN, ["K", "S"], trans)
+            place.get_placeref_list()[0].set_date_object(self.date(Date.MOD_BEFORE))
+            place.get_placeref_list()[1].set_date_object(self.date(Date.MOD_AFTER))
+            self.db.commit_place(place, trans)
+            self.add_place("R", "Rusthall", PlaceType.VILLAGE, ["T"], trans)
+
+    def tearDown(self):
+        self.db.close()
+        config.set("preferences.place-auto", self.place_auto)
+
+    def date(self, modifier, year=1900):
+        date = Date()
+        date.set(modifier=modifier, value=(0, 0, year, False))
+        return date
+
+    def add_place(self, handle, name, place_type, parents, trans):
+        place = Place()
+        place.set_handle(handle)
+        place.set_name(PlaceName(value=name))
+        place.set_type(place_type)
+        for parent in parents:
+            placeref = PlaceRef()
+            placeref.set_reference_handle(parent)
+            place.add_placeref(placeref)
+        self.db.add_place(place, trans)
+        return place
+
+    def display(self, handle, date=None):
+        place = self.db.get_place_from_handle(handle)
+        return self.place_display.display(self.db, place, date)
+
+    def test_dates(self):
+        for _ in range(2):
+            self.assertEqual(
+                self.display("R", self.date(Date.MOD_NONE, 1850)),
+                "Rusthall, Tonbridge, Kent, England",
+            )
+            self.assertEqual(
+                self.display("R", self.date(Date.MOD_NONE, 1950)),
+                "Rusthall, Tonbridge, Sussex, England",
+            )
+            self.assertEqual(self.display("K"), "Kent, England")
+
+    def test_update(self):
+        self.assertEqual(self.display("R"), "Rusthall, Tonbridge, Sussex, England")
+        with DbTxn("Edit", self.db) as trans:
+            place = self.db.get_place_from_handle("C")
+            place.set_name(PlaceName(value="United Kingdom"))
+            self.db.commit_place(place, trans)
+        self.assertEqual(
+            self.display("R"), "Rusthall, Tonbridge, Sussex, United Kingdom"
+        )
+
+        # A place being edited is shown as it is
+        place = self.db.get_place_from_handle("R")
+        place.set_name(PlaceName(value="Southborough"))
+        self.assertEqual(
+            self.place_display.display(self.db, place),
+            "Southborough, Tonbridge, Sussex, United Kingdom",
+        )
+
+    def test_loop(self):
+        with DbTxn("Edit", self.db) as trans:
+            place = self.db.get_place_from_handle("C")
+            placeref = PlaceRef()
+            placeref.set_reference_handle("K")
+            place.add_placeref(placeref)
+            self.db.commit_place(place, trans)
+        self.assertEqual(self.display("K"), "Kent, England")
+        self.assertEqual(self.display("C"), "England, Kent")
+
+    def test_display_all(self):
+        titles = self.place_display.display_all(self.db)
+        self.assertEqual(titles["S"], "Sussex, England")
+        self.assertEqual(titles["R"], "Rusthall, Tonbridge, Sussex, England")
+
+
+if __name__ == "__main__":
+    unittest.main()
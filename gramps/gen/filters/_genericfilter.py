@@ -187,6 +187,9 @@ class GenericFilter:
         #    len(possible_handles),
         # )
 
+        # let the database evaluate the rules that can be expressed in SQL
+        sql_handles, flist = optimizer.compute_sql_handles_for_filter(self, db)
+
         # if user:
         #    user.begin_progress(_("Filter"), _("Applying ..."), len(possible_handles))
 
@@ -201,10 +204,21 @@ class GenericFilter:
             if user:
                 user.step_progress()
 
-            obj = self.get_object(db, handle)
+            if sql_handles is None:
+                obj = self.get_object(db, handle)
+                match = apply_logical_op(db, obj, self.flist)
+            elif self.logical_op == "and" and handle not in sql_handles:
+                match = False
+            elif self.logical_op == "or" and handle in sql_handles:
+                match = True
+            elif not flist:
+                match = handle in sql_handles
+            else:
+                obj = self.get_object(db, handle)
+                match = apply_logical_op(db, obj, flist)
 
-            if apply_logical_op(db, obj, self.flist) != self.invert:
-                final_list.append(obj.handle)
+            if match != self.invert:
+                final_list.append(handle)
 
         if user:
             user.end_progress()
@@ -21,20 +21,43 @@
 Package providing filtering framework for Gramps.
 """
 
+import re
+
+# A column showing indexed text may show line breaks as spaces, and end long
+# text with "..."
+_NOT_INDEXED = re.compile(r"[\s.]")
+
 
 class SearchFilter:
-    def __init__(self, func, text, invert):
+    def __init__(self, func, text, invert, obj_type=None):
         self.func = func
         self.text = text.upper()
         self.invert = invert
+        # Set if the column searched shows a field of indexed text
+        self.obj_type = obj_type
 
     def match(self, handle, db):
         return self.invert ^ (self.func(handle).upper().find(self.text) != -1)
 
+    def candidates(self, db):
+        """
+        Return the handles of the objects that can match, found with the text
+        index of the database, or None if it can't be used.
+        """
+        text = self.text.strip()
+        if (
+            self.obj_type is None
+            or self.invert
+            or not text
+            or _NOT_INDEXED.search(text)
+        ):
+            return None
+        return db.search_text(self.obj_type, text)
+
 
 class ExactSearchFilter(SearchFilter):
-    def __init__(self, func, text, invert):
-        SearchFilter.__init__(self, func, text, invert)
+    def __init__(self, func, text, invert, obj_type=None):
+        SearchFilter.__init__(self, func, text, invert, obj_type)
 
     def match(self, handle, db):
         return self.invert ^ (self.func(handle).upper() == self.text.strip())
@@ -87,6 +87,88 @@ class Optimizer:
                 return self.compute_potential_handles_for_filter(filter)
         return (None, None)
 
+    def compute_sql_handles_for_filter(
+        self, filter: GenericFilter, db
+    ) -> Tuple[Set[PrimaryObjectHandle] | None, List[Rule]]:
+        """
+        Evaluate the rules of the filter that can be expressed in SQL with a
+        single database query.
+
+        Returns the set of handles matched by those rules combined with the
+        logical operator of the filter (ignoring invert), and the list of
+        rules that still have to be applied to each object.  If no rules
+        could be evaluated by the database, the set is None and all of the
+        rules are returned.
+        """
+        if filter.logical_op == "one":
+            # The count of matching rules needs all of them
+            sql = self.compile_rules_to_sql(filter.logical_op, filter.flist)
+            sql_rules = filter.flist if sql else []
+        else:
+            sql_rules = []
+            for rule in filter.flist:
+                if self.compile_rule_to_sql(rule) is not None:
+                    sql_rules.append(rule)
+            sql = self.compile_rules_to_sql(filter.logical_op, sql_rules)
+        if not sql_rules:
+            return (None, filter.flist)
+
+        obj_class = filter.make_obj().__class__.__name__
+        handles = db.select_handles(obj_class, *sql)
+        if handles is None:
+            return (None, filter.flist)
+        LOG.debug("SQL rules: %s, matches: %s", len(sql_rules), len(handles))
+        return (handles, [rule for rule in filter.flist if rule not in sql_rules])
+
+    def compile_filter_to_sql(self, filter: GenericFilter) -> Tuple[str, list] | None:
+        """
+        Return an SQL condition that is equivalent to the filter, or None if
+        any of its rules cannot be expressed in SQL.
+        """
+        sql = self.compile_rules_to_sql(filter.logical_op, filter.flist)
+        if sql is None or not filter.invert:
+            return sql
+        return (f"NOT coalesce({sql[0]}, 0)", sql[1])
+
+    def compile_rules_to_sql(
+        self, logical_op: str, rules: List[Rule]
+    ) -> Tuple[str, list] | None:
+        """
+        Combine the SQL conditions of the rules with the logical operator.
+        """
+        clauses = []
+        values: list = []
+        for rule in rules:
+            sql = self.compile_rule_to_sql(rule)
+            if sql is None:
+                return None
+            clauses.append(sql[0])
+            values.extend(sql[1])
+
+        if logical_op == "and":
+            where = " AND ".join(f"({clause})" for clause in clauses) or "1"
+        elif logical_op == "or":
+            where = " OR ".join(f"({clause})" for clause in clauses) or "0"
+        elif clauses:
+            where = " + ".join(
+                f"(CASE WHEN ({clause}) THEN 1 ELSE 0 END)" for clause in clauses
+            )
+            where = f"({where}) = 1"
+        else:
+            where = "0"
+        return (f"({where})", values)
+
+    def compile_rule_to_sql(self, rule: Rule) -> Tuple[str, list] | None:
+        """
+        Return the SQL condition for a particular rule.
+        """
+        if hasattr(rule, "find_filter"):
+            filter = rule.find_filter()
+            if filter and self.is_same_namespace(filter):
+                return self.compile_filter_to_sql(filter)
+            return None
+        return rule.to_sql()
+
     def is_same_namespace(self, filter):
         """
         Determine if the given filter is in the 'same namespace' as the top-level filter.
@@ -59,3 +59,6 @@ class Everything(Rule):
 
     def apply_to_one(self, db: Database, obj: PrimaryObject) -> bool:
         return True
+
+    def to_sql(self):
+        return ("1", [])
@@ -65,5 +65,8 @@ class HasGrampsId(Rule):
         """
         return obj.handle in self.selected_handles
 
+    def to_sql(self):
+        return ("gramps_id = ?", [self.list[0]])
+
     def reset(self):
         self.selected_handles.clear()
@@ -57,8 +57,20 @@ class HasNoteRegexBase(Rule):
     )
     category = _("General filters")
     allow_regex = True
+    note_handles = None
+
+    def prepare(self, db: Database, user):
+        # Handles of the matching notes, found with the text index
+        self.note_handles = None
+        if not self.use_regex:
+            self.note_handles = db.search_text("Note", self.list[0])
+
+    def reset(self):
+        self.note_handles = None
 
     def apply_to_one(self, db: Database, obj: NoteBase) -> bool:
+        if self.note_handles is not None:
+            return any(handle in self.note_handles for handle in obj.note_list)
         for handle in obj.note_list:
             note = db.get_note_from_handle(handle)
             if self.match_substring(0, str(note.text)):
@@ -52,8 +52,18 @@ class HasNoteSubstrBase(Rule):
     name = "Objects having notes containing <substring>"
     description = "Matches objects whose notes contain text matching a " "substring"
     category = _("General filters")
+    note_handles = None
+
+    def prepare(self, db: Database, user):
+        # Handles of the matching notes, found with the text index
+        self.note_handles = db.search_text("Note", self.list[0])
+
+    def reset(self):
+        self.note_handles = None
 
     def apply_to_one(self, db, person: Person) -> bool:
+        if self.note_handles is not None:
+            return any(handle in self.note_handles for handle in person.note_list)
         notelist = person.note_list
         for notehandle in notelist:
             note = db.get_note_from_handle(notehandle)
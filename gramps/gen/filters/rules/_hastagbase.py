@@ -76,3 +76,12 @@ class HasTagBase(Rule):
         if self.tag_handle is None:
             return False
         return self.tag_handle in obj.tag_list
+
+    def to_sql(self):
+        if self.tag_handle is None:
+            return ("0", [])
+        return (
+            "EXISTS (SELECT 1 FROM json_each(json_data, '$.tag_list') "
+            "WHERE value = ?)",
+            [self.tag_handle],
+        )
@@ -52,3 +52,6 @@ class IsPrivate(Rule):
 
     def apply_to_one(self, db: Database, obj: PrimaryObject) -> bool:
         return obj.private
+
+    def to_sql(self):
+        return ("json_extract(json_data, '$.private')", [])
@@ -50,3 +50,6 @@ class IsPublic(Rule):
 
     def apply_to_one(self, db: Database, obj: PrimaryObject) -> bool:
         return not obj.private
+
+    def to_sql(self):
+        return ("NOT json_extract(json_data, '$.private')", [])
@@ -65,3 +65,6 @@ class RegExpIdBase(Rule):
 
     def apply_to_one(self, db: Database, obj: PrimaryObject) -> bool:
         return self.match_substring(0, obj.gramps_id)
+
+    def to_sql(self):
+        return self.sql_match_substring(0, "gramps_id")
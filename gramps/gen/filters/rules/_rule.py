@@ -163,6 +163,35 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def to_sql(self) -> tuple[str, list] | None:
+        """
+        Return an SQL condition that is equivalent to apply_to_one, or None
+        if the rule cannot be expressed in SQL.
+
+        The condition is a (clause, values) pair that is evaluated against a
+        row of the primary object table, with the object available as JSON in
+        the json_data column.  It is called after the rule has been prepared.
+        """
+        return None
+
+    def sql_match_substring(self, param_index, expr):
+        """
+        Return an SQL condition that is equivalent to match_substring for
+        the given SQL expression.
+
+        The pattern is searched with the flags it is compiled with in Python,
+        given as the third argument of the regexp function.
+        """
+        if not self.list[param_index]:
+            return ("1", [])
+        if self.use_regex:
+            pattern = self.regex[param_index].pattern
+            flags = self.regex[param_index].flags
+        else:
+            pattern = re.escape(self.list[param_index])
+            flags = re.I
+        return (f"regexp(?, coalesce({expr}, ''), ?)", [pattern, int(flags)])
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = (
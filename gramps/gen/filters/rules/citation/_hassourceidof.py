@@ -59,3 +59,7 @@ class HasSourceIdOf(HasGrampsId):
     def apply_to_one(self, dbase: Database, citation: Citation) -> bool:  # type: ignore[override]
         source = dbase.get_source_from_handle(citation.source_handle)
         return HasGrampsId.apply_to_one(self, dbase, source)  # type: ignore[override]
+
+    def to_sql(self):
+        # The ID belongs to a related object, not to this one.
+        return None
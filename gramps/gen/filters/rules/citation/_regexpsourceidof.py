@@ -64,3 +64,7 @@ class RegExpSourceIdOf(RegExpIdBase):
     def apply_to_one(self, dbase: Database, citation: Citation) -> bool:  # type: ignore[override]
         source = dbase.get_source_from_handle(citation.source_handle)
         return RegExpIdBase.apply_to_one(self, dbase, source)
+
+    def to_sql(self):
+        # The ID belongs to a related object, not to this one.
+        return None
@@ -61,3 +61,7 @@ class ChildHasIdOf(RegExpIdBase):
             if super().apply_to_one(db, child):
                 return True
         return False
+
+    def to_sql(self):
+        # The ID belongs to a related object, not to this one.
+        return None
@@ -62,3 +62,7 @@ class FatherHasIdOf(RegExpIdBase):
             if father:
                 return super().apply_to_one(db, father)
         return False
+
+    def to_sql(self):
+        # The ID belongs to a related object, not to this one.
+        return None
@@ -64,3 +64,7 @@ class MotherHasIdOf(RegExpIdBase):
             else:
                 return False
         return False
+
+    def to_sql(self):
+        # The ID belongs to a related object, not to this one.
+        return None
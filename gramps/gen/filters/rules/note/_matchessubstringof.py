@@ -54,8 +54,20 @@ class MatchesSubstringOf(Rule):
     description = _("Matches notes that contain text " "which matches a substring")
     category = _("General filters")
 
+    def prepare(self, db: Database, user):
+        self.reset()
+        handles = db.search_text("Note", self.list[0])
+        if handles is not None:
+            self.selected_handles = handles
+
+    def reset(self):
+        if hasattr(self, "selected_handles"):
+            del self.selected_handles
+
     def apply_to_one(self, db: Database, note: Note) -> bool:
         """Apply the filter"""
+        if hasattr(self, "selected_handles"):
+            return note.handle in self.selected_handles
         text = str(note.text)
         if text.upper().find(self.list[0].upper()) != -1:
             return True
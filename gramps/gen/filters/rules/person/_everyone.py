@@ -59,3 +59,6 @@ class Everyone(Rule):
 
     def apply_to_one(self, db: Database, person: Person) -> bool:
         return True
+
+    def to_sql(self):
+        return ("1", [])
@@ -74,32 +74,42 @@ class HasCommonAncestorWith(Rule):
             self.with_people = []
 
     def add_ancs(self, db: Database, person: Person):
-        if person and person.handle not in self.ancestor_cache:
-            self.ancestor_cache[person.handle] = set()
-            # We are going to compare ancestors of one person with that of
-            # another person; if that other person is an ancestor and itself
-            # has no ancestors is must be included, this is achieved by the
-            # little trick of making a person his own ancestor.
-            self.ancestor_cache[person.handle].add(person.handle)
-        else:
+        if not person or person.handle in self.ancestor_cache:
             return
+        graph = db.get_graph_index()
+
+        # Walk up the tree depth first, and fill in the cache on the way
+        # back down, so that the ancestors of the parents are known when
+        # they are added to those of the child.
+        stack = [(person.handle, False)]
+        while stack:
+            handle, visited = stack.pop()
+            if not visited:
+                if handle in self.ancestor_cache:
+                    continue
+                # We are going to compare ancestors of one person with that of
+                # another person; if that other person is an ancestor and itself
+                # has no ancestors is must be included, this is achieved by the
+                # little trick of making a person his own ancestor.
+                self.ancestor_cache[handle] = {handle}
+                stack.append((handle, True))
+                for fam_handle in graph.get_parent_families(handle):
+                    for par_handle in graph.get_parents(fam_handle):
+                        if par_handle not in self.ancestor_cache:
+                            if graph.has_person(par_handle):
+                                stack.append((par_handle, False))
+                continue
 
-        for fam_handle in person.parent_family_list:
-            parentless_fam = True
-            fam = db.get_family_from_handle(fam_handle)
-            if fam:
-                for par_handle in (fam.father_handle, fam.mother_handle):
-                    if par_handle:
-                        parentless_fam = False
-                        par = db.get_person_from_handle(par_handle)
-                        if par and par.handle not in self.ancestor_cache:
-                            self.add_ancs(db, par)
-                        if par:
-                            self.ancestor_cache[person.handle] |= self.ancestor_cache[
-                                par.handle
-                            ]
-                if parentless_fam:
-                    self.ancestor_cache[person.handle].add(fam_handle)
+            ancestors = self.ancestor_cache[handle]
+            for fam_handle in graph.get_parent_families(handle):
+                if not graph.has_family(fam_handle):
+                    continue
+                parents = graph.get_parents(fam_handle)
+                if not parents:
+                    ancestors.add(fam_handle)
+                for par_handle in parents:
+                    if par_handle in self.ancestor_cache:
+                        ancestors |= self.ancestor_cache[par_handle]
 
     def reset(self):
         self.ancestor_cache = {}
@@ -108,3 +108,65 @@ class HasNameOf(Rule):
             if self.list[9] and not self.match_substring(9, surn.surname):
                 return False
         return True
+
+    def to_sql(self):
+        primary, values = self.name_to_sql("json_data", "$.primary_name")
+        alternate, alternate_values = self.name_to_sql("name.value", "$")
+        return (
+            f"({primary}) OR EXISTS (SELECT 1 FROM "
+            f"json_each(json_data, '$.alternate_names') AS name WHERE {alternate})",
+            values + alternate_values,
+        )
+
+    def name_to_sql(self, doc, path):
+        """
+        Return the SQL condition of match_name for the name at a path of a
+        JSON document.
+        """
+        surnames = f"json_each({doc}, '{path}.surname_list') AS surname"
+        prefix = "json_extract(surname.value, '$.prefix')"
+        surname = "json_extract(surname.value, '$.surname')"
+        connector = "json_extract(surname.value, '$.connector')"
+        # The surnames joined as get_surname does
+        full_surname = (
+            f"(SELECT trim(coalesce(group_concat(trim(trim({prefix} || ' ' || "
+            f"{surname}) || ' ' || {connector}), ' '), '')) FROM {surnames})"
+        )
+        fields = [
+            (0, f"json_extract({doc}, '{path}.first_name')"),
+            (1, full_surname),
+            (2, f"json_extract({doc}, '{path}.title')"),
+            (3, f"json_extract({doc}, '{path}.suffix')"),
+            (4, f"json_extract({doc}, '{path}.call')"),
+            (5, f"json_extract({doc}, '{path}.nick')"),
+            (10, f"json_extract({doc}, '{path}.famnick')"),
+        ]
+        surname_fields = [(6, prefix), (7, surname), (8, connector)]
+        clauses, values = self.fields_to_sql(fields)
+        surname_clauses, surname_values = self.fields_to_sql(surname_fields)
+        if self.list[9]:
+            sql, sql_values = self.sql_match_substring(9, surname)
+            surname_clauses.append(
+                f"(json_extract(surname.value, '$.origintype.value') != ? OR {sql})"
+            )
+            surname_values += [NameOriginType.PATRONYMIC] + sql_values
+        clauses.append(
+            f"EXISTS (SELECT 1 FROM {surnames} "
+            f"WHERE {' AND '.join(surname_clauses) or '1'})"
+        )
+        values += surname_values
+        return (" AND ".join(clauses), values)
+
+    def fields_to_sql(self, fields):
+        """
+        Return the SQL conditions matching the given (index, SQL expression)
+        fields, and the values of their placeholders.
+        """
+        clauses = []
+        values = []
+        for index, expr in fields:
+            if self.list[index]:
+                sql, sql_values = self.sql_match_substring(index, expr)
+                clauses.append(sql)
+                values += sql_values
+        return (clauses, values)
@@ -56,3 +56,6 @@ class HasOtherGender(Rule):
 
     def apply_to_one(self, db: Database, person: Person) -> bool:
         return person.gender == Person.OTHER
+
+    def to_sql(self):
+        return ("json_extract(json_data, '$.gender') = ?", [Person.OTHER])
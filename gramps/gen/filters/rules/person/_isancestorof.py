@@ -82,20 +82,6 @@ class IsAncestorOf(Rule):
     ) -> None:
         if not person:
             return
-        if person.handle in self.selected_handles:
-            return
-        if not first:
-            self.selected_handles.add(person.handle)
-        fam_id = (
-            person.parent_family_list[0] if len(person.parent_family_list) > 0 else None
+        self.selected_handles |= db.get_graph_index().get_ancestors(
+            [person.handle], inclusive=not first
         )
-        if fam_id:
-            fam = db.get_family_from_handle(fam_id)
-            if fam:
-                f_id = fam.father_handle
-                m_id = fam.mother_handle
-
-                if f_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(f_id), False)
-                if m_id:
-                    self.init_ancestor_list(db, db.get_person_from_handle(m_id), False)
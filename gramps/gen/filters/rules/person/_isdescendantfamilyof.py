@@ -23,6 +23,7 @@
 #
 # -------------------------------------------------------------------------
 from __future__ import annotations
+from collections import deque
 from ....const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
@@ -43,7 +44,7 @@ from .. import Rule
 # Typing modules
 #
 # -------------------------------------------------------------------------
-from typing import List, Set
+from typing import Deque, Set
 from ....lib import Person
 from ....db import Database
 from ....types import PersonHandle
@@ -90,30 +91,24 @@ class IsDescendantFamilyOf(Rule):
     def add_matches(self, person: Person | None):
         if not person:
             return
+        graph = self.db.get_graph_index()
 
         # Add self
-        queue: List[Person] = [person]
+        queue: Deque[PersonHandle] = deque([person.handle])
 
         while queue:
-            person = queue.pop(0)
-            if person is None or person.handle in self.selected_handles:
+            handle = queue.popleft()
+            if handle in self.selected_handles or not graph.has_person(handle):
                 # if we have been here before, skip
                 continue
-            self.selected_handles.add(person.handle)
-            for family_handle in person.family_list:
-                family = self.db.get_family_from_handle(family_handle)
-                if family:
-                    # Add every child recursively
-                    for child_ref in family.child_ref_list:
-                        if child_ref:
-                            queue.append(self.db.get_person_from_handle(child_ref.ref))
-                    # Add spouse
-                    if person.handle == family.father_handle:
-                        spouse_handle = family.mother_handle
-                    else:
-                        spouse_handle = family.father_handle
-                    if spouse_handle:
-                        self.selected_handles.add(spouse_handle)
+            self.selected_handles.add(handle)
+            for family_handle in graph.get_families(handle):
+                # Add every child recursively
+                queue.extend(graph.get_children(family_handle))
+                # Add spouse
+                spouse_handle = graph.get_spouse(family_handle, handle)
+                if spouse_handle:
+                    self.selected_handles.add(spouse_handle)
 
     def exclude(self):
         # This removes root person and his/her spouses from the matches set
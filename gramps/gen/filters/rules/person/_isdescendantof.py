@@ -78,14 +78,8 @@ class IsDescendantOf(Rule):
         return person.handle in self.selected_handles
 
     def init_list(self, person: Person | None, first: bool) -> None:
-        if not person or person.handle in self.selected_handles:
-            # if we have been here before, skip
+        if not person:
             return
-        if not first:
-            self.selected_handles.add(person.handle)
-
-        for fam_id in person.family_list:
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.child_ref_list:
-                    self.init_list(self.db.get_person_from_handle(child_ref.ref), False)
+        self.selected_handles |= self.db.get_graph_index().get_descendants(
+            [person.handle], inclusive=not first
+        )
@@ -56,3 +56,6 @@ class IsFemale(Rule):
 
     def apply_to_one(self, db: Database, person: Person) -> bool:
         return person.gender == Person.FEMALE
+
+    def to_sql(self):
+        return ("json_extract(json_data, '$.gender') = ?", [Person.FEMALE])
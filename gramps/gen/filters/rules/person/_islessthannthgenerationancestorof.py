@@ -38,7 +38,7 @@ from .. import Rule
 # Typing modules
 #
 # -------------------------------------------------------------------------
-from typing import List, Set, Tuple
+from typing import Set
 from ....lib import Person
 from ....db import Database
 from ....types import PersonHandle
@@ -71,31 +71,10 @@ class IsLessThanNthGenerationAncestorOf(Rule):
                 self.init_ancestor_list(root_handle)
 
     def init_ancestor_list(self, root_handle: PersonHandle):
-        queue: List[Tuple[PersonHandle, int]] = [
-            (root_handle, 1)
-        ]  # generation 1 is root
-        while queue:
-            handle, gen = queue.pop(0)
-            if handle in self.selected_handles:
-                # if we have been here before, skip
-                continue
-            self.selected_handles.add(handle)
-            gen += 1
-            if gen <= int(self.list[1]):
-                p = self.db.get_person_from_handle(handle)
-                fam_id = (
-                    p.parent_family_list[0] if len(p.parent_family_list) > 0 else None
-                )
-                if fam_id:
-                    fam = self.db.get_family_from_handle(fam_id)
-                    if fam:
-                        f_id = fam.father_handle
-                        m_id = fam.mother_handle
-                        # append to back of queue:
-                        if f_id:
-                            queue.append((f_id, gen))
-                        if m_id:
-                            queue.append((m_id, gen))
+        # generation 1 is root
+        self.selected_handles = self.db.get_graph_index().get_ancestors(
+            [root_handle], inclusive=True, max_generations=int(self.list[1]) - 1
+        )
 
     def reset(self):
         self.selected_handles.clear()
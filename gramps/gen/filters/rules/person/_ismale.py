@@ -56,3 +56,6 @@ class IsMale(Rule):
 
     def apply_to_one(self, db: Database, person: Person) -> bool:
         return person.gender == Person.MALE
+
+    def to_sql(self):
+        return ("json_extract(json_data, '$.gender') = ?", [Person.MALE])
@@ -31,7 +31,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....utils.alive import ProbablyAliveCache
 from .. import Rule
 from ....datehandler import parser
 
@@ -60,6 +60,10 @@ class ProbablyAlive(Rule):
             self.current_date = parser.parse(str(self.list[0]))
         except:
             self.current_date = None
+        self.alive = ProbablyAliveCache(db)
+
+    def reset(self):
+        self.alive = None
 
     def apply_to_one(self, db, person: Person) -> bool:
-        return probably_alive(person, db, self.current_date)
+        return self.alive.probably_alive(person, self.current_date)
@@ -56,7 +56,20 @@ class SearchName(Rule):
     description = _("Matches people with a specified (partial) name")
     category = _("General filters")
 
+    def prepare(self, db: Database, user):
+        self.reset()
+        handles = db.search_text("Person", self.list[0])
+        if handles is not None:
+            # The text index of the database matches the same name fields
+            self.selected_handles = handles
+
+    def reset(self):
+        if hasattr(self, "selected_handles"):
+            del self.selected_handles
+
     def apply_to_one(self, db: Database, person: Any) -> bool:
+        if hasattr(self, "selected_handles"):
+            return person.handle in self.selected_handles
         src = self.list[0].upper()
         if not src:
             return False
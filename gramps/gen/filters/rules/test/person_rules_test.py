@@ -1166,16 +1166,16 @@ class BaseTest(unittest.TestCase):
             # This used the optimizer, so it didn't loop through DB
             self.assertEqual(get_call_count(), 1)
 
-    def test_isfemale_not_optimized(self):
+    def test_isfemale_sql(self):
         """
-        Test IsFemale rule. Same as below, but tests optimizer.
+        Test IsFemale rule. Same as below, but tests SQL evaluation.
         """
         with count_method_calls(IsFemale, "apply_to_one") as get_call_count:
             rule = IsFemale([])
             # too many to list out to test explicitly
             self.assertEqual(len(self.filter_with_rule(rule)), 940)
-            # This did not use the optimizer, so it did loop through DB
-            self.assertEqual(get_call_count(), self.db.get_number_of_people())
+            # This was evaluated by the database, so it didn't loop through DB
+            self.assertEqual(get_call_count(), 0)
 
     def test_isfemale(self):
         """
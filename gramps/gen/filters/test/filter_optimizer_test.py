@@ -25,6 +25,10 @@ from ...const import TEST_DIR
 from ...db.utils import import_as_dict
 from ...user import User
 from ...filters import reload_custom_filters, FilterList, set_custom_filters
+from ...filters.optimizer import Optimizer
+from ...filters.rules.person import HasNameOf, RegExpIdOf
+from ...lib import Person
+from ...proxy import PrivateProxyDb
 from ....gen import filters
 
 custom_filters_xml = """<?xml version="1.0" encoding="utf-8"?>
@@ -215,6 +219,20 @@ custom_filters_xml = """<?xml version="1.0" encoding="utf-8"?>
         <arg value="Events of Home Person"/>
       </rule>
     </filter>
+    <filter name="Males among Ancestors" function="and">
+      <rule class="IsMale" use_regex="False" use_case="False">
+      </rule>
+      <rule class="MatchesFilter" use_regex="False" use_case="False">
+        <arg value="Ancestors of"/>
+      </rule>
+    </filter>
+    <filter name="Females or I0001" function="or">
+      <rule class="IsFemale" use_regex="False" use_case="False">
+      </rule>
+      <rule class="MatchesFilter" use_regex="False" use_case="False">
+        <arg value="I0001"/>
+      </rule>
+    </filter>
     <filter name="Regex Test" function="and">
       <rule class="RegExpName" use_regex="True" use_case="False">
         <arg value="Edwards|Daniels"/>
@@ -488,3 +506,89 @@ class OptimizerTest(unittest.TestCase):
         self.assertTrue(filter.match("XZLKQCRQA9EHPBNZPT", self.db))
         self.assertFalse(filter.match("GNUJQCL9MD64AM56OH", self.db))
         self.assertTrue(filter.match("44WJQCLCQIPZUB0UH", self.db))
+
+    def test_compile_to_sql(self):
+        filter = self.filters["I0001 xor I0002"]
+        self.assertIsNotNone(Optimizer(filter).compile_filter_to_sql(filter))
+        filter = self.filters["Ancestors of"]
+        self.assertIsNone(Optimizer(filter).compile_filter_to_sql(filter))
+
+    def test_males_among_ancestors(self):
+        filter = self.filters["Males among Ancestors"]
+        results = filter.apply(self.db)
+        ancestors = self.filters["Ancestors of"].apply(self.db)
+        expected = [
+            handle
+            for handle in ancestors
+            if self.db.get_person_from_handle(handle).gender == Person.MALE
+        ]
+        self.assertEqual(sorted(results), sorted(expected))
+        self.assertTrue(0 < len(results) < len(ancestors))
+
+    def test_females_or_I0001(self):
+        filter = self.filters["Females or I0001"]
+        results = filter.apply(self.db)
+        expected = [
+            person.handle
+            for person in self.db.iter_people()
+            if person.gender == Person.FEMALE or person.gramps_id == "I0001"
+        ]
+        self.assertEqual(sorted(results), sorted(expected))
+
+    def assert_sql_matches(self, rule):
+        """
+        Check that a rule matches the same people in SQL as in Python, and
+        return them.
+        """
+        rule.requestprepare(self.db, User())
+        try:
+            expected = {
+                person.handle
+                for person in self.db.iter_people()
+                if rule.apply_to_one(self.db, person)
+            }
+            self.assertEqual(self.db.select_handles("Person", *rule.to_sql()), expected)
+        finally:
+            rule.requestreset()
+        return expected
+
+    def test_sql_regex_flags(self):
+        # Inline flags of the pattern are kept with the case flag of the rule
+        for pattern, use_case, count in (
+            ("(?s)^I000[12]$", False, 2),
+            ("(?s)^i000[12]$", False, 2),
+            ("(?s)^i000[12]$", True, 0),
+            ("(?i)^i0001$", True, 1),
+        ):
+            rule = RegExpIdOf([pattern], use_regex=True, use_case=use_case)
+            self.assertEqual(len(self.assert_sql_matches(rule)), count, pattern)
+
+    def test_sql_name(self):
+        for values, use_regex, count in (
+            ({}, False, None),
+            ({1: "garner"}, False, None),
+            ({0: "^Louie$"}, True, 1),
+            ({0: "Phoebe", 1: "Garner"}, False, 1),
+            ({1: "^Garner von Zieliński$"}, True, 1),
+            ({2: "dr.", 5: "big louie"}, False, 1),
+            ({6: "von", 7: "Zieliński"}, False, 1),
+            ({6: "von", 7: "Garner"}, False, 0),
+            ({9: "^Fernandez$"}, True, None),
+        ):
+            arg = [values.get(index, "") for index in range(len(HasNameOf.labels))]
+            rule = HasNameOf(arg, use_regex=use_regex)
+            results = self.assert_sql_matches(rule)
+            if count is not None:
+                self.assertEqual(len(results), count, values)
+
+    def test_sql_fallback_for_proxy(self):
+        filter = self.filters["Females or I0001"]
+        proxy = PrivateProxyDb(self.db)
+        self.assertIsNone(proxy.select_handles("Person", "1", []))
+        results = filter.apply(proxy)
+        expected = [
+            person.handle
+            for person in proxy.iter_people()
+            if person.gender == Person.FEMALE or person.gramps_id == "I0001"
+        ]
+        self.assertEqual(sorted(results), sorted(expected))
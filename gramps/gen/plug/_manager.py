@@ -164,6 +164,7 @@ class BasePluginManager:
                 if dirpath not in self.__scanned_dirs:
                     self.__pgr.scan_dir(dirpath, filenames, uistate=uistate)
                     self.__scanned_dirs.append(dirpath)
+            self.__pgr.save_cache()
 
         if load_on_reg:
             # Run plugins that request to be loaded on startup and
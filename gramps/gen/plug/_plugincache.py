@@ -0,0 +1,202 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+An on-disk cache of the plugin data created by the plugin registration
+files, so that unchanged registration files are not executed at every start.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import dis
+import logging
+import os
+import pickle
+import types
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...version import VERSION as GRAMPSVERSION
+from ..const import USER_CACHE
+from ..const import GRAMPS_LOCALE as glocale
+
+LOG = logging.getLogger("._manager")
+
+PLUGIN_CACHE = os.path.join(USER_CACHE, "plugin-registration.pickle")
+
+# The only modules a cacheable registration file may import
+CACHEABLE_IMPORTS = ("gramps.gen.plug._pluginreg", "gramps.gen.const")
+
+
+# -------------------------------------------------------------------------
+#
+# Functions
+#
+# -------------------------------------------------------------------------
+def _code_objects(code):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _code_objects(const)
+
+
+def is_cacheable(code):
+    """
+    Return True if the result of a compiled registration file only depends
+    on the file itself.
+
+    Registration files which use the uistate, or which import anything
+    other than the registration constants and :mod:`gramps.gen.const` (for
+    example to check that a library is installed, whether there is a
+    display, or a preference), are executed at every start.
+    """
+    for obj in _code_objects(code):
+        if "uistate" in obj.co_names or "__import__" in obj.co_names:
+            return False
+        for instruction in dis.get_instructions(obj):
+            if (
+                instruction.opname == "IMPORT_NAME"
+                and instruction.argval not in CACHEABLE_IMPORTS
+            ):
+                return False
+    return True
+
+
+# -------------------------------------------------------------------------
+#
+# PluginCache
+#
+# -------------------------------------------------------------------------
+class PluginCache:
+    """
+    The :class:`.PluginData` objects registered by each registration file,
+    keyed by the path of the file.  An entry is only used if the
+    modification time and size of the file are unchanged.  The whole cache
+    is discarded when the Gramps version or the language changes.
+    """
+
+    def __init__(self, filename=PLUGIN_CACHE):
+        self.filename = filename
+        self.__files = None
+        self.__changed = False
+
+    def __get_key(self):
+        return (GRAMPSVERSION, glocale.lang, tuple(glocale.language))
+
+    def __load(self):
+        self.__files = {}
+        try:
+            with open(self.filename, "rb") as cache_file:
+                key, files = pickle.load(cache_file)
+        except FileNotFoundError:
+            return
+        except Exception as err:
+            LOG.warning("Ignoring the plugin registration cache: %s", err)
+            self.__changed = True
+            return
+        if key == self.__get_key():
+            self.__files = files
+        else:
+            self.__changed = True
+
+    def lookup(self, filename):
+        """
+        Return a (signature, plugins) tuple for a registration file, where
+        plugins is the list of :class:`.PluginData` objects the file
+        registered, or None if the file must be executed.  The signature is
+        passed to :meth:`store` after the file is executed.
+        """
+        if self.__files is None:
+            self.__load()
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None, None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self.__files.get(filename)
+        if entry is None or entry[0] != signature:
+            return signature, None
+        try:
+            return signature, pickle.loads(entry[1])
+        except Exception as err:
+            LOG.warning("Ignoring the cached registration of %s: %s", filename, err)
+            del self.__files[filename]
+            self.__changed = True
+            return signature, None
+
+    def store(self, filename, signature, code, plugins):
+        """
+        Store the plugins registered by executing a registration file, if
+        they can be reused.
+        """
+        if self.__files is None:
+            self.__load()
+        if self.__files.pop(filename, None) is not None:
+            self.__changed = True
+        if signature is None or not is_cacheable(code):
+            return
+        try:
+            data = pickle.dumps(plugins)
+        except Exception:
+            # The plugin data holds objects created by the file
+            return
+        self.__files[filename] = (signature, data)
+        self.__changed = True
+
+    def save(self):
+        """
+        Write the cache to disk if it changed.
+        """
+        if not self.__changed:
+            return
+        files = {
+            filename: entry
+            for filename, entry in self.__files.items()
+            if os.path.isfile(filename)
+        }
+        tmp_filename = self.filename + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            with open(tmp_filename, "wb") as cache_file:
+                pickle.dump((self.__get_key(), files), cache_file)
+            os.replace(tmp_filename, self.filename)
+        except OSError as err:
+            LOG.warning("Could not save the plugin registration cache: %s", err)
+            return
+        self.__files = files
+        self.__changed = False
+
+    def clear(self):
+        """
+        Remove the cache, so that all registration files are executed again.
+        """
+        self.__files = {}
+        self.__changed = False
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            LOG.warning("Could not remove the plugin registration cache: %s", err)
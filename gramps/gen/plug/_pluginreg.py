@@ -44,6 +44,7 @@ from ...version import VERSION as GRAMPSVERSION, VERSION_TUPLE
 from ..const import IMAGE_DIR
 from ..const import GRAMPS_LOCALE as glocale
 from ..utils.requirements import Requirements
+from ._plugincache import PluginCache
 
 _ = glocale.translation.gettext
 
@@ -1371,6 +1372,7 @@ class PluginRegister:
         self.__plugindata = []
         self.__id_to_pdata = {}
         self.__req = Requirements()
+        self.__cache = PluginCache()
 
     def add_plugindata(self, plugindata):
         """This is used to add an entry to the registration list.  The way it
@@ -1398,58 +1400,12 @@ class PluginRegister:
                 continue
             lenpd = len(self.__plugindata)
             full_filename = os.path.join(directory, filename)
-            try:
-                with open(full_filename, "r", encoding="utf-8") as file_descriptor:
-                    stream = file_descriptor.read()
-            except Exception as msg:
-                print(
-                    _("ERROR: Failed reading plugin registration %(filename)s")
-                    % {"filename": filename}
-                )
-                print(msg)
-                continue
-            if os.path.exists(os.path.join(os.path.dirname(full_filename), "locale")):
-                try:
-                    local_gettext = glocale.get_addon_translator(full_filename).gettext
-                except ValueError:
-                    print(
-                        _(
-                            "WARNING: Plugin %(plugin_name)s has no translation"
-                            " for any of your configured languages, using US"
-                            " English instead"
-                        )
-                        % {"plugin_name": filename.split(".")[0]}
-                    )
-                    local_gettext = glocale.translation.gettext
+            signature, plugins = self.__cache.lookup(full_filename)
+            if plugins is not None:
+                self.__plugindata.extend(plugins)
+                lenpd = self.__add_ids(lenpd)
             else:
-                local_gettext = glocale.translation.gettext
-            try:
-                exec(
-                    compile(stream, filename, "exec"),
-                    make_environment(_=local_gettext),
-                    {"uistate": uistate},
-                )
-                for pdata in self.__plugindata[lenpd:]:
-                    if pdata.id in self.__id_to_pdata:
-                        # reloading
-                        old = self.__id_to_pdata[pdata.id]
-                        self.__plugindata.remove(old)
-                        lenpd -= 1
-                    self.__id_to_pdata[pdata.id] = pdata
-            except ValueError as msg:
-                print(
-                    _("ERROR: Failed reading plugin registration %(filename)s")
-                    % {"filename": filename}
-                )
-                print(msg)
-                self.__plugindata = self.__plugindata[:lenpd]
-            except:
-                print(
-                    _("ERROR: Failed reading plugin registration %(filename)s")
-                    % {"filename": filename}
-                )
-                print("".join(traceback.format_exception(*sys.exc_info())))
-                self.__plugindata = self.__plugindata[:lenpd]
+                lenpd = self.__exec_file(full_filename, filename, signature, uistate)
             # check if:
             #  1. plugin exists, if not remove, otherwise set module name
             #  2. plugin not stable, if stable_only=True, remove
@@ -1522,6 +1478,92 @@ class PluginRegister:
                 del self.__id_to_pdata[self.__plugindata[ind].id]
                 del self.__plugindata[ind]
 
+    def __exec_file(self, full_filename, filename, signature, uistate):
+        """
+        Execute a registration file, and store the plugins it registered in
+        the cache.  Return the index of the first of these plugins.
+        """
+        lenpd = len(self.__plugindata)
+        try:
+            with open(full_filename, "r", encoding="utf-8") as file_descriptor:
+                stream = file_descriptor.read()
+        except Exception as msg:
+            print(
+                _("ERROR: Failed reading plugin registration %(filename)s")
+                % {"filename": filename}
+            )
+            print(msg)
+            return lenpd
+        if os.path.exists(os.path.join(os.path.dirname(full_filename), "locale")):
+            try:
+                local_gettext = glocale.get_addon_translator(full_filename).gettext
+            except ValueError:
+                print(
+                    _(
+                        "WARNING: Plugin %(plugin_name)s has no translation"
+                        " for any of your configured languages, using US"
+                        " English instead"
+                    )
+                    % {"plugin_name": filename.split(".")[0]}
+                )
+                local_gettext = glocale.translation.gettext
+        else:
+            local_gettext = glocale.translation.gettext
+        try:
+            code = compile(stream, filename, "exec")
+            exec(
+                code,
+                make_environment(_=local_gettext),
+                {"uistate": uistate},
+            )
+            lenpd = self.__add_ids(lenpd)
+            self.__cache.store(
+                full_filename, signature, code, self.__plugindata[lenpd:]
+            )
+        except ValueError as msg:
+            print(
+                _("ERROR: Failed reading plugin registration %(filename)s")
+                % {"filename": filename}
+            )
+            print(msg)
+            self.__plugindata = self.__plugindata[:lenpd]
+        except:
+            print(
+                _("ERROR: Failed reading plugin registration %(filename)s")
+                % {"filename": filename}
+            )
+            print("".join(traceback.format_exception(*sys.exc_info())))
+            self.__plugindata = self.__plugindata[:lenpd]
+        return lenpd
+
+    def __add_ids(self, lenpd):
+        """
+        Index the plugins added from lenpd on by id, replacing plugins which
+        were registered before with the same id.  Return the index of the
+        first added plugin.
+        """
+        for pdata in self.__plugindata[lenpd:]:
+            if pdata.id in self.__id_to_pdata:
+                # reloading
+                old = self.__id_to_pdata[pdata.id]
+                self.__plugindata.remove(old)
+                lenpd -= 1
+            self.__id_to_pdata[pdata.id] = pdata
+        return lenpd
+
+    def save_cache(self):
+        """
+        Save the cache of the registration files to disk.
+        """
+        self.__cache.save()
+
+    def clear_cache(self):
+        """
+        Remove the cache of the registration files, so that they are all
+        executed again.
+        """
+        self.__cache.clear()
+
     def get_plugin(self, plugin_id):
         """
         Return the :class:`PluginData` for the plugin with id
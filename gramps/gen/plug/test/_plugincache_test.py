@@ -0,0 +1,141 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests of the plugin registration cache."""
+
+# ------------------------
+# Python modules
+# ------------------------
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# ------------------------
+# Gramps modules
+# ------------------------
+from .. import _pluginreg
+from .._plugincache import PluginCache
+from .._pluginreg import PluginRegister
+from ....version import VERSION_TUPLE
+
+REGISTRATION = """
+register(
+    GENERAL,
+    id="cachetest",
+    name="%s",
+    version="1.0",
+    gramps_target_version="%d.%d",
+    status=STABLE,
+    fname="cachetest.py",
+)
+"""
+
+
+# ------------------------------------------------------------
+#
+# PluginCacheTest
+#
+# ------------------------------------------------------------
+class PluginCacheTest(unittest.TestCase):
+    """Check that unchanged registration files are not executed again."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.directory = self.tmpdir.name
+        open(os.path.join(self.directory, "cachetest.py"), "w").close()
+        self.cache_file = os.path.join(self.directory, "cache", "plugins.pickle")
+        self.new_register()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def new_register(self):
+        """
+        Use a new register, as after a restart of Gramps.
+        """
+        with mock.patch.object(PluginRegister, "_PluginRegister__instance", 1):
+            self.pgr = PluginRegister()
+        self.pgr._PluginRegister__cache = PluginCache(self.cache_file)
+
+    def write(self, name, extra=""):
+        with open(os.path.join(self.directory, "cachetest.gpr.py"), "w") as gpr:
+            gpr.write(REGISTRATION % ((name,) + VERSION_TUPLE[:2]) + extra)
+
+    def scan(self):
+        """
+        Scan the directory and return the name of the registered plugin, and
+        whether the registration file was executed.
+        """
+        with (
+            mock.patch.object(PluginRegister, "_PluginRegister__instance", self.pgr),
+            mock.patch.object(
+                _pluginreg, "compile", side_effect=compile, create=True
+            ) as mock_compile,
+        ):
+            self.pgr.scan_dir(self.directory, ["cachetest.gpr.py"])
+        self.pgr.save_cache()
+        plugin = self.pgr.get_plugin("cachetest")
+        self.assertEqual(plugin.mod_name, "cachetest")
+        return plugin.name, mock_compile.called
+
+    def test_cache(self):
+        self.write("First")
+        self.assertEqual(self.scan(), ("First", True))
+        self.new_register()
+        self.assertEqual(self.scan(), ("First", False))
+
+        self.write("Second version")
+        self.new_register()
+        self.assertEqual(self.scan(), ("Second version", True))
+        self.new_register()
+        self.assertEqual(self.scan(), ("Second version", False))
+
+        self.pgr.clear_cache()
+        self.assertFalse(os.path.exists(self.cache_file))
+        self.new_register()
+        self.assertEqual(self.scan(), ("Second version", True))
+
+    def test_const_import(self):
+        self.write("First", "from gramps.gen.const import GRAMPS_LOCALE\n")
+        self.assertEqual(self.scan(), ("First", True))
+        self.new_register()
+        self.assertEqual(self.scan(), ("First", False))
+
+    def test_not_cacheable(self):
+        self.write("First", "import os\n")
+        self.assertEqual(self.scan(), ("First", True))
+        self.new_register()
+        self.assertEqual(self.scan(), ("First", True))
+
+        self.write("First", "from gramps.gen.constfunc import has_display\n")
+        self.new_register()
+        self.assertEqual(self.scan(), ("First", True))
+        self.new_register()
+        self.assertEqual(self.scan(), ("First", True))
+
+        self.write("First", "if uistate:\n    pass\n")
+        self.new_register()
+        self.assertEqual(self.scan(), ("First", True))
+        self.new_register()
+        self.assertEqual(self.scan(), ("First", True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -106,6 +106,7 @@ class LivingProxyDb(ProxyDbBase):
         else:
             self.current_date = None
         self.years_after_death = years_after_death
+        self.__alive = None
         self._ = llocale.translation.gettext
         self._p_f_n = self._(config.get("preferences.private-given-text"))
         self._p_s_n = self._(config.get("preferences.private-surname-text"))
@@ -254,12 +255,14 @@ class LivingProxyDb(ProxyDbBase):
         Returns True if the person is considered living.
         Returns False if the person is not considered living.
         """
-        from ..utils.alive import probably_alive
+        if self.__alive is None:
+            from ..utils.alive import ProbablyAliveCache
 
+            self.__alive = ProbablyAliveCache(self.db)
         person_handle = person.get_handle()
         unfil_person = self.get_unfiltered_person(person_handle)
-        return probably_alive(
-            unfil_person, self.db, self.current_date, self.years_after_death
+        return self.__alive.probably_alive(
+            unfil_person, self.current_date, self.years_after_death
         )
 
     def __remove_living_from_family(self, family):
@@ -26,6 +26,7 @@ Classes for relationships.
 #
 # -------------------------------------------------------------------------
 import logging
+from collections import OrderedDict
 
 # -------------------------------------------------------------------------
 #
@@ -45,6 +46,9 @@ UNKNOWN = Person.UNKNOWN
 LOG = logging.getLogger("gen.relationship")
 LOG.addHandler(logging.StreamHandler())
 
+# Number of ancestor maps kept while the database doesn't change
+MAP_CACHE_SIZE = 20
+
 # -------------------------------------------------------------------------
 #
 #
@@ -944,10 +948,12 @@ class RelationshipCalculator:
         self.state_signal_key = None
         self.storemap = False
         self.dirtymap = True
-        self.stored_map = None
-        self.map_handle = None
-        self.map_meta = None
         self.__db_connected = False
+        # ancestor maps, and the parents of people and families
+        self.__maps = OrderedDict()
+        self.__people = {}
+        self.__families = {}
+        self.__index_db = None
         self.depth = 15
         try:
             from .config import config
@@ -1381,48 +1387,51 @@ class RelationshipCalculator:
         second_map = {}
         rank = 9999999
 
+        if not self.storemap or self.dirtymap or db is not self.__index_db:
+            self.__clear_cache(db)
+        key = (orig_person.handle, all_families, only_birth, self.__max_depth)
+
         try:
-            if (
-                self.storemap
-                and self.stored_map is not None
-                and self.map_handle == orig_person.handle
-                and not self.dirtymap
-            ):
-                first_map = self.stored_map
+            if key in self.__maps:
+                self.__maps.move_to_end(key)
+                first_map, meta = self.__maps[key]
                 (
                     self.__max_depth_reached,
                     self.__loop_detected,
-                    self.__all_families,
-                    self.__all_dist,
-                    self.__only_birth,
                     self.__crosslinks,
                     self.__msg,
-                ) = self.map_meta
+                ) = meta
                 self.__msg = list(self.__msg)
             else:
-                self.__apply_filter(db, orig_person, "", [], first_map)
-                self.map_meta = (
-                    self.__max_depth_reached,
-                    self.__loop_detected,
-                    self.__all_families,
-                    self.__all_dist,
-                    self.__only_birth,
-                    self.__crosslinks,
-                    list(self.__msg),
+                self.__apply_filter(
+                    db, orig_person.handle, "", [], first_map, person=orig_person
                 )
+                if self.storemap:
+                    self.__maps[key] = (
+                        first_map,
+                        (
+                            self.__max_depth_reached,
+                            self.__loop_detected,
+                            self.__crosslinks,
+                            list(self.__msg),
+                        ),
+                    )
+                    if len(self.__maps) > MAP_CACHE_SIZE:
+                        self.__maps.popitem(last=False)
             self.__apply_filter(
-                db, other_person, "", [], second_map, stoprecursemap=first_map
+                db,
+                other_person.handle,
+                "",
+                [],
+                second_map,
+                stoprecursemap=first_map,
+                person=other_person,
             )
         except RuntimeError:
             return (-1, None, -1, [], -1, []), [
                 _("Relationship loop detected")
             ] + self.__msg
 
-        if self.storemap:
-            self.stored_map = first_map
-            self.dirtymap = False
-            self.map_handle = orig_person.handle
-
         for person_handle in second_map:
             if person_handle in first_map:
                 com = []
@@ -1521,8 +1530,69 @@ class RelationshipCalculator:
         else:
             return [(-1, None, "", [], "", [])], self.__msg
 
+    def __clear_cache(self, db):
+        """
+        Forget the ancestor maps and the parents, which are then looked up
+        in db.
+        """
+        self.__maps.clear()
+        self.__people.clear()
+        self.__families.clear()
+        self.__index_db = db
+        self.dirtymap = False
+
+    def __get_parent_families(self, db, handle, person=None):
+        """
+        Return the main parent family and the list of parent families of a
+        person, or None if there is no such person.
+        """
+        if person is not None:
+            # may differ from the database, e.g. in an editor
+            return (
+                person.get_main_parents_family_handle(),
+                person.get_parent_family_handle_list(),
+            )
+        if handle not in self.__people:
+            person = db.get_person_from_handle(handle)
+            if person is None:
+                self.__people[handle] = None
+            else:
+                self.__people[handle] = (
+                    person.get_main_parents_family_handle(),
+                    person.get_parent_family_handle_list(),
+                )
+        return self.__people[handle]
+
+    def __get_family(self, db, handle):
+        """
+        Return the father, the mother and a list of (child, mother relation,
+        father relation) of a family, or None if there is no such family.
+        """
+        if handle not in self.__families:
+            family = db.get_family_from_handle(handle)
+            if family:
+                self.__families[handle] = (
+                    family.father_handle,
+                    family.mother_handle,
+                    [
+                        (ref.ref, ref.get_mother_relation(), ref.get_father_relation())
+                        for ref in family.get_child_ref_list()
+                    ],
+                )
+            else:
+                self.__families[handle] = None
+        return self.__families[handle]
+
     def __apply_filter(
-        self, db, person, rel_str, rel_fam, pmap, depth=1, stoprecursemap=None
+        self,
+        db,
+        handle,
+        rel_str,
+        rel_fam,
+        pmap,
+        depth=1,
+        stoprecursemap=None,
+        person=None,
     ):
         """
         Typically this method is called recursively in two ways:
@@ -1536,8 +1606,14 @@ class RelationshipCalculator:
         of first contains loops, and parents
         will be looked up anyway an stored if common. At end the doubles
         are filtered out
+
+        The people are given by handle; person is the object of the first
+        person, which is used instead of the one in the database.
         """
-        if person is None or not person.handle:
+        if not handle:
+            return
+        families = self.__get_parent_families(db, handle, person)
+        if families is None:
             return
 
         if depth > self.__max_depth:
@@ -1552,23 +1628,23 @@ class RelationshipCalculator:
         store = True  # normally we store all parents
         if stoprecursemap:
             store = False  # but not if a stop map given
-            if person.handle in stoprecursemap:
+            if handle in stoprecursemap:
                 commonancestor = True
                 store = True
 
         # add person to the map, take into account that person can be obtained
         # from different sides
-        if person.handle in pmap:
+        if handle in pmap:
             # person is already a grandparent in another branch, we already have
             # had lookup of all parents, we call that a crosslink
             if not stoprecursemap:
                 self.__crosslinks = True
-            pmap[person.handle][0] += [rel_str]
-            pmap[person.handle][1] += [rel_fam]
+            pmap[handle][0] += [rel_str]
+            pmap[handle][1] += [rel_fam]
             # check if there is no loop father son of his son, ...
             # loop means person is twice reached, same rel_str in begin
-            for rel1 in pmap[person.handle][0]:
-                for rel2 in pmap[person.handle][0]:
+            for rel1 in pmap[handle][0]:
+                for rel2 in pmap[handle][0]:
                     if len(rel1) < len(rel2) and rel1 == rel2[: len(rel1)]:
                         # loop, keep one message in storage!
                         self.__loop_detected = True
@@ -1579,13 +1655,15 @@ class RelationshipCalculator:
                                 "Person %(person)s connects to himself via %(relation)s"
                             )
                             % {
-                                "person": person.get_primary_name().get_name(),
+                                "person": (person or db.get_person_from_handle(handle))
+                                .get_primary_name()
+                                .get_name(),
                                 "relation": rel2[len(rel1) :],
                             }
                         ]
                         return
         elif store:
-            pmap[person.handle] = [[rel_str], [rel_fam]]
+            pmap[handle] = [[rel_str], [rel_fam]]
 
         # having added person to the pmap, we only look up recursively to
         # parents if this person is not common relative
@@ -1595,31 +1673,30 @@ class RelationshipCalculator:
             return
 
         family_handles = []
-        main = person.get_main_parents_family_handle()
+        main, parent_family_handles = families
         if main:
             family_handles = [main]
         if self.__all_families:
-            family_handles = person.get_parent_family_handle_list()
+            family_handles = parent_family_handles
 
         try:
             parentstodo = {}
             fam = 0
             for family_handle in family_handles:
                 rel_fam_new = rel_fam + [fam]
-                family = db.get_family_from_handle(family_handle)
+                family = self.__get_family(db, family_handle)
                 if not family:
                     continue
+                fhandle, mhandle, child_refs = family
                 # obtain childref for this person
                 childrel = [
-                    (ref.get_mother_relation(), ref.get_father_relation())
-                    for ref in family.get_child_ref_list()
-                    if ref.ref == person.handle
+                    (mrel, frel)
+                    for (child, mrel, frel) in child_refs
+                    if child == handle
                 ]
                 # Add this check
                 if not childrel:
                     continue  # Skip to the next family if childrel is empty
-                fhandle = family.father_handle
-                mhandle = family.mother_handle
                 for data in [
                     (
                         fhandle,
@@ -1635,7 +1712,6 @@ class RelationshipCalculator:
                     ),
                 ]:
                     if data[0] and data[0] not in parentstodo:
-                        persontodo = db.get_person_from_handle(data[0])
                         if data[3] == ChildRefType.BIRTH:
                             addstr = data[1]
                         elif not self.__only_birth:
@@ -1644,7 +1720,7 @@ class RelationshipCalculator:
                             addstr = ""
                         if addstr:
                             parentstodo[data[0]] = (
-                                persontodo,
+                                data[0],
                                 rel_str + addstr,
                                 rel_fam_new,
                             )
@@ -1666,9 +1742,7 @@ class RelationshipCalculator:
                     # other person has recusemap, and will stop when seeing
                     # the brother.
                     child_list = [
-                        ref.ref
-                        for ref in family.get_child_ref_list()
-                        if ref.ref != person.handle
+                        child for (child, mrel, frel) in child_refs if child != handle
                     ]
                     addstr = self.REL_SIBLING
                     for chandle in child_list:
@@ -2559,7 +2633,7 @@ class RelationshipCalculator:
         dbstate.disconnect(self.state_signal_key)
         list(map(dbstate.db.disconnect, self.signal_keys))
         self.storemap = False
-        self.stored_map = None
+        self.__clear_cache(None)
 
     def _dbchange_callback(self, db):
         """
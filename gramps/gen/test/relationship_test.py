@@ -0,0 +1,116 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Unittest for the ancestor maps of relationship.py"""
+
+import unittest
+
+from ..db import DbTxn
+from ..db.utils import make_database
+from ..lib import ChildRef, Family, Person
+from ..relationship import RelationshipCalculator
+
+
+class RelationshipMapTest(unittest.TestCase):
+    """
+    Test that the cached ancestor maps follow the changes of the database.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add", self.db) as trans:
+            grandfather = self.add_person("G", Person.MALE, trans)
+            children = [
+                self.add_person("A", Person.MALE, trans),
+                self.add_person("B", Person.FEMALE, trans),
+            ]
+            self.add_family("F1", grandfather, children, trans)
+            self.add_family(
+                "F2", children[0], [self.add_person("C", Person.MALE, trans)], trans
+            )
+            self.add_family(
+                "F3", children[1], [self.add_person("D", Person.FEMALE, trans)], trans
+            )
+            self.add_person("E", Person.FEMALE, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_person(self, handle, gender, trans):
+        person = Person()
+        person.set_handle(handle)
+        person.set_gender(gender)
+        self.db.add_person(person, trans)
+        return person
+
+    def add_family(self, handle, father, children, trans):
+        family = Family()
+        family.set_handle(handle)
+        family.set_father_handle(father.handle)
+        father.add_family_handle(handle)
+        self.db.commit_person(father, trans)
+        for child in children:
+            child_ref = ChildRef()
+            child_ref.set_reference_handle(child.handle)
+            family.add_child_ref(child_ref)
+            child.add_parent_family_handle(handle)
+            self.db.commit_person(child, trans)
+        self.db.add_family(family, trans)
+
+    def relationship(self, calc, handle1, handle2):
+        return calc.get_one_relationship(
+            self.db,
+            self.db.get_person_from_handle(handle1),
+            self.db.get_person_from_handle(handle2),
+        )
+
+    def test_cached_maps(self):
+        calc = RelationshipCalculator()
+        calc.storemap = True
+        self.assertEqual(self.relationship(calc, "C", "D"), "first cousin")
+        self.assertEqual(self.relationship(calc, "D", "G"), "grandfather")
+        self.assertEqual(self.relationship(calc, "C", "B"), "aunt")
+        self.assertEqual(self.relationship(calc, "C", "E"), "")
+
+        # E becomes a child of C
+        with DbTxn("Edit", self.db) as trans:
+            parent = self.db.get_person_from_handle("C")
+            child = self.db.get_person_from_handle("E")
+            self.add_family("F4", parent, [child], trans)
+        calc._datachange_callback(["C", "E"])
+        self.assertEqual(self.relationship(calc, "C", "E"), "daughter")
+        self.assertEqual(
+            self.relationship(calc, "E", "D"), "first cousin once removed (up)"
+        )
+
+    def test_same_results(self):
+        cached = RelationshipCalculator()
+        cached.storemap = True
+        calc = RelationshipCalculator()
+        for handle1 in "ABCDEG":
+            for handle2 in "ABCDEG":
+                self.assertEqual(
+                    self.relationship(cached, handle1, handle2),
+                    self.relationship(calc, handle1, handle2),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -109,6 +109,121 @@ class ProbablyAlive:
         self.MIN_GENERATION_YEARS = min_generation_years
         self.pset = set()
 
+    def get_person_bd(self, class_or_handle):
+        """
+        Looks up birth and death events for referenced person,
+        using fallback dates if necessary.
+        The dates will always be either None or valid values, avoiding EMPTYs.
+        Only actual recorded dates are returned - there are no inferred
+        limit values supplied for missing dates.
+
+        returns  (birth_date, death_date, death_found, explain_birth, explain_death)
+                             for the referenced person
+        """
+        birth_date = None
+        death_date = None
+        death_found = False
+        explain_birth = ""
+        explain_death = ""
+
+        if not class_or_handle:
+            return (
+                birth_date,
+                death_date,
+                death_found,
+                explain_birth,
+                explain_death,
+            )
+
+        if isinstance(class_or_handle, (Person, DataDict)):
+            thisperson = class_or_handle
+        elif isinstance(class_or_handle, str):
+            thisperson = self.db.get_person_from_handle(class_or_handle)
+        else:
+            thisperson = None
+
+        if not thisperson:
+            LOG.debug("    get_person_bd(): null person called")
+            return (
+                birth_date,
+                death_date,
+                death_found,
+                explain_birth,
+                explain_death,
+            )
+        # is there an actual death record?  Even if yes, there may be no date,
+        # in which case the EMPTY date is reported for the event.
+        death_ref = thisperson.get_death_ref()
+        if death_ref and death_ref.get_role().is_primary():
+            evnt = self.db.get_event_from_handle(death_ref.ref)
+            if evnt:
+                death_found = True
+                dateobj = evnt.get_date_object()
+                if dateobj and dateobj.is_valid():
+                    death_date = dateobj
+                    explain_death = _("date")
+
+        # at this stage death_date is None or a valid date.
+        # death_found is true if thisperson is known to be dead,
+        #        whether or not a date was found.
+        # If we have no death_date then look for fallback event such as Burial.
+        # These fallbacks are fairly good indications that someone's not alive.
+        # If the fallback death event does not have a valid date then it means
+        # we know they are dead but not when they died.
+        # So keep checking in case we get a date.
+        if not death_date:
+            for ev_ref in thisperson.get_primary_event_ref_list():
+                if ev_ref:
+                    evnt = self.db.get_event_from_handle(ev_ref.ref)
+                    if evnt and evnt.type.is_death_fallback():
+                        death_date_fb = evnt.get_date_object()
+                        death_found = True
+                        if death_date_fb.is_valid():
+                            # copy, the modifier must not change the event
+                            death_date = Date(death_date_fb)
+                            explain_death = _("date fallback")
+                            if death_date.get_modifier() == Date.MOD_NONE:
+                                death_date.set_modifier(Date.MOD_BEFORE)
+                            break  # we found a valid date, stop looking.
+        # At this point:
+        # * death_found is False: (no death indication found); or
+        # * death_found is True. (death confirmed somehow);  In which case:
+        #       * (death_date is valid) some form of death date found; or
+        #       * (death_date is None and no date was recorded)
+        # now repeat, looking for birth date
+        birth_ref = thisperson.get_birth_ref()
+        if birth_ref and birth_ref.get_role().is_primary():
+            evnt = self.db.get_event_from_handle(birth_ref.ref)
+            if evnt:
+                dateobj = evnt.get_date_object()
+                if dateobj and dateobj.get_year_valid():
+                    birth_date = dateobj
+                    explain_birth = _("date")
+
+        # to here:
+        #   birth_date is None: either no birth record, or the birth event
+        #   has no valid date (missing or year-less date like "February 3");
+        #   birth_date is a valid date with a known year
+        # Look for Baptism, etc events.
+        # These are fairly good indications of someone's birth date.
+        if not birth_date:
+            for ev_ref in thisperson.get_primary_event_ref_list():
+                evnt = self.db.get_event_from_handle(ev_ref.ref)
+                if evnt and evnt.type.is_birth_fallback():
+                    birth_date_fb = evnt.get_date_object()
+                    if birth_date_fb and birth_date_fb.get_year_valid():
+                        birth_date = birth_date_fb
+                        explain_birth = _("date fallback")
+                        break
+        if DEBUGLEVEL > 3:
+            LOG.debug(
+                "           << get_person_bd for [%s], birth %s, death %s",
+                thisperson.get_gramps_id(),
+                birth_date,
+                death_date,
+            )
+        return (birth_date, death_date, death_found, explain_birth, explain_death)
+
     def probably_alive_range(self, person, is_spouse=False, immediate_fam_only=False):
         """
         Find likely birth and death date ranges, either from dates of actual
@@ -140,119 +255,7 @@ class ProbablyAlive:
         explain_birth_max = ""
         explain_death = ""
 
-        def get_person_bd(class_or_handle):
-            """
-                Looks up birth and death events for referenced person,
-                using fallback dates if necessary.
-                The dates will always be either None or valid values, avoiding EMPTYs.
-                Only actual recorded dates are returned - there are no inferred
-                limit values supplied for missing dates.
-
-            returns  (birth_date, death_date, death_found, explain_birth, explain_death)
-                                 for the referenced person
-            """
-            birth_date = None
-            death_date = None
-            death_found = False
-            explain_birth = ""
-            explain_death = ""
-
-            if not class_or_handle:
-                return (
-                    birth_date,
-                    death_date,
-                    death_found,
-                    explain_birth,
-                    explain_death,
-                )
-
-            if isinstance(class_or_handle, (Person, DataDict)):
-                thisperson = class_or_handle
-            elif isinstance(class_or_handle, str):
-                thisperson = self.db.get_person_from_handle(class_or_handle)
-            else:
-                thisperson = None
-
-            if not thisperson:
-                LOG.debug("    get_person_bd(): null person called")
-                return (
-                    birth_date,
-                    death_date,
-                    death_found,
-                    explain_birth,
-                    explain_death,
-                )
-            # is there an actual death record?  Even if yes, there may be no date,
-            # in which case the EMPTY date is reported for the event.
-            death_ref = thisperson.get_death_ref()
-            if death_ref and death_ref.get_role().is_primary():
-                evnt = self.db.get_event_from_handle(death_ref.ref)
-                if evnt:
-                    death_found = True
-                    dateobj = evnt.get_date_object()
-                    if dateobj and dateobj.is_valid():
-                        death_date = dateobj
-                        explain_death = _("date")
-
-            # at this stage death_date is None or a valid date.
-            # death_found is true if thisperson is known to be dead,
-            #        whether or not a date was found.
-            # If we have no death_date then look for fallback event such as Burial.
-            # These fallbacks are fairly good indications that someone's not alive.
-            # If the fallback death event does not have a valid date then it means
-            # we know they are dead but not when they died.
-            # So keep checking in case we get a date.
-            if not death_date:
-                for ev_ref in thisperson.get_primary_event_ref_list():
-                    if ev_ref:
-                        evnt = self.db.get_event_from_handle(ev_ref.ref)
-                        if evnt and evnt.type.is_death_fallback():
-                            death_date_fb = evnt.get_date_object()
-                            death_found = True
-                            if death_date_fb.is_valid():
-                                death_date = death_date_fb
-                                explain_death = _("date fallback")
-                                if death_date.get_modifier() == Date.MOD_NONE:
-                                    death_date.set_modifier(Date.MOD_BEFORE)
-                                break  # we found a valid date, stop looking.
-            # At this point:
-            # * death_found is False: (no death indication found); or
-            # * death_found is True. (death confirmed somehow);  In which case:
-            #       * (death_date is valid) some form of death date found; or
-            #       * (death_date is None and no date was recorded)
-            # now repeat, looking for birth date
-            birth_ref = thisperson.get_birth_ref()
-            if birth_ref and birth_ref.get_role().is_primary():
-                evnt = self.db.get_event_from_handle(birth_ref.ref)
-                if evnt:
-                    dateobj = evnt.get_date_object()
-                    if dateobj and dateobj.get_year_valid():
-                        birth_date = dateobj
-                        explain_birth = _("date")
-
-            # to here:
-            #   birth_date is None: either no birth record, or the birth event
-            #   has no valid date (missing or year-less date like "February 3");
-            #   birth_date is a valid date with a known year
-            # Look for Baptism, etc events.
-            # These are fairly good indications of someone's birth date.
-            if not birth_date:
-                for ev_ref in thisperson.get_primary_event_ref_list():
-                    evnt = self.db.get_event_from_handle(ev_ref.ref)
-                    if evnt and evnt.type.is_birth_fallback():
-                        birth_date_fb = evnt.get_date_object()
-                        if birth_date_fb and birth_date_fb.get_year_valid():
-                            birth_date = birth_date_fb
-                            explain_birth = _("date fallback")
-                            break
-            if DEBUGLEVEL > 3:
-                LOG.debug(
-                    "           << get_person_bd for [%s], birth %s, death %s",
-                    thisperson.get_gramps_id(),
-                    birth_date,
-                    death_date,
-                )
-            return (birth_date, death_date, death_found, explain_birth, explain_death)
+        get_person_bd = self.get_person_bd
 
         birth_date, death_date, known_to_be_dead, explain_birth_min, explain_death = (
             get_person_bd(person)
@@ -1034,6 +1037,18 @@ def probably_alive(
     birth, death, explain, relative = probably_alive_range(
         person, db, max_sib_age_diff, max_age_prob_alive, avg_generation_gap
     )
+    return _alive_in_range(
+        person, birth, death, explain, relative, current_date, limit, return_range
+    )
+
+
+def _alive_in_range(
+    person, birth, death, explain, relative, current_date, limit, return_range
+):
+    """
+    Return the result of probably_alive for the estimated birth and death
+    date ranges of a person.
+    """
     if current_date is None or not current_date.is_valid():
         current_date = Today()
 
@@ -1115,6 +1130,87 @@ def probably_alive_range(
     return pbac.probably_alive_range(person)
 
 
+# -------------------------------------------------------------------------
+#
+# ProbablyAliveCache class
+#
+# -------------------------------------------------------------------------
+class ProbablyAliveCache(ProbablyAlive):
+    """
+    Checks whether many people of a database are probably alive.
+
+    The birth and death evidence of each person, and the estimated ranges,
+    are computed once and remembered, so the relatives shared by many
+    people are only looked at once.  The results are those of
+    :func:`probably_alive`, for the state of the database when they were
+    computed: a new instance must be used after the database changes.
+    """
+
+    def __init__(
+        self,
+        db,
+        max_sib_age_diff=None,
+        max_age_prob_alive=None,
+        avg_generation_gap=None,
+        min_generation_years=None,
+    ):
+        # Use the real database to find all people
+        while isinstance(db, ProxyDbBase):
+            db = db.db
+        ProbablyAlive.__init__(
+            self,
+            db,
+            max_sib_age_diff,
+            max_age_prob_alive,
+            avg_generation_gap,
+            min_generation_years,
+        )
+        self.person_bd = {}
+        self.ranges = {}
+
+    def get_person_bd(self, class_or_handle):
+        if isinstance(class_or_handle, str):
+            handle = class_or_handle
+        else:
+            handle = getattr(class_or_handle, "handle", None)
+        if not handle:
+            return ProbablyAlive.get_person_bd(self, class_or_handle)
+        result = self.person_bd.get(handle)
+        if result is None:
+            result = ProbablyAlive.get_person_bd(self, class_or_handle)
+            self.person_bd[handle] = result
+        return result
+
+    def probably_alive_range(self, person, is_spouse=False, immediate_fam_only=False):
+        if person is None:
+            return (None, None, "", None)
+        key = (person.handle, is_spouse, immediate_fam_only)
+        result = self.ranges.get(key)
+        if result is None:
+            result = ProbablyAlive.probably_alive_range(
+                self, person, is_spouse, immediate_fam_only
+            )
+            self.ranges[key] = result
+        birth, death, explain, relative = result
+        # The callers may change the dates
+        return (
+            None if birth is None else Date(birth),
+            None if death is None else Date(death),
+            explain,
+            relative,
+        )
+
+    def probably_alive(self, person, current_date=None, limit=0, return_range=False):
+        """
+        Return true if the person may be alive on current_date.  See
+        :func:`probably_alive`.
+        """
+        birth, death, explain, relative = self.probably_alive_range(person)
+        return _alive_in_range(
+            person, birth, death, explain, relative, current_date, limit, return_range
+        )
+
+
 def update_constants():
     """
     Used to update the constants that are cached in this module.
@@ -29,21 +29,25 @@ from ..lib.date import Date, Today
 # get_location_list
 #
 # -------------------------------------------------------------------------
-def get_location_list(db, place, date=None, lang=""):
+def get_location_list(db, place, date=None, lang="", cache=None):
     """
     Return a list of place names for display.
+
+    The lists of the places enclosing the place can be kept in a cache, a
+    dictionary which is only valid as long as the places of the database
+    don't change.  The place itself is never taken from the cache, so that
+    a place being edited is shown as it is.
     """
     if date is None:
         date = __get_latest_date(place)
+    if cache is not None:
+        lines = __get_cached_list(db, place, date, lang, cache)
+        if lines is not None:
+            return lines
     visited = [place.handle]
     lines = [(__get_name(place, date, lang), place.get_type())]
     while True:
-        handle = None
-        for placeref in place.get_placeref_list():
-            ref_date = placeref.get_date_object()
-            if ref_date.is_empty() or date.match_exact(ref_date):
-                handle = placeref.ref
-                break
+        handle = __get_parent_handle(place, date)
         if handle is None or handle in visited:
             break
         place = db.get_place_from_handle(handle)
@@ -54,6 +58,80 @@ def get_location_list(db, place, date=None, lang=""):
     return lines
 
 
+def __get_cached_list(db, place, date, lang, cache):
+    """
+    Return the list of place names, using and updating a cache of the lists
+    of the enclosing places.  Return None if the hierarchy has a loop.
+
+    The cache holds (lines, handles, dated) tuples keyed by (handle, lang,
+    date key), where the date key is None if the list doesn't depend on the
+    date.
+    """
+    date_key = __get_date_key(date)
+    visited = {place.handle}
+    todo = []
+    handle = __get_parent_handle(place, date)
+    lines, handles, dated = (), (), False
+    while handle is not None:
+        entry = cache.get((handle, lang, None)) or cache.get((handle, lang, date_key))
+        if entry is not None:
+            if not visited.isdisjoint(entry[1]):
+                return None
+            lines, handles, dated = entry
+            break
+        if handle in visited:
+            return None
+        parent = db.get_place_from_handle(handle)
+        if parent is None:
+            break
+        visited.add(handle)
+        todo.append(parent)
+        handle = __get_parent_handle(parent, date)
+
+    # Add the lists of the enclosing places, from the top down
+    for parent in reversed(todo):
+        lines = ((__get_name(parent, date, lang), parent.get_type()),) + lines
+        handles = (parent.handle,) + handles
+        dated = dated or __is_dated(parent)
+        cache[(parent.handle, lang, date_key if dated else None)] = (
+            lines,
+            handles,
+            dated,
+        )
+    return [(__get_name(place, date, lang), place.get_type())] + list(lines)
+
+
+def __get_parent_handle(place, date):
+    for placeref in place.get_placeref_list():
+        ref_date = placeref.get_date_object()
+        if ref_date.is_empty() or date.match_exact(ref_date):
+            return placeref.ref
+    return None
+
+
+def __is_dated(place):
+    """
+    Return True if the name or the enclosing place of a place depend on the
+    date.
+    """
+    for place_name in place.get_all_names():
+        if not place_name.get_date_object().is_empty():
+            return True
+    placeref_list = place.get_placeref_list()
+    return bool(placeref_list) and not placeref_list[0].get_date_object().is_empty()
+
+
+def __get_date_key(date):
+    return (
+        date.calendar,
+        date.modifier,
+        date.quality,
+        tuple(date.dateval),
+        date.text,
+        date.newyear,
+    )
+
+
 def __get_name(place, date, lang):
     endonym = None
     for place_name in place.get_all_names():
@@ -27,8 +27,8 @@ import unittest
 
 from ...db import DbTxn
 from ...db.utils import make_database
-from ...lib import Date, Event, EventRef, EventType, Person
-from ..alive import probably_alive_range
+from ...lib import ChildRef, Date, Event, EventRef, EventType, Family, Person
+from ..alive import ProbablyAliveCache, probably_alive, probably_alive_range
 
 
 def _make_db():
@@ -207,5 +207,59 @@ class TestProbablyAliveRange(unittest.TestCase):
         self.assertEqual(year, 1848)
 
 
+class TestProbablyAliveCache(unittest.TestCase):
+    """Tests that ProbablyAliveCache gives the results of probably_alive."""
+
+    def setUp(self):
+        self.db = _make_db()
+        with DbTxn("test", self.db) as trans:
+            father = _add_person_with_events(self.db, trans, birth_year=1800)
+            mother = _add_person_with_events(self.db, trans, include_birth=False)
+            children = [
+                _add_person_with_events(self.db, trans, birth_year=1830),
+                _add_person_with_events(self.db, trans, include_birth=False),
+            ]
+            family = Family()
+            family.set_father_handle(father)
+            family.set_mother_handle(mother)
+            for child in children:
+                child_ref = ChildRef()
+                child_ref.set_reference_handle(child)
+                family.add_child_ref(child_ref)
+            self.db.add_family(family, trans)
+            for handle in [father, mother] + children:
+                person = self.db.get_person_from_handle(handle)
+                if handle in children:
+                    person.add_parent_family_handle(family.handle)
+                else:
+                    person.add_family_handle(family.handle)
+                self.db.commit_person(person, trans)
+        self.handles = [father, mother] + children
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_same_results(self):
+        alive = ProbablyAliveCache(self.db)
+        current_date = Date(1900, 1, 1)
+        for _pass in range(2):
+            for handle in self.handles:
+                person = self.db.get_person_from_handle(handle)
+                birth, death, explain, _who = alive.probably_alive_range(person)
+                expected = probably_alive_range(person, self.db)
+                self.assertEqual(
+                    (str(birth), str(death), explain),
+                    (str(expected[0]), str(expected[1]), expected[2]),
+                )
+                self.assertEqual(
+                    alive.probably_alive(person, current_date),
+                    probably_alive(person, self.db, current_date),
+                )
+                # Changing a result doesn't change the cache
+                if birth is not None:
+                    birth.set_yr_mon_day(1, 1, 1, remove_stop_date=True)
+        self.assertEqual(set(alive.person_bd), set(self.handles))
+
+
 if __name__ == "__main__":
     unittest.main()
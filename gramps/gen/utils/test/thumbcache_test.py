@@ -0,0 +1,115 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Thumbnail index tests.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import os
+import tempfile
+import unittest
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from ...const import SIZE_LARGE, SIZE_NORMAL
+from ...db import DbTxn
+from ...db.utils import make_database
+from ...lib import Media, MediaRef, Person
+from ..thumbcache import ThumbnailIndex, get_thumbnail_jobs
+
+
+# -------------------------------------------------------------------------
+#
+# ThumbnailIndexTest class
+#
+# -------------------------------------------------------------------------
+class ThumbnailIndexTest(unittest.TestCase):
+    """
+    Tests for the thumbnail index.
+    """
+
+    def test_index(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            index = ThumbnailIndex(os.path.join(tmpdirname, "index.sqlite"))
+            index.set("/a.jpg", 10.0, None, SIZE_NORMAL, "/thumb/a.png")
+            index.set("/a.jpg", 10.0, (0, 0, 50, 50), SIZE_NORMAL, "/thumb/b.png")
+            self.assertEqual(index.get("/a.jpg", 10.0), "/thumb/a.png")
+            self.assertEqual(index.get("/a.jpg", 10.0, (0, 0, 50, 50)), "/thumb/b.png")
+            # The source file was modified, or the size differs
+            self.assertIsNone(index.get("/a.jpg", 11.0))
+            self.assertIsNone(index.get("/a.jpg", 10.0, size=SIZE_LARGE))
+            index.close()
+
+            # The index persists
+            index = ThumbnailIndex(os.path.join(tmpdirname, "index.sqlite"))
+            self.assertEqual(index.get("/a.jpg", 10.0), "/thumb/a.png")
+            index.remove("/a.jpg")
+            self.assertIsNone(index.get("/a.jpg", 10.0))
+            self.assertEqual(index.get("/a.jpg", 10.0, (0, 0, 50, 50)), "/thumb/b.png")
+            index.close()
+
+    def test_unusable(self):
+        with tempfile.NamedTemporaryFile() as tmpfile:
+            # The directory of the index is a file
+            index = ThumbnailIndex(os.path.join(tmpfile.name, "index.sqlite"))
+            with self.assertLogs(".thumbnail", "WARNING"):
+                self.assertIsNone(index.get("/a.jpg", 10.0))
+            index.set("/a.jpg", 10.0, None, SIZE_NORMAL, "/thumb/a.png")
+            self.assertIsNone(index.get("/a.jpg", 10.0))
+
+    def test_jobs(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        try:
+            with DbTxn("Media", db) as trans:
+                media = Media()
+                media.set_path("/photos/a.jpg")
+                media.set_mime_type("image/jpeg")
+                db.add_media(media, trans)
+                person = Person()
+                for rectangle in ((10, 10, 40, 40), (10, 10, 40, 40), None):
+                    media_ref = MediaRef()
+                    media_ref.set_reference_handle(media.handle)
+                    media_ref.set_rectangle(rectangle)
+                    person.add_media_reference(media_ref)
+                db.add_person(person, trans)
+            jobs = get_thumbnail_jobs(db)
+        finally:
+            db.close()
+        self.assertEqual(
+            jobs,
+            [
+                ("/photos/a.jpg", "image/jpeg", None, SIZE_NORMAL),
+                ("/photos/a.jpg", "image/jpeg", None, SIZE_LARGE),
+                ("/photos/a.jpg", "image/jpeg", (10, 10, 40, 40), SIZE_NORMAL),
+                ("/photos/a.jpg", "image/jpeg", (10, 10, 40, 40), SIZE_LARGE),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
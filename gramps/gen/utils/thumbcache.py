@@ -0,0 +1,240 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Persistent index of the thumbnails, and the list of the thumbnails used by a
+family tree.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import os
+import sqlite3
+import threading
+
+# -------------------------------------------------------------------------
+#
+# gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import SIZE_LARGE, SIZE_NORMAL, THUMB_DIR
+from gramps.gen.utils.file import media_path_full
+
+# -------------------------------------------------------------------------
+#
+# Constants
+#
+# -------------------------------------------------------------------------
+LOG = logging.getLogger(".thumbnail")
+
+INDEX_PATH = os.path.join(THUMB_DIR, "index.sqlite")
+
+SIZES = (SIZE_NORMAL, SIZE_LARGE)
+
+
+# -------------------------------------------------------------------------
+#
+# ThumbnailIndex class
+#
+# -------------------------------------------------------------------------
+class ThumbnailIndex:
+    """
+    The thumbnail of each source file, rectangle and size, with the
+    modification time the source file had when the thumbnail was made.
+
+    A thumbnail is found from the modification time of its source file only,
+    without hashing the path or looking at the thumbnail file.  The index
+    can be used from several threads.  If it can't be used, e.g. because
+    the cache directory is read-only, every lookup fails.
+
+    :param path: Path of the index database.
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__conn = None
+        self.__failed = False
+
+    def __connect(self):
+        if self.__conn is None and not self.__failed:
+            try:
+                if self.path != ":memory:":
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self.__conn = sqlite3.connect(
+                    self.path, timeout=5, check_same_thread=False
+                )
+                self.__conn.execute(
+                    "CREATE TABLE IF NOT EXISTS thumbnail ("
+                    "path TEXT NOT NULL, "
+                    "rectangle TEXT NOT NULL, "
+                    "size INTEGER NOT NULL, "
+                    "mtime REAL NOT NULL, "
+                    "thumb TEXT NOT NULL, "
+                    "PRIMARY KEY (path, rectangle, size))"
+                )
+                self.__conn.commit()
+            except (OSError, sqlite3.Error) as err:
+                LOG.warning("Thumbnail index %s not used: %s", self.path, err)
+                self.__conn = None
+                self.__failed = True
+        return self.__conn
+
+    def __execute(self, sql, args, many=False):
+        with self.__lock:
+            conn = self.__connect()
+            if conn is None:
+                return None
+            try:
+                if many:
+                    cursor = conn.executemany(sql, args)
+                else:
+                    cursor = conn.execute(sql, args)
+                rows = cursor.fetchall()
+                conn.commit()
+                return rows
+            except sqlite3.Error as err:
+                LOG.warning("Thumbnail index %s: %s", self.path, err)
+                return None
+
+    def get(self, path, mtime, rectangle=None, size=SIZE_NORMAL):
+        """
+        Return the path of the thumbnail, or None if there is no thumbnail
+        made since the source file was last modified.
+
+        :param path: Path of the source file.
+        :type path: str
+        :param mtime: Modification time of the source file.
+        :type mtime: float
+        :param rectangle: Subsection rectangle.
+        :type rectangle: tuple
+        :param size: SIZE_NORMAL or SIZE_LARGE.
+        :type size: int
+        """
+        rows = self.__execute(
+            "SELECT thumb FROM thumbnail "
+            "WHERE path = ? AND rectangle = ? AND size = ? AND mtime = ?",
+            [path, _rectangle_key(rectangle), size, mtime],
+        )
+        return rows[0][0] if rows else None
+
+    def set(self, path, mtime, rectangle, size, thumb):
+        """
+        Add the thumbnail of a source file.
+        """
+        self.set_many([(path, mtime, rectangle, size, thumb)])
+
+    def set_many(self, thumbnails):
+        """
+        Add the thumbnails of a list of (path, mtime, rectangle, size, thumb)
+        tuples.
+        """
+        self.__execute(
+            "INSERT OR REPLACE INTO thumbnail "
+            "(path, rectangle, size, mtime, thumb) VALUES (?, ?, ?, ?, ?)",
+            [
+                (path, _rectangle_key(rectangle), size, mtime, thumb)
+                for path, mtime, rectangle, size, thumb in thumbnails
+            ],
+            many=True,
+        )
+
+    def remove(self, path, rectangle=None, size=SIZE_NORMAL):
+        """
+        Remove the thumbnail of a source file, e.g. because the thumbnail file
+        was removed.
+        """
+        self.__execute(
+            "DELETE FROM thumbnail WHERE path = ? AND rectangle = ? AND size = ?",
+            [path, _rectangle_key(rectangle), size],
+        )
+
+    def close(self):
+        with self.__lock:
+            if self.__conn is not None:
+                self.__conn.close()
+                self.__conn = None
+
+
+def _rectangle_key(rectangle):
+    if rectangle is None:
+        return ""
+    return ",".join(str(value) for value in rectangle)
+
+
+_INDEX = None
+
+
+def get_thumbnail_index():
+    """
+    Return the index of the thumbnails of the thumbnail directory.
+    """
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = ThumbnailIndex(INDEX_PATH)
+    return _INDEX
+
+
+# -------------------------------------------------------------------------
+#
+# get_thumbnail_jobs
+#
+# -------------------------------------------------------------------------
+def get_thumbnail_jobs(db, sizes=SIZES, step=None):
+    """
+    Return the thumbnails used for the media objects of a family tree, as a
+    list of (path, mime type, rectangle, size) tuples.  There is a thumbnail
+    of each media file, and one of each region of a media file that is
+    referenced.
+
+    :param db: Database of the family tree.
+    :type db: :class:`.DbReadBase`
+    :param sizes: Sizes of the thumbnails.
+    :type sizes: tuple
+    :param step: Function called after each media object.
+    :type step: callable
+    """
+    jobs = []
+    for media in db.iter_media():
+        path = media_path_full(db, media.get_path())
+        mime_type = media.get_mime_type()
+        rectangles = [None]
+        for class_name, handle in db.find_backlink_handles(media.handle):
+            obj = db.method("get_%s_from_handle", class_name)(handle)
+            if obj is None or not hasattr(obj, "get_media_list"):
+                continue
+            for media_ref in obj.get_media_list():
+                rectangle = media_ref.get_rectangle()
+                if (
+                    media_ref.ref == media.handle
+                    and rectangle is not None
+                    and rectangle not in rectangles
+                ):
+                    rectangles.append(rectangle)
+        for rectangle in rectangles:
+            for size in sizes:
+                jobs.append((path, mime_type, rectangle, size))
+        if step:
+            step()
+    return jobs
@@ -30,6 +30,10 @@ Handles generation and access to thumbnails used in Gramps.
 from __future__ import annotations
 import os
 import logging
+import multiprocessing
+import stat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from hashlib import md5
 
 # -------------------------------------------------------------------------
@@ -63,6 +67,7 @@ from gramps.gen.const import (
 )
 from gramps.gen.mime import get_type
 from gramps.gen.plug import BasePluginManager, START, Thumbnailer
+from gramps.gen.utils.thumbcache import get_thumbnail_index
 
 # -------------------------------------------------------------------------
 #
@@ -73,6 +78,12 @@ LOG = logging.getLogger(".thumbnail")
 
 THUMBNAILERS: list[Thumbnailer] = []
 
+# Number of threads making the thumbnails requested by the GUI
+REQUEST_THREADS = 2
+
+# Number of thumbnails made by a worker process at a time
+CHUNKSIZE = 20
+
 
 def get_thumbnailers():
     if len(THUMBNAILERS):
@@ -227,13 +238,99 @@ def get_thumbnail_image(src_file, mtype=None, rectangle=None, size=SIZE_NORMAL):
     """
     try:
         filename = get_thumbnail_path(src_file, mtype, rectangle, size)
-        return GdkPixbuf.Pixbuf.new_from_file(filename)
+        try:
+            return GdkPixbuf.Pixbuf.new_from_file(filename)
+        except GLib.GError:
+            # The thumbnail may have been removed since it was indexed
+            get_thumbnail_index().remove(src_file, rectangle, size)
+            filename = get_thumbnail_path(src_file, mtype, rectangle, size)
+            return GdkPixbuf.Pixbuf.new_from_file(filename)
     except (GLib.GError, OSError):
-        if mtype:
-            return find_mime_type_pixbuf(mtype)
-        else:
-            default = os.path.join(IMAGE_DIR, "document.png")
-            return GdkPixbuf.Pixbuf.new_from_file(default)
+        return get_placeholder_image(mtype)
+
+
+def get_placeholder_image(mtype=None):
+    """
+    Return the image shown instead of a thumbnail: the icon of the mime type,
+    or a generic document icon.
+
+    :param mtype: mime type of the source file
+    :type mtype: unicode
+    :rtype: GdkPixbuf.Pixbuf
+    """
+    if mtype:
+        return find_mime_type_pixbuf(mtype)
+    default = os.path.join(IMAGE_DIR, "document.png")
+    return GdkPixbuf.Pixbuf.new_from_file(default)
+
+
+# -------------------------------------------------------------------------
+#
+# request_thumbnail_image
+#
+# -------------------------------------------------------------------------
+_REQUESTS = {}
+_EXECUTOR = None
+
+
+def request_thumbnail_image(
+    src_file, callback, mtype=None, rectangle=None, size=SIZE_NORMAL
+):
+    """
+    Return the thumbnail image associated with the source file, without
+    waiting for it to be made.
+
+    If the thumbnail is current, it is returned.  Otherwise a placeholder is
+    returned, and the thumbnail is made in a background thread.  The
+    callback is then called with the thumbnail from the GTK main loop.
+
+    :param src_file: Source media file
+    :type src_file: unicode
+    :param callback: function called with the thumbnail when it is made
+    :type callback: callable
+    :param mtype: mime type of the source file
+    :type mtype: unicode
+    :param rectangle: subsection rectangle
+    :type rectangle: tuple
+    :returns: thumbnail or placeholder
+    :rtype: GdkPixbuf.Pixbuf
+    """
+    global _EXECUTOR
+    filename = find_thumbnail_path(src_file, rectangle, size)
+    if filename is not None:
+        try:
+            return GdkPixbuf.Pixbuf.new_from_file(filename)
+        except GLib.GError:
+            get_thumbnail_index().remove(src_file, rectangle, size)
+
+    key = (src_file, str(rectangle), size)
+    if key in _REQUESTS:
+        _REQUESTS[key].append(callback)
+    else:
+        _REQUESTS[key] = [callback]
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                REQUEST_THREADS, thread_name_prefix="thumbnail"
+            )
+        # The thumbnailers are loaded by the main thread
+        get_thumbnailers()
+        future = _EXECUTOR.submit(get_thumbnail_path, src_file, mtype, rectangle, size)
+        future.add_done_callback(
+            lambda future: GLib.idle_add(_request_done, key, mtype, future)
+        )
+    return get_placeholder_image(mtype)
+
+
+def _request_done(key, mtype, future):
+    callbacks = _REQUESTS.pop(key)
+    try:
+        pixbuf = GdkPixbuf.Pixbuf.new_from_file(future.result())
+    except (GLib.GError, OSError) as err:
+        LOG.debug("Thumbnail of %s not made: %s", key[0], err)
+        pixbuf = get_placeholder_image(mtype)
+    for callback in callbacks:
+        callback(pixbuf)
+    return False
 
 
 # -------------------------------------------------------------------------
@@ -256,19 +353,139 @@ def get_thumbnail_path(src_file, mtype=None, rectangle=None, size=SIZE_NORMAL):
     :returns: thumbnail representing the source file
     :rtype: GdkPixbuf.Pixbuf
     """
-    filename = __build_thumb_path(src_file, rectangle, size)
     if src_file.startswith(("http://", "https://")):
+        filename = __build_thumb_path(src_file, rectangle, size)
         mtype = REMOTE_MIME
         if not os.path.isfile(filename):
             if not __create_thumbnail_image(src_file, mtype, rectangle, size):
                 return os.path.join(IMAGE_DIR, "gramps-url.png")
         return os.path.abspath(filename)
-    elif not os.path.isfile(src_file):
+    mtime = __get_mtime(src_file)
+    if mtime is None:
         return os.path.join(IMAGE_DIR, "image-missing.png")
-    else:
-        if (not os.path.isfile(filename)) or (
-            os.path.getmtime(src_file) > os.path.getmtime(filename)
-        ):
+    index = get_thumbnail_index()
+    filename = index.get(src_file, mtime, rectangle, size)
+    if filename is None:
+        filename = __build_thumb_path(src_file, rectangle, size)
+        if (not os.path.isfile(filename)) or (mtime > os.path.getmtime(filename)):
             if not __create_thumbnail_image(src_file, mtype, rectangle, size):
                 return os.path.join(IMAGE_DIR, "document.png")
-        return os.path.abspath(filename)
+        filename = os.path.abspath(filename)
+        index.set(src_file, mtime, rectangle, size, filename)
+    return filename
+
+
+def find_thumbnail_path(src_file, rectangle=None, size=SIZE_NORMAL):
+    """
+    Return the path to the thumbnail image associated with the source file,
+    or None if the thumbnail was not made since the source file was last
+    modified.  The thumbnail is not made.
+
+    :param src_file: Source media file
+    :type src_file: unicode
+    :param rectangle: subsection rectangle
+    :type rectangle: tuple
+    :rtype: unicode
+    """
+    if src_file.startswith(("http://", "https://")):
+        filename = __build_thumb_path(src_file, rectangle, size)
+        return os.path.abspath(filename) if os.path.isfile(filename) else None
+    mtime = __get_mtime(src_file)
+    if mtime is None:
+        return os.path.join(IMAGE_DIR, "image-missing.png")
+    return get_thumbnail_index().get(src_file, mtime, rectangle, size)
+
+
+def __get_mtime(src_file):
+    """
+    Return the modification time of a file, or None if it is not a file.
+    """
+    try:
+        status = os.stat(src_file)
+    except OSError:
+        return None
+    if not stat.S_ISREG(status.st_mode):
+        return None
+    return status.st_mtime
+
+
+# -------------------------------------------------------------------------
+#
+# generate_thumbnails
+#
+# -------------------------------------------------------------------------
+def generate_thumbnails(jobs, processes=1, step=None):
+    """
+    Make the thumbnails which are not current, in worker processes if more
+    than one process is used.  The thumbnails are added to the index.
+
+    :param jobs: thumbnails to make, as (path, mime type, rectangle, size)
+      tuples, e.g. from :func:`.get_thumbnail_jobs`
+    :type jobs: list
+    :param processes: number of worker processes
+    :type processes: int
+    :param step: function called after each thumbnail
+    :type step: callable
+    :returns: the number of thumbnails made, and the number that failed
+    :rtype: tuple
+    """
+    index = get_thumbnail_index()
+    pending = []
+    for job in jobs:
+        src_file, dummy_mtype, rectangle, size = job
+        if find_thumbnail_path(src_file, rectangle, size) is None:
+            pending.append(job)
+        elif step:
+            step()
+
+    made = failed = 0
+    for job, thumb in _make_thumbnails(pending, processes):
+        if thumb is None:
+            failed += 1
+        else:
+            made += 1
+            src_file, dummy_mtype, rectangle, size = job
+            mtime = __get_mtime(src_file)
+            if mtime is not None:
+                index.set(src_file, mtime, rectangle, size, thumb)
+        if step:
+            step()
+    return made, failed
+
+
+def _make_thumbnails(jobs, processes):
+    """
+    Yield each job with the path of its thumbnail, or None if it failed.
+    """
+    get_thumbnailers()
+    if (
+        processes > 1
+        and len(jobs) > CHUNKSIZE
+        and "fork" in multiprocessing.get_all_start_methods()
+    ):
+        done = 0
+        # Forked workers inherit the thumbnailers
+        executor = ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("fork")
+        )
+        try:
+            for result in executor.map(_make_thumbnail, jobs, chunksize=CHUNKSIZE):
+                done += 1
+                yield result
+            return
+        except (OSError, BrokenProcessPool) as err:
+            LOG.warning("Making thumbnails in worker processes failed: %s", err)
+            jobs = jobs[done:]
+        finally:
+            executor.shutdown(cancel_futures=True)
+    for job in jobs:
+        yield _make_thumbnail(job)
+
+
+def _make_thumbnail(job):
+    src_file, mtype, rectangle, size = job
+    if src_file.startswith(("http://", "https://")):
+        mtype = REMOTE_MIME
+    if __create_thumbnail_image(src_file, mtype, rectangle, size):
+        return job, os.path.abspath(__build_thumb_path(src_file, rectangle, size))
+    return job, None
@@ -25,6 +25,7 @@
 # -------------------------------------------------------------------------
 import os
 import pickle
+from functools import partial
 from urllib.parse import urlparse
 from urllib.request import url2pathname
 
@@ -56,7 +57,7 @@ from gramps.gen.utils.file import (
     relative_path,
     create_checksum,
 )
-from gramps.gen.utils.thumbnails import get_thumbnail_image
+from gramps.gen.utils.thumbnails import request_thumbnail_image
 from gramps.gen.errors import WindowActiveError
 from gramps.gen.mime import get_type, is_valid_type
 from ...ddtargets import DdTargets
@@ -286,18 +287,30 @@ class GalleryTab(ButtonTab, DbGUIElement):
                     parent=self.uistate.window,
                 )
             else:
-                pixbuf = get_thumbnail_image(
+                # A placeholder is shown until the thumbnail is made
+                row = Gtk.TreeRowReference.new(
+                    self.iconmodel, self.iconmodel.get_path(self.iconmodel.append())
+                )
+                pixbuf = request_thumbnail_image(
                     media_path_full(self.dbstate.db, obj.get_path()),
+                    partial(self._thumbnail_made, row),
                     obj.get_mime_type(),
                     ref.get_rectangle(),
                 )
-                self.iconmodel.append(row=[pixbuf, obj.get_description(), ref])
+                self.iconmodel[row.get_path()] = [pixbuf, obj.get_description(), ref]
         self._connect_icon_model()
         self._set_label()
         self._selection_changed()
         if self.update:
             self.update()
 
+    def _thumbnail_made(self, row, pixbuf):
+        """
+        Show a thumbnail made in the background, if its row is still there.
+        """
+        if row.valid():
+            self.iconmodel[row.get_path()][0] = pixbuf
+
     def get_selected(self):
         node = self.iconlist.get_selected_items()
         if len(node) > 0:
@@ -26,6 +26,7 @@
 #
 # -------------------------------------------------------------------------
 import os
+from functools import partial
 
 # -------------------------------------------------------------------------
 #
@@ -47,7 +48,7 @@ from ..utils import open_file_with_default_application
 from gramps.gen.lib import Media, NoteType
 from gramps.gen.db import DbTxn
 from gramps.gen.mime import get_description, get_type
-from gramps.gen.utils.thumbnails import get_thumbnail_image, find_mime_type_pixbuf
+from gramps.gen.utils.thumbnails import request_thumbnail_image, find_mime_type_pixbuf
 from gramps.gen.utils.file import media_path_full, find_file, create_checksum
 from .editprimary import EditPrimary
 from ..widgets import MonitoredDate, MonitoredEntry, PrivacyButton, MonitoredTagList
@@ -208,14 +209,25 @@ class EditMedia(EditPrimary):
     def draw_preview(self):
         mtype = self.obj.get_mime_type()
         if mtype:
-            pb = get_thumbnail_image(
-                media_path_full(self.db, self.obj.get_path()), mtype
+            fullpath = media_path_full(self.db, self.obj.get_path())
+            # A placeholder is shown until the thumbnail is made
+            self.preview_request = (fullpath,)
+            pb = request_thumbnail_image(
+                fullpath, partial(self.preview_made, self.preview_request), mtype
             )
             self.pixmap.set_from_pixbuf(pb)
         else:
+            self.preview_request = None
             pb = find_mime_type_pixbuf("text/plain")
             self.pixmap.set_from_pixbuf(pb)
 
+    def preview_made(self, request, pixbuf):
+        """
+        Show the preview, unless the path was changed meanwhile.
+        """
+        if request is self.preview_request:
+            self.pixmap.set_from_pixbuf(pixbuf)
+
     def setup_filepath(self):
         self.select = self.glade.get_object("file_select")
         self.file_path = self.glade.get_object("path")
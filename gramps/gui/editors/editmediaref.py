@@ -29,6 +29,7 @@
 # -------------------------------------------------------------------------
 import os
 from copy import deepcopy
+from functools import partial
 
 # -------------------------------------------------------------------------
 #
@@ -49,7 +50,7 @@ _ = glocale.translation.sgettext
 from ..utils import open_file_with_default_application
 from gramps.gen.const import THUMBSCALE, REMOTE_MIME
 from gramps.gen.mime import get_description, get_type
-from gramps.gen.utils.thumbnails import get_thumbnail_image, find_mime_type_pixbuf
+from gramps.gen.utils.thumbnails import request_thumbnail_image, find_mime_type_pixbuf
 from gramps.gen.utils.file import media_path_full, find_file, create_checksum
 from gramps.gen.lib import NoteType
 from gramps.gen.db import DbTxn
@@ -173,14 +174,26 @@ class EditMediaRef(EditReference):
         mtype = self.source.get_mime_type()
         if mtype and mtype != REMOTE_MIME:
             fullpath = media_path_full(self.db, self.source.get_path())
-            pb = get_thumbnail_image(fullpath, mtype)
+            # A placeholder is shown until the thumbnail is made
+            self.preview_request = (fullpath,)
+            pb = request_thumbnail_image(
+                fullpath, partial(self.preview_made, self.preview_request), mtype
+            )
             self.pixmap.set_from_pixbuf(pb)
             self.selection.load_image(fullpath)
         else:
+            self.preview_request = None
             pb = find_mime_type_pixbuf("text/plain")
             self.pixmap.set_from_pixbuf(pb)
             self.selection.load_image("")
 
+    def preview_made(self, request, pixbuf):
+        """
+        Show the preview, unless the path was changed meanwhile.
+        """
+        if request is self.preview_request:
+            self.pixmap.set_from_pixbuf(pixbuf)
+
     def _setup_fields(self):
         ebox_shared = self.top.get_object("eventbox")
         ebox_shared.connect("button-press-event", self.button_press_event)
@@ -58,6 +58,13 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
     Flat citation model.  (Original code in CitationBaseModel).
     """
 
+    indexed_columns = {0: "Citation"}
+    sort_columns = {
+        0: ("Citation", "page"),
+        1: ("Citation", "gramps_id"),
+        6: ("Citation", "change"),
+    }
+
     def __init__(
         self,
         db,
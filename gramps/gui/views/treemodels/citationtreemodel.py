@@ -69,6 +69,10 @@ class CitationTreeModel(CitationBaseModel, TreeBaseModel):
     Hierarchical citation model.
     """
 
+    # Source titles and citation pages
+    indexed_columns = {0: "Source"}
+    indexed_columns2 = {0: "Citation"}
+
     def __init__(
         self,
         db,
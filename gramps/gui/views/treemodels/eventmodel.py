@@ -58,6 +58,12 @@ INVALID_DATE_FORMAT = config.get("preferences.invalid-date-format")
 #
 # -------------------------------------------------------------------------
 class EventModel(FlatBaseModel):
+    sort_columns = {
+        0: ("Event", "description"),
+        1: ("Event", "gramps_id"),
+        7: ("Event", "change"),
+    }
+
     def __init__(
         self,
         db,
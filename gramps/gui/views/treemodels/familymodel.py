@@ -57,6 +57,8 @@ invalid_date_format = config.get("preferences.invalid-date-format")
 #
 # -------------------------------------------------------------------------
 class FamilyModel(FlatBaseModel):
+    sort_columns = {0: ("Family", "gramps_id"), 7: ("Family", "change")}
+
     def __init__(
         self,
         db,
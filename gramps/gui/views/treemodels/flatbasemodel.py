@@ -52,7 +52,9 @@ It keeps a FlatNodeMap, and obtains data from database as needed
 # -------------------------------------------------------------------------
 import logging
 import bisect
+from collections import OrderedDict
 from time import perf_counter
+from types import SimpleNamespace
 
 _LOG = logging.getLogger(".gui.basetreemodel")
 
@@ -437,6 +439,143 @@ class FlatNodeMap:
         return Gtk.TreePath((delpath,))
 
 
+# -------------------------------------------------------------------------
+#
+# PagedNodeMap
+#
+# -------------------------------------------------------------------------
+
+# Number of rows read from a sort index at a time, and number of pages kept
+PAGE_SIZE = 250
+MAX_PAGES = 8
+
+
+class SortIndexWindow:
+    """
+    Read-only sequence of the (sortkey, handle) tuples of a sort index of the
+    database.  The tuples are read a page at a time, and only the most
+    recently used pages are kept: the visible rows and a margin around them.
+    """
+
+    def __init__(self, sort_index):
+        self.sort_index = sort_index
+        self.pages = OrderedDict()
+
+    def __len__(self):
+        return len(self.sort_index)
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self.sort_index):
+            raise IndexError(index)
+        page_no, offset = divmod(index, PAGE_SIZE)
+        page = self.pages.get(page_no)
+        if page is None:
+            page = self.sort_index.get_range(page_no * PAGE_SIZE, PAGE_SIZE)
+            self.pages[page_no] = page
+            if len(self.pages) > MAX_PAGES:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_no)
+        if offset >= len(page):
+            raise IndexError(index)
+        return page[offset]
+
+    def clear(self):
+        """
+        Drop the pages that have been read, after a change of the index.
+        """
+        self.pages.clear()
+
+
+class PagedNodeMap(FlatNodeMap):
+    """
+    A NodeMap for a flat treeview that shows all of the objects of a type,
+    in the order of a sort index kept by the database.
+
+    Instead of the list of all (sortkey, handle) tuples, the map only holds
+    the pages of the index around the rows that have been shown.  The index
+    is updated by :meth:`insert` and :meth:`delete`.
+    """
+
+    def __init__(self, sort_index, reverse=False, stamp=0):
+        FlatNodeMap.__init__(self)
+        self.sort_index = sort_index
+        self._index2hndl = SortIndexWindow(sort_index)
+        self._fullhndl = self._index2hndl
+        self._reverse = reverse
+        self.stamp = stamp
+
+    def destroy(self):
+        FlatNodeMap.destroy(self)
+        self.sort_index = None
+
+    def full_srtkey_hndl_map(self):
+        """
+        The sort index holds all of the objects, there is no list of them.
+        """
+        return []
+
+    def reverse_order(self):
+        self._reverse = not self._reverse
+
+    def real_path(self, index):
+        if self._reverse:
+            return len(self.sort_index) - 1 - index
+        return index
+
+    def real_index(self, path):
+        return self.real_path(path)
+
+    def get_path_from_handle(self, handle):
+        index = self.sort_index.get_position(handle)
+        if index is None:
+            return None
+        return Gtk.TreePath((self.real_path(index),))
+
+    def get_sortkey(self, handle):
+        return self.sort_index.get_sort_key(handle)
+
+    def new_iter(self, handle):
+        iter = Gtk.TreeIter()
+        iter.stamp = self.stamp
+        iter.user_data = self.sort_index.get_position(handle)
+        return iter
+
+    def get_iter(self, path):
+        index = self.real_index(path)
+        if not 0 <= index < len(self.sort_index):
+            raise IndexError(path)
+        iter = Gtk.TreeIter()
+        iter.stamp = self.stamp
+        iter.user_data = index
+        return iter
+
+    def insert(self, srtkey_hndl, allkeyonly=False):
+        """
+        Add an object to the sort index, which computes its sort key from
+        the database.  Returns the path of the inserted row.
+        """
+        handle = srtkey_hndl[1]
+        if self.sort_index.get_position(handle) is not None:
+            print(("WARNING: Attempt to add row twice to the model (%s)" % handle))
+            return None
+        self.sort_index.update(handle)
+        self._index2hndl.clear()
+        return self.get_path_from_handle(handle)
+
+    def delete(self, handle):
+        """
+        Delete an object from the sort index.  Returns the path of the
+        deleted row, or None if the object is not shown.
+        """
+        path = self.get_path_from_handle(handle)
+        if path is None:
+            return None
+        self.sort_index.remove(handle)
+        self._index2hndl.clear()
+        return path
+
+
 # -------------------------------------------------------------------------
 #
 # FlatBaseModel
@@ -450,6 +589,16 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             so as to have localized sort
     """
 
+    # Columns showing a field of the text indexed by the database, mapped to
+    # the class name of the objects
+    indexed_columns = {}
+
+    # Columns whose sort value only depends on a secondary column, mapped to
+    # the class name of the objects and the name of that column.  When all
+    # of the objects are shown, the database can then sort them.  See
+    # sort_index_key for columns of values other than secondary columns.
+    sort_columns = {}
+
     def __init__(
         self,
         db,
@@ -487,6 +636,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         self.sort_col = scol
         self.skip = skip
         self._in_build = False
+        self._sort_column = self.sort_columns.get(col)
+        self._sort_index = None
 
         self.node_map = FlatNodeMap()
         self.set_search(search)
@@ -503,6 +654,9 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         Unset all elements that prevent garbage collection
         """
         BaseModel.destroy(self)
+        if self._sort_index is not None:
+            self._sort_index.close()
+            self._sort_index = None
         self.db = None
         self.sort_func = None
         if self.node_map:
@@ -532,10 +686,11 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     text = search[1][1]
                     inv = search[1][2]
                     func = lambda x: self._get_value(x, col) or UEMPTY
+                    obj_type = self.indexed_columns.get(col)
                     if search[2]:
-                        self.search = ExactSearchFilter(func, text, inv)
+                        self.search = ExactSearchFilter(func, text, inv, obj_type)
                     else:
-                        self.search = SearchFilter(func, text, inv)
+                        self.search = SearchFilter(func, text, inv, obj_type)
                 else:
                     self.search = None
                 self.rebuild_data = self._rebuild_search
@@ -581,21 +736,72 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             srt_keys.sort()
             return srt_keys
 
+    def sort_index_key(self, column, value):
+        """
+        Return the sort key of a row for a sort index of the database, given
+        the value the database sorts the rows on.
+
+        The sort functions of the models take the raw data of an object, of
+        which only the secondary column is needed.  Models sorting on other
+        values the database provides override this method.
+        """
+        return self.sort_func(SimpleNamespace(**{column: value}))
+
+    def _use_sort_index(self, show_all):
+        """
+        Set up the node map to show the rows in the order of a sort index of
+        the database, if all of the rows are shown and the database can sort
+        them on the sort column.  Otherwise make sure that the node map holds
+        the list of sort keys.  Return True if the sort index is used.
+        """
+        if self.db is None or not self.db.is_open():
+            return False
+        if show_all and not self.skip and self._sort_column:
+            if self._sort_index is None:
+                obj_class, column = self._sort_column
+                sort_key = lambda value: self.sort_index_key(column, value)
+                self._sort_index = self.db.get_sort_index(obj_class, column, sort_key)
+                if self._sort_index is None:
+                    self._sort_column = None
+        else:
+            # The rows must be sorted again if the sort index is dropped
+            if self._sort_index is not None:
+                self._sort_index.close()
+                self._sort_index = None
+        if self._sort_index is not None:
+            if not isinstance(self.node_map, PagedNodeMap):
+                stamp = self.node_map.stamp + 1
+                self.node_map.destroy()
+                self.node_map = PagedNodeMap(self._sort_index, self._reverse, stamp)
+            return True
+        if isinstance(self.node_map, PagedNodeMap):
+            stamp = self.node_map.stamp + 1
+            self.node_map.destroy()
+            self.node_map = FlatNodeMap()
+            self.node_map.stamp = stamp
+        return False
+
     def _rebuild_search(self, ignore=None):
         """function called when view must be build, given a search text
         in the top search bar
         """
         self.clear_cache()
+        if self._use_sort_index(
+            ignore is None and not (self.search and self.search.text)
+        ):
+            return
         self._in_build = True
         if (self.db is not None) and self.db.is_open():
             allkeys = self.node_map.full_srtkey_hndl_map()
             if not allkeys:
                 allkeys = self.sort_keys()
             if self.search and self.search.text:
+                candidates = self.search.candidates(self.db)
                 dlist = [
                     h
                     for h in allkeys
-                    if self.search.match(h[1], self.db)
+                    if (candidates is None or h[1] in candidates)
+                    and self.search.match(h[1], self.db)
                     and h[1] not in self.skip
                     and h[1] != ignore
                 ]
@@ -619,6 +825,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         in the filter sidebar
         """
         self.clear_cache()
+        if self._use_sort_index(ignore is None and not self.search):
+            return
         self._in_build = True
         if (self.db is not None) and self.db.is_open():
             cdb = CacheProxyDb(self.db)
@@ -55,6 +55,14 @@ from .flatbasemodel import FlatBaseModel
 #
 # -------------------------------------------------------------------------
 class MediaModel(FlatBaseModel):
+    sort_columns = {
+        0: ("Media", "desc"),
+        1: ("Media", "gramps_id"),
+        2: ("Media", "mime"),
+        3: ("Media", "path"),
+        7: ("Media", "change"),
+    }
+
     def __init__(
         self,
         db,
@@ -54,6 +54,10 @@ from gramps.gen.lib import Note, NoteType, StyledText
 class NoteModel(FlatBaseModel):
     """ """
 
+    # The preview of the text
+    indexed_columns = {0: "Note"}
+    sort_columns = {1: ("Note", "gramps_id"), 5: ("Note", "change")}
+
     def __init__(
         self,
         db,
@@ -61,12 +61,12 @@ from gramps.gen.lib import (
     Name,
     EventRef,
     EventType,
-    EventRoleType,
     FamilyRelType,
     ChildRefType,
     NoteType,
 )
-from gramps.gen.lib.json_utils import data_to_object
+from gramps.gen.db.summary import EMPTY_SUMMARY, SUMMARY_KINDS
+from gramps.gen.errors import HandleError
 from gramps.gen.display.name import displayer as name_displayer
 from gramps.gen.display.place import displayer as place_displayer
 from gramps.gen.datehandler import format_time, get_date, get_date_valid
@@ -233,45 +233,7 @@ class PeopleBaseModel(BaseModel):
         return value
 
     def _get_birth_data(self, data, sort_mode):
-        index = data.birth_ref_index
-        if index != -1:
-            try:
-                local = data.event_ref_list[index]
-                b = data_to_object(local)
-                birth = self.db.get_event_from_handle(b.ref)
-                if sort_mode:
-                    retval = "%09d" % birth.get_date_object().get_sort_key()
-                else:
-                    date_str = get_date(birth)
-                    if date_str != "":
-                        retval = escape(date_str)
-                if not get_date_valid(birth):
-                    return invalid_date_format % retval
-                else:
-                    return retval
-            except:
-                return ""
-
-        for event_ref in data.event_ref_list:
-            er = data_to_object(event_ref)
-            event = self.db.get_event_from_handle(er.ref)
-            etype = event.get_type()
-            date_str = get_date(event)
-            if (
-                etype.is_birth_fallback()
-                and er.get_role() == EventRoleType.PRIMARY
-                and date_str != ""
-            ):
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_key()
-                else:
-                    retval = "<i>%s</i>" % escape(date_str)
-                if not get_date_valid(event):
-                    return invalid_date_format % retval
-                else:
-                    return retval
-
-        return ""
+        return self._get_date_data(data, 0, sort_mode)
 
     def column_death_day(self, data):
         handle = data.handle
@@ -290,118 +252,86 @@ class PeopleBaseModel(BaseModel):
         return value
 
     def _get_death_data(self, data, sort_mode):
-        index = data.death_ref_index
-        if index != -1:
+        return self._get_date_data(data, 1, sort_mode)
+
+    def _get_summary(self, data):
+        """
+        Return the summaries of the birth and death of a person.
+        """
+        handle = data.handle
+        cached, value = self.get_cached_value(handle, "SUMMARY")
+        if not cached:
             try:
-                local = data.event_ref_list[index]
-                ref = data_to_object(local)
-                event = self.db.get_event_from_handle(ref.ref)
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_key()
-                else:
-                    date_str = get_date(event)
-                    if date_str != "":
-                        retval = escape(date_str)
-                if not get_date_valid(event):
-                    return invalid_date_format % retval
-                else:
-                    return retval
-            except:
-                return ""
-
-        for event_ref in data.event_ref_list:
-            er = data_to_object(event_ref)
-            event = self.db.get_event_from_handle(er.ref)
-            etype = event.get_type()
-            date_str = get_date(event)
-            if (
-                etype.is_death_fallback()
-                and er.get_role() == EventRoleType.PRIMARY
-                and date_str
-            ):
-                if sort_mode:
-                    retval = "%09d" % event.get_date_object().get_sort_key()
-                else:
-                    retval = "<i>%s</i>" % escape(date_str)
-                if not get_date_valid(event):
-                    return invalid_date_format % retval
-                else:
-                    return retval
-        return ""
+                value = self.db.get_person_summary(handle)
+            except HandleError:
+                value = (EMPTY_SUMMARY, EMPTY_SUMMARY)
+            self.set_cached_value(handle, "SUMMARY", value)
+        return value
+
+    def _get_date_data(self, data, index, sort_mode):
+        summary = self._get_summary(data)[index]
+        if sort_mode:
+            return self._get_date_sort_value(summary)
+        if summary.event is None:
+            return ""
+        try:
+            event = self.db.get_event_from_handle(summary.event)
+        except HandleError:
+            return ""
+        date_str = get_date(event)
+        if date_str == "":
+            return ""
+        if summary.fallback:
+            retval = "<i>%s</i>" % escape(date_str)
+        else:
+            retval = escape(date_str)
+        if not summary.valid:
+            return invalid_date_format % retval
+        else:
+            return retval
+
+    def _get_date_sort_value(self, summary):
+        """
+        Return the sort value of the date of an event summary.
+        """
+        if summary.event is None:
+            return ""
+        retval = "%09d" % summary.sort_key
+        if not summary.valid:
+            return invalid_date_format % retval
+        else:
+            return retval
 
     def column_birth_place(self, data):
         handle = data.handle
         cached, value = self.get_cached_value(handle, "BIRTH_PLACE")
-        if cached:
-            return value
-        else:
-            index = data.birth_ref_index
-            if index != -1:
-                try:
-                    local = data.event_ref_list[index]
-                    br = data_to_object(local)
-                    event = self.db.get_event_from_handle(br.ref)
-                    if event:
-                        place_title = place_displayer.display_event(self.db, event)
-                        if place_title:
-                            value = escape(place_title)
-                            self.set_cached_value(handle, "BIRTH_PLACE", value)
-                            return value
-                except:
-                    value = ""
-                    self.set_cached_value(handle, "BIRTH_PLACE", value)
-                    return value
-
-            for event_ref in data.event_ref_list:
-                er = data_to_object(event_ref)
-                event = self.db.get_event_from_handle(er.ref)
-                etype = event.get_type()
-                if etype.is_birth_fallback() and er.get_role() == EventRoleType.PRIMARY:
-                    place_title = place_displayer.display_event(self.db, event)
-                    if place_title:
-                        value = "<i>%s</i>" % escape(place_title)
-                        self.set_cached_value(handle, "BIRTH_PLACE", value)
-                        return value
-            value = ""
+        if not cached:
+            value = self._get_place_data(data, 0)
             self.set_cached_value(handle, "BIRTH_PLACE", value)
-            return value
+        return value
 
     def column_death_place(self, data):
         handle = data.handle
         cached, value = self.get_cached_value(handle, "DEATH_PLACE")
-        if cached:
-            return value
-        else:
-            index = data.death_ref_index
-            if index != -1:
-                try:
-                    local = data.event_ref_list[index]
-                    dr = data_to_object(local)
-                    event = self.db.get_event_from_handle(dr.ref)
-                    if event:
-                        place_title = place_displayer.display_event(self.db, event)
-                        if place_title:
-                            value = escape(place_title)
-                            self.set_cached_value(handle, "DEATH_PLACE", value)
-                            return value
-                except:
-                    value = ""
-                    self.set_cached_value(handle, "DEATH_PLACE", value)
-                    return value
-
-            for event_ref in data.event_ref_list:
-                er = data_to_object(event_ref)
-                event = self.db.get_event_from_handle(er.ref)
-                etype = event.get_type()
-                if etype.is_death_fallback() and er.get_role() == EventRoleType.PRIMARY:
-                    place_title = place_displayer.display_event(self.db, event)
-                    if place_title:
-                        value = "<i>%s</i>" % escape(place_title)
-                        self.set_cached_value(handle, "DEATH_PLACE", value)
-                        return value
-            value = ""
+        if not cached:
+            value = self._get_place_data(data, 1)
             self.set_cached_value(handle, "DEATH_PLACE", value)
-            return value
+        return value
+
+    def _get_place_data(self, data, index):
+        summary = self._get_summary(data)[index]
+        if summary.place_event is None:
+            return ""
+        try:
+            event = self.db.get_event_from_handle(summary.place_event)
+            place_title = place_displayer.display_event(self.db, event)
+        except HandleError:
+            return ""
+        if not place_title:
+            return ""
+        if summary.place_fallback:
+            return "<i>%s</i>" % escape(place_title)
+        return escape(place_title)
 
     def _get_parents_data(self, data):
         parents = 0
@@ -559,6 +489,14 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
     Listed people model.
     """
 
+    sort_columns = {
+        1: ("Person", "gramps_id"),
+        2: ("Person", "gender"),
+        3: ("Person", "birth"),
+        5: ("Person", "death"),
+        14: ("Person", "change"),
+    }
+
     def __init__(
         self,
         db,
@@ -581,6 +519,15 @@ class PersonListModel(PeopleBaseModel, FlatBaseModel):
             sort_map=sort_map,
         )
 
+    def sort_index_key(self, column, value):
+        """
+        The database sorts people on the birth and death dates from the
+        summary of the event.
+        """
+        if column in SUMMARY_KINDS:
+            return glocale.sort_key(self._get_date_sort_value(value))
+        return FlatBaseModel.sort_index_key(self, column, value)
+
     def destroy(self):
         """
         Unset all elements that can prevent garbage collection
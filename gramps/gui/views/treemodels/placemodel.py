@@ -271,6 +271,12 @@ class PlaceListModel(PlaceBaseModel, FlatBaseModel):
     Flat place model.  (Original code in PlaceBaseModel).
     """
 
+    sort_columns = {
+        1: ("Place", "gramps_id"),
+        4: ("Place", "code"),
+        9: ("Place", "change"),
+    }
+
     def __init__(
         self,
         db,
@@ -52,6 +52,12 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 class RepositoryModel(FlatBaseModel):
+    sort_columns = {
+        0: ("Repository", "name"),
+        1: ("Repository", "gramps_id"),
+        14: ("Repository", "change"),
+    }
+
     def __init__(
         self,
         db,
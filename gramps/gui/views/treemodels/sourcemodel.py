@@ -50,6 +50,16 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 #
 # -------------------------------------------------------------------------
 class SourceModel(FlatBaseModel):
+    indexed_columns = {0: "Source"}
+    sort_columns = {
+        0: ("Source", "title"),
+        1: ("Source", "gramps_id"),
+        2: ("Source", "author"),
+        3: ("Source", "abbrev"),
+        4: ("Source", "pubinfo"),
+        7: ("Source", "change"),
+    }
+
     def __init__(
         self,
         db,
@@ -291,6 +291,11 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                       secondary object type.
     """
 
+    # Columns showing a field of the text indexed by the database, mapped to
+    # the class name of the objects
+    indexed_columns = {}
+    indexed_columns2 = {}
+
     def __init__(
         self,
         db,
@@ -469,16 +474,20 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     # we have search[1] = (index, text_unicode, inversion)
                     col, text, inv = search[1]
                     func = lambda x: self._get_value(x, col, secondary=False) or ""
+                    obj_type = self.indexed_columns.get(col)
                     if self.has_secondary:
                         func2 = lambda x: self._get_value(x, col, secondary=True) or ""
+                        obj_type2 = self.indexed_columns2.get(col)
                     if search[2]:
-                        self.search = ExactSearchFilter(func, text, inv)
+                        self.search = ExactSearchFilter(func, text, inv, obj_type)
                         if self.has_secondary:
-                            self.search2 = ExactSearchFilter(func2, text, inv)
+                            self.search2 = ExactSearchFilter(
+                                func2, text, inv, obj_type2
+                            )
                     else:
-                        self.search = SearchFilter(func, text, inv)
+                        self.search = SearchFilter(func, text, inv, obj_type)
                         if self.has_secondary:
-                            self.search2 = SearchFilter(func2, text, inv)
+                            self.search2 = SearchFilter(func2, text, inv, obj_type2)
                 else:
                     self.search = None
                     if self.has_secondary:
@@ -562,12 +571,15 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         )
         status = progressdlg.LongOpStatus(total_steps=items, interval=items // 20)
         pmon.add_op(status)
+        candidates = dfilter.candidates(self.db) if dfilter else None
         with gen_cursor() as cursor:
             for handle, data in cursor:
                 status.heartbeat()
                 self.__total += 1
                 if not (
-                    handle in skip or (dfilter and not dfilter.match(handle, self.db))
+                    handle in skip
+                    or (candidates is not None and handle not in candidates)
+                    or (dfilter and not dfilter.match(handle, self.db))
                 ):
                     _LOG.debug("    add %s %s" % (handle, data))
                     self.__displayed += 1
@@ -16,6 +16,13 @@
 # with this program; if not, see <https://www.gnu.org/licenses/>.
 #
 
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+from functools import partial
+
 # -------------------------------------------------------------------------
 #
 # GTK/Gnome modules
@@ -29,7 +36,11 @@ from gi.repository import Gtk
 # Gramps modules
 #
 # -------------------------------------------------------------------------
-from gramps.gen.utils.thumbnails import get_thumbnail_image, SIZE_NORMAL, SIZE_LARGE
+from gramps.gen.utils.thumbnails import (
+    request_thumbnail_image,
+    SIZE_NORMAL,
+    SIZE_LARGE,
+)
 from ..utils import is_right_click, open_file_with_default_application
 from ..widgets.menuitem import add_menuitem
 from gramps.gen.const import GRAMPS_LOCALE as glocale
@@ -63,19 +74,35 @@ class Photo(Gtk.EventBox):
         self.__size = SIZE_LARGE
         if use_small_size:
             self.__size = SIZE_NORMAL
+        self.__request = None
 
     def set_image(self, full_path, mime_type=None, rectangle=None):
         """
         Set the image to be displayed.
         """
         self.full_path = full_path
+        self.__request = (full_path, rectangle)
         if full_path:
-            pixbuf = get_thumbnail_image(full_path, mime_type, rectangle, self.__size)
+            # A placeholder is shown until the thumbnail is made
+            pixbuf = request_thumbnail_image(
+                full_path,
+                partial(self.__thumbnail_made, self.__request),
+                mime_type,
+                rectangle,
+                self.__size,
+            )
             self.photo.set_from_pixbuf(pixbuf)
             self.photo.show()
         else:
             self.photo.hide()
 
+    def __thumbnail_made(self, request, pixbuf):
+        """
+        Show the thumbnail, unless another image was set meanwhile.
+        """
+        if request is self.__request:
+            self.photo.set_from_pixbuf(pixbuf)
+
     def handle_button_press(self, widget, event):
         """
         Display the image with the default external viewer.
@@ -0,0 +1,189 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Buffered writer used by the DB-API backend for batch commits.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import logging
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db.dbconst import BATCHSIZE, KEY_TO_NAME_MAP
+
+LOG = logging.getLogger(".dbapi")
+
+
+# -------------------------------------------------------------------------
+#
+# BatchWriter class
+#
+# -------------------------------------------------------------------------
+class BatchWriter:
+    """
+    Collect primary object rows and reference map rows in memory, and write
+    them to the database with one ``executemany`` statement per table.
+
+    Objects that have been added but not yet flushed can still be looked up
+    by handle and Gramps ID, so that callers see a consistent view of the
+    database.  Any other query must be preceded by a call to :meth:`flush`.
+    """
+
+    def __init__(self, db, size=BATCHSIZE):
+        self.db = db
+        self.size = size
+        # {table: [column, ...]}
+        self.columns = {}
+        # {table: {handle: (gramps_id, [value, ...])}}
+        self.rows = {}
+        # {table: {gramps_id: handle}}
+        self.gramps_ids = {}
+        # {obj_handle: (obj_class, {(ref_class, ref_handle), ...})}
+        self.references = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add_object(self, obj_key, obj, data, references):
+        """
+        Add a serialized primary object and its current references.
+
+        :param obj_key: The key of the primary object table.
+        :type obj_key: int
+        :param obj: The primary object.
+        :type obj: :py:class:`.TableObject`
+        :param data: The serialized object.
+        :type data: str or bytes
+        :param references: The (class name, handle) pairs referenced by the
+                           object, or None to leave the reference map alone.
+        :type references: set
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        fields, values = self.db._get_secondary_values(obj)
+        if table not in self.columns:
+            self.columns[table] = fields
+            self.rows[table] = {}
+            self.gramps_ids[table] = {}
+
+        rows = self.rows[table]
+        gramps_id = getattr(obj, "gramps_id", None)
+        if obj.handle in rows:
+            old_gramps_id = rows[obj.handle][0]
+            if self.gramps_ids[table].get(old_gramps_id) == obj.handle:
+                del self.gramps_ids[table][old_gramps_id]
+        else:
+            self.count += 1
+        rows[obj.handle] = (gramps_id, [obj.handle, data] + values)
+        if gramps_id:
+            self.gramps_ids[table][gramps_id] = obj.handle
+        if references is not None:
+            self.references[obj.handle] = (obj.__class__.__name__, references)
+
+        if self.count >= self.size:
+            self.flush()
+
+    def has_handle(self, obj_key, handle):
+        """
+        Return True if the handle is waiting to be written.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        return handle in self.rows.get(table, ())
+
+    def get_data(self, obj_key, handle):
+        """
+        Return the serialized data of an object waiting to be written, or
+        None if there is no such object.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        row = self.rows.get(table, {}).get(handle)
+        if row is None:
+            return None
+        return row[1][1]
+
+    def get_handle_from_gramps_id(self, obj_key, gramps_id):
+        """
+        Return the handle of an object waiting to be written with the given
+        Gramps ID, or None if there is no such object.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        return self.gramps_ids.get(table, {}).get(gramps_id)
+
+    def get_references(self, handle):
+        """
+        Return the references of an object waiting to be written, or None if
+        the object is not in the buffer.
+        """
+        if handle in self.references:
+            return self.references[handle][1]
+        return None
+
+    def flush(self):
+        """
+        Write all buffered rows to the database.
+        """
+        if not self.count:
+            return
+        LOG.debug("Flushing %d buffered objects", self.count)
+        data_field = self.db.serializer.data_field
+        for table, rows in self.rows.items():
+            if not rows:
+                continue
+            columns = ["handle", data_field] + self.columns[table]
+            updates = ", ".join(f"{col} = excluded.{col}" for col in columns[1:])
+            self.db._executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT (handle) DO UPDATE SET {updates}",
+                [values for (_gramps_id, values) in rows.values()],
+            )
+
+        self.db._executemany(
+            "DELETE FROM reference WHERE obj_handle = ?",
+            [(handle,) for handle in self.references],
+        )
+        self.db._executemany(
+            "INSERT INTO reference "
+            "(obj_handle, obj_class, ref_handle, ref_class) "
+            "VALUES (?, ?, ?, ?)",
+            [
+                (obj_handle, obj_class, ref_handle, ref_class)
+                for obj_handle, (obj_class, refs) in self.references.items()
+                for (ref_class, ref_handle) in refs
+            ],
+        )
+        self.clear()
+
+    def clear(self):
+        """
+        Discard all buffered rows.
+        """
+        for table in self.rows:
+            self.rows[table] = {}
+            self.gramps_ids[table] = {}
+        self.references = {}
+        self.count = 0
@@ -31,6 +31,8 @@ Database API interface
 import logging
 import time
 import copy
+from collections import defaultdict
+from functools import lru_cache
 
 # ------------------------------------------------------------------------
 #
@@ -38,7 +40,9 @@ import copy
 #
 # ------------------------------------------------------------------------
 from gramps.gen.db.dbconst import (
+    BATCHSIZE,
     DBLOGNAME,
+    EVENT_KEY,
     KEY_TO_CLASS_MAP,
     KEY_TO_NAME_MAP,
     PERSON_KEY,
@@ -48,6 +52,7 @@ from gramps.gen.db.dbconst import (
     TXNUPD,
 )
 from gramps.gen.db.generic import DbGeneric
+from gramps.gen.db.summary import SUMMARY_KINDS, EventSummary, get_event_summary
 from gramps.gen.lib import (
     Citation,
     Event,
@@ -67,12 +72,117 @@ from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.db import DbTxn
 from gramps.gen.errors import HandleError
+from gramps.plugins.db.dbapi.batchwriter import BatchWriter
+from gramps.plugins.db.dbapi.sortindex import SortIndex, SummarySortIndex
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
 _ = glocale.translation.gettext
 
+# (name, table, column) of the indices on the primary and secondary tables
+INDEXES = (
+    ("person_gramps_id", "person", "gramps_id"),
+    ("person_surname", "person", "surname"),
+    ("person_given_name", "person", "given_name"),
+    ("source_title", "source", "title"),
+    ("source_gramps_id", "source", "gramps_id"),
+    ("citation_page", "citation", "page"),
+    ("citation_gramps_id", "citation", "gramps_id"),
+    ("media_desc", "media", "desc"),
+    ("media_gramps_id", "media", "gramps_id"),
+    ("place_title", "place", "title"),
+    ("place_enclosed_by", "place", "enclosed_by"),
+    ("place_gramps_id", "place", "gramps_id"),
+    ("tag_name", "tag", "name"),
+    ("reference_ref_handle", "reference", "ref_handle"),
+    ("family_gramps_id", "family", "gramps_id"),
+    ("event_gramps_id", "event", "gramps_id"),
+    ("repository_gramps_id", "repository", "gramps_id"),
+    ("note_gramps_id", "note", "gramps_id"),
+    ("reference_obj_handle", "reference", "obj_handle"),
+)
+
+# Indices that are dropped during a bulk load into an empty tree and rebuilt
+# when it is committed.  The Gramps ID and tag name indices are kept, because
+# importers look objects up by them while loading, and the index of the
+# objects in the reference map is kept to update their references.
+BULK_LOAD_INDEXES = (
+    "person_surname",
+    "person_given_name",
+    "source_title",
+    "citation_page",
+    "media_desc",
+    "place_title",
+    "place_enclosed_by",
+    "reference_ref_handle",
+)
+
+# Classes of the primary objects, keyed by class name
+PRIMARY_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        Person,
+        Family,
+        Event,
+        Place,
+        Repository,
+        Source,
+        Citation,
+        Media,
+        Note,
+        Tag,
+    )
+}
+
+# SQL types of the fields of an EventSummary.  The summary of the birth and
+# death of each person is stored in the person table, in the columns named
+# "<kind>_<field>".
+SUMMARY_TYPES = {
+    "event": "VARCHAR(50)",
+    "fallback": "INTEGER",
+    "sort_key": "INTEGER",
+    "valid": "INTEGER",
+    "place_event": "VARCHAR(50)",
+    "place_fallback": "INTEGER",
+    "place": "VARCHAR(50)",
+}
+SUMMARY_COLUMNS = tuple(
+    f"{kind}_{field}" for kind in SUMMARY_KINDS for field in EventSummary._fields
+)
+
+# Number of handles looked up by one query of the reference map, within the
+# limit on the number of SQL variables of older SQLite versions
+REFERENCE_CHUNK = 500
+
+
+@lru_cache(maxsize=None)
+def _secondary_columns(obj_class):
+    """
+    Return the names of the secondary columns of a primary object class.
+    The schema they come from is rebuilt on each call, so they are cached.
+    """
+    return tuple(
+        field[0] for field in obj_class.get_secondary_fields() if field[0] != "handle"
+    )
+
+
+def _event_summary(row):
+    """
+    Return the :class:`.EventSummary` stored in the summary columns of a
+    row of the person table.
+    """
+    event, fallback, sort_key, valid, place_event, place_fallback, place = row
+    return EventSummary(
+        event,
+        bool(fallback),
+        sort_key,
+        valid != 0,
+        place_event,
+        bool(place_fallback),
+        place,
+    )
+
 
 def _familysearch_status_from_raw_person_data(person_data):
     """
@@ -105,6 +215,15 @@ class DBAPI(DbGeneric):
     Database backends class for DB-API 2.0 databases
     """
 
+    def __init__(self, directory=None):
+        self._batch_writer = None
+        self._bulk_handles = {}
+        self._bulk_indexes = False
+        self._person_summary = None
+        self._summary_people = set()
+        self._summary_events = set()
+        super().__init__(directory)
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
@@ -253,32 +372,43 @@ class DBAPI(DbGeneric):
             "unknown INTEGER"
             ")"
         )
+        self._create_change_log()
 
         self._create_secondary_columns()
+        self._create_person_summary()
 
         ## Indices:
-        self.dbapi.execute("CREATE INDEX person_gramps_id ON person(gramps_id)")
-        self.dbapi.execute("CREATE INDEX person_surname ON person(surname)")
-        self.dbapi.execute("CREATE INDEX person_given_name ON person(given_name)")
-        self.dbapi.execute("CREATE INDEX source_title ON source(title)")
-        self.dbapi.execute("CREATE INDEX source_gramps_id ON source(gramps_id)")
-        self.dbapi.execute("CREATE INDEX citation_page ON citation(page)")
-        self.dbapi.execute("CREATE INDEX citation_gramps_id ON citation(gramps_id)")
-        self.dbapi.execute("CREATE INDEX media_desc ON media(desc)")
-        self.dbapi.execute("CREATE INDEX media_gramps_id ON media(gramps_id)")
-        self.dbapi.execute("CREATE INDEX place_title ON place(title)")
-        self.dbapi.execute("CREATE INDEX place_enclosed_by ON place(enclosed_by)")
-        self.dbapi.execute("CREATE INDEX place_gramps_id ON place(gramps_id)")
-        self.dbapi.execute("CREATE INDEX tag_name ON tag(name)")
-        self.dbapi.execute("CREATE INDEX reference_ref_handle ON reference(ref_handle)")
-        self.dbapi.execute("CREATE INDEX family_gramps_id ON family(gramps_id)")
-        self.dbapi.execute("CREATE INDEX event_gramps_id ON event(gramps_id)")
-        self.dbapi.execute("CREATE INDEX repository_gramps_id ON repository(gramps_id)")
-        self.dbapi.execute("CREATE INDEX note_gramps_id ON note(gramps_id)")
-        self.dbapi.execute("CREATE INDEX reference_obj_handle ON reference(obj_handle)")
+        for index in INDEXES:
+            self._create_index(*index)
 
         self.dbapi.commit()
 
+    def _create_change_log(self):
+        """
+        Create the table of changes that are logged for incremental backups.
+        """
+        self.dbapi.execute(
+            "CREATE TABLE IF NOT EXISTS change_log "
+            "("
+            "obj_class TEXT, "
+            "handle VARCHAR(50), "
+            "change INTEGER, "
+            "PRIMARY KEY (obj_class, handle)"
+            ")"
+        )
+
+    def _create_index(self, name, table, column):
+        """
+        Create an index on a single column.
+        """
+        self.dbapi.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({column})")
+
+    def _drop_index(self, name):
+        """
+        Drop an index if it exists.
+        """
+        self.dbapi.execute(f"DROP INDEX IF EXISTS {name}")
+
     def _drop_column(self, table_name, column_name):
         """
         Used to remove a column of data which we don't need anymore.
@@ -289,6 +419,7 @@ class DBAPI(DbGeneric):
 
     def _close(self):
         self.dbapi.close()
+        self._person_summary = None
 
     def _txn_begin(self):
         """
@@ -306,6 +437,7 @@ class DBAPI(DbGeneric):
         """
         if self.transaction is None:
             _LOG.debug("    DBAPI %s transaction commit", hex(id(self)))
+            self._update_person_summary()
             self.dbapi.commit()
 
     def _txn_abort(self):
@@ -314,6 +446,7 @@ class DBAPI(DbGeneric):
         Executes a db ROLLBACK;
         """
         if self.transaction is None:
+            self._clear_person_summary()
             self.dbapi.rollback()
 
     def _collation(self, locale):
@@ -340,8 +473,16 @@ class DBAPI(DbGeneric):
             # A batch transaction does not store the commits
             # Aborting the session completely will become impossible.
             self.abort_possible = False
+            self._batch_writer = BatchWriter(self)
         self.transaction = transaction
         self.dbapi.begin()
+        if transaction.bulk:
+            # Rebuilding the indices only pays off when loading into an
+            # empty family tree
+            self._bulk_indexes = self._is_empty_tree()
+            if self._bulk_indexes:
+                for name in BULK_LOAD_INDEXES:
+                    self._drop_index(name)
         return transaction
 
     def transaction_commit(self, transaction):
@@ -356,6 +497,12 @@ class DBAPI(DbGeneric):
         )
 
         action = {TXNADD: "-add", TXNUPD: "-update", TXNDEL: "-delete", None: "-delete"}
+        self._flush_batch()
+        self._batch_writer = None
+        if transaction.bulk:
+            self._finish_bulk_load()
+        self._update_person_summary()
+        self._forget_saved_statistics()
         self.dbapi.commit()
         if not transaction.batch:
             # Now, emit signals:
@@ -395,13 +542,117 @@ class DBAPI(DbGeneric):
         """
         Executed after a batch operation abort.
         """
+        self._batch_writer = None
+        self._bulk_handles = {}
+        self._bulk_indexes = False
+        self._clear_person_summary()
         self.dbapi.rollback()
+        # Objects read during the transaction may have been rolled back
+        self._object_cache.clear()
         self.transaction = None
+        self.undodb.abort(transaction)
         transaction.clear()
         transaction.first = None
         transaction.last = None
         self._after_commit(transaction)
 
+    def _finish_bulk_load(self):
+        """
+        Write the references of the objects committed during a bulk load,
+        and rebuild the indices that were dropped at its start.
+        """
+        _LOG.debug("    DBAPI %s finishing bulk load", hex(id(self)))
+        self._write_bulk_references()
+        if self._bulk_indexes:
+            for index in INDEXES:
+                if index[0] in BULK_LOAD_INDEXES:
+                    self._create_index(*index)
+            self._bulk_indexes = False
+
+    def _write_bulk_references(self):
+        """
+        Bring the reference map up to date with the objects committed during
+        a bulk load.  It is called at the end of the load, and before the
+        reference map is read during it.
+        """
+        if not self._bulk_handles:
+            return
+        bulk_handles, self._bulk_handles = self._bulk_handles, {}
+        self._flush_batch()
+        for obj_key, handles in bulk_handles.items():
+            obj_class = KEY_TO_CLASS_MAP[obj_key]
+            self._executemany(
+                "DELETE FROM reference WHERE obj_handle = ?",
+                [(handle,) for handle in handles],
+            )
+            rows = []
+            for handle in handles:
+                data = self._get_raw_data(obj_key, handle)
+                if data is None:
+                    continue
+                obj = self.serializer.data_to_object(data, PRIMARY_CLASSES[obj_class])
+                rows.extend(
+                    (handle, obj_class, ref_handle, ref_class_name)
+                    for ref_class_name, ref_handle in set(
+                        obj.get_referenced_handles_recursively()
+                    )
+                )
+                if len(rows) >= BATCHSIZE:
+                    self._insert_references(rows)
+                    rows = []
+            self._insert_references(rows)
+
+    def _is_empty_tree(self):
+        """
+        Return True if none of the primary tables has any rows.
+        """
+        for table in KEY_TO_NAME_MAP.values():
+            self.dbapi.execute(f"SELECT 1 FROM {table} LIMIT 1")
+            if self.dbapi.fetchone() is not None:
+                return False
+        return True
+
+    def _executemany(self, query, rows):
+        """
+        Execute a statement for each sequence of values in rows.  The
+        connections of other backends may not have an executemany method,
+        in which case the statement is executed once per row.
+        """
+        executemany = getattr(self.dbapi, "executemany", None)
+        if executemany is not None:
+            executemany(query, rows)
+        else:
+            for values in rows:
+                self.dbapi.execute(query, values)
+
+    def _flush_batch(self):
+        """
+        Write any objects buffered by a batch commit to the database.
+
+        Must be called before running a query that is not answered by the
+        batch writer itself.
+        """
+        if self._batch_writer is not None:
+            self._batch_writer.flush()
+
+    def commit_many(self, objects, transaction, change_time=None):
+        """
+        Commit a sequence of primary objects to the database, storing the
+        changes as part of the transaction.
+
+        Rows are buffered and written with one statement per table, even if
+        the transaction is not a batch transaction.
+        """
+        if self._batch_writer is not None:
+            super().commit_many(objects, transaction, change_time)
+            return
+        self._batch_writer = BatchWriter(self)
+        try:
+            super().commit_many(objects, transaction, change_time)
+            self._flush_batch()
+        finally:
+            self._batch_writer = None
+
     def _get_metadata_keys(self):
         """
         Get all of the metadata setting names from the
@@ -452,6 +703,189 @@ class DBAPI(DbGeneric):
         if use_txn:
             self._txn_commit()
 
+    def set_backup_watermark(self, watermark):
+        """
+        Record the time of a backup of the database, and forget the logged
+        changes that it includes.
+        """
+        self._txn_begin()
+        self._create_change_log()
+        self.dbapi.execute("DELETE FROM change_log WHERE change < ?", [watermark])
+        self._set_metadata("backup_watermark", watermark, use_txn=False)
+        self._txn_commit()
+        self._backup_watermark = watermark
+
+    def get_logged_changes(self, since):
+        """
+        Return the (class name, handle) pairs of the objects that have been
+        deleted, or changed without updating their change time, since a
+        given time.
+        """
+        if self._backup_watermark is None:
+            return []
+        self._flush_batch()
+        self.dbapi.execute(
+            "SELECT obj_class, handle FROM change_log WHERE change >= ?", [since]
+        )
+        return [(row[0], row[1]) for row in self.dbapi.fetchall()]
+
+    def _log_change(self, obj_key, handle):
+        """
+        Log a change that an incremental backup can't find from the change
+        time of the object.
+        """
+        if self._backup_watermark is None:
+            return
+        self.dbapi.execute(
+            "INSERT INTO change_log (obj_class, handle, change) VALUES (?, ?, ?) "
+            "ON CONFLICT (obj_class, handle) DO UPDATE SET change = excluded.change",
+            [KEY_TO_CLASS_MAP[obj_key], handle, int(time.time())],
+        )
+
+    def _has_indexed_text(self, obj_key):
+        """
+        Return True if the backend has a text index holding objects of the
+        given type.
+        """
+        return False
+
+    def _update_text_index(self, obj_key, handle, obj):
+        """
+        Update the text index of the backend, if it has one, for an object
+        that has been written, or removed if obj is None.
+        """
+
+    def get_person_summary(self, handle):
+        """
+        Return the summaries of the birth and death of a person, as stored
+        in the person table.
+
+        The summaries of a family tree created by an older version of Gramps
+        are stored by the first call.
+        """
+        if not self._has_person_summary():
+            if self.readonly:
+                return super().get_person_summary(handle)
+            self._build_person_summary()
+        self._flush_person_summary()
+        columns = ", ".join(SUMMARY_COLUMNS)
+        self.dbapi.execute(f"SELECT {columns} FROM person WHERE handle = ?", [handle])
+        row = self.dbapi.fetchone()
+        if row is None:
+            raise HandleError(f"Handle {handle} not found")
+        size = len(EventSummary._fields)
+        return tuple(
+            _event_summary(row[start : start + size])
+            for start in range(0, len(row), size)
+        )
+
+    def _has_person_summary(self):
+        """
+        Return True if the person table has the summary columns.
+        """
+        if self._person_summary is None:
+            self._person_summary = self.dbapi.column_exists("person", "birth_event")
+        return self._person_summary
+
+    def _create_person_summary(self):
+        """
+        Add the summary columns to the person table.
+        """
+        for kind in SUMMARY_KINDS:
+            for field, sql_type in SUMMARY_TYPES.items():
+                self.dbapi.execute(
+                    f"ALTER TABLE person ADD COLUMN {kind}_{field} {sql_type}"
+                )
+        self._person_summary = True
+
+    def _build_person_summary(self):
+        """
+        Add the summary columns to the person table if needed, and store the
+        summary of every person.
+        """
+        self._flush_batch()
+        self._txn_begin()
+        if not self._has_person_summary():
+            self._create_person_summary()
+        people = [
+            self.serializer.data_to_object(data, Person)
+            for handle, data in self._iter_raw_data(PERSON_KEY)
+        ]
+        self._write_person_summary(people)
+        self._summary_people.clear()
+        self._summary_events.clear()
+        self._txn_commit()
+
+    def _write_person_summary(self, people):
+        """
+        Store the summary of the given people.
+        """
+        rows = []
+        for person in people:
+            values = []
+            for kind in SUMMARY_KINDS:
+                values.extend(get_event_summary(self, person, kind))
+            rows.append(self._sql_cast_list(values) + [person.handle])
+        sets = ", ".join(f"{column} = ?" for column in SUMMARY_COLUMNS)
+        self._executemany(f"UPDATE person SET {sets} WHERE handle = ?", rows)
+
+    def _mark_person_summary(self, obj_key, handle):
+        """
+        Note a person or event that has been written or removed, so that the
+        summaries that depend on it are updated at the end of the
+        transaction.
+        """
+        if obj_key == PERSON_KEY:
+            if self._has_person_summary():
+                self._summary_people.add(handle)
+        elif obj_key == EVENT_KEY:
+            if self._has_person_summary():
+                self._summary_events.add(handle)
+
+    def _update_person_summary(self):
+        """
+        Update the summaries of the people, and of the people referring to
+        the events, that have been changed.
+        """
+        if not (self._summary_people or self._summary_events):
+            return
+        handles, self._summary_people = self._summary_people, set()
+        events, self._summary_events = list(self._summary_events), set()
+        self._flush_batch()
+        for start in range(0, len(events), REFERENCE_CHUNK):
+            chunk = events[start : start + REFERENCE_CHUNK]
+            self.dbapi.execute(
+                "SELECT obj_handle FROM reference "
+                "WHERE obj_class = 'Person' AND ref_handle IN "
+                f"({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            handles.update(row[0] for row in self.dbapi.fetchall())
+        people = []
+        for handle in handles:
+            data = self._get_raw_data(PERSON_KEY, handle)
+            if data is not None:
+                people.append(self.serializer.data_to_object(data, Person))
+        self._write_person_summary(people)
+
+    def _flush_person_summary(self):
+        """
+        Update the summaries that are pending before reading them.
+
+        The reference map is incomplete until a bulk load is committed, so
+        the summaries are not updated during one.
+        """
+        self._flush_batch()
+        if self.transaction is None or not self.transaction.bulk:
+            self._update_person_summary()
+
+    def _clear_person_summary(self):
+        """
+        Forget the pending summaries of a transaction that is rolled back.
+        """
+        self._summary_people.clear()
+        self._summary_events.clear()
+
     def get_name_group_keys(self):
         """
         Return the defined names that have been assigned to a default grouping.
@@ -476,21 +910,74 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Person in
         the database.
 
-        :param sort_handles: If True, the list is sorted by surnames.
-        :type sort_handles: bool
+        :param sort_handles: If True, the list is sorted by surnames.  If
+            "birth" or "death", it is sorted by the date of birth or death,
+            then by surnames.
+        :type sort_handles: bool or str
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
-        if sort_handles:
+        if sort_handles in SUMMARY_KINDS:
+            if not self._has_person_summary():
+                if self.readonly:
+                    return self._sort_by_summary(sort_handles, locale)
+                self._build_person_summary()
+            self._flush_person_summary()
+            self.dbapi.execute(
+                "SELECT handle FROM person "
+                f"ORDER BY {sort_handles}_sort_key, surname "
+                f'COLLATE "{self._collation(locale)}"'
+            )
+        elif sort_handles:
+            self._flush_batch()
             self.dbapi.execute(
                 "SELECT handle FROM person "
                 "ORDER BY surname "
                 f'COLLATE "{self._collation(locale)}"'
             )
         else:
+            self._flush_batch()
             self.dbapi.execute("SELECT handle FROM person")
         return [row[0] for row in self.dbapi.fetchall()]
 
+    def get_sort_index(self, obj_class, column, sort_key):
+        """
+        Return a :class:`.SortIndex` of the objects of a primary table,
+        sorted on the sort keys of the values of a secondary column, or None
+        if the column is not a secondary column of the table.
+
+        People can also be sorted on the summary of their birth or death,
+        with the column "birth" or "death".  The sort key is then computed
+        from an :class:`.EventSummary`.
+        """
+        if obj_class == "Person" and column in SUMMARY_KINDS:
+            if not self._has_person_summary():
+                if self.readonly:
+                    return None
+                self._build_person_summary()
+            self._flush_person_summary()
+            columns = tuple(f"{column}_{field}" for field in EventSummary._fields)
+            return SummarySortIndex(
+                self, "person", columns, lambda row: sort_key(_event_summary(row))
+            )
+        cls = PRIMARY_CLASSES.get(obj_class)
+        if cls is None or column not in _secondary_columns(cls):
+            return None
+        return SortIndex(self, obj_class.lower(), column, sort_key)
+
+    def _sort_by_summary(self, kind, locale):
+        """
+        Return the person handles sorted by the date of birth or death, for
+        a read-only family tree that has no summary columns.
+        """
+        index = SUMMARY_KINDS.index(kind)
+        sort_keys = {}
+        for handle in self.get_person_handles(True, locale):
+            sort_key = super().get_person_summary(handle)[index].sort_key
+            # People without a date come first, as NULL values do in SQL
+            sort_keys[handle] = (sort_key is not None, sort_key or 0)
+        return sorted(sort_keys, key=sort_keys.get)
+
     def get_family_handles(self, sort_handles=False, locale=glocale):
         """
         Return a list of database handles, one handle for each Family in
@@ -501,6 +988,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT family.handle "
@@ -528,6 +1016,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Event in the
         database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM event")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -541,6 +1030,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM citation "
@@ -561,6 +1051,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM source "
@@ -581,6 +1072,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM place "
@@ -596,6 +1088,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Repository in
         the database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM repository")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -609,6 +1102,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM media "
@@ -624,6 +1118,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Note in the
         database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM note")
         return [row[0] for row in self.dbapi.fetchall()]
 
@@ -637,6 +1132,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             self.dbapi.execute(
                 "SELECT handle FROM tag "
@@ -653,6 +1149,7 @@ class DBAPI(DbGeneric):
 
         If no such Tag exists, None is returned.
         """
+        self._flush_batch()
         self.dbapi.execute(
             f"SELECT {self.serializer.data_field} FROM tag WHERE name = ?", [name]
         )
@@ -662,6 +1159,7 @@ class DBAPI(DbGeneric):
         return None
 
     def _get_number_of(self, obj_key):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT count(1) FROM {table}")
         row = self.dbapi.fetchone()
@@ -706,22 +1204,51 @@ class DBAPI(DbGeneric):
         old_data = None
         obj.change = int(change_time or time.time())
         table = KEY_TO_NAME_MAP[obj_key]
+        self._object_cache.invalidate(obj_key, obj.handle)
+        self._update_text_index(obj_key, obj.handle, obj)
+        self._mark_person_summary(obj_key, obj.handle)
+        if self._backup_watermark is not None and obj.change < self._backup_watermark:
+            self._log_change(obj_key, obj.handle)
 
-        if self._has_handle(obj_key, obj.handle):
+        if self._batch_writer is not None:
+            old_data = self._get_raw_data(obj_key, obj.handle)
+            if trans.bulk:
+                # The references are written when the reference map is read
+                # or the transaction is committed
+                self._bulk_handles.setdefault(obj_key, set()).add(obj.handle)
+                current_references = None
+            else:
+                current_references = set(obj.get_referenced_handles_recursively())
+            if not trans.batch:
+                self._add_backlinks_to_transaction(
+                    obj,
+                    self._get_references(obj.handle),
+                    current_references,
+                    trans,
+                )
+            self._batch_writer.add_object(
+                obj_key,
+                obj,
+                self.serializer.object_to_string(obj),
+                current_references,
+            )
+        elif self._has_handle(obj_key, obj.handle):
             old_data = self._get_raw_data(obj_key, obj.handle)
             # update the object:
             self.dbapi.execute(
                 f"UPDATE {table} SET {self.serializer.data_field} = ? WHERE handle = ?",
                 [self.serializer.object_to_string(obj), obj.handle],
             )
+            self._update_secondary_values(obj)
+            self._update_backlinks(obj, trans)
         else:
             # Insert the object:
             self.dbapi.execute(
                 f"INSERT INTO {table} (handle, {self.serializer.data_field}) VALUES (?, ?)",
                 [obj.handle, self.serializer.object_to_string(obj)],
             )
-        self._update_secondary_values(obj)
-        self._update_backlinks(obj, trans)
+            self._update_secondary_values(obj)
+            self._update_backlinks(obj, trans)
         if not trans.batch:
             if old_data:
                 trans.add(
@@ -747,8 +1274,14 @@ class DBAPI(DbGeneric):
         Commit a serialized primary object to the database, storing the
         changes as part of the transaction.
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         handle = self.serializer.get_from_data_by_name(data, "handle")
+        self._object_cache.invalidate(obj_key, handle)
+        if self._has_indexed_text(obj_key):
+            obj = self.serializer.data_to_object(data, KEY_TO_CLASS_MAP[obj_key])
+            self._update_text_index(obj_key, handle, obj)
+        self._mark_person_summary(obj_key, handle)
 
         if self._has_handle(obj_key, handle):
             # update the object:
@@ -762,6 +1295,7 @@ class DBAPI(DbGeneric):
                 f"INSERT INTO {table} (handle, {self.serializer.data_field}) VALUES (?, ?)",
                 [handle, self.serializer.data_to_string(data)],
             )
+        self._log_change(obj_key, handle)
 
     def _commit_familysearch_person_raw(self, handle, old_data, new_data, transaction):
         """
@@ -777,23 +1311,57 @@ class DBAPI(DbGeneric):
                 copy.deepcopy(new_data),
             )
 
+    def _get_references(self, obj_handle):
+        """
+        Return the set of (ref_class, ref_handle) pairs currently stored for
+        the given object.
+        """
+        if self._batch_writer is not None:
+            references = self._batch_writer.get_references(obj_handle)
+            if references is not None:
+                return references
+        self.dbapi.execute(
+            "SELECT ref_class, ref_handle FROM reference WHERE obj_handle = ?",
+            [obj_handle],
+        )
+        return set(self.dbapi.fetchall())
+
+    def _add_backlinks_to_transaction(
+        self, obj, existing_references, current_references, transaction
+    ):
+        """
+        Record the reference map changes of an object in the transaction.
+        """
+        # Once we have the list of rows that already have a reference
+        # we need to compare it with the list of objects that are
+        # still references from the primary object.
+        no_longer_required_references = existing_references.difference(
+            current_references
+        )
+        new_references = current_references.difference(existing_references)
+
+        # Add new references to the transaction
+        for ref_class_name, ref_handle in new_references:
+            key = (obj.handle, ref_handle)
+            data = (obj.handle, obj.__class__.__name__, ref_handle, ref_class_name)
+            transaction.add(REFERENCE_KEY, TXNADD, key, None, data)
+
+        # Add old references to the transaction
+        for ref_class_name, ref_handle in no_longer_required_references:
+            key = (obj.handle, ref_handle)
+            old_data = (
+                obj.handle,
+                obj.__class__.__name__,
+                ref_handle,
+                ref_class_name,
+            )
+            transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
+
     def _update_backlinks(self, obj, transaction):
         if not transaction.batch:
             # Find existing references
-            self.dbapi.execute(
-                "SELECT ref_class, ref_handle FROM reference WHERE obj_handle = ?",
-                [obj.handle],
-            )
-            existing_references = set(self.dbapi.fetchall())
-
-            # Once we have the list of rows that already have a reference
-            # we need to compare it with the list of objects that are
-            # still references from the primary object.
+            existing_references = self._get_references(obj.handle)
             current_references = set(obj.get_referenced_handles_recursively())
-            no_longer_required_references = existing_references.difference(
-                current_references
-            )
-            new_references = current_references.difference(existing_references)
 
             # Delete the existing references
             self.dbapi.execute(
@@ -809,22 +1377,9 @@ class DBAPI(DbGeneric):
                     [obj.handle, obj.__class__.__name__, ref_handle, ref_class_name],
                 )
 
-            # Add new references to the transaction
-            for ref_class_name, ref_handle in new_references:
-                key = (obj.handle, ref_handle)
-                data = (obj.handle, obj.__class__.__name__, ref_handle, ref_class_name)
-                transaction.add(REFERENCE_KEY, TXNADD, key, None, data)
-
-            # Add old references to the transaction
-            for ref_class_name, ref_handle in no_longer_required_references:
-                key = (obj.handle, ref_handle)
-                old_data = (
-                    obj.handle,
-                    obj.__class__.__name__,
-                    ref_handle,
-                    ref_class_name,
-                )
-                transaction.add(REFERENCE_KEY, TXNDEL, key, old_data, None)
+            self._add_backlinks_to_transaction(
+                obj, existing_references, current_references, transaction
+            )
         else:  # batch mode
             current_references = set(obj.get_referenced_handles_recursively())
 
@@ -845,12 +1400,17 @@ class DBAPI(DbGeneric):
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
             return
+        self._flush_batch()
         if self._has_handle(obj_key, handle):
             data = self._get_raw_data(obj_key, handle)
             obj_class = KEY_TO_CLASS_MAP[obj_key]
             self._remove_backlinks(obj_class, handle, transaction)
             table = KEY_TO_NAME_MAP[obj_key]
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            self._object_cache.invalidate(obj_key, handle)
+            self._update_text_index(obj_key, handle, None)
+            self._mark_person_summary(obj_key, handle)
+            self._log_change(obj_key, handle)
             if not transaction.batch:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
@@ -890,6 +1450,8 @@ class DBAPI(DbGeneric):
 
             result_list = list(find_backlink_handles(handle))
         """
+        self._write_bulk_references()
+        self._flush_batch()
         self.dbapi.execute(
             "SELECT obj_class, obj_handle FROM reference WHERE ref_handle = ?",
             [handle],
@@ -899,10 +1461,71 @@ class DBAPI(DbGeneric):
             if (include_classes is None) or (row[0] in include_classes):
                 yield (row[0], row[1])
 
+    def iter_reference_map(self):
+        """
+        Return an iterator over the (obj_class, obj_handle, ref_class,
+        ref_handle) tuples of the reference map.
+        """
+        self._write_bulk_references()
+        self._flush_batch()
+        with self.dbapi.cursor() as cursor:
+            cursor.execute(
+                "SELECT obj_class, obj_handle, ref_class, ref_handle FROM reference"
+            )
+            rows = cursor.fetchmany()
+            while rows:
+                for row in rows:
+                    yield tuple(row)
+                rows = cursor.fetchmany()
+
+    def find_missing_references(self, ref_class=None):
+        """
+        Return the (obj_class, obj_handle, ref_class, ref_handle) tuples of
+        the references to objects which are not in the database.
+
+        Each class of referenced objects is found by an anti-join of the
+        reference map with the table of the class.
+        """
+        self._write_bulk_references()
+        self._flush_batch()
+        missing = []
+        for class_name in PRIMARY_CLASSES:
+            if ref_class is not None and class_name != ref_class:
+                continue
+            table = class_name.lower()
+            self.dbapi.execute(
+                "SELECT reference.obj_class, reference.obj_handle, "
+                "reference.ref_class, reference.ref_handle FROM reference "
+                f"LEFT JOIN {table} ON {table}.handle = reference.ref_handle "
+                f"WHERE reference.ref_class = ? AND {table}.handle IS NULL",
+                [class_name],
+            )
+            missing.extend(tuple(row) for row in self.dbapi.fetchall())
+        return missing
+
+    def find_duplicated_gramps_ids(self, obj_class):
+        """
+        Return the lists of the handles of the objects of a primary table
+        which have the same Gramps ID, found by grouping the table on the
+        gramps_id column.
+        """
+        self._flush_batch()
+        table = obj_class.lower()
+        self.dbapi.execute(
+            f"SELECT gramps_id, handle FROM {table} WHERE gramps_id IN "
+            f"(SELECT gramps_id FROM {table} "
+            "GROUP BY gramps_id HAVING COUNT(*) > 1)"
+        )
+        duplicates = defaultdict(list)
+        for gramps_id, handle in self.dbapi.fetchall():
+            duplicates[gramps_id].append(handle)
+        return list(duplicates.values())
+
     def find_initial_person(self):
         """
         Returns first person in the database
         """
+        self._flush_batch()
         handle = self.get_default_handle()
         person = None
         if handle:
@@ -919,6 +1542,7 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over handles in the database
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT handle FROM {table}")
         rows = self.dbapi.fetchall()
@@ -929,6 +1553,7 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over raw data in the database.
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         with self.dbapi.cursor() as cursor:
             cursor.execute(f"SELECT handle, {self.serializer.data_field} FROM {table}")
@@ -942,6 +1567,7 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over raw data in the place hierarchy.
         """
+        self._flush_batch()
         to_do = [""]
         while to_do:
             handle = to_do.pop()
@@ -958,6 +1584,7 @@ class DBAPI(DbGeneric):
         """
         Reindex all primary records in the database.
         """
+        self._flush_batch()
         self._txn_begin()
         self.dbapi.execute("DELETE FROM reference")
         total = 0
@@ -990,6 +1617,7 @@ class DBAPI(DbGeneric):
         )
         # Now we use the functions and classes defined above
         # to loop through each of the primary object tables.
+        rows = []
         for cursor_func, class_func in primary_table:
             logging.info("Rebuilding %s reference map", class_func.__name__)
             with cursor_func() as cursor:
@@ -997,21 +1625,29 @@ class DBAPI(DbGeneric):
                     obj = self.serializer.data_to_object(val, class_func)
                     references = set(obj.get_referenced_handles_recursively())
                     # handle addition of new references
-                    for ref_class_name, ref_handle in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
-                            [
-                                obj.handle,
-                                obj.__class__.__name__,
-                                ref_handle,
-                                ref_class_name,
-                            ],
-                        )
+                    rows.extend(
+                        (obj.handle, class_func.__name__, ref_handle, ref_class_name)
+                        for ref_class_name, ref_handle in references
+                    )
+                    if len(rows) >= BATCHSIZE:
+                        self._insert_references(rows)
+                        rows = []
                     self.update()
+        self._insert_references(rows)
         self._txn_commit()
 
+    def _insert_references(self, rows):
+        """
+        Insert a list of (obj_handle, obj_class, ref_handle, ref_class) rows
+        into the reference map.
+        """
+        self._executemany(
+            "INSERT INTO reference "
+            "(obj_handle, obj_class, ref_handle, ref_class) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
     def rebuild_secondary(self, callback=None):
         """
         Rebuild secondary indices
@@ -1055,27 +1691,57 @@ class DBAPI(DbGeneric):
                 self._update_secondary_values(obj)
                 self.update()
         self._txn_commit()
+        self._build_person_summary()
 
         # Next, rebuild stats:
         gstats = self.get_gender_stats()
         self.genderStats = GenderStats(gstats)
 
     def _has_handle(self, obj_key, handle):
+        if self._batch_writer is not None and self._batch_writer.has_handle(
+            obj_key, handle
+        ):
+            return True
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT 1 FROM {table} WHERE handle = ?", [handle])
         return self.dbapi.fetchone() is not None
 
     def _has_gramps_id(self, obj_key, gramps_id):
+        if self._batch_writer is not None:
+            return self._get_handle_from_gramps_id(obj_key, gramps_id) is not None
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT 1 FROM {table} WHERE gramps_id = ?", [gramps_id])
         return self.dbapi.fetchone() is not None
 
+    def _get_handle_from_gramps_id(self, obj_key, gramps_id):
+        """
+        Return the handle of the object with the given Gramps ID, taking
+        objects buffered by a batch commit into account.
+        """
+        handle = self._batch_writer.get_handle_from_gramps_id(obj_key, gramps_id)
+        if handle is not None:
+            return handle
+        table = KEY_TO_NAME_MAP[obj_key]
+        self.dbapi.execute(
+            f"SELECT handle FROM {table} WHERE gramps_id = ?", [gramps_id]
+        )
+        for (handle,) in self.dbapi.fetchall():
+            # A buffered object may have been given a new Gramps ID
+            if not self._batch_writer.has_handle(obj_key, handle):
+                return handle
+        return None
+
     def _get_gramps_ids(self, obj_key):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(f"SELECT gramps_id FROM {table}")
         return [row[0] for row in self.dbapi.fetchall()]
 
     def _get_raw_data(self, obj_key, handle):
+        if self._batch_writer is not None:
+            data = self._batch_writer.get_data(obj_key, handle)
+            if data is not None:
+                return self.serializer.string_to_data(data)
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(
             f"SELECT {self.serializer.data_field} FROM {table} WHERE handle = ?",
@@ -1087,6 +1753,11 @@ class DBAPI(DbGeneric):
         return None
 
     def _get_raw_from_id_data(self, obj_key, gramps_id):
+        if self._batch_writer is not None:
+            handle = self._get_handle_from_gramps_id(obj_key, gramps_id)
+            if handle is None:
+                return None
+            return self._get_raw_data(obj_key, handle)
         table = KEY_TO_NAME_MAP[obj_key]
         self.dbapi.execute(
             f"SELECT {self.serializer.data_field} FROM {table} WHERE gramps_id = ?",
@@ -1144,8 +1815,10 @@ class DBAPI(DbGeneric):
         """
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
+        self._object_cache.invalidate(obj_key, handle)
         if data is None:
             self.dbapi.execute(f"DELETE FROM {table} WHERE handle = ?", [handle])
+            self._update_text_index(obj_key, handle, None)
         else:
             if self._has_handle(obj_key, handle):
                 self.dbapi.execute(
@@ -1159,11 +1832,15 @@ class DBAPI(DbGeneric):
                 )
             obj = self.serializer.data_to_object(data, cls)
             self._update_secondary_values(obj)
+            self._update_text_index(obj_key, handle, obj)
+        self._mark_person_summary(obj_key, handle)
+        self._log_change(obj_key, handle)
 
     def get_surname_list(self):
         """
         Return the list of locale-sorted surnames contained in the database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT DISTINCT surname FROM person ORDER BY surname")
         surname_list = []
         for row in self.dbapi.fetchall():
@@ -1190,18 +1867,7 @@ class DBAPI(DbGeneric):
         Create secondary columns.
         """
         LOG.debug("Creating secondary columns...")
-        for cls in (
-            Person,
-            Family,
-            Event,
-            Place,
-            Repository,
-            Source,
-            Citation,
-            Media,
-            Note,
-            Tag,
-        ):
+        for cls in PRIMARY_CLASSES.values():
             table_name = cls.__name__.lower()
             for field, schema_type, max_length in cls.get_secondary_fields():
                 if field != "handle":
@@ -1210,37 +1876,41 @@ class DBAPI(DbGeneric):
                         f"ALTER TABLE {table_name} ADD COLUMN {field} {sql_type}"
                     )
 
-    def _update_secondary_values(self, obj):
+    def _get_secondary_values(self, obj):
         """
-        Given a primary object update its secondary field values
-        in the database.
-        Does not commit.
+        Given a primary object return the names of its secondary columns,
+        including derived ones, and the values to store in them.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append(f"{field} = ?")
-            values.append(getattr(obj, field))
+        fields = list(_secondary_columns(obj.__class__))
+        values = [getattr(obj, field) for field in fields]
 
         # Derived fields
         if table == "Person":
             given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
+            fields += ["given_name", "surname"]
+            values += [given_name, surname]
         if table == "Place":
             handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
+            fields.append("enclosed_by")
             values.append(handle)
 
+        return fields, self._sql_cast_list(values)
+
+    def _update_secondary_values(self, obj):
+        """
+        Given a primary object update its secondary field values
+        in the database.
+        Does not commit.
+        """
+        fields, values = self._get_secondary_values(obj)
+        sets = [f"{field} = ?" for field in fields]
+
         if len(values) > 0:
-            table_name = table.lower()
+            table_name = obj.__class__.__name__.lower()
             self.dbapi.execute(
                 f'UPDATE {table_name} SET {", ".join(sets)} where handle = ?',
-                self._sql_cast_list(values) + [obj.handle],
+                values + [obj.handle],
             )
 
     def _sql_cast_list(self, values):
@@ -0,0 +1,228 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Sorted list of the handles of a table, used by the DB-API backend to page
+through large tables in the order of a view.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Python modules
+#
+# -------------------------------------------------------------------------
+import itertools
+import logging
+from contextlib import contextmanager
+
+LOG = logging.getLogger(".dbapi")
+
+
+# -------------------------------------------------------------------------
+#
+# SortIndex class
+#
+# -------------------------------------------------------------------------
+class SortIndex:
+    """
+    The handles of the objects of a primary table, sorted on a sort key
+    computed from one of its secondary columns, or from several columns.
+
+    The (sort key, handle) pairs are kept in a temporary table of the
+    connection, indexed on the pair, so that a view can read them a window
+    at a time.  The index is not updated by the database: the owner calls
+    :meth:`update` and :meth:`remove` for the objects that change, so that
+    the index follows the rows the owner has shown.
+
+    :param db: Database holding the table.
+    :type db: :class:`.DBAPI`
+    :param table: Name of the primary table, e.g. "event".
+    :type table: str
+    :param column: Name of the secondary column, or a tuple of the names
+                   of several columns.
+    :type column: str or tuple
+    :param sort_key: Function giving the sort key of a column value, or of
+                     a tuple of the values of several columns.
+    :type sort_key: callable
+    """
+
+    _names = itertools.count()
+
+    def __init__(self, db, table, column, sort_key):
+        self.db = db
+        self.table = table
+        self.column = column
+        self.sort_key = sort_key
+        if isinstance(column, tuple):
+            self.columns = ", ".join(column)
+        else:
+            self.columns = column
+        self.name = "sort_index_%d" % next(self._names)
+        self.count = 0
+        self._build()
+
+    def _build(self):
+        """
+        Create the temporary table and fill it with all of the objects.
+        """
+        self._flush()
+        self.db.dbapi.execute(f"SELECT handle, {self.columns} FROM {self.table}")
+        rows = [
+            (row[0], self.sort_key(self._value(row[1:])))
+            for row in self.db.dbapi.fetchall()
+        ]
+        with self._savepoint():
+            self.db.dbapi.execute(
+                f"CREATE TEMP TABLE {self.name} "
+                "(handle VARCHAR(50) PRIMARY KEY NOT NULL, sort_key)"
+            )
+            self.db._executemany(
+                f"INSERT INTO {self.name} (handle, sort_key) VALUES (?, ?)", rows
+            )
+            self.db.dbapi.execute(
+                f"CREATE INDEX {self.name}_key ON {self.name} (sort_key, handle)"
+            )
+        self.count = len(rows)
+        LOG.debug("Sort index %s on %s.%s", self.name, self.table, self.column)
+
+    def _flush(self):
+        """
+        Write the pending changes of the database before reading the table.
+        """
+        self.db._flush_batch()
+
+    def _value(self, values):
+        """
+        Return the value the sort key is computed from, given the values of
+        the columns of a row.
+        """
+        if isinstance(self.column, tuple):
+            return tuple(values)
+        return values[0]
+
+    @contextmanager
+    def _savepoint(self):
+        """
+        Run writes in a savepoint.  Unlike a transaction, it can be opened
+        whether or not the database is already in a transaction, e.g. from
+        the signal handlers run after a commit.
+        """
+        self.db.dbapi.execute("SAVEPOINT sort_index")
+        try:
+            yield
+        except Exception:
+            self.db.dbapi.execute("ROLLBACK TO sort_index")
+            self.db.dbapi.execute("RELEASE sort_index")
+            raise
+        self.db.dbapi.execute("RELEASE sort_index")
+
+    def __len__(self):
+        return self.count
+
+    def get_range(self, start, count):
+        """
+        Return a list of (sort key, handle) tuples in the sort order.
+
+        :param start: Position of the first tuple.
+        :type start: int
+        :param count: Maximum number of tuples.
+        :type count: int
+        """
+        self.db.dbapi.execute(
+            f"SELECT sort_key, handle FROM {self.name} "
+            "ORDER BY sort_key, handle LIMIT ? OFFSET ?",
+            [count, start],
+        )
+        return [tuple(row) for row in self.db.dbapi.fetchall()]
+
+    def get_sort_key(self, handle):
+        """
+        Return the sort key of an object, or None if it is not in the index.
+        """
+        self.db.dbapi.execute(
+            f"SELECT sort_key FROM {self.name} WHERE handle = ?", [handle]
+        )
+        row = self.db.dbapi.fetchone()
+        return None if row is None else row[0]
+
+    def get_position(self, handle):
+        """
+        Return the position of an object in the sort order, or None if it is
+        not in the index.
+        """
+        sort_key = self.get_sort_key(handle)
+        if sort_key is None:
+            return None
+        self.db.dbapi.execute(
+            f"SELECT COUNT(*) FROM {self.name} WHERE (sort_key, handle) < (?, ?)",
+            [sort_key, handle],
+        )
+        return self.db.dbapi.fetchone()[0]
+
+    def update(self, handle):
+        """
+        Add an object to the index, or update its sort key, from the current
+        value of the column.  An object that is no longer in the table is
+        removed.
+        """
+        self._flush()
+        self.db.dbapi.execute(
+            f"SELECT {self.columns} FROM {self.table} WHERE handle = ?", [handle]
+        )
+        row = self.db.dbapi.fetchone()
+        if row is None:
+            self.remove(handle)
+            return
+        known = self.get_sort_key(handle) is not None
+        with self._savepoint():
+            self.db.dbapi.execute(
+                f"INSERT OR REPLACE INTO {self.name} (handle, sort_key) "
+                "VALUES (?, ?)",
+                [handle, self.sort_key(self._value(row))],
+            )
+        if not known:
+            self.count += 1
+
+    def remove(self, handle):
+        """
+        Remove an object from the index.
+        """
+        if self.get_sort_key(handle) is None:
+            return
+        with self._savepoint():
+            self.db.dbapi.execute(f"DELETE FROM {self.name} WHERE handle = ?", [handle])
+        self.count -= 1
+
+    def close(self):
+        """
+        Drop the temporary table.
+        """
+        if self.db.is_open():
+            with self._savepoint():
+                self.db.dbapi.execute(f"DROP TABLE IF EXISTS {self.name}")
+
+
+class SummarySortIndex(SortIndex):
+    """
+    The handles of people, sorted on the summary of their birth or death
+    stored in the person table.
+    """
+
+    def _flush(self):
+        self.db._flush_person_summary()
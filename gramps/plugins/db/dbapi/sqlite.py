@@ -31,6 +31,7 @@ import logging
 import os
 import re
 import sqlite3
+from functools import lru_cache
 
 # -------------------------------------------------------------------------
 #
@@ -38,13 +39,72 @@ import sqlite3
 #
 # -------------------------------------------------------------------------
 from gramps.gen.const import GRAMPS_LOCALE as glocale
-from gramps.gen.db.dbconst import ARRAYSIZE
+from gramps.gen.db.dbconst import (
+    ARRAYSIZE,
+    CITATION_KEY,
+    KEY_TO_CLASS_MAP,
+    NOTE_KEY,
+    PERSON_KEY,
+    PLACE_KEY,
+    SOURCE_KEY,
+)
+from gramps.gen.lib import Citation, Person, Place, Source
 from gramps.plugins.db.dbapi.dbapi import DBAPI
 
 _ = glocale.translation.gettext
+LOG = logging.getLogger(".sqlite")
 
 sqlite3.paramstyle = "qmark"  # type: ignore[misc]
 
+# Primary objects with text in the text index
+TEXT_INDEX_KEYS = (PERSON_KEY, SOURCE_KEY, CITATION_KEY, PLACE_KEY, NOTE_KEY)
+TEXT_INDEX_TOKENIZER = "trigram case_sensitive 1"
+
+
+@lru_cache(maxsize=None)
+def _text_index_supported():
+    """
+    Return True if SQLite has FTS5 and its trigram tokenizer (SQLite 3.34).
+    """
+    try:
+        sqlite3.connect(":memory:").execute(
+            "CREATE VIRTUAL TABLE test "
+            f"USING fts5(text, tokenize='{TEXT_INDEX_TOKENIZER}')"
+        )
+    except sqlite3.OperationalError:
+        LOG.warning("SQLite does not support FTS5 trigram indices")
+        return False
+    return True
+
+
+def _indexed_text(obj):
+    """
+    Return the text of an object that is indexed, in upper case, with one
+    field per line.
+    """
+    if isinstance(obj, Person):
+        # The fields matched by the SearchName rule
+        fields = []
+        for name in [obj.primary_name] + obj.alternate_names:
+            fields += [
+                name.first_name,
+                name.get_surname(),
+                name.suffix,
+                name.title,
+                name.nick,
+                name.famnick,
+                name.call,
+            ]
+    elif isinstance(obj, Place):
+        fields = [obj.title] + [name.value for name in obj.get_all_names()]
+    elif isinstance(obj, Source):
+        fields = [obj.title]
+    elif isinstance(obj, Citation):
+        fields = [obj.page]
+    else:
+        fields = [str(obj.text)]
+    return "\n".join(fields).upper()
+
 
 # -------------------------------------------------------------------------
 #
@@ -54,8 +114,19 @@ sqlite3.paramstyle = "qmark"  # type: ignore[misc]
 class SQLite(DBAPI):
     """
     SQLite interface.
+
+    The text of notes, names, places, sources and citations is kept in an
+    FTS5 table with a trigram tokenizer, so that :meth:`search_text` finds
+    substrings without reading the objects.  The text is put in upper case
+    by Python, and the index is case sensitive, so a search matches the
+    same objects as comparing ``str.upper`` strings does.
     """
 
+    def __init__(self, directory=None):
+        self._text_index = None
+        self._text_rows = {}
+        super().__init__(directory)
+
     def get_summary(self):
         """
         Return a dictionary of information about this database backend.
@@ -75,6 +146,217 @@ class SQLite(DBAPI):
         else:
             path_to_db = os.path.join(directory, "sqlite.db")
         self.dbapi = Connection(path_to_db)
+        self._text_index = None
+
+    def _create_schema(self, json_data):
+        super()._create_schema(json_data)
+        self.dbapi.begin()
+        self._create_text_index()
+        if json_data:
+            self._create_change_indexes()
+        self.dbapi.commit()
+
+    def select_handles(self, obj_class, where, values):
+        """
+        Return the set of handles of the primary objects that satisfy an SQL
+        condition.  Conditions use the SQLite JSON functions, so they can
+        only be evaluated when objects are stored as JSON.
+        """
+        if self.serializer.data_field != "json_data":
+            return None
+        self._flush_batch()
+        table = obj_class.lower()
+        self.dbapi.execute(f"SELECT handle FROM {table} WHERE {where}", values)
+        return {row[0] for row in self.dbapi.fetchall()}
+
+    def set_backup_watermark(self, watermark):
+        """
+        Record the time of a backup of the database.
+
+        A family tree created by an older version of Gramps gets the indices
+        of the change times with its first backup.
+        """
+        super().set_backup_watermark(watermark)
+        if self.serializer.data_field == "json_data":
+            self._txn_begin()
+            self._create_change_indexes()
+            self._txn_commit()
+
+    def _create_change_indexes(self):
+        """
+        Create the indices of the change times of the primary objects, used
+        to find the objects changed since the last backup.
+        """
+        for obj_class in KEY_TO_CLASS_MAP.values():
+            table = obj_class.lower()
+            self.dbapi.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_change "
+                f"ON {table}(json_extract(json_data, '$.change'))"
+            )
+
+    def search_text(self, obj_type, text):
+        """
+        Return the set of handles of the primary objects with a field of
+        indexed text that contains a substring, ignoring case.
+
+        The text index of a family tree created by an older version of
+        Gramps is built by the first search.
+        """
+        # Fields are stored one per line
+        if not text or "\n" in text:
+            return None
+        if not self._has_text_index():
+            if self.readonly or not _text_index_supported():
+                return None
+            self._build_text_index()
+        self._flush_batch()
+        text = text.upper()
+        if len(text) < 3:
+            # The trigram tokenizer can't match shorter strings
+            self.dbapi.execute(
+                "SELECT k.handle FROM text_index_key AS k "
+                "JOIN text_index AS t ON t.rowid = k.id "
+                "WHERE k.obj_class = ? AND instr(t.text, ?) > 0",
+                [obj_type, text],
+            )
+        else:
+            phrase = '"%s"' % text.replace('"', '""')
+            self.dbapi.execute(
+                "SELECT handle FROM text_index_key WHERE id IN "
+                "(SELECT rowid FROM text_index WHERE text_index MATCH ?) "
+                "AND obj_class = ?",
+                [phrase, obj_type],
+            )
+        return {row[0] for row in self.dbapi.fetchall()}
+
+    def rebuild_secondary(self, callback=None):
+        """
+        Rebuild secondary indices, and the text index.
+        """
+        super().rebuild_secondary(callback)
+        if self.readonly:
+            return
+        self._txn_begin()
+        self.dbapi.execute("DROP TABLE IF EXISTS text_index")
+        self.dbapi.execute("DROP TABLE IF EXISTS text_index_key")
+        self._txn_commit()
+        self._text_index = None
+        self._build_text_index()
+
+    def transaction_abort(self, transaction):
+        self._text_rows = {}
+        super().transaction_abort(transaction)
+
+    def _flush_batch(self):
+        super()._flush_batch()
+        if self._text_rows:
+            rows, self._text_rows = self._text_rows, {}
+            self._write_text_rows(rows)
+
+    def _has_text_index(self):
+        """
+        Return True if the family tree has a text index.
+        """
+        if self._text_index is None:
+            self._text_index = self.dbapi.table_exists("text_index_key")
+        return self._text_index
+
+    def _create_text_index(self):
+        """
+        Create the tables of the text index, if SQLite supports it.
+        """
+        if not _text_index_supported():
+            self._text_index = False
+            return
+        self.dbapi.execute(
+            "CREATE VIRTUAL TABLE text_index "
+            f"USING fts5(text, tokenize='{TEXT_INDEX_TOKENIZER}')"
+        )
+        # Maps the objects to the rows of the index
+        self.dbapi.execute(
+            "CREATE TABLE text_index_key "
+            "("
+            "id INTEGER PRIMARY KEY, "
+            "obj_class TEXT, "
+            "handle VARCHAR(50), "
+            "UNIQUE (obj_class, handle)"
+            ")"
+        )
+        self._text_index = True
+
+    def _build_text_index(self):
+        """
+        Create the text index and index all of the objects.
+        """
+        self._flush_batch()
+        self._txn_begin()
+        self._create_text_index()
+        if self._text_index:
+            for obj_key in TEXT_INDEX_KEYS:
+                obj_class = KEY_TO_CLASS_MAP[obj_key]
+                rows = {}
+                for handle, data in self._iter_raw_data(obj_key):
+                    obj = self.serializer.data_to_object(data, obj_class)
+                    rows[(obj_class, handle)] = _indexed_text(obj)
+                self._write_text_rows(rows)
+        self._txn_commit()
+
+    def _has_indexed_text(self, obj_key):
+        return obj_key in TEXT_INDEX_KEYS and self._has_text_index()
+
+    def _update_text_index(self, obj_key, handle, obj):
+        if not self._has_indexed_text(obj_key):
+            return
+        key = (KEY_TO_CLASS_MAP[obj_key], handle)
+        text = None if obj is None else _indexed_text(obj)
+        if self._batch_writer is not None:
+            # Written with the other rows of the batch
+            self._text_rows[key] = text
+        else:
+            self._write_text_rows({key: text})
+
+    def _write_text_rows(self, rows):
+        """
+        Write the indexed text of objects, given a dict of the text keyed by
+        (class name, handle).  Objects with a text of None are removed.
+        """
+        old_ids = []
+        removed = []
+        new_keys = []
+        added = []
+        for key, text in rows.items():
+            self.dbapi.execute(
+                "SELECT id FROM text_index_key WHERE obj_class = ? AND handle = ?",
+                key,
+            )
+            row = self.dbapi.fetchone()
+            if row:
+                old_ids.append(row)
+                if text is None:
+                    removed.append(row)
+                else:
+                    added.append((row[0], text))
+            elif text is not None:
+                new_keys.append(key)
+                added.append((None, text))
+        self._executemany("DELETE FROM text_index WHERE rowid = ?", old_ids)
+        self._executemany("DELETE FROM text_index_key WHERE id = ?", removed)
+        if new_keys:
+            # Inserting the text with known row ids is much faster than
+            # looking them up in the same statement
+            self.dbapi.execute("SELECT COALESCE(MAX(id), 0) FROM text_index_key")
+            next_id = self.dbapi.fetchone()[0] + 1
+            ids = range(next_id, next_id + len(new_keys))
+            self._executemany(
+                "INSERT INTO text_index_key (id, obj_class, handle) VALUES (?, ?, ?)",
+                [(row_id, *key) for row_id, key in zip(ids, new_keys)],
+            )
+            new_ids = iter(ids)
+            added = [
+                (next(new_ids) if row_id is None else row_id, text)
+                for row_id, text in added
+            ]
+        self._executemany("INSERT INTO text_index (rowid, text) VALUES (?, ?)", added)
 
 
 # -------------------------------------------------------------------------
@@ -105,6 +387,7 @@ class Connection:
         self.__connection = sqlite3.connect(*args, **kwargs)
         self.__cursor = self.__connection.cursor()
         self.__connection.create_function("regexp", 2, regexp)
+        self.__connection.create_function("regexp", 3, regexp)
         self.__collations = []
         self.__tmap = str.maketrans("-.@=;", "_____")
         self.check_collation(glocale)
@@ -137,6 +420,19 @@ class Connection:
         self.log.debug(args)
         self.__cursor.execute(*args, **kwargs)
 
+    def executemany(self, *args, **kwargs):
+        """
+        Executes an SQL statement against all parameter sequences.
+
+        :param args: arguments to be passed to the sqlite3 executemany statement
+        :type args: list
+        :param kwargs: arguments to be passed to the sqlite3 executemany
+                       statement
+        :type kwargs: list
+        """
+        self.log.debug(args[0])
+        self.__cursor.executemany(*args, **kwargs)
+
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
@@ -267,17 +563,19 @@ class Cursor:
         return self.__cursor.fetchmany()
 
 
-def regexp(expr, value):
+def regexp(expr, value, flags=0):
     """
     A user defined function that can be called from within an SQL statement.
 
-    This function has two parameters.
+    This function has two parameters, or three with the flags.
 
     :param expr: pattern to look for.
     :type expr: str
     :param value: the string to search.
     :type value: list
+    :param flags: flags of the pattern, as for :func:`re.search`.
+    :type flags: int
     :returns: True if the expr exists within the value, false otherwise.
     :rtype: bool
     """
-    return re.search(expr, value, re.MULTILINE) is not None
+    return re.search(expr, value, flags) is not None
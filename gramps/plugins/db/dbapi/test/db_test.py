@@ -22,7 +22,9 @@
 # Standard python modules
 #
 # -------------------------------------------------------------------------
+import re
 import unittest
+from unittest import mock
 
 # -------------------------------------------------------------------------
 #
@@ -299,6 +301,16 @@ class DbRandomTest(unittest.TestCase):
             sort_handles=True,
         )
 
+    def test_regexp(self):
+        # Matches as the filter rules do in Python
+        for pattern, result in (("^b", 0), ("b$", 1), ("(?i)^A", 1)):
+            self.db.dbapi.execute("SELECT ? REGEXP ?", ["a\nb", pattern])
+            self.assertEqual(self.db.dbapi.fetchone()[0], result, pattern)
+        # The flags of the pattern can be given apart from the pattern
+        for pattern, flags, result in (("(?s)A.b", re.I, 1), ("(?s)A.b", 0, 0)):
+            self.db.dbapi.execute("SELECT regexp(?, ?, ?)", [pattern, "a\nb", flags])
+            self.assertEqual(self.db.dbapi.fetchone()[0], result, pattern)
+
     ################################################################
     #
     # Test get_*_gramps_ids methods
@@ -913,5 +925,142 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved["Mary"], (1, 3, 1))
 
 
+# -------------------------------------------------------------------------
+#
+# DbBatchTest class
+#
+# -------------------------------------------------------------------------
+class DbBatchTest(unittest.TestCase):
+    """
+    Tests for buffered batch commits.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def __make_family(self):
+        father = Person()
+        father.set_handle("father")
+        father.set_gramps_id("I0001")
+        father.gender = Person.MALE
+        family = Family()
+        family.set_handle("family")
+        family.set_gramps_id("F0001")
+        family.set_father_handle(father.handle)
+        father.add_family_handle(family.handle)
+        return father, family
+
+    def test_batch_commit(self):
+        father, family = self.__make_family()
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            self.db.add_person(father, trans)
+            self.db.add_family(family, trans)
+            # Buffered objects are visible before they are written
+            self.assertTrue(self.db.has_person_handle("father"))
+            self.assertTrue(self.db.has_family_gramps_id("F0001"))
+            person = self.db.get_person_from_gramps_id("I0001")
+            self.assertEqual(person.handle, "father")
+            self.assertEqual(self.db.get_number_of_people(), 1)
+        self.assertEqual(self.db.get_number_of_families(), 1)
+        self.assertEqual(
+            list(self.db.find_backlink_handles("family")), [("Person", "father")]
+        )
+        self.assertEqual(self.db.get_person_handles(sort_handles=True), ["father"])
+
+    def test_batch_commit_update(self):
+        father, family = self.__make_family()
+        with DbTxn("Batch", self.db, batch=True) as trans:
+            self.db.add_person(father, trans)
+            self.db.add_family(family, trans)
+            father.set_gramps_id("I0002")
+            father.set_family_handle_list([])
+            self.db.commit_person(father, trans)
+            self.assertFalse(self.db.has_person_gramps_id("I0001"))
+            self.assertTrue(self.db.has_person_gramps_id("I0002"))
+        self.assertEqual(self.db.get_person_gramps_ids(), ["I0002"])
+        self.assertEqual(list(self.db.find_backlink_handles("family")), [])
+
+    def test_batch_abort(self):
+        father, family = self.__make_family()
+        with self.assertRaises(ValueError):
+            with DbTxn("Batch", self.db, batch=True) as trans:
+                self.db.add_person(father, trans)
+                raise ValueError
+        self.assertFalse(self.db.has_person_handle("father"))
+
+    def has_index(self, name):
+        self.db.dbapi.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name = ?",
+            [name],
+        )
+        return self.db.dbapi.fetchone() is not None
+
+    def test_bulk_load(self):
+        father, family = self.__make_family()
+        with DbTxn("Bulk", self.db, bulk=True) as trans:
+            self.assertTrue(trans.batch)
+            self.db.add_person(father, trans)
+            self.db.add_family(family, trans)
+            # Dropped when loading into an empty tree
+            self.assertFalse(self.has_index("reference_ref_handle"))
+            # The reference map is written before it is read
+            self.assertEqual(
+                list(self.db.find_backlink_handles("family")), [("Person", "father")]
+            )
+            father.set_family_handle_list([])
+            self.db.commit_person(father, trans)
+        self.assertEqual(list(self.db.find_backlink_handles("family")), [])
+        self.assertTrue(self.has_index("reference_ref_handle"))
+
+    def test_bulk_load_existing_tree(self):
+        father, family = self.__make_family()
+        with DbTxn("Add", self.db) as trans:
+            self.db.add_family(family, trans)
+        with DbTxn("Bulk", self.db, bulk=True) as trans:
+            self.db.add_person(father, trans)
+            self.assertTrue(self.has_index("reference_ref_handle"))
+        self.assertEqual(
+            list(self.db.find_backlink_handles("family")), [("Person", "father")]
+        )
+
+    def test_commit_many(self):
+        father, family = self.__make_family()
+        with DbTxn("Commit many", self.db) as trans:
+            self.db.commit_many([father, family], trans)
+        self.assertEqual(self.db.get_person_from_handle("father").gramps_id, "I0001")
+        self.assertEqual(
+            list(self.db.find_backlink_handles("family")), [("Person", "father")]
+        )
+        self.db.undo()
+        self.assertFalse(self.db.has_person_handle("father"))
+        self.assertFalse(self.db.has_family_handle("family"))
+        self.assertEqual(list(self.db.find_backlink_handles("family")), [])
+
+    def test_batch_commit_execute_only(self):
+        # The connection of a backend without executemany
+        class Connection:
+            def __init__(self, connection):
+                self.connection = connection
+
+            def __getattr__(self, name):
+                if name == "executemany":
+                    raise AttributeError(name)
+                return getattr(self.connection, name)
+
+        father, family = self.__make_family()
+        with mock.patch.object(self.db, "dbapi", Connection(self.db.dbapi)):
+            with DbTxn("Batch", self.db, batch=True) as trans:
+                self.db.add_person(father, trans)
+                self.db.add_family(family, trans)
+        self.assertEqual(self.db.get_number_of_families(), 1)
+        self.assertEqual(
+            list(self.db.find_backlink_handles("family")), [("Person", "father")]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,180 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the person summary columns of the DB-API backends.
+"""
+
+import unittest
+
+from gramps.gen.db import DbReadBase, DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    Date,
+    Event,
+    EventRef,
+    EventRoleType,
+    EventType,
+    Person,
+    Place,
+)
+from gramps.plugins.db.dbapi.dbapi import SUMMARY_COLUMNS
+
+
+class PersonSummaryTest(unittest.TestCase):
+    """
+    Test that the stored summaries follow the changes to the database.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add", self.db) as trans:
+            self.place = Place()
+            self.db.add_place(self.place, trans)
+            self.birth = self.add_event(EventType.BIRTH, 1900, None, trans)
+            self.baptism = self.add_event(EventType.BAPTISM, 1901, self.place, trans)
+            self.burial = self.add_event(EventType.BURIAL, 1950, None, trans)
+            self.person = Person()
+            self.add_ref(self.person, self.birth)
+            self.add_ref(self.person, self.baptism)
+            self.add_ref(self.person, self.burial)
+            self.db.add_person(self.person, trans)
+            self.other = Person()
+            self.add_ref(self.other, self.burial, EventRoleType.WITNESS)
+            self.db.add_person(self.other, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_event(self, event_type, year, place, trans):
+        event = Event()
+        event.set_type(event_type)
+        date = Date()
+        date.set_yr_mon_day(year, 1, 1)
+        event.set_date_object(date)
+        if place is not None:
+            event.set_place_handle(place.handle)
+        self.db.add_event(event, trans)
+        return event
+
+    def add_ref(self, person, event, role=EventRoleType.PRIMARY):
+        event_ref = EventRef()
+        event_ref.set_reference_handle(event.handle)
+        event_ref.set_role(role)
+        person.add_event_ref(event_ref)
+        if role == EventRoleType.PRIMARY and event.get_type() == EventType.BIRTH:
+            person.set_birth_ref(event_ref)
+
+    def summary(self, handle):
+        stored = self.db.get_person_summary(handle)
+        # The stored summary is the one computed from the events
+        self.assertEqual(stored, DbReadBase.get_person_summary(self.db, handle))
+        return stored
+
+    def test_summary(self):
+        birth, death = self.summary(self.person.handle)
+        self.assertEqual(birth.event, self.birth.handle)
+        self.assertFalse(birth.fallback)
+        self.assertEqual(birth.sort_key, self.birth.get_date_object().get_sort_key())
+        # The birth has no place, the place of the baptism is shown
+        self.assertEqual(birth.place_event, self.baptism.handle)
+        self.assertTrue(birth.place_fallback)
+        self.assertEqual(birth.place, self.place.handle)
+        self.assertEqual(death.event, self.burial.handle)
+        self.assertTrue(death.fallback)
+        self.assertIsNone(death.place)
+        # The role of a witness is not a fallback
+        birth, death = self.summary(self.other.handle)
+        self.assertIsNone(death.event)
+        self.assertIsNone(birth.sort_key)
+
+    def test_changes(self):
+        with DbTxn("Edit", self.db) as trans:
+            self.burial.get_date_object().set_yr_mon_day(1960, 1, 1)
+            self.db.commit_event(self.burial, trans)
+        death = self.summary(self.person.handle)[1]
+        self.assertEqual(death.sort_key, self.burial.get_date_object().get_sort_key())
+        self.db.undo()
+        death = self.summary(self.person.handle)[1]
+        self.assertEqual(death.sort_key, Date(1950, 1, 1).get_sort_key())
+
+        with DbTxn("Edit", self.db, batch=True) as trans:
+            self.person.set_birth_ref(None)
+            self.db.commit_person(self.person, trans)
+            # Pending summaries are stored before they are read
+            birth = self.summary(self.person.handle)[0]
+            self.assertEqual(birth.event, self.baptism.handle)
+        with self.assertRaises(ValueError):
+            with DbTxn("Edit", self.db, batch=True) as trans:
+                self.db.remove_event(self.baptism.handle, trans)
+                raise ValueError
+        self.assertEqual(self.summary(self.person.handle)[0].event, self.baptism.handle)
+
+    def test_sort(self):
+        with DbTxn("Add", self.db) as trans:
+            person = Person()
+            self.add_ref(person, self.add_event(EventType.BIRTH, 1800, None, trans))
+            self.db.add_person(person, trans)
+        self.assertEqual(
+            self.db.get_person_handles(sort_handles="birth"),
+            [self.other.handle, person.handle, self.person.handle],
+        )
+        self.assertEqual(
+            self.db.get_person_handles(sort_handles="death")[-1], self.person.handle
+        )
+
+    def test_sort_index(self):
+        # The sort key is computed from the summary of the event
+        index = self.db.get_sort_index(
+            "Person", "death", lambda summary: summary.sort_key or 0
+        )
+        try:
+            self.assertEqual(
+                index.get_range(0, 10),
+                [
+                    (0, self.other.handle),
+                    (Date(1950, 1, 1).get_sort_key(), self.person.handle),
+                ],
+            )
+            with DbTxn("Edit", self.db) as trans:
+                self.burial.get_date_object().set_yr_mon_day(1960, 1, 1)
+                self.db.commit_event(self.burial, trans)
+            # Pending summaries are stored before the index is updated
+            index.update(self.person.handle)
+            self.assertEqual(
+                index.get_sort_key(self.person.handle),
+                self.burial.get_date_object().get_sort_key(),
+            )
+        finally:
+            index.close()
+
+    def test_older_tree(self):
+        # The summaries of a family tree without the columns are stored by
+        # the first call
+        self.db.dbapi.begin()
+        for column in SUMMARY_COLUMNS:
+            self.db.dbapi.drop_column("person", column)
+        self.db.dbapi.commit()
+        self.db._person_summary = None
+        self.assertEqual(self.summary(self.person.handle)[1].event, self.burial.handle)
+
+
+if __name__ == "__main__":
+    unittest.main()
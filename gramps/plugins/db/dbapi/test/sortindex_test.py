@@ -0,0 +1,117 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the sort indices of the DB-API backends.
+"""
+
+import unittest
+
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Event
+
+
+class SortIndexTest(unittest.TestCase):
+    """
+    Test that a sort index gives the order of a Python sort.
+    """
+
+    DESCRIPTIONS = ["b", "Á", "a", "", "c", "B", "a"]
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.events = {}
+        with DbTxn("Add", self.db) as trans:
+            for description in self.DESCRIPTIONS:
+                self.add_event(description, trans)
+        self.index = self.db.get_sort_index("Event", "description", glocale.sort_key)
+
+    def tearDown(self):
+        self.index.close()
+        self.db.close()
+
+    def add_event(self, description, trans):
+        event = Event()
+        event.set_description(description)
+        self.db.add_event(event, trans)
+        self.events[event.handle] = description
+
+    def expected(self):
+        return sorted(
+            (glocale.sort_key(description), handle)
+            for handle, description in self.events.items()
+        )
+
+    def test_order(self):
+        self.assertEqual(len(self.index), len(self.DESCRIPTIONS))
+        expected = self.expected()
+        self.assertEqual(self.index.get_range(0, 100), expected)
+        self.assertEqual(self.index.get_range(2, 3), expected[2:5])
+        for position, (sort_key, handle) in enumerate(expected):
+            self.assertEqual(self.index.get_position(handle), position)
+            self.assertEqual(self.index.get_sort_key(handle), sort_key)
+        self.assertIsNone(self.index.get_position("missing"))
+
+    def test_changes(self):
+        handle = next(iter(self.events))
+        with DbTxn("Edit", self.db) as trans:
+            event = self.db.get_event_from_handle(handle)
+            event.set_description("zzz")
+            self.db.commit_event(event, trans)
+            self.add_event("aa", trans)
+        # The index follows the calls of its owner only
+        self.assertEqual(len(self.index), len(self.DESCRIPTIONS))
+        self.events[handle] = "zzz"
+        for handle in self.events:
+            self.index.update(handle)
+        self.assertEqual(self.index.get_range(0, 100), self.expected())
+
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_event(handle, trans)
+        del self.events[handle]
+        self.index.update(handle)
+        self.index.remove(handle)
+        self.assertEqual(len(self.index), len(self.events))
+        self.assertEqual(self.index.get_range(0, 100), self.expected())
+
+    def test_transactions(self):
+        # The index can be changed while a transaction is open, and from the
+        # signal handlers run after its commit
+        def row_add(handles):
+            for handle in handles:
+                self.index.update(handle)
+
+        self.db.connect("event-add", row_add)
+        with DbTxn("Add", self.db) as trans:
+            self.add_event("d", trans)
+        with DbTxn("Add", self.db, batch=True) as trans:
+            self.add_event("e", trans)
+            self.index.update(list(self.events)[-1])
+        self.assertEqual(self.index.get_range(0, 100), self.expected())
+
+    def test_unsupported(self):
+        self.assertIsNone(self.db.get_sort_index("Event", "date", str))
+        self.assertIsNone(self.db.get_sort_index("Reference", "handle", str))
+
+
+if __name__ == "__main__":
+    unittest.main()
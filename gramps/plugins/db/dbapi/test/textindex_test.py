@@ -0,0 +1,171 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the text index of the SQLite backend.
+"""
+
+import unittest
+from unittest import mock
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.filters import GenericFilterFactory, SearchFilter
+from gramps.gen.filters.rules.note import MatchesSubstringOf
+from gramps.gen.filters.rules.person import HasNoteMatchingSubstringOf, SearchName
+from gramps.gen.lib import Citation, Name, Note, Person, Place, Surname
+
+
+class TextIndexTest(unittest.TestCase):
+    """
+    Test that the text index follows the changes to the database.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add", self.db) as trans:
+            self.note = Note("The Straße to\nSpringfield")
+            self.db.add_note(self.note, trans)
+            self.person = Person()
+            self.person.set_primary_name(self.make_name("Garner", "Lewis"))
+            self.person.add_alternate_name(self.make_name("Zieliński", "Anna"))
+            self.person.add_note(self.note.handle)
+            self.db.add_person(self.person, trans)
+            self.other = Person()
+            self.other.set_primary_name(self.make_name("Warner", "Ann"))
+            self.db.add_person(self.other, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def make_name(self, surname, first_name):
+        name = Name()
+        name.set_first_name(first_name)
+        name.add_surname(Surname())
+        name.get_primary_surname().set_surname(surname)
+        return name
+
+    def search(self, obj_type, text):
+        return self.db.search_text(obj_type, text)
+
+    def test_search(self):
+        self.assertEqual(self.search("Note", "STRASSE"), {self.note.handle})
+        self.assertEqual(self.search("Note", "springF"), {self.note.handle})
+        self.assertEqual(
+            self.search("Person", "arner"), {self.person.handle, self.other.handle}
+        )
+        self.assertEqual(self.search("Person", "ZIELI"), {self.person.handle})
+        # Short strings and strings in different fields
+        self.assertEqual(
+            self.search("Person", "nn"), {self.person.handle, self.other.handle}
+        )
+        self.assertEqual(self.search("Person", "LEWISGARNER"), set())
+        self.assertEqual(self.search("Place", "Spring"), set())
+        self.assertIsNone(self.search("Note", ""))
+        self.assertIsNone(self.search("Note", "to\nSpring"))
+
+    def test_changes(self):
+        with DbTxn("Edit", self.db) as trans:
+            self.note.set("Shelbyville")
+            self.db.commit_note(self.note, trans)
+        self.assertEqual(self.search("Note", "spring"), set())
+        self.assertEqual(self.search("Note", "shelby"), {self.note.handle})
+        self.db.undo()
+        self.assertEqual(self.search("Note", "spring"), {self.note.handle})
+        self.assertEqual(self.search("Note", "shelby"), set())
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_person(self.other.handle, trans)
+        self.assertEqual(self.search("Person", "arner"), {self.person.handle})
+        self.db.undo()
+        self.assertEqual(
+            self.search("Person", "arner"), {self.person.handle, self.other.handle}
+        )
+
+    def test_batch(self):
+        with DbTxn("Add", self.db, batch=True) as trans:
+            place = Place()
+            place.set_title("Springfield, IL")
+            self.db.add_place(place, trans)
+            citation = Citation()
+            citation.set_page("p. 12")
+            self.db.add_citation(citation, trans)
+            # Buffered rows are searched too
+            self.assertEqual(self.search("Place", "field"), {place.handle})
+            place.set_title("Capital City")
+            self.db.commit_place(place, trans)
+        self.assertEqual(self.search("Place", "field"), set())
+        self.assertEqual(self.search("Place", "capital"), {place.handle})
+        self.assertEqual(self.search("Citation", "P. 1"), {citation.handle})
+
+        with self.assertRaises(ValueError):
+            with DbTxn("Edit", self.db, batch=True) as trans:
+                place.set_title("Ogdenville")
+                self.db.commit_place(place, trans)
+                raise ValueError
+        self.assertEqual(self.search("Place", "ogden"), set())
+        self.assertEqual(self.search("Place", "capital"), {place.handle})
+
+    def test_rebuild(self):
+        # A family tree without an index is indexed by the first search
+        self.db.dbapi.execute("DROP TABLE text_index")
+        self.db.dbapi.execute("DROP TABLE text_index_key")
+        self.db._text_index = None
+        self.assertEqual(self.search("Note", "strasse"), {self.note.handle})
+        self.db.rebuild_secondary()
+        self.assertEqual(self.search("Person", "lewis"), {self.person.handle})
+
+    def test_rules(self):
+        # The rules give the same result with and without the index
+        def apply(namespace, rule, invert):
+            rule_filter = GenericFilterFactory(namespace)()
+            rule_filter.add_rule(rule)
+            rule_filter.set_invert(invert)
+            return set(rule_filter.apply(self.db))
+
+        rules = [
+            ("Person", SearchName(["ann"]), 2),
+            ("Person", SearchName(["nn"]), 2),
+            ("Person", SearchName(["lewisgarner"]), 0),
+            ("Person", HasNoteMatchingSubstringOf(["strasse"]), 1),
+            ("Note", MatchesSubstringOf(["SPRING"]), 1),
+        ]
+        for namespace, rule, count in rules:
+            for invert in (False, True):
+                with self.subTest(rule=rule.list, invert=invert):
+                    indexed = apply(namespace, rule, invert)
+                    if not invert:
+                        self.assertEqual(len(indexed), count)
+                    with mock.patch.object(self.db, "search_text", return_value=None):
+                        self.assertEqual(apply(namespace, rule, invert), indexed)
+
+    def test_search_filter(self):
+        def candidates(text, invert=False):
+            func = lambda handle: ""
+            return SearchFilter(func, text, invert, "Note").candidates(self.db)
+
+        self.assertEqual(candidates("Straße"), {self.note.handle})
+        self.assertIsNone(candidates("Straße", invert=True))
+        # Line breaks are shown as spaces
+        self.assertIsNone(candidates("to Spring"))
+        self.assertIsNone(SearchFilter(None, "Spring", False).candidates(self.db))
+
+
+if __name__ == "__main__":
+    unittest.main()
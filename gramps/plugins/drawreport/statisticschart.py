@@ -44,7 +44,7 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.sgettext
 # Person and relation types
-from gramps.gen.lib import Person, FamilyRelType, EventType, EventRoleType
+from gramps.gen.lib import Person, FamilyRelType
 from gramps.gen.lib.date import Date
 
 # gender and report type names
@@ -244,8 +244,6 @@ def estimate_age(dbase, person, end_handle=None, start_handle=None, today=_TODAY
     @rtype: tuple
     """
 
-    calendar = config.get("preferences.calendar-format-report")
-
     bhandle = None
     if start_handle:
         bhandle = start_handle
@@ -267,9 +265,30 @@ def estimate_age(dbase, person, end_handle=None, start_handle=None, today=_TODAY
         return (-1, -1)
 
     bdata = dbase.get_event_from_handle(bhandle).get_date_object()
-    bdata = bdata.to_calendar(calendar)
     if dhandle:
         ddata = dbase.get_event_from_handle(dhandle).get_date_object()
+    else:
+        ddata = None
+    return estimate_date_age(bdata, ddata, today)
+
+
+def estimate_date_age(bdata, ddata, today=_TODAY):
+    """
+    Estimates the age between two dates, like :func:`estimate_age`.
+
+    @param bdata: Date of the start of the age
+    @type bdata: Date
+    @param ddata: Date of the end of the age. If None, today is used
+    @type ddata: Date
+    @returns: tuple containing the lower and upper bounds of the
+       age, or (-1, -1) if it could not be determined.
+    @rtype: tuple
+    """
+
+    calendar = config.get("preferences.calendar-format-report")
+
+    bdata = bdata.to_calendar(calendar)
+    if ddata is not None:
         ddata = ddata.to_calendar(calendar)
     else:
         if today is not None:
@@ -378,25 +397,25 @@ class Extract:
             "data_byear": (
                 "Birth year",
                 _T_("Birth year"),
-                self.get_birth,
+                self.get_birth_date,
                 self.get_year,
             ),
             "data_dyear": (
                 "Death year",
                 _T_("Death year"),
-                self.get_death,
+                self.get_death_date,
                 self.get_year,
             ),
             "data_bmonth": (
                 "Birth month",
                 _T_("Birth month"),
-                self.get_birth,
+                self.get_birth_date,
                 self.get_month,
             ),
             "data_dmonth": (
                 "Death month",
                 _T_("Death month"),
-                self.get_death,
+                self.get_death_date,
                 self.get_month,
             ),
             "data_bplace": (
@@ -505,9 +524,8 @@ class Extract:
             return [_T_("Other")]
         return [_T_("Gender unknown")]
 
-    def get_year(self, event):
-        "return year for given event"
-        date = event.get_date_object()
+    def get_year(self, date):
+        "return year for given date"
         date = date.to_calendar(self.calendar)
         if date:
             year = date.get_year()
@@ -515,8 +533,8 @@ class Extract:
                 return [self._get_date(Date(year))]  # localized year
         return [_T_("Date(s) missing")]
 
-    def get_month(self, event):
-        "return month for given event"
+    def get_month(self, date):
+        "return month for given date"
         date_displayer = self._locale.date_displayer
         CAL_TO_LONG_MONTHS_NAMES = {
             Date.CAL_GREGORIAN: date_displayer.long_months,
@@ -528,7 +546,6 @@ class Extract:
             Date.CAL_SWEDISH: date_displayer.swedish,
         }
 
-        date = event.get_date_object()
         if date:
             month = date.get_month()
             if month:
@@ -546,11 +563,11 @@ class Extract:
         return [_T_("Place missing")]
 
     def get_places(self, data):
-        "return places for given (person,event_handles)"
+        "return places for given (person,events)"
         places = []
-        person, event_handles = data
-        for event_handle in event_handles:
-            event = self.db.get_event_from_handle(event_handle)
+        person, events = data
+        for number in events:
+            event = self.db.get_event_from_handle(self.snapshot.event_handles[number])
             place_handle = event.get_place_handle()
             if place_handle:
                 place = _pd.display_event(self.db, event)
@@ -562,40 +579,38 @@ class Extract:
 
     def get_person_age(self, person):
         "return age for given person, if alive"
-        death_ref = person.get_death_ref()
-        if not death_ref:
+        if self.snapshot.death[self.snapshot.index[person.handle]] == -1:
             return [self.estimate_age(person)]
         return [_T_("Already dead")]
 
     def get_death_age(self, person):
         "return age at death for given person, if dead"
-        death_ref = person.get_death_ref()
-        if death_ref:
-            return [self.estimate_age(person, death_ref.ref)]
+        death = self.snapshot.death[self.snapshot.index[person.handle]]
+        if death != -1:
+            return [self.estimate_age(person, death)]
         return [_T_("Still alive")]
 
     def get_event_ages(self, data):
-        "return ages at given (person,event_handles)"
-        person, event_handles = data
-        ages = [self.estimate_age(person, h) for h in event_handles]
+        "return ages at given (person,events)"
+        person, events = data
+        ages = [self.estimate_age(person, event) for event in events]
         if ages:
             return ages
         return [_T_("Events missing")]
 
     def get_event_type(self, data):
-        "return event types at given (person,event_handles)"
+        "return event types at given (person,events)"
         types = []
-        person, event_handles = data
-        for event_handle in event_handles:
-            event = self.db.get_event_from_handle(event_handle)
-            event_type = self._(self._get_type(event.get_type()))
+        person, events = data
+        for event in events:
+            event_type = self._(self._get_type(self.snapshot.get_event_type(event)))
             types.append(event_type)
         if types:
             return types
         return [_T_("Events missing")]
 
     def get_first_child_age(self, data):
-        "return age when first child in given (person,child_handles) was born"
+        "return age when first child in given (person,children) was born"
         ages, errors = self.get_sorted_child_ages(data)
         if ages:
             errors.append(ages[0])
@@ -603,7 +618,7 @@ class Extract:
         return [_T_("Children missing")]
 
     def get_last_child_age(self, data):
-        "return age when last child in given (person,child_handles) was born"
+        "return age when last child in given (person,children) was born"
         ages, errors = self.get_sorted_child_ages(data)
         if ages:
             errors.append(ages[-1])
@@ -620,25 +635,36 @@ class Extract:
     # ------------------- utility methods -------------------------
 
     def get_sorted_child_ages(self, data):
-        "return (sorted_ages,errors) for given (person,child_handles)"
+        "return (sorted_ages,errors) for given (person,children)"
         ages = []
         errors = []
-        person, child_handles = data
-        for child_handle in child_handles:
-            child = self.db.get_person_from_handle(child_handle)
-            birth_ref = child.get_birth_ref()
-            if birth_ref:
-                ages.append(self.estimate_age(person, birth_ref.ref))
+        person, children = data
+        for child in children:
+            birth = self.snapshot.birth[child]
+            if birth != -1:
+                ages.append(self.estimate_age(person, birth))
             else:
                 errors.append(_T_("Birth missing"))
                 continue
         ages.sort()
         return (ages, errors)
 
-    def estimate_age(self, person, end=None, begin=None):
+    def estimate_age(self, person, end=None):
         """return estimated age (range) for given person or error message.
-        age string is padded with spaces so that it can be sorted"""
-        age = estimate_age(self.db, person, end, begin)
+        end is the snapshot number of the event ending the age, instead of
+        the death.  age string is padded with spaces so that it can be
+        sorted"""
+        index = self.snapshot.index[person.handle]
+        birth = self.snapshot.birth[index]
+        if end is None:
+            end = self.snapshot.death[index]
+        if birth == -1:
+            age = (-1, -1)
+        else:
+            age = estimate_date_age(
+                self.snapshot.get_event_date(birth),
+                self.snapshot.get_event_date(end) if end != -1 else None,
+            )
         if age[0] < 0 or age[1] < 0:
             # inadequate information
             return _T_("Date(s) missing")
@@ -670,13 +696,25 @@ class Extract:
             return self.db.get_event_from_handle(death_ref.ref)
         return None
 
+    def get_birth_date(self, person):
+        "return birth date for given person or None"
+        birth = self.snapshot.birth[self.snapshot.index[person.handle]]
+        if birth != -1:
+            return self.snapshot.get_event_date(birth)
+        return None
+
+    def get_death_date(self, person):
+        "return death date for given person or None"
+        death = self.snapshot.death[self.snapshot.index[person.handle]]
+        if death != -1:
+            return self.snapshot.get_event_date(death)
+        return None
+
     def get_child_handles(self, person):
-        "return list of child handles for given person or None"
+        "return list of child numbers in the snapshot for given person or None"
         children = []
-        for fam_handle in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_handle)
-            for child_ref in fam.get_child_ref_list():
-                children.append(child_ref.ref)
+        for family in self.snapshot.families[self.snapshot.index[person.handle]]:
+            children.extend(self.snapshot.children[family])
         # TODO: it would be good to return only biological children,
         # but Gramps doesn't offer any efficient way to check that
         # (I don't want to check each children's parent family mother
@@ -686,18 +724,11 @@ class Extract:
         return None
 
     def get_marriage_handles(self, person):
-        "return list of marriage event handles for given person or None"
+        "return list of marriage event numbers in the snapshot or None"
         marriages = []
-        for family_handle in person.get_family_handle_list():
-            family = self.db.get_family_from_handle(family_handle)
-            if int(family.get_relationship()) == FamilyRelType.MARRIED:
-                for event_ref in family.get_event_ref_list():
-                    event = self.db.get_event_from_handle(event_ref.ref)
-                    if event.get_type() == EventType.MARRIAGE and (
-                        event_ref.get_role() == EventRoleType.FAMILY
-                        or event_ref.get_role() == EventRoleType.PRIMARY
-                    ):
-                        marriages.append(event_ref.ref)
+        for family in self.snapshot.families[self.snapshot.index[person.handle]]:
+            if self.snapshot.relationship[family] == FamilyRelType.MARRIED:
+                marriages.extend(self.snapshot.marriages[family])
         if marriages:
             return (person, marriages)
         return None
@@ -711,8 +742,8 @@ class Extract:
         return None
 
     def get_event_handles(self, person):
-        "return list of event handles for given person or None"
-        events = [ref.ref for ref in person.get_event_ref_list()]
+        "return list of event numbers in the snapshot for given person or None"
+        events = self.snapshot.events[self.snapshot.index[person.handle]]
 
         if events:
             return (person, events)
@@ -771,6 +802,7 @@ class Extract:
         (- Method)
         """
         self.db = dbase  # store for use by methods
+        self.snapshot = dbase.get_person_snapshot()
         self._locale = rlocale
         self._ = rlocale.translation.sgettext
         self._get_type = rlocale.get_type
@@ -795,9 +827,8 @@ class Extract:
                 continue
 
             # check whether birth year is within required range
-            birth = self.get_birth(person)
-            if birth:
-                birthdate = birth.get_date_object()
+            birthdate = self.get_birth_date(person)
+            if birthdate:
                 if birthdate.get_year_valid():
                     birthdate = birthdate.to_calendar(self.calendar)
 
@@ -806,9 +837,8 @@ class Extract:
                         continue
                 else:
                     # if death before range, person's out of range too...
-                    death = self.get_death(person)
-                    if death:
-                        deathdate = death.get_date_object()
+                    deathdate = self.get_death_date(person)
+                    if deathdate:
                         if deathdate.get_year_valid():
                             deathdate = deathdate.to_calendar(self.calendar)
 
@@ -163,6 +163,28 @@ plg.export_options = "WriterOptionBoxWithCompression"
 plg.export_options_title = _("Gramps XML export options")
 plg.extension = "gramps"
 
+# ------------------------------------------------------------------------
+#
+# Gramps incremental backup
+#
+# ------------------------------------------------------------------------
+
+plg = newplugin()
+plg.id = "ex_backup"
+plg.name = _("Gramps incremental backup")
+plg.name_accell = _("Gramps _incremental backup")
+plg.description = _(
+    "Back up the family tree, writing only the changes made since "
+    "the previous backup. The first backup of a family tree is a full one."
+)
+plg.version = "1.0"
+plg.gramps_target_version = MODULE_VERSION
+plg.status = STABLE
+plg.fname = "exportbackup.py"
+plg.ptype = EXPORT
+plg.export_function = "export_data"
+plg.extension = "gbackup"
+
 # ------------------------------------------------------------------------
 #
 # vCalendar
@@ -0,0 +1,223 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Export a family tree to an incremental backup.
+
+A backup is a gzip compressed file of JSON lines.  The first line is a
+header, the second one holds the metadata of the tree, and each following
+line holds a primary object, or the handle of a deleted one.
+
+The first backup of a tree is a full backup.  The time at which it was taken
+is then recorded in the database as the backup watermark, and each
+following backup only holds the objects that changed since the previous one.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import gzip
+import logging
+import time
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.lib import (
+    Citation,
+    Event,
+    Family,
+    Media,
+    Note,
+    Person,
+    Place,
+    Repository,
+    Source,
+    Tag,
+)
+from gramps.gen.lib.json_utils import data_to_string, dict_to_string, object_to_dict
+from gramps.gen.updatecallback import UpdateCallback
+
+_ = glocale.translation.gettext
+LOG = logging.getLogger(".ExportBackup")
+
+BACKUP_FORMAT = "gramps-backup"
+BACKUP_VERSION = 1
+
+# Primary object classes, in the order they are written
+BACKUP_CLASSES = (
+    Tag,
+    Note,
+    Repository,
+    Source,
+    Citation,
+    Media,
+    Place,
+    Event,
+    Person,
+    Family,
+)
+
+# Bookmark lists, by the name of the database method that returns them
+BOOKMARKS = (
+    "bookmarks",
+    "family_bookmarks",
+    "event_bookmarks",
+    "source_bookmarks",
+    "citation_bookmarks",
+    "place_bookmarks",
+    "repo_bookmarks",
+    "media_bookmarks",
+    "note_bookmarks",
+)
+
+
+# -------------------------------------------------------------------------
+#
+# export_data
+#
+# -------------------------------------------------------------------------
+def export_data(database, filename, user, option_box=None):
+    """
+    Write a backup of the database: an incremental one if the database has
+    been backed up before, or a full one otherwise.
+    """
+    writer = BackupWriter(database, user)
+    try:
+        writer.write(filename)
+    except OSError as msg:
+        user.notify_error(_("Failure writing %s") % filename, str(msg))
+        return False
+    return True
+
+
+# -------------------------------------------------------------------------
+#
+# BackupWriter
+#
+# -------------------------------------------------------------------------
+class BackupWriter(UpdateCallback):
+    """
+    Write a full or incremental backup of a database.
+    """
+
+    def __init__(self, db, user, full=False):
+        """
+        :param db: The database to back up.
+        :type db: :py:class:`.DbGeneric`
+        :param user: The user, for progress reporting.
+        :type user: :py:class:`.User`
+        :param full: Write a full backup even if there is a watermark.
+        :type full: bool
+        """
+        UpdateCallback.__init__(self, user.callback)
+        self.db = db
+        self.full = full
+
+    def write(self, filename):
+        """
+        Write the backup, and record its time as the new watermark.
+        """
+        since = None if self.full else self.db.get_backup_watermark()
+        # Changes made while the backup is written go to the next one
+        watermark = int(time.time())
+
+        changes = {
+            obj_class.__name__: self.get_changed_handles(obj_class, since)
+            for obj_class in BACKUP_CLASSES
+        }
+        deleted = []
+        if since is not None:
+            for class_name, handle in self.db.get_logged_changes(since):
+                if self.db.method("has_%s_handle", class_name)(handle):
+                    changes[class_name].add(handle)
+                else:
+                    deleted.append((class_name, handle))
+        count = sum(len(handles) for handles in changes.values())
+        if count:
+            self.set_total(count)
+
+        header = {
+            "format": BACKUP_FORMAT,
+            "version": BACKUP_VERSION,
+            "since": since,
+            "watermark": watermark,
+            "count": count + len(deleted),
+        }
+        with gzip.open(filename, "wt", encoding="utf-8") as ofile:
+            ofile.write(dict_to_string(header) + "\n")
+            ofile.write(dict_to_string(self.get_metadata()) + "\n")
+            for obj_class in BACKUP_CLASSES:
+                get_raw_data = self.db.method("get_raw_%s_data", obj_class.__name__)
+                for handle in sorted(changes[obj_class.__name__]):
+                    data = get_raw_data(handle)
+                    if data is not None:
+                        if not isinstance(data, dict):
+                            data = object_to_dict(obj_class.create(data))
+                        item = {"class": obj_class.__name__, "data": data}
+                        ofile.write(data_to_string(item) + "\n")
+                    self.update()
+            for class_name, handle in deleted:
+                item = {"class": class_name, "deleted": handle}
+                ofile.write(dict_to_string(item) + "\n")
+
+        self.db.set_backup_watermark(watermark)
+        LOG.debug("Backup since %s: %d objects, %d deleted", since, count, len(deleted))
+
+    def get_changed_handles(self, obj_class, since):
+        """
+        Return the set of handles of the objects of a class that have been
+        changed at or after a given time, or all of them if it is None.
+        """
+        name = obj_class.__name__
+        if since is None:
+            return set(self.db.method("get_%s_handles", name)())
+        handles = self.db.select_handles(
+            name, "json_extract(json_data, '$.change') >= ?", [since]
+        )
+        if handles is None:
+            get_object = self.db.method("get_%s_from_handle", name)
+            handles = {
+                handle
+                for handle in self.db.method("get_%s_handles", name)()
+                if get_object(handle).change >= since
+            }
+        return handles
+
+    def get_metadata(self):
+        """
+        Return the metadata of the tree that is restored with the objects.
+        """
+        return {
+            "researcher": object_to_dict(self.db.get_researcher()),
+            "mediapath": self.db.get_mediapath(),
+            "name_formats": self.db.name_formats,
+            "name_groups": {
+                name: self.db.get_name_group_mapping(name)
+                for name in self.db.get_name_group_keys()
+            },
+            "bookmarks": {
+                name: self.db.method("get_%s", name)().get() for name in BOOKMARKS
+            },
+        }
@@ -38,6 +38,12 @@ import time
 import shutil
 import os
 import codecs
+import io
+import multiprocessing
+from collections import deque
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from xml.sax.saxutils import escape
 
 # ------------------------------------------------------------------------
@@ -58,7 +64,20 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 from gramps.gen.const import URL_NS
-from gramps.gen.lib import Date, Person
+from gramps.gen.lib import (
+    Citation,
+    Date,
+    Event,
+    Family,
+    Media,
+    Note,
+    Person,
+    Place,
+    Repository,
+    Source,
+    Tag,
+)
+from gramps.gen.lib.json_utils import data_to_object
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.db.exceptions import DbWriteFailure
 from gramps.version import VERSION
@@ -79,6 +98,15 @@ try:
 except:
     _gzip_ok = 0
 
+# Number of objects serialized in one batch
+CHUNKSIZE = 1000
+
+# Number of objects from which the batches are serialized in worker processes
+PARALLEL_THRESHOLD = 20 * CHUNKSIZE
+
+# Size of the blocks that are compressed in parallel
+GZIP_BLOCK = 1 << 20
+
 # table for skipping control chars from XML except 09, 0A, 0D
 strip_dict = dict.fromkeys(list(range(9)) + list(range(11, 13)) + list(range(14, 32)))
 
@@ -108,7 +136,15 @@ class GrampsXmlWriter(UpdateCallback):
     Writes a database to the XML file.
     """
 
-    def __init__(self, db, strip_photos=0, compress=1, version="unknown", user=None):
+    def __init__(
+        self,
+        db,
+        strip_photos=0,
+        compress=1,
+        version="unknown",
+        user=None,
+        max_workers=None,
+    ):
         """
         Initialize, but does not write, an XML file.
 
@@ -118,6 +154,8 @@ class GrampsXmlWriter(UpdateCallback):
         >              1: remove everything expect the filename (eg gpkg)
         >              2: remove leading slash (quick write)
         compress - attempt to compress the database
+        max_workers - maximum number of worker processes and compression
+        >             threads; everything is done in this process if it is 1
         """
         UpdateCallback.__init__(self, user.callback)
         self.user = user
@@ -127,6 +165,10 @@ class GrampsXmlWriter(UpdateCallback):
         self.db = db
         self.strip_photos = strip_photos
         self.version = version
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        self.max_workers = max_workers
+        self.executor = None
 
         self.status = None
 
@@ -185,7 +227,12 @@ class GrampsXmlWriter(UpdateCallback):
             try:
                 if self.compress and _gzip_ok:
                     try:
-                        g = gzip.open(filename, "wb")
+                        if self.max_workers == 1:
+                            g = gzip.open(filename, "wb")
+                        else:
+                            g = BlockGzipFile(
+                                open(filename, "wb"), self.max_workers, True
+                            )
                     except:
                         g = open(filename, "wb")
                 else:
@@ -209,7 +256,10 @@ class GrampsXmlWriter(UpdateCallback):
 
         if self.compress and _gzip_ok:
             try:
-                g = gzip.GzipFile(mode="wb", fileobj=handle)
+                if self.max_workers == 1:
+                    g = gzip.GzipFile(mode="wb", fileobj=handle)
+                else:
+                    g = BlockGzipFile(handle, self.max_workers)
             except:
                 g = handle
         else:
@@ -287,103 +337,73 @@ class GrampsXmlWriter(UpdateCallback):
         # by the time we get to person's names
         self.write_name_formats()
 
-        # Write table objects
-        if tag_len > 0:
-            self.g.write("  <tags>\n")
-            for key in sorted(self.db.get_tag_handles()):
-                tag = self.db.get_tag_from_handle(key)
-                if tag:
-                    self.write_tag(tag, 2)
-                self.update()
-            self.g.write("  </tags>\n")
-
-        # Write primary objects
-        if event_len > 0:
-            self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event, 2)
-                self.update()
-            self.g.write("  </events>\n")
-
-        if person_len > 0:
-            self.g.write("  <people")
-            person = self.db.get_default_person()
-            if person:
-                self.g.write(' home="_%s"' % person.handle)
-            self.g.write(">\n")
-
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
+        self.start_workers(total_steps)
+        try:
+            # Write table objects
+            if tag_len > 0:
+                self.g.write("  <tags>\n")
+                self.write_objects(self.db.get_tag_handles(), Tag, "write_tag")
+                self.g.write("  </tags>\n")
+
+            # Write primary objects
+            if event_len > 0:
+                self.g.write("  <events>\n")
+                self.write_objects(self.db.get_event_handles(), Event, "write_event")
+                self.g.write("  </events>\n")
+
+            if person_len > 0:
+                self.g.write("  <people")
+                person = self.db.get_default_person()
                 if person:
-                    self.write_person(person, 2)
-                self.update()
-            self.g.write("  </people>\n")
-
-        if family_len > 0:
-            self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family, 2)
-                self.update()
-            self.g.write("  </families>\n")
-
-        if citation_len > 0:
-            self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation, 2)
-                self.update()
-            self.g.write("  </citations>\n")
-
-        if source_len > 0:
-            self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source, 2)
-                self.update()
-            self.g.write("  </sources>\n")
-
-        if place_len > 0:
-            self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place, 2)
-                self.update()
-            self.g.write("  </places>\n")
-
-        if obj_len > 0:
-            self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj, 2)
-                self.update()
-            self.g.write("  </objects>\n")
-
-        if repo_len > 0:
-            self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo, 2)
-                self.update()
-            self.g.write("  </repositories>\n")
-
-        if note_len > 0:
-            self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
-                self.update()
-            self.g.write("  </notes>\n")
+                    self.g.write(' home="_%s"' % person.handle)
+                self.g.write(">\n")
+                self.write_objects(self.db.get_person_handles(), Person, "write_person")
+                self.g.write("  </people>\n")
+
+            if family_len > 0:
+                self.g.write("  <families>\n")
+                self.write_objects(
+                    self.db.iter_family_handles(), Family, "write_family"
+                )
+                self.g.write("  </families>\n")
+
+            if citation_len > 0:
+                self.g.write("  <citations>\n")
+                self.write_objects(
+                    self.db.get_citation_handles(), Citation, "write_citation"
+                )
+                self.g.write("  </citations>\n")
+
+            if source_len > 0:
+                self.g.write("  <sources>\n")
+                self.write_objects(self.db.get_source_handles(), Source, "write_source")
+                self.g.write("  </sources>\n")
+
+            if place_len > 0:
+                self.g.write("  <places>\n")
+                self.write_objects(
+                    self.db.get_place_handles(), Place, "write_place_obj"
+                )
+                self.g.write("  </places>\n")
+
+            if obj_len > 0:
+                self.g.write("  <objects>\n")
+                self.write_objects(self.db.get_media_handles(), Media, "write_object")
+                self.g.write("  </objects>\n")
+
+            if repo_len > 0:
+                self.g.write("  <repositories>\n")
+                self.write_objects(
+                    self.db.get_repository_handles(), Repository, "write_repository"
+                )
+                self.g.write("  </repositories>\n")
+
+            if note_len > 0:
+                self.g.write("  <notes>\n")
+                self.write_objects(self.db.get_note_handles(), Note, "write_note")
+                self.g.write("  </notes>\n")
+        finally:
+            self.stop_workers()
 
         # Data is written, now write bookmarks.
         self.write_bookmarks()
@@ -394,6 +414,127 @@ class GrampsXmlWriter(UpdateCallback):
     #        self.status.end()
     #        self.status = None
 
+    def start_workers(self, total):
+        """
+        Start the worker processes that serialize the objects, if there are
+        enough objects to make it worthwhile.
+        """
+        if (
+            total < PARALLEL_THRESHOLD
+            or self.max_workers == 1
+            or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            return
+        # Forked workers inherit the writer.  Spawned workers would run the
+        # main script again, which starts Gramps.
+        try:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(self,),
+            )
+            # Fork the workers now, before any compression thread is started
+            self.executor.submit(int).result()
+        except (OSError, BrokenProcessPool) as err:
+            LOG.warning("Starting the worker processes failed: %s", err)
+            self.stop_workers()
+
+    def stop_workers(self):
+        """
+        Stop the worker processes, if any.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def write_objects(self, handles, obj_class, method):
+        """
+        Write the objects of a table, in handle order.
+
+        The objects are serialized in batches of CHUNKSIZE objects, by the
+        worker processes if they are running.
+
+        :param handles: The handles of the objects.
+        :type handles: iterable
+        :param obj_class: The class of the objects.
+        :type obj_class: class
+        :param method: The name of the method that writes an object.
+        :type method: str
+        """
+        name = obj_class.__name__.lower()
+        if self.executor is None:
+            get_data = getattr(self.db, "get_%s_from_handle" % name)
+        else:
+            get_data = getattr(self.db, "get_raw_%s_data" % name)
+        handles = sorted(handles)
+        chunks = (
+            self.read_chunk(get_data, handles[start : start + CHUNKSIZE])
+            for start in range(0, len(handles), CHUNKSIZE)
+        )
+        if self.executor is None:
+            fragments = (self.serialize(method, chunk) for chunk in chunks)
+        else:
+            fragments = self.serialize_parallel(method, obj_class, chunks)
+        for fragment in fragments:
+            self.g.write(fragment)
+
+    def read_chunk(self, get_data, handles):
+        """
+        Return the objects, or raw data, of a batch of handles.
+        """
+        chunk = []
+        for handle in handles:
+            data = get_data(handle)
+            if data:
+                chunk.append(data)
+            self.update()
+        return chunk
+
+    def serialize(self, method, objects):
+        """
+        Return the XML of a batch of objects.
+        """
+        out = self.g
+        self.g = io.StringIO()
+        try:
+            write = getattr(self, method)
+            for obj in objects:
+                write(obj, 2)
+            return self.g.getvalue()
+        finally:
+            self.g = out
+
+    def serialize_parallel(self, method, obj_class, chunks):
+        """
+        Serialize batches of raw data in the worker processes, and yield
+        their XML in order.  The batches are serialized in this process if
+        the workers fail.
+        """
+        pending = deque()
+        futures = deque()
+        chunk = []
+        try:
+            while chunk is not None or futures:
+                # Keep the workers busy without holding all objects in memory
+                if chunk is not None and len(futures) < 2 * self.max_workers:
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.append(chunk)
+                        futures.append(
+                            self.executor.submit(_serialize, method, obj_class, chunk)
+                        )
+                    continue
+                fragment = futures[0].result()
+                futures.popleft()
+                pending.popleft()
+                yield fragment
+        except (OSError, BrokenProcessPool) as err:
+            LOG.warning("Writing in worker processes failed: %s", err)
+            self.stop_workers()
+            for chunk in chain(pending, chunks):
+                yield self.serialize(method, _data_to_objects(obj_class, chunk))
+
     def write_metadata(self):
         """Method to write out metadata of the database"""
         mediapath = self.db.get_mediapath()
@@ -1439,6 +1580,92 @@ def conf_priv(obj):
         return ""
 
 
+# -------------------------------------------------------------------------
+#
+# BlockGzipFile
+#
+# -------------------------------------------------------------------------
+class BlockGzipFile:
+    """
+    Write-only file object that compresses blocks of GZIP_BLOCK bytes in
+    parallel threads.  Each block is written as a gzip member of its own, and
+    gzip readers decompress the members of a file as a single stream.
+    """
+
+    def __init__(self, fileobj, max_workers, close_fileobj=False):
+        self.fileobj = fileobj
+        self.close_fileobj = close_fileobj
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.pending = deque()
+        self.buffer = []
+        self.size = 0
+        self.members = 0
+        self.closed = False
+
+    def write(self, data):
+        self.buffer.append(data)
+        self.size += len(data)
+        if self.size >= GZIP_BLOCK:
+            self.compress_block()
+        return len(data)
+
+    def compress_block(self):
+        """
+        Compress the buffered data in a thread.
+        """
+        block = b"".join(self.buffer)
+        self.buffer = []
+        self.size = 0
+        self.pending.append(self.executor.submit(gzip.compress, block))
+        self.members += 1
+        while len(self.pending) > 2 * self.max_workers:
+            self.fileobj.write(self.pending.popleft().result())
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            # An empty file still needs one member
+            if self.buffer or not self.members:
+                self.compress_block()
+            while self.pending:
+                self.fileobj.write(self.pending.popleft().result())
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            if self.close_fileobj:
+                self.fileobj.close()
+
+
+# -------------------------------------------------------------------------
+#
+# Worker process functions
+#
+# -------------------------------------------------------------------------
+_WRITER = None
+
+
+def _init_worker(writer):
+    global _WRITER
+    _WRITER = writer
+
+
+def _serialize(method, obj_class, chunk):
+    return _WRITER.serialize(method, _data_to_objects(obj_class, chunk))
+
+
+def _data_to_objects(obj_class, chunk):
+    for data in chunk:
+        if isinstance(data, dict):
+            yield data_to_object(data)
+        else:
+            yield obj_class.create(data)
+
+
 # -------------------------------------------------------------------------
 #
 # export_data
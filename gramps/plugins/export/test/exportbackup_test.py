@@ -0,0 +1,178 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the incremental backup
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Note, Person, Surname
+from gramps.gen.lib.json_utils import object_to_dict, string_to_dict
+from gramps.gen.user import User
+from gramps.plugins.importer.importbackup import BackupChainError, BackupRestorer
+from ..exportbackup import BACKUP_CLASSES, BackupWriter
+
+
+class BackupTest(unittest.TestCase):
+    """
+    A full backup and the incremental backups that follow it must restore
+    the same family tree.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db = self.new_db()
+        with mock.patch("time.time", return_value=1000):
+            with DbTxn("Add", self.db) as trans:
+                self.handles = [
+                    self.add_person(name, trans) for name in ("A", "B", "C")
+                ]
+                self.note = Note("text")
+                self.db.add_note(self.note, trans)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+
+    def new_db(self):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        return db
+
+    def add_person(self, name, trans):
+        person = Person()
+        person.get_primary_name().add_surname(Surname())
+        person.get_primary_name().get_primary_surname().set_surname(name)
+        return self.db.add_person(person, trans)
+
+    def backup(self, name, now):
+        filename = os.path.join(self.tmpdir, name)
+        with mock.patch("time.time", return_value=now):
+            BackupWriter(self.db, User()).write(filename)
+        with gzip.open(filename, "rt") as ifile:
+            header = string_to_dict(ifile.readline())
+            ifile.readline()
+            items = [string_to_dict(line) for line in ifile]
+        return filename, header, items
+
+    def change(self):
+        handle_a, handle_b, handle_c = self.handles
+        with mock.patch("time.time", return_value=3000):
+            with DbTxn("Edit", self.db) as trans:
+                person = self.db.get_person_from_handle(handle_a)
+                person.set_gender(Person.FEMALE)
+                self.db.commit_person(person, trans)
+                self.db.remove_person(handle_b, trans)
+                self.added = self.add_person("D", trans)
+                # A commit that keeps an old change time
+                self.note.set("new text")
+                self.db.commit_note(self.note, trans, 500)
+            with DbTxn("Edit and undo", self.db) as trans:
+                person = self.db.get_person_from_handle(handle_c)
+                person.set_gender(Person.MALE)
+                self.db.commit_person(person, trans)
+            self.db.undo()
+
+    def dump(self, db):
+        return {
+            obj_class.__name__: {
+                obj.handle: object_to_dict(obj)
+                for obj in db.method("iter_%s", self.plural(obj_class))()
+            }
+            for obj_class in BACKUP_CLASSES
+        }
+
+    def plural(self, obj_class):
+        return {
+            "Person": "people",
+            "Family": "families",
+            "Media": "media",
+            "Repository": "repositories",
+        }.get(obj_class.__name__, obj_class.__name__.lower() + "s")
+
+    def test_incremental(self):
+        full, header, items = self.backup("full.gbackup", 2000)
+        self.assertIsNone(header["since"])
+        self.assertEqual(len(items), 4)
+        self.assertEqual(self.db.get_backup_watermark(), 2000)
+
+        self.change()
+        delta, header, items = self.backup("delta.gbackup", 4000)
+        self.assertEqual((header["since"], header["watermark"]), (2000, 4000))
+        handle_a, handle_b, handle_c = self.handles
+        self.assertEqual(
+            {item["data"]["handle"] for item in items if "data" in item},
+            {handle_a, handle_c, self.added, self.note.handle},
+        )
+        self.assertEqual(
+            [item for item in items if "deleted" in item],
+            [{"class": "Person", "deleted": handle_b}],
+        )
+
+        restored = self.new_db()
+        try:
+            restorer = BackupRestorer(restored, User())
+            # The chain must start with a full backup
+            self.assertRaises(BackupChainError, restorer.restore, delta)
+            restorer.restore(full)
+            self.assertRaises(BackupChainError, restorer.restore, full)
+            restorer.restore(delta)
+            self.assertEqual(self.dump(restored), self.dump(self.db))
+            self.assertEqual(restored.get_backup_watermark(), 4000)
+        finally:
+            restored.close()
+
+    def test_no_changes(self):
+        self.backup("full.gbackup", 2000)
+        filename, header, items = self.backup("delta.gbackup", 4000)
+        self.assertEqual(items, [])
+        self.assertEqual(header["count"], 0)
+
+    def test_change_index(self):
+        self.db.dbapi.execute(
+            "EXPLAIN QUERY PLAN SELECT handle FROM person "
+            "WHERE json_extract(json_data, '$.change') >= ?",
+            [0],
+        )
+        plan = " ".join(str(row[-1]) for row in self.db.dbapi.fetchall())
+        self.assertIn("person_change", plan)
+
+        # A tree created without the indices gets them with its first backup
+        def has_index():
+            self.db.dbapi.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'person_change'"
+            )
+            return self.db.dbapi.fetchone() is not None
+
+        self.db.dbapi.execute("DROP INDEX person_change")
+        self.assertFalse(has_index())
+        self.backup("full.gbackup", 2000)
+        self.assertTrue(has_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
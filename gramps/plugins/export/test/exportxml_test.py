@@ -0,0 +1,87 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the parallel export to Gramps XML
+"""
+
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from gramps.gen.const import TEST_DIR
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.user import User
+from .. import exportxml
+from ..exportxml import BlockGzipFile, GrampsXmlWriter
+
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+
+class ExportXmlTest(unittest.TestCase):
+    """
+    The parallel export must write the same XML as the serial one.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.tmpdir = tempfile.mkdtemp()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmpdir)
+
+    def export(self, max_workers):
+        filename = os.path.join(self.tmpdir, "%d.gramps" % max_workers)
+        writer = GrampsXmlWriter(self.db, 0, 1, "test", User(), max_workers)
+        self.assertEqual(writer.write(filename), 1)
+        with gzip.open(filename, "rb") as ifile:
+            return ifile.read()
+
+    def test_parallel(self):
+        expect = self.export(1)
+        with mock.patch.multiple(
+            exportxml, CHUNKSIZE=50, PARALLEL_THRESHOLD=100, GZIP_BLOCK=10000
+        ):
+            self.assertEqual(self.export(3), expect)
+
+    def test_block_gzip(self):
+        data = [b"%d\n" % number for number in range(10000)]
+        for block in (1, 100, 1 << 20):
+            handle = io.BytesIO()
+            with mock.patch.object(exportxml, "GZIP_BLOCK", block):
+                ofile = BlockGzipFile(handle, 2)
+                for line in data:
+                    ofile.write(line)
+                ofile.close()
+            self.assertEqual(gzip.decompress(handle.getvalue()), b"".join(data))
+
+    def test_block_gzip_empty(self):
+        handle = io.BytesIO()
+        BlockGzipFile(handle, 2).close()
+        self.assertEqual(gzip.decompress(handle.getvalue()), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -44,7 +44,6 @@ from gi.repository import Gtk
 #
 # ------------------------------------------------------------------------
 from gramps.gen.plug import Gramplet
-from gramps.gen.lib import Date, ChildRefType
 from gramps.gui.widgets import Histogram
 from gramps.gui.plug.quick import run_quick_report_by_name
 from gramps.gen.const import GRAMPS_LOCALE as glocale
@@ -64,10 +63,9 @@ class AgeStatsGramplet(Gramplet):
         self.max_father_diff = 70
 
     def db_changed(self):
-        self.connect(self.dbstate.db, "person-add", self.update)
-        self.connect(self.dbstate.db, "person-delete", self.update)
-        self.connect(self.dbstate.db, "person-update", self.update)
-        self.connect(self.dbstate.db, "event-update", self.update)
+        self.connect(
+            self.dbstate.db.get_statistics(), "statistics-changed", self.update
+        )
 
     def build_gui(self):
         self.vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
@@ -124,45 +122,15 @@ class AgeStatsGramplet(Gramplet):
             self.vbox.remove(widget)
         if not self.dbstate.is_open():
             return
-        age_dict = defaultdict(int)
-        mother_dict = defaultdict(int)
-        father_dict = defaultdict(int)
-        age_handles = defaultdict(list)
-        mother_handles = defaultdict(list)
-        father_handles = defaultdict(list)
-        text = ""
-        count = 0
-        for person in self.dbstate.db.iter_people():
-            if count % 300 == 0:
-                yield True
-            # if birth_date and death_date, compute age
-            birth_date = self.get_date("BIRTH", person)
-            death_date = self.get_date("DEATH", person)
-            if birth_date:
-                if death_date:
-                    age = (death_date - birth_date).tuple()[0]
-                    if age >= 0:
-                        age_dict[age] += 1
-                        age_handles[age].append(person.handle)
-
-                # for each parent m/f:
-                mother, father = self.get_birth_parents(person)
-                if mother:
-                    bdate = self.get_date("BIRTH", mother)
-                    if bdate:
-                        diff = (birth_date - bdate).tuple()[0]
-                        if diff >= 0:
-                            mother_dict[diff] += 1
-                            mother_handles[diff].append(mother.handle)
-                if father:
-                    bdate = self.get_date("BIRTH", father)
-                    if bdate:
-                        diff = (birth_date - bdate).tuple()[0]
-                        if diff >= 0:
-                            father_dict[diff] += 1
-                            father_handles[diff].append(father.handle)
-
-            count += 1
+        stats = self.dbstate.db.get_statistics()
+        for _dummy in stats.iter_update():
+            yield True
+        age_handles = stats.get_lifespans()
+        mother_handles = stats.get_mother_ages()
+        father_handles = stats.get_father_ages()
+        age_dict = {age: len(handles) for age, handles in age_handles.items()}
+        mother_dict = {diff: len(handles) for diff, handles in mother_handles.items()}
+        father_dict = {diff: len(handles) for diff, handles in father_handles.items()}
 
         self.create_histogram(
             age_dict,
@@ -189,48 +157,6 @@ class AgeStatsGramplet(Gramplet):
             self.max_mother_diff,
         )
 
-    def get_date(self, event_type, person):
-        """
-        Find the birth or death date of a given person.
-        """
-        if event_type == "BIRTH":
-            ref = person.get_birth_ref()
-        else:
-            ref = person.get_death_ref()
-        if ref:
-            event = self.dbstate.db.get_event_from_handle(ref.ref)
-            date = event.get_date_object()
-            if date.is_valid():
-                return date
-        return None
-
-    def get_birth_parents(self, person):
-        """
-        Find the biological parents of a given person.
-        """
-        m_handle = None
-        f_handle = None
-        family_list = person.get_parent_family_handle_list()
-        for family_handle in family_list:
-            family = self.dbstate.db.get_family_from_handle(family_handle)
-            if family:
-                childrel = [
-                    (ref.get_mother_relation(), ref.get_father_relation())
-                    for ref in family.get_child_ref_list()
-                    if ref.ref == person.handle
-                ]
-                if childrel[0][0] == ChildRefType.BIRTH:
-                    m_handle = family.get_mother_handle()
-                if childrel[0][1] == ChildRefType.BIRTH:
-                    f_handle = family.get_father_handle()
-        mother = None
-        father = None
-        if m_handle:
-            mother = self.dbstate.db.get_person_from_handle(m_handle)
-        if f_handle:
-            father = self.dbstate.db.get_person_from_handle(f_handle)
-        return mother, father
-
     def compute_stats(self, data):
         """
         Create a table of statistics based on a dictionary of data.
@@ -36,8 +36,6 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.gettext
 
-_YIELD_INTERVAL = 350
-
 
 def make_tag_size(n, counts, mins=8, maxs=20):
     # return font sizes mins to maxs
@@ -57,9 +55,9 @@ class GivenNameCloudGramplet(Gramplet):
         self.set_text(_("No Family Tree loaded."))
 
     def db_changed(self):
-        self.connect(self.dbstate.db, "person-add", self.update)
-        self.connect(self.dbstate.db, "person-delete", self.update)
-        self.connect(self.dbstate.db, "person-update", self.update)
+        self.connect(
+            self.dbstate.db.get_statistics(), "statistics-changed", self.update
+        )
 
     def on_load(self):
         if len(self.gui.data) > 0:
@@ -71,37 +69,18 @@ class GivenNameCloudGramplet(Gramplet):
     def main(self):
         self.set_text(_("Processing...") + "\n")
         yield True
-        givensubnames = defaultdict(int)
-        representative_handle = {}
-
-        cnt = 0
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set(name.get_first_name().strip() for name in allnames)
-            for givenname in allnames:
-                nbsp = givenname.split("\u00a0")
-                if len(nbsp) > 1:  # there was an NBSP, a non-breaking space
-                    first_two = nbsp[0] + "\u00a0" + nbsp[1].split()[0]
-                    givensubnames[first_two] += 1
-                    representative_handle[first_two] = person.handle
-                    givenname = " ".join(nbsp[1].split()[1:])
-                for givensubname in givenname.split():
-                    givensubnames[givensubname] += 1
-                    representative_handle[givensubname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
+        stats = self.dbstate.db.get_statistics()
+        for _dummy in stats.iter_update():
+            yield True
 
-        total_people = cnt
+        givensubnames = stats.get_given_name_counts()
+        total_people = stats.get_number_of_people()
         givensubname_sort = []
 
-        total = cnt = 0
+        cnt = 0
         for givensubname in givensubnames:
             givensubname_sort.append((givensubnames[givensubname], givensubname))
-            total += givensubnames[givensubname]
             cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
 
         total_givensubnames = cnt
         givensubname_sort.sort(reverse=True)
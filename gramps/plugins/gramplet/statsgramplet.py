@@ -15,34 +15,17 @@
 # You should have received a copy of the GNU General Public License along
 # with this program; if not, see <https://www.gnu.org/licenses/>.
 
-# ------------------------------------------------------------------------
-#
-# Python modules
-#
-# ------------------------------------------------------------------------
-import os
-
 # ------------------------------------------------------------------------
 #
 # Gramps modules
 #
 # ------------------------------------------------------------------------
 from gramps.gen.plug import Gramplet
-from gramps.gen.utils.file import media_path_full
-from gramps.gen.datehandler import get_date
 from gramps.gen.lib import Person
 from gramps.gen.const import COLON, GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.sgettext
 
-# ------------------------------------------------------------------------
-#
-# Constants
-#
-# ------------------------------------------------------------------------
-
-_YIELD_INTERVAL = 200
-
 # ------------------------------------------------------------------------
 #
 # StatsGramplet class
@@ -60,91 +43,38 @@ class StatsGramplet(Gramplet):
         self.set_tooltip(_("Double-click item to see matches"))
 
     def db_changed(self):
-        self.connect(self.dbstate.db, "person-add", self.update)
-        self.connect(self.dbstate.db, "person-update", self.update)
-        self.connect(self.dbstate.db, "person-delete", self.update)
-        self.connect(self.dbstate.db, "family-add", self.update)
-        self.connect(self.dbstate.db, "family-delete", self.update)
-        self.connect(self.dbstate.db, "person-rebuild", self.update)
-        self.connect(self.dbstate.db, "family-rebuild", self.update)
+        self.connect(
+            self.dbstate.db.get_statistics(), "statistics-changed", self.update
+        )
 
     def main(self):
         self.set_text(_("Processing..."))
         database = self.dbstate.db
-        personList = database.iter_people()
+        stats = database.get_statistics()
+        for _dummy in stats.iter_update():
+            yield True
 
-        with_media = 0
-        total_media = 0
-        incomp_names = 0
-        disconnected = 0
-        missing_bday = 0
-        males = 0
-        females = 0
-        others = 0
-        unknowns = 0
-        bytes_cnt = 0
-        notfound = []
+        genders = stats.get_gender_counts()
+        males = genders.get(Person.MALE, 0)
+        females = genders.get(Person.FEMALE, 0)
+        others = genders.get(Person.OTHER, 0)
+        unknowns = stats.get_number_of_people() - males - females - others
+        counts = stats.get_person_counts()
 
         mobjects = database.get_number_of_media()
-        mbytes = "0"
-        for media in database.iter_media():
-            fullname = media_path_full(database, media.get_path())
-            try:
-                bytes_cnt += os.path.getsize(fullname)
-                length = len(str(bytes_cnt))
-                if bytes_cnt <= 999999:
-                    mbytes = _("less than 1")
-                else:
-                    mbytes = str(bytes_cnt)[: (length - 6)]
-            except OSError:
-                notfound.append(media.get_path())
-
-        for cnt, person in enumerate(personList):
-            length = len(person.get_media_list())
-            if length > 0:
-                with_media += 1
-                total_media += length
-
-            for name in [person.get_primary_name()] + person.get_alternate_names():
-                if name.get_first_name().strip() == "":
-                    incomp_names += 1
-                else:
-                    if name.get_surname_list():
-                        for surname in name.get_surname_list():
-                            if surname.get_surname().strip() == "":
-                                incomp_names += 1
-                    else:
-                        incomp_names += 1
-
-            if (
-                not person.get_main_parents_family_handle()
-                and not person.get_family_handle_list()
-            ):
-                disconnected += 1
-
-            birth_ref = person.get_birth_ref()
-            if birth_ref:
-                birth = database.get_event_from_handle(birth_ref.ref)
-                if not get_date(birth):
-                    missing_bday += 1
-            else:
-                missing_bday += 1
+        bytes_cnt, notfound = stats.get_media_size()
+        if bytes_cnt > 999999:
+            mbytes = str(bytes_cnt)[:-6]
+        elif notfound < mobjects:
+            mbytes = _("less than 1")
+        else:
+            mbytes = "0"
 
-            if person.get_gender() == Person.FEMALE:
-                females += 1
-            elif person.get_gender() == Person.MALE:
-                males += 1
-            elif person.get_gender() == Person.OTHER:
-                others += 1
-            else:
-                unknowns += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
         self.clear_text()
         self.append_text(_("Individuals") + "\n")
         self.append_text("----------------------------\n")
         self.link(_("Number of individuals") + COLON, "Filter", "all people")
-        self.append_text(" %s" % database.get_number_of_people())
+        self.append_text(" %s" % stats.get_number_of_people())
         self.append_text("\n")
         self.link(_("%s:") % _("Males"), "Filter", "males")
         self.append_text(" %s" % males)
@@ -167,19 +97,19 @@ class StatsGramplet(Gramplet):
         self.append_text(" %s" % unknowns)
         self.append_text("\n")
         self.link(_("%s:") % _("Incomplete names"), "Filter", "incomplete names")
-        self.append_text(" %s" % incomp_names)
+        self.append_text(" %s" % counts.incomplete_names)
         self.append_text("\n")
         self.link(
             _("%s:") % _("Individuals missing birth dates"),
             "Filter",
             "people with missing birth dates",
         )
-        self.append_text(" %s" % missing_bday)
+        self.append_text(" %s" % counts.missing_birth)
         self.append_text("\n")
         self.link(
             _("%s:") % _("Disconnected individuals"), "Filter", "disconnected people"
         )
-        self.append_text(" %s" % disconnected)
+        self.append_text(" %s" % counts.disconnected)
         self.append_text("\n")
         self.append_text("\n%s\n" % _("Family Information"))
         self.append_text("----------------------------\n")
@@ -197,14 +127,14 @@ class StatsGramplet(Gramplet):
             "Filter",
             "people with media",
         )
-        self.append_text(" %s" % with_media)
+        self.append_text(" %s" % counts.with_media)
         self.append_text("\n")
         self.link(
             _("%s:") % _("Total number of media object references"),
             "Filter",
             "media references",
         )
-        self.append_text(" %s" % total_media)
+        self.append_text(" %s" % counts.media_references)
         self.append_text("\n")
         self.link(
             _("%s:") % _("Number of unique media objects"), "Filter", "unique media"
@@ -218,5 +148,5 @@ class StatsGramplet(Gramplet):
         self.append_text(" %s %s" % (mbytes, _("MB", "Megabyte")))
         self.append_text("\n")
         self.link(_("%s:") % _("Missing Media Objects"), "Filter", "missing media")
-        self.append_text(" %s\n" % len(notfound))
+        self.append_text(" %s\n" % notfound)
         self.append_text("", scroll_to="begin")
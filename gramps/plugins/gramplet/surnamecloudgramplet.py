@@ -33,14 +33,6 @@ from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 _ = glocale.translation.sgettext
 
-# ------------------------------------------------------------------------
-#
-# Constants
-#
-# ------------------------------------------------------------------------
-
-_YIELD_INTERVAL = 350
-
 
 # ------------------------------------------------------------------------
 #
@@ -72,11 +64,9 @@ class SurnameCloudGramplet(Gramplet):
         self.set_text(_("No Family Tree loaded."))
 
     def db_changed(self):
-        self.connect(self.dbstate.db, "person-add", self.update)
-        self.connect(self.dbstate.db, "person-delete", self.update)
-        self.connect(self.dbstate.db, "person-update", self.update)
-        self.connect(self.dbstate.db, "person-rebuild", self.update)
-        self.connect(self.dbstate.db, "family-rebuild", self.update)
+        self.connect(
+            self.dbstate.db.get_statistics(), "statistics-changed", self.update
+        )
 
     def on_load(self):
         if len(self.gui.data) == 3:
@@ -94,37 +84,15 @@ class SurnameCloudGramplet(Gramplet):
     def main(self):
         self.set_text(_("Processing...") + "\n")
         yield True
-        surnames = defaultdict(int)
-        representative_handle = {}
-
-        cnt = 0
-        namelist = []
-        for person in self.dbstate.db.iter_people():
-            allnames = [person.get_primary_name()] + person.get_alternate_names()
-            allnames = set([name.get_group_name().strip() for name in allnames])
-            for surname in allnames:
-                surnames[surname] += 1
-                representative_handle[surname] = person.handle
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
-            # Count unique surnames
-            for name in [person.get_primary_name()] + person.get_alternate_names():
-                if (
-                    not name.get_surname().strip() in namelist
-                    and not name.get_surname().strip() == ""
-                ):
-                    namelist.append(name.get_surname().strip())
-
-        total_people = cnt
+        stats = self.dbstate.db.get_statistics()
+        for _dummy in stats.iter_update():
+            yield True
+
+        surnames = stats.get_surname_counts()
+        total_people = stats.get_number_of_people()
         surname_sort = []
-        total = cnt = 0
         for surname in surnames:
             surname_sort.append((surnames[surname], surname))
-            total += surnames[surname]
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
 
         surname_sort.sort(reverse=True)
         cloud_names = []
@@ -172,7 +140,7 @@ class SurnameCloudGramplet(Gramplet):
                 self.link(
                     text,
                     "Surname",
-                    representative_handle[surname],
+                    stats.get_surname_representative(surname),
                     size,
                     "%s, %d%% (%d)"
                     % (text, int((float(count) / total_people) * 100), count),
@@ -180,7 +148,8 @@ class SurnameCloudGramplet(Gramplet):
                 self.append_text(" ")
                 showing += 1
         self.append_text(
-            ("\n\n" + _("Total unique surnames") + ": %d\n") % len(namelist)
+            ("\n\n" + _("Total unique surnames") + ": %d\n")
+            % stats.get_number_of_surnames()
         )
         self.append_text((_("Total surnames showing") + ": %d\n") % showing)
         self.append_text((_("Total people") + ": %d") % total_people, "begin")
@@ -15,13 +15,6 @@
 # You should have received a copy of the GNU General Public License along
 # with this program; if not, see <https://www.gnu.org/licenses/>.
 
-# ------------------------------------------------------------------------
-#
-# Python modules
-#
-# ------------------------------------------------------------------------
-from collections import defaultdict
-
 # ------------------------------------------------------------------------
 #
 # Gramps modules
@@ -41,8 +34,6 @@ _ = glocale.translation.sgettext
 # Constants
 #
 # ------------------------------------------------------------------------
-_YIELD_INTERVAL = 350
-
 NUM_SURNAMES = _("Number of Surnames to display")
 
 
@@ -90,11 +81,9 @@ class TopSurnamesGramplet(Gramplet):
         self.set_text(_("No Family Tree loaded."))
 
     def db_changed(self):
-        self.connect(self.dbstate.db, "person-add", self.update)
-        self.connect(self.dbstate.db, "person-delete", self.update)
-        self.connect(self.dbstate.db, "person-update", self.update)
-        self.connect(self.dbstate.db, "person-rebuild", self.update)
-        self.connect(self.dbstate.db, "family-rebuild", self.update)
+        self.connect(
+            self.dbstate.db.get_statistics(), "statistics-changed", self.update
+        )
         self.set_text(_("No Family Tree loaded."))
 
     def build_options(self):
@@ -112,17 +101,12 @@ class TopSurnamesGramplet(Gramplet):
 
     def main(self):
         self.set_text(_("Processing...") + "\n")
-        surnames: dict[str, int] = defaultdict(int)
-        representative_handle: dict[str, PersonHandle] = {}
-
-        cnt = 0
-        for person in self.dbstate.db.iter_people():
-            record_surnames(person, surnames, representative_handle)
-            cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
+        stats = self.dbstate.db.get_statistics()
+        for _dummy in stats.iter_update():
+            yield True
 
-        total_people = cnt
+        surnames = stats.get_surname_counts()
+        total_people = stats.get_number_of_people()
         surname_sort = []
         total = 0
 
@@ -131,8 +115,6 @@ class TopSurnamesGramplet(Gramplet):
             surname_sort.append((surnames[surname], surname))
             total += surnames[surname]
             cnt += 1
-            if not cnt % _YIELD_INTERVAL:
-                yield True
 
         total_surnames = cnt
         surname_sort.sort(reverse=True)
@@ -144,7 +126,7 @@ class TopSurnamesGramplet(Gramplet):
             text = "%s, " % (surname if surname else nosurname)
             text += "%d%% (%d)\n" % (int((float(count) / total) * 100), count)
             self.append_text(" %d. " % (line + 1))
-            self.link(text, "Surname", representative_handle[surname])
+            self.link(text, "Surname", stats.get_surname_representative(surname))
             line += 1
             if line >= self.top_size:
                 break
@@ -228,6 +228,8 @@ class RelGraphReport(Report):
             self.rel_calc = get_relationship_calculator(
                 reinit=True, clocale=self._locale
             )
+            # the database doesn't change while the report is written
+            self.rel_calc.storemap = True
 
         if __debug__:
             self.advrelinfo = get_value("advrelinfo")
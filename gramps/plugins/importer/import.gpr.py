@@ -126,6 +126,27 @@ plg.ptype = IMPORT
 plg.import_function = "importData"
 plg.extension = "gramps"
 
+# ------------------------------------------------------------------------
+#
+# Gramps incremental backup
+#
+# ------------------------------------------------------------------------
+
+plg = newplugin()
+plg.id = "im_backup"
+plg.name = _("Gramps incremental backup")
+plg.description = _(
+    "Restore a full backup into an empty family tree, or apply the "
+    "next incremental backup of the chain to a restored family tree."
+)
+plg.version = "1.0"
+plg.gramps_target_version = MODULE_VERSION
+plg.status = STABLE
+plg.fname = "importbackup.py"
+plg.ptype = IMPORT
+plg.import_function = "importData"
+plg.extension = "gbackup"
+
 # ------------------------------------------------------------------------
 #
 # GRDB database
@@ -0,0 +1,174 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Restore a family tree from a full backup and a chain of incremental backups.
+
+The backups must be imported in the order they were written, starting with
+the full backup into an empty family tree::
+
+    gramps -C Restored -i full.gbackup -i delta1.gbackup -i delta2.gbackup
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import gzip
+import logging
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.db import DbTxn
+from gramps.gen.lib.json_utils import data_to_object, string_to_dict
+from gramps.gen.updatecallback import UpdateCallback
+from gramps.plugins.export.exportbackup import (
+    BACKUP_CLASSES,
+    BACKUP_FORMAT,
+    BACKUP_VERSION,
+)
+
+_ = glocale.translation.gettext
+LOG = logging.getLogger(".ImportBackup")
+
+
+# -------------------------------------------------------------------------
+#
+# BackupChainError
+#
+# -------------------------------------------------------------------------
+class BackupChainError(Exception):
+    """
+    Error raised when a backup does not follow the last restored one.
+    """
+
+
+# -------------------------------------------------------------------------
+#
+# importData
+#
+# -------------------------------------------------------------------------
+def importData(database, filename, user):
+    """
+    Restore a backup into the database.
+    """
+    restorer = BackupRestorer(database, user)
+    try:
+        restorer.restore(filename)
+    except (OSError, ValueError, KeyError) as msg:
+        user.notify_error(_("Error reading %s") % filename, str(msg))
+    except BackupChainError as msg:
+        user.notify_error(_("%s can't be restored") % filename, str(msg))
+
+
+# -------------------------------------------------------------------------
+#
+# BackupRestorer
+#
+# -------------------------------------------------------------------------
+class BackupRestorer(UpdateCallback):
+    """
+    Apply a full or incremental backup to a database.
+    """
+
+    def __init__(self, db, user):
+        UpdateCallback.__init__(self, user.callback)
+        self.db = db
+
+    def restore(self, filename):
+        """
+        Apply a backup, and record its watermark in the database so that the
+        next incremental backup of the chain can be applied.
+        """
+        with gzip.open(filename, "rt", encoding="utf-8") as ifile:
+            header = string_to_dict(ifile.readline())
+            if header.get("format") != BACKUP_FORMAT:
+                raise ValueError(_("The file is not a Gramps backup."))
+            if header["version"] > BACKUP_VERSION:
+                raise ValueError(
+                    _("The backup was written by a newer version of Gramps.")
+                )
+            self.check_chain(header["since"])
+            if header["count"]:
+                self.set_total(header["count"])
+            metadata = string_to_dict(ifile.readline())
+
+            classes = {obj_class.__name__ for obj_class in BACKUP_CLASSES}
+            self.db.disable_signals()
+            try:
+                with DbTxn(_("Restore backup"), self.db, batch=True) as trans:
+                    for line in ifile:
+                        item = string_to_dict(line)
+                        name = item["class"]
+                        if name not in classes:
+                            raise ValueError(_("Unknown object class %s") % name)
+                        if "deleted" in item:
+                            handle = item["deleted"]
+                            if self.db.method("has_%s_handle", name)(handle):
+                                self.db.method("remove_%s", name)(handle, trans)
+                        else:
+                            obj = data_to_object(item["data"])
+                            # Keep the change time of the backed up object
+                            commit = self.db.method("commit_%s", name)
+                            commit(obj, trans, obj.change)
+                        self.update()
+                    self.restore_metadata(metadata)
+            finally:
+                self.db.enable_signals()
+                self.db.request_rebuild()
+        self.db.set_backup_watermark(header["watermark"])
+
+    def check_chain(self, since):
+        """
+        Check that the backup can be applied to the database.
+        """
+        if since is None:
+            if self.db.get_total():
+                raise BackupChainError(
+                    _("A full backup can only be restored into an empty family tree.")
+                )
+        elif self.db.get_backup_watermark() != since:
+            raise BackupChainError(
+                _(
+                    "This incremental backup does not follow the last backup "
+                    "that was restored into the family tree."
+                )
+            )
+
+    def restore_metadata(self, metadata):
+        """
+        Restore the metadata of the tree.
+        """
+        self.db.set_researcher(data_to_object(metadata["researcher"]))
+        if metadata["mediapath"] is not None:
+            self.db.set_mediapath(metadata["mediapath"])
+        self.db.name_formats = [tuple(fmt) for fmt in metadata["name_formats"]]
+        name_groups = metadata["name_groups"]
+        for name in self.db.get_name_group_keys():
+            if name not in name_groups:
+                self.db.set_name_group_mapping(name, None)
+        for name, group in name_groups.items():
+            self.db.set_name_group_mapping(name, group)
+        for name, handles in metadata["bookmarks"].items():
+            self.db.method("get_%s", name)().set(handles)
@@ -537,7 +537,7 @@ class CSVParser:
         ) as step:
             tym = time.time()
             self.db.disable_signals()
-            with DbTxn(_("CSV import"), self.db, batch=True) as self.trans:
+            with DbTxn(_("CSV import"), self.db, bulk=True) as self.trans:
                 if self.default_tag and self.default_tag.handle is None:
                     self.db.add_tag(self.default_tag, self.trans)
                 self._parse_csv_data(data, step)
@@ -120,9 +120,17 @@ def importData(database, filename, user):
         if code_set:
             stage_one.set_encoding(code_set)
         ifile.seek(0)
+        pipeline = stage_one.get_line_count() >= libgedcom.PIPELINE_LINES
         if database.get_feature("skip-import-additions"):  # don't add source or tags
             gedparse = libgedcom.GedcomParser(
-                database, ifile, filename, user, stage_one, None, None
+                database,
+                ifile,
+                filename,
+                user,
+                stage_one,
+                None,
+                None,
+                pipeline=pipeline,
             )
         else:
             gedparse = libgedcom.GedcomParser(
@@ -137,6 +145,7 @@ def importData(database, filename, user):
                     if config.get("preferences.tag-on-import")
                     else None
                 ),
+                pipeline=pipeline,
             )
     except IOError as msg:
         user.notify_error(_("%s could not be opened\n") % filename, str(msg))
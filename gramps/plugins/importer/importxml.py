@@ -28,7 +28,9 @@
 #
 # -------------------------------------------------------------------------
 import os
+import queue
 import sys
+import threading
 import time
 from xml.parsers.expat import ExpatError, ParserCreate
 from xml.sax.saxutils import escape
@@ -113,6 +115,7 @@ from gramps.gen.db.dbconst import (
     TAG_KEY,
     CITATION_KEY,
     CLASS_TO_KEY_MAP,
+    KEY_TO_NAME_MAP,
 )
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.version import VERSION
@@ -137,6 +140,11 @@ except:
 
 PERSON_RE = re.compile(r"\s*\<person\s(.*)$")
 
+# Pipelined import of large files
+PIPELINE_LINES = 500000  # number of lines from which importData uses it
+READ_BLOCK = 1 << 20  # bytes handed over by the reader thread at a time
+READ_QUEUE = 16  # blocks read ahead by the reader thread
+
 CHILD_REL_MAP = {
     "Birth": ChildRefType(ChildRefType.BIRTH),
     "Adopted": ChildRefType(ChildRefType.ADOPTED),
@@ -169,6 +177,7 @@ def importData(database, filename, user):
     database.fmap = {}
     line_cnt = 1
     person_cnt = 0
+    pipeline = False
 
     with ImportOpenFileContextManager(filename, user) as xml_file:
         if xml_file is None:
@@ -178,8 +187,12 @@ def importData(database, filename, user):
             change = time.time()
         else:
             change = os.path.getmtime(filename)
+            linecounter = LineParser(filename)
+            line_cnt = linecounter.get_count()
+            person_cnt = linecounter.get_person_count()
+            pipeline = line_cnt >= PIPELINE_LINES
         if database.get_feature("skip-import-additions"):  # don't add source or tags
-            parser = GrampsParser(database, user, change, None)
+            parser = GrampsParser(database, user, change, None, pipeline=pipeline)
         else:
             parser = GrampsParser(
                 database,
@@ -190,13 +203,9 @@ def importData(database, filename, user):
                     if config.get("preferences.tag-on-import")
                     else None
                 ),
+                pipeline=pipeline,
             )
 
-        if filename != "-":
-            linecounter = LineParser(filename)
-            line_cnt = linecounter.get_count()
-            person_cnt = linecounter.get_person_count()
-
         read_only = database.readonly
         database.readonly = False
 
@@ -527,13 +536,72 @@ class ImportOpenFileContextManager:
         return xml_file
 
 
+# -------------------------------------------------------------------------
+#
+# BlockReader
+#
+# -------------------------------------------------------------------------
+class BlockReader:
+    """
+    Iterate over the blocks of a file, which are read ahead by a separate
+    thread, so that decompressing the file overlaps with parsing it.
+    """
+
+    def __init__(self, ifile):
+        self.ifile = ifile
+        self.blocks = queue.Queue(READ_QUEUE)
+        self.stopped = False
+
+    def __iter__(self):
+        thread = threading.Thread(target=self.__produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = self.blocks.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.stopped = True
+            thread.join()
+
+    def __produce(self):
+        """read the file in the reader thread"""
+        try:
+            while not self.stopped:
+                block = self.ifile.read(READ_BLOCK)
+                if not block:
+                    break
+                self.__put(block)
+        except Exception as err:
+            self.__put(err)
+        self.__put(None)
+
+    def __put(self, item):
+        """hand over an item to the parser, unless it has stopped reading"""
+        while not self.stopped:
+            try:
+                self.blocks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+
 # -------------------------------------------------------------------------
 #
 # Gramps database parsing class.  Derived from SAX XML parser
 #
 # -------------------------------------------------------------------------
 class GrampsParser(UpdateCallback):
-    def __init__(self, database, user, change, default_tag_format=None):
+    """
+    In pipeline mode, the file is read ahead by a BlockReader, and the
+    handles and Gramps IDs already in the database are read once, instead of
+    querying the database for each object of the file.
+    """
+
+    def __init__(self, database, user, change, default_tag_format=None, pipeline=False):
         UpdateCallback.__init__(self, user.callback)
         self.user = user
         self.__gramps_version = "unknown"
@@ -553,6 +621,10 @@ class GrampsParser(UpdateCallback):
         self.gid2nid = {}
         self.childref_map = {}
         self.change = change
+        self.pipeline = pipeline
+        # {target: set(handle)} and {key: set(gramps_id)} in pipeline mode
+        self.known_handles = None
+        self.known_ids = None
         self.dp = parser
         self.info = ImportInfo()
         self.all_abs = True
@@ -859,21 +931,11 @@ class GrampsParser(UpdateCallback):
                 while handle in self.import_handles:
                     handle = create_id()
             else:
-                has_handle_func = {
-                    "person": self.db.has_person_handle,
-                    "family": self.db.has_family_handle,
-                    "event": self.db.has_event_handle,
-                    "place": self.db.has_place_handle,
-                    "source": self.db.has_source_handle,
-                    "citation": self.db.get_raw_citation_data,
-                    "repository": self.db.has_repository_handle,
-                    "media": self.db.has_media_handle,
-                    "note": self.db.has_note_handle,
-                    "tag": self.db.has_tag_handle,
-                }[target]
-                while has_handle_func(handle):
+                while self.has_handle(target, handle):
                     handle = create_id()
             self.import_handles[orig_handle] = {target: [handle, False]}
+        if self.known_handles is not None:
+            self.known_handles[target].add(handle)
         # method is called by a reference
         if isinstance(prim_obj, abc.Callable):
             prim_obj = prim_obj()
@@ -917,17 +979,6 @@ class GrampsParser(UpdateCallback):
             "reference",
             self.gid2nid,
         ][key]
-        has_handle_func = [
-            self.db.has_person_handle,
-            self.db.has_family_handle,
-            self.db.has_source_handle,
-            self.db.has_event_handle,
-            self.db.has_media_handle,
-            self.db.has_place_handle,
-            self.db.has_repository_handle,
-            "reference",
-            self.db.has_note_handle,
-        ][key]
         add_func = [
             self.db.add_person,
             self.db.add_family,
@@ -1004,9 +1055,12 @@ class GrampsParser(UpdateCallback):
             temp_obj = data_to_object(raw)
             prim_obj.set_object_state(temp_obj.get_object_state())
         else:
+            target = KEY_TO_NAME_MAP[key]
             handle = create_id()
-            while has_handle_func(handle):
+            while self.has_handle(target, handle):
                 handle = create_id()
+            if self.known_handles is not None:
+                self.known_handles[target].add(handle)
             if isinstance(prim_obj, abc.Callable):
                 prim_obj = prim_obj()
             prim_obj.set_handle(handle)
@@ -1037,19 +1091,55 @@ class GrampsParser(UpdateCallback):
         """
         gramps_id = id2user_format(id_)
         if gramps_id is None or not gramps_ids.get(id_):
-            if gramps_id is None or has_gramps_id(gramps_id):
+            if self.known_ids is not None:
+                known_ids = self.known_ids[key]
+                if gramps_id is None or gramps_id in known_ids:
+                    gramps_ids[id_] = find_next_gramps_id()
+                else:
+                    gramps_ids[id_] = gramps_id
+                known_ids.add(gramps_ids[id_])
+            elif gramps_id is None or has_gramps_id(gramps_id):
                 gramps_ids[id_] = find_next_gramps_id()
             else:
                 gramps_ids[id_] = gramps_id
         return gramps_ids[id_]
 
+    def record_id(self, key, obj):
+        """
+        Record the Gramps ID the database gave to an object created by the
+        import, so that legalize_id does not give the same ID to another
+        object.
+        """
+        if self.known_ids is not None:
+            self.known_ids[key].add(obj.get_gramps_id())
+
+    def has_handle(self, target, handle):
+        """
+        Return True if the database has an object of the target type with the
+        given handle.
+        """
+        if self.known_handles is not None:
+            return handle in self.known_handles[target]
+        return self.db.method("has_%s_handle", target)(handle)
+
+    def read_known_keys(self):
+        """
+        Read the handles and Gramps IDs that are already in the database.
+        """
+        self.known_handles = {}
+        self.known_ids = {}
+        for key, target in KEY_TO_NAME_MAP.items():
+            self.known_handles[target] = set(self.db.method("get_%s_handles", target)())
+            if key != TAG_KEY:
+                self.known_ids[key] = set(self.db.method("get_%s_gramps_ids", target)())
+
     def parse(self, ifile, linecount=1, personcount=0):
         """
         Parse the xml file
         :param ifile: must be a file handle that is already open, with position
                       at the start of the file
         """
-        with DbTxn(_("Gramps XML import"), self.db, batch=True) as self.trans:
+        with DbTxn(_("Gramps XML import"), self.db, bulk=True) as self.trans:
             self.set_total(linecount)
 
             self.db.disable_signals()
@@ -1057,11 +1147,19 @@ class GrampsParser(UpdateCallback):
             if self.default_tag and self.default_tag.handle is None:
                 self.db.add_tag(self.default_tag, self.trans)
 
+            if self.pipeline:
+                self.read_known_keys()
+
             self.p = ParserCreate()
             self.p.StartElementHandler = self.startElement
             self.p.EndElementHandler = self.endElement
             self.p.CharacterDataHandler = self.characters
-            self.p.ParseFile(ifile)
+            if self.pipeline:
+                for block in BlockReader(ifile):
+                    self.p.Parse(block, False)
+                self.p.Parse(b"", True)
+            else:
+                self.p.ParseFile(ifile)
 
             if len(self.name_formats) > 0:
                 # add new name formats to the existing table
@@ -1259,8 +1357,8 @@ class GrampsParser(UpdateCallback):
         self.placeobj = Place()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
-            is_merge_candidate = (
-                self.replace_import_handle and self.db.has_place_handle(orig_handle)
+            is_merge_candidate = self.replace_import_handle and self.has_handle(
+                "place", orig_handle
             )
             self.inaugurate(orig_handle, "place", self.placeobj)
             gramps_id = self.legalize_id(
@@ -1357,6 +1455,7 @@ class GrampsParser(UpdateCallback):
             note.type.set(NoteType.EVENT)
             note.private = self.event.private
             self.db.add_note(note, self.trans)
+            self.record_id(NOTE_KEY, note)
             # set correct change time
             self.db.commit_note(note, self.trans, self.change)
             self.info.add("new-object", NOTE_KEY, note)
@@ -1397,6 +1496,7 @@ class GrampsParser(UpdateCallback):
             self.event.type = EventType()
             self.event.type.set_from_xml_str(attrs["type"])
             self.db.add_event(self.event, self.trans)
+            self.record_id(EVENT_KEY, self.event)
             # set correct change time
             self.db.commit_event(self.event, self.trans, self.change)
             self.info.add("new-object", EVENT_KEY, self.event)
@@ -1406,8 +1506,8 @@ class GrampsParser(UpdateCallback):
             self.event = Event()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
-                is_merge_candidate = (
-                    self.replace_import_handle and self.db.has_event_handle(orig_handle)
+                is_merge_candidate = self.replace_import_handle and self.has_handle(
+                    "event", orig_handle
                 )
                 self.inaugurate(orig_handle, "event", self.event)
                 gramps_id = self.legalize_id(
@@ -1629,8 +1729,8 @@ class GrampsParser(UpdateCallback):
         self.person = Person()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
-            is_merge_candidate = (
-                self.replace_import_handle and self.db.has_person_handle(orig_handle)
+            is_merge_candidate = self.replace_import_handle and self.has_handle(
+                "person", orig_handle
             )
             self.inaugurate(orig_handle, "person", self.person)
             gramps_id = self.legalize_id(
@@ -1765,8 +1865,8 @@ class GrampsParser(UpdateCallback):
         self.family = Family()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
-            is_merge_candidate = (
-                self.replace_import_handle and self.db.has_family_handle(orig_handle)
+            is_merge_candidate = self.replace_import_handle and self.has_handle(
+                "family", orig_handle
             )
             self.inaugurate(orig_handle, "family", self.family)
             gramps_id = self.legalize_id(
@@ -2053,8 +2153,8 @@ class GrampsParser(UpdateCallback):
             self.note = Note()
             if "handle" in attrs:
                 orig_handle = attrs["handle"].replace("_", "")
-                is_merge_candidate = (
-                    self.replace_import_handle and self.db.has_note_handle(orig_handle)
+                is_merge_candidate = self.replace_import_handle and self.has_handle(
+                    "note", orig_handle
                 )
                 self.inaugurate(orig_handle, "note", self.note)
                 gramps_id = self.legalize_id(
@@ -2150,6 +2250,7 @@ class GrampsParser(UpdateCallback):
                 self.note.private = self.repo.private
 
             self.db.add_note(self.note, self.trans)
+            self.record_id(NOTE_KEY, self.note)
             # set correct change time
             self.db.commit_note(self.note, self.trans, self.change)
             self.info.add("new-object", NOTE_KEY, self.note)
@@ -2257,8 +2358,8 @@ class GrampsParser(UpdateCallback):
         self.update(self.p.CurrentLineNumber)
         self.citation = Citation()
         orig_handle = attrs["handle"].replace("_", "")
-        is_merge_candidate = self.replace_import_handle and self.db.has_citation_handle(
-            orig_handle
+        is_merge_candidate = self.replace_import_handle and self.has_handle(
+            "citation", orig_handle
         )
         self.inaugurate(orig_handle, "citation", self.citation)
         gramps_id = self.legalize_id(
@@ -2306,6 +2407,7 @@ class GrampsParser(UpdateCallback):
             self.citation.private = bool(attrs.get("priv"))
 
             citation_handle = self.db.add_citation(self.citation, self.trans)
+            self.record_id(CITATION_KEY, self.citation)
             self.__add_citation(citation_handle)
 
     def start_source(self, attrs):
@@ -2317,8 +2419,8 @@ class GrampsParser(UpdateCallback):
         self.source = Source()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
-            is_merge_candidate = (
-                self.replace_import_handle and self.db.has_source_handle(orig_handle)
+            is_merge_candidate = self.replace_import_handle and self.has_handle(
+                "source", orig_handle
             )
             self.inaugurate(orig_handle, "source", self.source)
             gramps_id = self.legalize_id(
@@ -2401,8 +2503,8 @@ class GrampsParser(UpdateCallback):
         self.object = Media()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
-            is_merge_candidate = (
-                self.replace_import_handle and self.db.has_media_handle(orig_handle)
+            is_merge_candidate = self.replace_import_handle and self.has_handle(
+                "media", orig_handle
             )
             self.inaugurate(orig_handle, "media", self.object)
             gramps_id = self.legalize_id(
@@ -2443,9 +2545,8 @@ class GrampsParser(UpdateCallback):
         self.repo = Repository()
         if "handle" in attrs:
             orig_handle = attrs["handle"].replace("_", "")
-            is_merge_candidate = (
-                self.replace_import_handle
-                and self.db.has_repository_handle(orig_handle)
+            is_merge_candidate = self.replace_import_handle and self.has_handle(
+                "repository", orig_handle
             )
             self.inaugurate(orig_handle, "repository", self.repo)
             gramps_id = self.legalize_id(
@@ -2510,6 +2611,7 @@ class GrampsParser(UpdateCallback):
                 self.photo.add_attribute(attr)
         self.photo.set_mime_type(get_type(self.photo.get_path()))
         self.db.add_media(self.photo, self.trans)
+        self.record_id(MEDIA_KEY, self.photo)
         # set correct change time
         self.db.commit_media(self.photo, self.trans, self.change)
         self.info.add("new-object", MEDIA_KEY, self.photo)
@@ -2805,6 +2907,7 @@ class GrampsParser(UpdateCallback):
             note.type.set(NoteType.EVENT)
             note.private = self.event.private
             self.db.add_note(note, self.trans)
+            self.record_id(NOTE_KEY, note)
             # set correct change time
             self.db.commit_note(note, self.trans, self.change)
             self.info.add("new-object", NOTE_KEY, note)
@@ -2829,6 +2932,9 @@ class GrampsParser(UpdateCallback):
 
         if self.__xml_version < (1, 6, 0):
             self.place_import.generate_hierarchy(self.trans)
+            if self.known_ids is not None:
+                # The new places got their Gramps IDs from the database
+                self.known_ids[PLACE_KEY] = set(self.db.get_place_gramps_ids())
 
     def stop_photo(self, *tag):
         self.photo = None
@@ -2936,6 +3042,7 @@ class GrampsParser(UpdateCallback):
             note.type.set(NoteType.EVENT)
             note.private = self.event.private
             self.db.add_note(note, self.trans)
+            self.record_id(NOTE_KEY, note)
             # set correct change time
             self.db.commit_note(note, self.trans, self.change)
             self.info.add("new-object", NOTE_KEY, note)
@@ -3171,6 +3278,7 @@ class GrampsParser(UpdateCallback):
         note.set(text)
         note.type.set(NoteType.SOURCE_TEXT)
         self.db.add_note(note, self.trans)
+        self.record_id(NOTE_KEY, note)
         # set correct change time
         self.db.commit_note(note, self.trans, self.change)
         self.info.add("new-object", NOTE_KEY, note)
@@ -3188,6 +3296,7 @@ class GrampsParser(UpdateCallback):
         note.set(text)
         note.type.set(NoteType.CITATION)
         self.db.add_note(note, self.trans)
+        self.record_id(NOTE_KEY, note)
         # set correct change time
         self.db.commit_note(note, self.trans, self.change)
         self.info.add("new-object", NOTE_KEY, note)
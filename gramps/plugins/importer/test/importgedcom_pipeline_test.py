@@ -0,0 +1,150 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Unittest for the pipelined GEDCOM import"""
+
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from gramps.cli.user import User as CliUser
+from gramps.gen.db.utils import make_database
+from gramps.plugins.lib import libgedcom
+from gramps.plugins.lib.libmixin import DbMixin
+
+GEDCOM_FIXTURE = """\
+0 HEAD
+1 SOUR Test
+1 GEDC
+2 VERS 5.5.1
+2 FORM LINEAGE-LINKED
+1 CHAR UTF-8
+0 @I1@ INDI
+1 NAME John /Smith/
+1 SEX M
+1 BIRT
+2 DATE 5 MAR 1899
+1 FAMS @F1@
+1 NOTE First line
+2 CONT second line
+2 CONC , continued
+0 @I0001@ INDI
+1 NAME Mary /Jones/
+1 SEX F
+1 FAMS @F1@
+this line is not valid
+0 @I2@ INDI
+1 NAME Peter /Smith/
+1 FAMC @F1@
+1 FAMC @F2@
+0 @F1@ FAM
+1 HUSB @I1@
+1 WIFE @I0001@
+1 CHIL @I2@
+1 CHIL @I3@
+0 TRLR
+"""
+
+
+class CapturingUser(CliUser):
+    """CLI ``User`` whose output is captured into a :class:`io.StringIO`."""
+
+    def __init__(self):
+        self.buf = io.StringIO()
+        super().__init__(error=self.buf, callback=lambda *a, **k: None)
+        self._fileout = self.buf
+
+
+class GedcomPipelineTest(unittest.TestCase):
+    """
+    The pipelined import must give the same result as the ordinary one.
+    """
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".ged", text=True)
+        with os.fdopen(fd, "w") as f:
+            f.write(GEDCOM_FIXTURE)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def _import(self, pipeline):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        # As in importData
+        if DbMixin not in db.__class__.__bases__:
+            db.__class__.__bases__ = (DbMixin,) + db.__class__.__bases__
+        user = CapturingUser()
+        with open(self.path, "rb") as ifile:
+            stage_one = libgedcom.GedcomStageOne(ifile)
+            stage_one.parse()
+            ifile.seek(0)
+            parser = libgedcom.GedcomParser(
+                db, ifile, self.path, user, stage_one, None, None, pipeline=pipeline
+            )
+            parser.parse_gedcom_file(False)
+        people = {
+            person.gramps_id: (
+                person.get_primary_name().get_name(),
+                [db.get_family_from_handle(h).gramps_id for h in person.family_list],
+                [
+                    db.get_note_from_handle(h).get() + "|"
+                    for h in person.get_note_list()
+                ],
+            )
+            for person in db.iter_people()
+        }
+        db.close()
+        return people, user.buf.getvalue()
+
+    def test_same_result(self):
+        people, report = self._import(False)
+        self.assertEqual(len(people), 4)
+        self.assertIn("Line ignored", report)
+        self.assertEqual(self._import(True), (people, report))
+
+    def test_small_blocks(self):
+        with mock.patch.multiple(libgedcom, LEXER_BLOCK=2, LEXER_QUEUE=1):
+            self.assertEqual(self._import(True), self._import(False))
+
+    def test_id_mapper(self):
+        store = libgedcom.XrefStore()
+        try:
+            ids = iter(["I0002", "I0003"])
+            mapper = libgedcom.IdMapper(
+                lambda gid: False,
+                lambda: next(ids),
+                lambda gid: "I%04d" % int(gid[1:]),
+                store,
+            )
+            self.assertEqual(mapper["@I1@"], "I0001")
+            # I0001 is taken by I1, so a new ID is used
+            self.assertEqual(mapper["@I0001@"], "I0002")
+            self.assertEqual(mapper["I1"], "I0001")
+            self.assertEqual(
+                dict(mapper.map().items()), {"I1": "I0001", "I0001": "I0002"}
+            )
+        finally:
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Unittest for the pipelined Gramps XML import"""
+
+import io
+import os
+import unittest
+from unittest import mock
+
+from gramps.gen.const import TEST_DIR
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person
+from gramps.gen.lib.json_utils import object_to_dict
+from gramps.gen.user import User
+from gramps.plugins.importer import importxml
+
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+CLASSES = ("people", "families", "events", "places", "sources", "citations")
+CLASSES += ("repositories", "media", "notes", "tags")
+
+WITNESS = """<?xml version="1.0" encoding="UTF-8"?>
+<database xmlns="http://gramps-project.org/xml/1.1.0/">
+  <header><created date="2000-01-01" version="3.0.0"/></header>
+  <events>
+    <event handle="_e0" id="E0000">
+      <type>Birth</type>
+      <witness name="John Smith"/>
+    </event>
+  </events>
+  <notes>
+    <note handle="_n0" id="N0000" type="General"><text>Note</text></note>
+  </notes>
+</database>
+"""
+
+DANGLING = """<?xml version="1.0" encoding="UTF-8"?>
+<database xmlns="http://gramps-project.org/xml/1.7.1/">
+  <header><created date="2000-01-01" version="5.2.0"/></header>
+  <people>
+    <person handle="_p1" id="I0001">
+      <gender>M</gender>
+      <parentin hlink="_f1"/>
+    </person>
+    <person handle="_p2" id="I0002">
+      <gender>F</gender>
+      <childof hlink="_f1"/>
+    </person>
+  </people>
+</database>
+"""
+
+
+class XmlPipelineTest(unittest.TestCase):
+    """
+    The pipelined import must give the same result as the ordinary one.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with open(EXAMPLE, "rb") as ifile:
+            cls.data = ifile.read()
+
+    def _import(self, pipeline, times=1):
+        db = make_database("sqlite")
+        db.load(":memory:")
+        for dummy in range(times):
+            parser = importxml.GrampsParser(db, User(), 0, pipeline=pipeline)
+            parser.parse(io.BytesIO(self.data))
+        objects = {
+            name: sorted(
+                (object_to_dict(obj) for obj in db.method("iter_%s", name)()),
+                key=lambda data: data["handle"],
+            )
+            for name in CLASSES
+        }
+        db.close()
+        return objects
+
+    def test_same_result(self):
+        with mock.patch.object(importxml, "READ_BLOCK", 1000):
+            self.assertEqual(self._import(True), self._import(False))
+
+    def test_import_twice(self):
+        # The second import gets new handles and Gramps IDs
+        def gramps_ids(objects):
+            return {
+                name: sorted(obj.get("gramps_id", obj.get("name")) for obj in items)
+                for name, items in objects.items()
+            }
+
+        objects = self._import(False, 2)
+        self.assertEqual(len(objects["people"]), 2 * 2128)
+        self.assertEqual(gramps_ids(self._import(True, 2)), gramps_ids(objects))
+
+    def test_created_ids(self):
+        # A note made from a witness name must not share its Gramps ID with
+        # a note of the file
+        data = WITNESS.encode("utf-8")
+        for pipeline in (False, True):
+            db = make_database("sqlite")
+            db.load(":memory:")
+            parser = importxml.GrampsParser(db, User(), 0, pipeline=pipeline)
+            parser.parse(io.BytesIO(data))
+            gramps_ids = [note.gramps_id for note in db.iter_notes()]
+            db.close()
+            self.assertEqual(len(gramps_ids), 2)
+            self.assertEqual(len(set(gramps_ids)), 2, gramps_ids)
+
+    def test_dangling_family(self):
+        # The family made for a missing one gets the people referring to it
+        for pipeline in (False, True):
+            db = make_database("sqlite")
+            db.load(":memory:")
+            parser = importxml.GrampsParser(db, User(), 0, pipeline=pipeline)
+            parser.parse(io.BytesIO(DANGLING.encode("utf-8")))
+            (family,) = db.iter_families()
+            people = {person.gender: person.handle for person in db.iter_people()}
+            child_handles = [ref.ref for ref in family.get_child_ref_list()]
+            db.close()
+            self.assertEqual(family.get_father_handle(), people[Person.MALE])
+            self.assertEqual(child_handles, [people[Person.FEMALE]])
+
+    def test_read_error(self):
+        ifile = mock.Mock()
+        ifile.read.side_effect = OSError("broken")
+        with self.assertRaises(OSError):
+            for dummy in importxml.BlockReader(ifile):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
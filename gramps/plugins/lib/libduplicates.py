@@ -0,0 +1,565 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Detection of potential duplicate people.
+
+The comparison features of every person are computed once.  People are
+then grouped by a blocking index, and only the pairs of people that share
+a block are scored.  Scoring does not need the database, so large trees
+are scored in a pool of worker processes.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import multiprocessing
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import chain
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.lib import Date, Person
+from gramps.gen.soundex import soundex
+
+LOG = logging.getLogger(".finddupes")
+
+# Number of candidate pairs scored by a worker at a time
+CHUNKSIZE = 5000
+
+# Don't start worker processes for fewer candidate pairs than this
+PARALLEL_THRESHOLD = 4 * CHUNKSIZE
+
+# Indices into the tuples of person features
+NAME, GENDER, BIRTH, DEATH, PARENTS, FAMILIES = range(6)
+
+
+# -------------------------------------------------------------------------
+#
+# Helper functions
+#
+# -------------------------------------------------------------------------
+@lru_cache(maxsize=65536)
+def _soundex(value):
+    try:
+        return soundex(value)
+    except UnicodeEncodeError:
+        return value
+
+
+def is_initial(name):
+    if len(name) > 2:
+        return 0
+    elif len(name) == 2:
+        if name[0] == name[0].upper() and name[1] == ".":
+            return 1
+    else:
+        return name[0] == name[0].upper()
+
+
+def get_surnames(name):
+    """Construct a full surname of the surnames"""
+    return " ".join([surn.get_surname() for surn in name.get_surname_list()])
+
+
+def date_features(date):
+    """
+    Return the parts of a date that are used for comparison, or None if
+    the date is empty.
+    """
+    if date.is_empty():
+        return None
+    if date.get_modifier() == Date.MOD_TEXTONLY:
+        equality_key = (date.get_text(),)
+    else:
+        equality_key = (
+            date.get_calendar(),
+            date.get_modifier(),
+            date.get_quality(),
+            tuple(date.dateval),
+        )
+    return (
+        equality_key,
+        date.is_compound(),
+        date.get_start_date()[0:3],
+        date.get_stop_date()[0:3],
+        date.get_year(),
+        date.get_month(),
+        date.get_month_valid(),
+    )
+
+
+# -------------------------------------------------------------------------
+#
+# DuplicateFinder class
+#
+# -------------------------------------------------------------------------
+class DuplicateFinder:
+    """
+    Find pairs of people that are potential duplicates.
+
+    :param use_soundex: Compare names by their SoundEx codes.
+    :type use_soundex: bool
+    """
+
+    def __init__(self, use_soundex=True):
+        self.use_soundex = use_soundex
+        # {handle: (name, gender, birth, death, parents, families)}
+        self.people = {}
+        # {place_handle: title}
+        self.places = {}
+        self.order = {}
+        self.keys = {}
+        self.blocks = {}
+
+    def gen_key(self, val):
+        if self.use_soundex:
+            return _soundex(val)
+        else:
+            return val
+
+    def name_compare(self, s1, s2):
+        if self.use_soundex:
+            return _soundex(s1) == _soundex(s2)
+        else:
+            return s1 == s2
+
+    # ---------------------------------------------------------------------
+    #
+    # Features
+    #
+    # ---------------------------------------------------------------------
+
+    def load(self, db, callback=None):
+        """
+        Compute the comparison features of all people in the database.
+
+        :param callback: Called once for each person.
+        :type callback: callable
+        """
+        families = {}
+        for family in db.iter_families():
+            families[family.handle] = (
+                family.get_father_handle(),
+                family.get_mother_handle(),
+            )
+
+        for index, person in enumerate(db.iter_people()):
+            if callback:
+                callback()
+            self.order[person.handle] = index
+            parent_handle = person.get_main_parents_family_handle()
+            self.people[person.handle] = (
+                self.name_features(person.get_primary_name()),
+                person.get_gender(),
+                self.event_features(db, person.get_birth_ref()),
+                self.event_features(db, person.get_death_ref()),
+                families.get(parent_handle) if parent_handle else None,
+                tuple(
+                    families[handle]
+                    for handle in person.get_family_handle_list()
+                    if handle in families
+                ),
+            )
+        self.build_blocks()
+
+    def name_features(self, name):
+        surnames = get_surnames(name)
+        first_name = name.get_first_name()
+        return (
+            self.gen_key(surnames),
+            name.get_suffix(),
+            first_name,
+            tuple(first_name.split()),
+        )
+
+    def event_features(self, db, event_ref):
+        if not event_ref:
+            return (None, "")
+        event = db.get_event_from_handle(event_ref.ref)
+        place_handle = event.get_place_handle()
+        if place_handle and place_handle not in self.places:
+            self.places[place_handle] = db.get_place_from_handle(
+                place_handle
+            ).get_title()
+        return (date_features(event.get_date_object()), place_handle)
+
+    # ---------------------------------------------------------------------
+    #
+    # Blocking
+    #
+    # ---------------------------------------------------------------------
+
+    def block_keys(self, handle):
+        """
+        Return the blocking keys of a person.
+
+        Two names can only match if their surnames have the same key and if
+        they have a given name that starts with the same letter, so the
+        people that are compared share a block for at least one of their
+        initials.
+        """
+        name, gender = self.people[handle][NAME : GENDER + 1]
+        initials = sorted({token[0] for token in name[3]}) or [""]
+        return [(gender == Person.MALE, name[0], initial) for initial in initials]
+
+    def build_blocks(self):
+        """
+        Build the blocking index.
+        """
+        self.keys = {handle: self.block_keys(handle) for handle in self.people}
+        self.blocks = defaultdict(list)
+        for handle, person_keys in self.keys.items():
+            for key in person_keys:
+                self.blocks[key].append(handle)
+
+    def count_pairs(self):
+        """
+        Return an upper bound of the number of candidate pairs.
+        """
+        return sum(len(block) * (len(block) - 1) // 2 for block in self.blocks.values())
+
+    def candidate_pairs(self):
+        """
+        Yield every pair of people that share at least one block, once.
+        """
+        keys = self.keys
+        for key, handles in self.blocks.items():
+            for index, handle1 in enumerate(handles):
+                keys1 = keys[handle1]
+                for handle2 in handles[index + 1 :]:
+                    if len(keys1) > 1 and len(keys[handle2]) > 1:
+                        # Only yield the pair from the first block they share
+                        if key != min(set(keys1).intersection(keys[handle2])):
+                            continue
+                    yield (handle1, handle2)
+
+    # ---------------------------------------------------------------------
+    #
+    # Scoring
+    #
+    # ---------------------------------------------------------------------
+
+    def find_matches(self, thresh, is_ancestor=None, max_workers=None):
+        """
+        Score the candidate pairs, and yield a list of matches for each
+        chunk of pairs that has been scored.  Matches are (handle1, handle2,
+        chance) tuples with a chance of at least thresh.
+
+        :param thresh: The minimum chance of a match.
+        :type thresh: float
+        :param is_ancestor: Function returning True if the first person is
+                            an ancestor of the second one.
+        :type is_ancestor: callable
+        :param max_workers: Maximum number of worker processes.  Pairs are
+                            scored in this process if it is 1, or if worker
+                            processes can't be forked.
+        :type max_workers: int
+        """
+        chunks = self.chunks()
+        first_chunks = []
+        for chunk in chunks:
+            first_chunks.append(chunk)
+            if len(first_chunks) * CHUNKSIZE >= PARALLEL_THRESHOLD:
+                break
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if (
+            len(first_chunks) * CHUNKSIZE < PARALLEL_THRESHOLD
+            or max_workers == 1
+            or "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            results = (
+                self.score_pairs(chunk, thresh) for chunk in chain(first_chunks, chunks)
+            )
+        else:
+            results = self.score_parallel(first_chunks, chunks, thresh, max_workers)
+
+        for matches in results:
+            if is_ancestor:
+                matches = [
+                    (handle1, handle2, chance)
+                    for (handle1, handle2, chance) in matches
+                    if not is_ancestor(handle1, handle2)
+                    and not is_ancestor(handle2, handle1)
+                ]
+            yield matches
+
+    def chunks(self):
+        chunk = []
+        for pair in self.candidate_pairs():
+            chunk.append(pair)
+            if len(chunk) == CHUNKSIZE:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def score_parallel(self, first_chunks, chunks, thresh, max_workers):
+        """
+        Score chunks of pairs in worker processes.  The chunks are scored in
+        this process if the workers can't be used.
+        """
+        # Forked workers inherit the features.  Spawned workers would run the
+        # main script again, which starts Gramps.
+        context = multiprocessing.get_context("fork")
+        pending = {}
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self,),
+            ) as executor:
+                for chunk in first_chunks:
+                    pending[executor.submit(_score_pairs, chunk, thresh)] = chunk
+                while pending:
+                    future = next(as_completed(pending))
+                    matches = future.result()
+                    del pending[future]
+                    # Keep the workers busy without holding all pairs in memory
+                    for chunk in chunks:
+                        pending[executor.submit(_score_pairs, chunk, thresh)] = chunk
+                        if len(pending) >= 2 * max_workers:
+                            break
+                    yield matches
+        except (OSError, BrokenProcessPool) as err:
+            LOG.warning("Scoring in worker processes failed: %s", err)
+            for chunk in chain(pending.values(), chunks):
+                yield self.score_pairs(chunk, thresh)
+
+    def score_pairs(self, pairs, thresh):
+        """
+        Return the (handle1, handle2, chance) tuples of the pairs that
+        match with a chance of at least thresh.
+        """
+        matches = []
+        for handle1, handle2 in pairs:
+            chance = self.compare_people(handle1, handle2)
+            if chance >= thresh:
+                if self.order[handle1] > self.order[handle2]:
+                    handle1, handle2 = handle2, handle1
+                matches.append((handle1, handle2, chance))
+        return matches
+
+    def compare_people(self, handle1, handle2):
+        """
+        Return the chance that two people are the same, or -1 if they can't
+        be.  Whether one person is an ancestor of the other is not checked.
+        """
+        p1 = self.people[handle1]
+        p2 = self.people[handle2]
+
+        chance = self.name_match(p1[NAME], p2[NAME])
+        if chance == -1:
+            return -1
+
+        birth1, birth_place1 = p1[BIRTH]
+        death1, death_place1 = p1[DEATH]
+        birth2, birth_place2 = p2[BIRTH]
+        death2, death_place2 = p2[DEATH]
+
+        value = self.date_match(birth1, birth2)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.date_match(death1, death2)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.place_match(birth_place1, birth_place2)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = self.place_match(death_place1, death_place2)
+        if value == -1:
+            return -1
+        chance += value
+
+        if p1[PARENTS] and p2[PARENTS]:
+            dad1, mom1 = p1[PARENTS]
+            dad2, mom2 = p2[PARENTS]
+
+            value = self.name_match(self.get_name(dad1), self.get_name(dad2))
+            if value == -1:
+                return -1
+            chance += value
+
+            value = self.name_match(self.get_name(mom1), self.get_name(mom2))
+            if value == -1:
+                return -1
+            chance += value
+
+        for father1, mother1 in p1[FAMILIES]:
+            for father2, mother2 in p2[FAMILIES]:
+                if p1[GENDER] == Person.FEMALE:
+                    spouse1, spouse2 = father1, father2
+                else:
+                    spouse1, spouse2 = mother1, mother2
+                if spouse1 and spouse2:
+                    if spouse1 == spouse2:
+                        chance += 1
+                    else:
+                        value = self.name_match(
+                            self.get_name(spouse1), self.get_name(spouse2)
+                        )
+                        if value != -1:
+                            chance += value
+        return chance
+
+    def get_name(self, handle):
+        if handle and handle in self.people:
+            return self.people[handle][NAME]
+        return None
+
+    def date_match(self, date1, date2):
+        if date1 is None or date2 is None:
+            return 0
+        if date1[0] == date2[0]:
+            return 1
+
+        if date1[1] or date2[1]:
+            return self.range_compare(date1, date2)
+
+        if date1[4] == date2[4]:
+            if date1[5] == date2[5]:
+                return 0.75
+            if not date1[6] or not date2[6]:
+                return 0.75
+            else:
+                return -1
+        else:
+            return -1
+
+    def range_compare(self, date1, date2):
+        start_date_1 = date1[2]
+        start_date_2 = date2[2]
+        stop_date_1 = date1[3]
+        stop_date_2 = date2[3]
+        if date1[1] and date2[1]:
+            if (
+                start_date_2 <= start_date_1 <= stop_date_2
+                or start_date_1 <= start_date_2 <= stop_date_1
+                or start_date_2 <= stop_date_1 <= stop_date_2
+                or start_date_1 <= stop_date_2 <= stop_date_1
+            ):
+                return 0.5
+            else:
+                return -1
+        elif date2[1]:
+            if start_date_2 <= start_date_1 <= stop_date_2:
+                return 0.5
+            else:
+                return -1
+        else:
+            if start_date_1 <= start_date_2 <= stop_date_1:
+                return 0.5
+            else:
+                return -1
+
+    def name_match(self, name, name1):
+        if not name1 or not name:
+            return 0
+
+        srn1, sfx1, first1, list1 = name
+        srn2, sfx2, first2, list2 = name1
+
+        if srn1 != srn2:
+            return -1
+        if sfx1 != sfx2:
+            if sfx1 != "" and sfx2 != "":
+                return -1
+
+        if first1 == first2:
+            return 1
+        else:
+            if len(list1) < len(list2):
+                return self.list_reduce(list1, list2)
+            else:
+                return self.list_reduce(list2, list1)
+
+    def place_match(self, p1_id, p2_id):
+        if p1_id == p2_id:
+            return 1
+
+        name1 = self.places.get(p1_id, "") if p1_id else ""
+        name2 = self.places.get(p2_id, "") if p2_id else ""
+
+        if not (name1 and name2):
+            return 0
+        if name1 == name2:
+            return 1
+
+        list1 = name1.replace(",", " ").split()
+        list2 = name2.replace(",", " ").split()
+
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+    def list_reduce(self, list1, list2):
+        value = 0
+        for name in list1:
+            for name2 in list2:
+                if is_initial(name) and name[0] == name2[0]:
+                    value += 0.25
+                elif is_initial(name2) and name2[0] == name[0]:
+                    value += 0.25
+                elif name == name2:
+                    value += 0.5
+                elif name[0] == name2[0] and self.name_compare(name, name2):
+                    value += 0.25
+        return min(value, 1) if value else -1
+
+
+# -------------------------------------------------------------------------
+#
+# Worker process functions
+#
+# -------------------------------------------------------------------------
+_FINDER = None
+
+
+def _init_worker(finder):
+    global _FINDER
+    _FINDER = finder
+
+
+def _score_pairs(pairs, thresh):
+    return _FINDER.score_pairs(pairs, thresh)
@@ -89,11 +89,15 @@ all lines until the next level 2 token is found (in this case, skipping the
 #
 # -------------------------------------------------------------------------
 import os
+import queue
 import re
+import sqlite3
+import threading
 import time
 
 # from xml.parsers.expat import ParserCreate
-from collections import defaultdict, OrderedDict
+from collections import defaultdict, deque, OrderedDict
+from collections.abc import MutableMapping
 import string
 import mimetypes
 from io import StringIO, TextIOWrapper
@@ -558,6 +562,12 @@ RESIDENCE_PLAC = 1
 SOURCE_REFS_NO = 0
 SOURCE_REFS_YES = 1
 
+# Pipelined import of large files
+PIPELINE_LINES = 500000  # number of lines from which importData uses it
+LEXER_BLOCK = 2000  # lines handed over by the lexer thread at a time
+LEXER_QUEUE = 16  # blocks read ahead by the lexer thread
+XREF_PENDING = 10000  # cross-references kept in memory before writing them
+
 TYPE_BIRTH = ChildRefType()
 TYPE_ADOPT = ChildRefType(ChildRefType.ADOPTED)
 TYPE_FOSTER = ChildRefType(ChildRefType.FOSTER)
@@ -939,9 +949,13 @@ class GedcomDateParser(DateParser):
 #
 # -------------------------------------------------------------------------
 class Lexer:
-    """low level line reading and early parsing"""
+    """low level line reading and early parsing
 
-    def __init__(self, ifile, __add_msg):
+    In threaded mode, the lines are read and tokenized by a separate thread,
+    which hands them over in blocks of LEXER_BLOCK lines.
+    """
+
+    def __init__(self, ifile, __add_msg, threaded=False):
         self.ifile = ifile
         self.current_list = []
         self.eof = False
@@ -953,9 +967,17 @@ class Lexer:
             TOKEN_CONC: self.__fix_token_conc,
         }
         self.__add_msg = __add_msg
+        self.threaded = threaded
+        self.thread = None
+        self.blocks = queue.Queue(LEXER_QUEUE)
+        self.block = deque()
+        self.done = False
+        self.stopped = False
 
     def readline(self):
         """read a line from file with possibility of putting it back"""
+        if self.threaded:
+            return self.__readline_threaded()
         if len(self.current_list) <= 1 and not self.eof:
             self.__readahead()
         try:
@@ -964,6 +986,60 @@ class Lexer:
             LOG.debug("Error in reading Gedcom line", exc_info=True)
             return None
 
+    def __readline_threaded(self):
+        """read a line from the blocks produced by the lexer thread"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.__produce, daemon=True)
+            self.thread.start()
+        while True:
+            while not self.block:
+                if self.done:
+                    return None
+                item = self.blocks.get()
+                if item is None:
+                    self.done = True
+                elif isinstance(item, BaseException):
+                    self.done = True
+                    raise item
+                else:
+                    self.block = deque(item)
+            line = self.block.popleft()
+            if not isinstance(line, str):
+                return line
+            # A message about a line that was ignored
+            self.__add_msg(line)
+
+    def __produce(self):
+        """read and tokenize the file in the lexer thread"""
+        block = []
+        try:
+            while not self.stopped:
+                if len(self.current_list) <= 1 and not self.eof:
+                    self.__readahead(block)
+                if not self.current_list:
+                    break
+                try:
+                    block.append(GedLine(self.current_list.pop()))
+                except:
+                    LOG.debug("Error in reading Gedcom line", exc_info=True)
+                    break
+                if len(block) >= LEXER_BLOCK:
+                    self.__put(block)
+                    block = []
+            self.__put(block)
+        except Exception as err:
+            self.__put(err)
+        self.__put(None)
+
+    def __put(self, item):
+        """hand over an item to the parser, unless it has stopped reading"""
+        while not self.stopped:
+            try:
+                self.blocks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
     def __fix_token_cont(self, data):
         line = self.current_list[0]
         new_value = line[2] + "\n" + data[2]
@@ -984,14 +1060,13 @@ class Lexer:
             new_value = line[2] + data[2]
         self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
 
-    def __readahead(self):
+    def __readahead(self, messages=None):
         while len(self.current_list) < 5:
             line = self.ifile.readline()
             self.index += 1
             if not line:
                 self.eof = True
                 return
-
             original_line = line
             try:
                 # According to the GEDCOM 5.5 standard,
@@ -1031,7 +1106,11 @@ class Lexer:
                 problem = problem.ljust(prob_width)[0 : (prob_width - 1)]
                 text = text.replace("\n", "\n".ljust(prob_width + 22))
                 message = "%s              %s" % (problem, text)
-                self.__add_msg(message)
+                if messages is None:
+                    self.__add_msg(message)
+                else:
+                    # Keep the message in order with the lines
+                    messages.append(message)
                 continue
 
             # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
@@ -1057,10 +1136,19 @@ class Lexer:
         Break circular references to parsing methods stored in dictionaries
         to aid garbage collection
         """
+        self.close()
         for key in list(self.func_map.keys()):
             del self.func_map[key]
         del self.func_map
 
+    def close(self):
+        """
+        Stop the lexer thread
+        """
+        self.stopped = True
+        if self.thread is not None:
+            self.thread.join()
+
 
 # -----------------------------------------------------------------------
 #
@@ -2108,18 +2196,24 @@ class IdMapper:
     """This class provide methods to keep track of the correspoindence between
     Gedcom xrefs (@P1023@) and Gramps IDs."""
 
-    def __init__(self, has_gid, find_next, id2user_format):
+    def __init__(self, has_gid, find_next, id2user_format, store=None):
         self.has_gid = has_gid
         self.find_next = find_next
         self.id2user_format = id2user_format
-        self.swap = {}
+        # The reverse of swap
+        if store is None:
+            self.swap = {}
+            self.used = {}
+        else:
+            self.swap = store.new_map()
+            self.used = store.new_map()
 
     def __getitem__(self, gid):
         if gid == "":
             # We need to find the next gramps ID provided it is not already
             # the target of a swap
             new_val = self.find_next()
-            while new_val in list(self.swap.values()):
+            while new_val in self.used:
                 new_val = self.find_next()
         else:
             # remove any @ signs
@@ -2134,19 +2228,22 @@ class IdMapper:
                 # have found it. If we had already encountered I0001 and we are
                 # now looking for I1, it wouldn't be in self.swap, and we now
                 # find that I0001 is in use, so we have to create a new id.
-                if self.has_gid(formatted_gid) or (
-                    formatted_gid in list(self.swap.values())
-                ):
+                if self.has_gid(formatted_gid) or (formatted_gid in self.used):
                     new_val = self.find_next()
-                    while new_val in list(self.swap.values()):
+                    while new_val in self.used:
                         new_val = self.find_next()
                 else:
                     new_val = formatted_gid
             # we need to distinguish between I1 and I0001, so we record the map
             # from the original format
             self.swap[gid] = new_val
+            self.used[new_val] = gid
         return new_val
 
+    def xref(self, gramps_id):
+        """return the xref that was mapped to a Gramps ID, if any"""
+        return self.used.get(gramps_id)
+
     def clean(self, gid):
         """remove '@' from start and end of xref"""
         temp = gid.strip()
@@ -2159,6 +2256,105 @@ class IdMapper:
         return self.swap
 
 
+# -------------------------------------------------------------------------
+#
+# XrefStore
+#
+# -------------------------------------------------------------------------
+class XrefStore:
+    """
+    Temporary database that holds the cross-reference maps of a pipelined
+    import, so that their size does not limit the size of the import.
+    """
+
+    def __init__(self):
+        # An empty file name gives a private on-disk database, which is
+        # removed when it is closed.
+        self.connection = sqlite3.connect("")
+        self.connection.execute("PRAGMA journal_mode = OFF")
+        self.connection.execute("PRAGMA synchronous = OFF")
+        self.count = 0
+
+    def new_map(self):
+        """return a new, empty XrefMap"""
+        self.count += 1
+        return XrefMap(self.connection, "map%d" % self.count)
+
+    def close(self):
+        """remove the database"""
+        self.connection.close()
+
+
+class XrefMap(MutableMapping):
+    """
+    A map of strings that is held in a table of an XrefStore.  New items
+    are kept in memory until there are XREF_PENDING of them.
+    """
+
+    def __init__(self, connection, table):
+        self.connection = connection
+        self.table = table
+        self.pending = {}
+        connection.execute(
+            f"CREATE TABLE {table} (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID"
+        )
+
+    def flush(self):
+        """write the pending items to the table"""
+        if self.pending:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                self.pending.items(),
+            )
+            self.pending.clear()
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.pending[key] = value
+        if len(self.pending) >= XREF_PENDING:
+            self.flush()
+
+    def __delitem__(self, key):
+        self.flush()
+        cursor = self.connection.execute(
+            f"DELETE FROM {self.table} WHERE key = ?", (key,)
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        self.flush()
+        for row in self.connection.execute(f"SELECT key FROM {self.table}"):
+            yield row[0]
+
+    def __len__(self):
+        self.flush()
+        return self.connection.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[
+            0
+        ]
+
+    def get(self, key, default=None):
+        value = self.pending.get(key)
+        if value is not None:
+            return value
+        row = self.connection.execute(
+            f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+        return default if row is None else row[0]
+
+    def items(self):
+        self.flush()
+        return self.connection.execute(f"SELECT key, value FROM {self.table}")
+
+
 # -------------------------------------------------------------------------
 #
 # GedcomParser
@@ -2168,6 +2364,10 @@ class GedcomParser(UpdateCallback):
     """
     Performs the second pass of the GEDCOM parser, which does all the heavy
     lifting.
+
+    With pipeline set, the file is read and tokenized by a separate thread
+    while the records are parsed, and the cross-reference maps are held in
+    a temporary database on disk.  This is meant for very large files.
     """
 
     __TRUNC_MSG = _(
@@ -2233,6 +2433,7 @@ class GedcomParser(UpdateCallback):
         stage_one,
         default_source,
         default_tag_format=None,
+        pipeline=False,
     ):
         UpdateCallback.__init__(self, user.callback)
         self.user = user
@@ -2280,44 +2481,53 @@ class GedcomParser(UpdateCallback):
         self.groups = None
         self.want_parse_warnings = True
 
+        # Cross-reference maps of a pipelined import are held on disk
+        self.xref_store = XrefStore() if pipeline else None
+
         self.pid_map = IdMapper(
             self.dbase.has_person_gramps_id,
             self.dbase.find_next_person_gramps_id,
             self.dbase.id2user_format,
+            self.xref_store,
         )
         self.fid_map = IdMapper(
             self.dbase.has_family_gramps_id,
             self.dbase.find_next_family_gramps_id,
             self.dbase.fid2user_format,
+            self.xref_store,
         )
         self.sid_map = IdMapper(
             self.dbase.has_source_gramps_id,
             self.dbase.find_next_source_gramps_id,
             self.dbase.sid2user_format,
+            self.xref_store,
         )
         self.oid_map = IdMapper(
             self.dbase.has_media_gramps_id,
             self.dbase.find_next_media_gramps_id,
             self.dbase.oid2user_format,
+            self.xref_store,
         )
         self.rid_map = IdMapper(
             self.dbase.has_repository_gramps_id,
             self.dbase.find_next_repository_gramps_id,
             self.dbase.rid2user_format,
+            self.xref_store,
         )
         self.nid_map = IdMapper(
             self.dbase.has_note_gramps_id,
             self.dbase.find_next_note_gramps_id,
             self.dbase.nid2user_format,
+            self.xref_store,
         )
 
-        self.gid2id = {}
-        self.oid2id = {}
-        self.sid2id = {}
-        self.lid2id = {}
-        self.fid2id = {}
-        self.rid2id = {}
-        self.nid2id = {}
+        self.gid2id = self.__new_map()
+        self.oid2id = self.__new_map()
+        self.sid2id = self.__new_map()
+        self.lid2id = self.__new_map()
+        self.fid2id = self.__new_map()
+        self.rid2id = self.__new_map()
+        self.nid2id = self.__new_map()
 
         self.place_import = PlaceImport(self.dbase)
 
@@ -3090,7 +3300,7 @@ class GedcomParser(UpdateCallback):
         else:
             rdr = AnsiReader(ifile, self.__add_msg)
 
-        self.lexer = Lexer(rdr, self.__add_msg)
+        self.lexer = Lexer(rdr, self.__add_msg, threaded=pipeline)
         self.filename = filename
         self.backoff = False
 
@@ -3114,7 +3324,31 @@ class GedcomParser(UpdateCallback):
           0 TRLR                                          {1:1}
 
         """
-        with DbTxn(_("GEDCOM import"), self.dbase, not use_trans) as self.trans:
+        try:
+            self.__parse_gedcom_file(use_trans)
+        finally:
+            self.lexer.close()
+            if self.xref_store:
+                self.xref_store.close()
+
+        self.dbase.enable_signals()
+        self.dbase.request_rebuild()
+        if self.number_of_errors == 0:
+            message = _("GEDCOM import report: No errors detected")
+        else:
+            message = (
+                _("GEDCOM import report: %s errors detected") % self.number_of_errors
+            )
+        if hasattr(self.user.uistate, "window"):
+            parent_window = self.user.uistate.window
+        else:
+            parent_window = None
+        self.user.info(
+            message, "".join(self.errors), parent=parent_window, monospaced=True
+        )
+
+    def __parse_gedcom_file(self, use_trans):
+        with DbTxn(_("GEDCOM import"), self.dbase, bulk=not use_trans) as self.trans:
             self.dbase.disable_signals()
             self.__parse_header_head()
             self.want_parse_warnings = False
@@ -3137,21 +3371,14 @@ class GedcomParser(UpdateCallback):
 
             if not self.dbase.get_feature("skip-check-xref"):
                 self.__check_xref()
-        self.dbase.enable_signals()
-        self.dbase.request_rebuild()
-        if self.number_of_errors == 0:
-            message = _("GEDCOM import report: No errors detected")
-        else:
-            message = (
-                _("GEDCOM import report: %s errors detected") % self.number_of_errors
-            )
-        if hasattr(self.user.uistate, "window"):
-            parent_window = self.user.uistate.window
-        else:
-            parent_window = None
-        self.user.info(
-            message, "".join(self.errors), parent=parent_window, monospaced=True
-        )
+
+    def __new_map(self):
+        """
+        Return a new cross-reference map, on disk for a pipelined import.
+        """
+        if self.xref_store:
+            return self.xref_store.new_map()
+        return {}
 
     def __clean_up(self):
         """
@@ -3737,11 +3964,6 @@ class GedcomParser(UpdateCallback):
         )
 
         # Check persons membership in referenced families
-        def __input_fid(gramps_id):
-            for key, val in self.fid_map.map().items():
-                if val == gramps_id:
-                    return key
-
         for input_id, gramps_id in self.pid_map.map().items():
             person_handle = self.__find_from_handle(gramps_id, self.gid2id)
             person = self.dbase.get_person_from_handle(person_handle)
@@ -3764,17 +3986,12 @@ class GedcomParser(UpdateCallback):
                         )
                         % {
                             "family": family.gramps_id,
-                            "orig_family": __input_fid(family.gramps_id),
+                            "orig_family": self.fid_map.xref(family.gramps_id),
                             "person": person.gramps_id,
                             "orig_person": input_id,
                         }
                     )
 
-        def __input_pid(gramps_id):
-            for key, val in self.pid_map.map().items():
-                if val == gramps_id:
-                    return key
-
         for input_id, gramps_id in self.fid_map.map().items():
             family_handle = self.__find_from_handle(gramps_id, self.fid2id)
             family = self.dbase.get_family_from_handle(family_handle)
@@ -3795,7 +4012,7 @@ class GedcomParser(UpdateCallback):
                             "family": family.gramps_id,
                             "orig_family": input_id,
                             "father": father.gramps_id,
-                            "orig_father": __input_pid(father.gramps_id),
+                            "orig_father": self.pid_map.xref(father.gramps_id),
                         }
                     )
 
@@ -3813,7 +4030,7 @@ class GedcomParser(UpdateCallback):
                             "family": family.gramps_id,
                             "orig_family": input_id,
                             "mother": mother.gramps_id,
-                            "orig_mother": __input_pid(mother.gramps_id),
+                            "orig_mother": self.pid_map.xref(mother.gramps_id),
                         }
                     )
 
@@ -3837,7 +4054,7 @@ class GedcomParser(UpdateCallback):
                                 "family": family.gramps_id,
                                 "orig_family": input_id,
                                 "child": child.gramps_id,
-                                "orig_child": __input_pid(child.gramps_id),
+                                "orig_child": self.pid_map.xref(child.gramps_id),
                             }
                         )
 
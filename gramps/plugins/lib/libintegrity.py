@@ -0,0 +1,269 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Set-based integrity checks of the reference map, used by the Check and
+Repair tool.
+
+The references of every object are computed once, and compared with the
+whole reference map, instead of looking up the backlinks of each object.
+Computing the references does not need the database, so the objects of
+large trees are read in this process and unpacked in a pool of worker
+processes.
+"""
+
+# -------------------------------------------------------------------------
+#
+# Standard Python modules
+#
+# -------------------------------------------------------------------------
+import logging
+import multiprocessing
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.lib import (
+    Citation,
+    Event,
+    Family,
+    Media,
+    Note,
+    Person,
+    Place,
+    Repository,
+    Source,
+    Tag,
+)
+
+LOG = logging.getLogger(".check")
+
+# Number of objects unpacked by a worker at a time
+CHUNKSIZE = 1000
+
+# Don't start worker processes for fewer objects than this
+PARALLEL_THRESHOLD = 20 * CHUNKSIZE
+
+# Classes of the primary objects, keyed by class name
+PRIMARY_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        Person,
+        Family,
+        Event,
+        Place,
+        Source,
+        Citation,
+        Media,
+        Repository,
+        Note,
+        Tag,
+    )
+}
+
+# Problems of the reference map, as lists of (obj_class, obj_handle,
+# ref_class, ref_handle) tuples:
+#
+# missing_target: references to objects which are not in the database.
+# missing_backlink: references which are not in the reference map, whether
+#     or not the objects they refer to are in the database.
+# missing_object: backlinks from objects which are not in the database.
+# missing_reference: backlinks from objects which don't hold the reference.
+BacklinkProblems = namedtuple(
+    "BacklinkProblems",
+    ["missing_target", "missing_backlink", "missing_object", "missing_reference"],
+)
+
+
+# -------------------------------------------------------------------------
+#
+# Functions
+#
+# -------------------------------------------------------------------------
+def get_references(serializer, obj_class, chunk):
+    """
+    Return the (handle, references) tuples of a list of raw objects, where
+    references is the set of the (ref_class, ref_handle) tuples of the
+    objects referred to.
+    """
+    cls = PRIMARY_CLASSES[obj_class]
+    result = []
+    for data in chunk:
+        obj = serializer.data_to_object(data, cls)
+        result.append((obj.handle, set(obj.get_referenced_handles_recursively())))
+    return result
+
+
+def _chunks(db):
+    for obj_class in PRIMARY_CLASSES:
+        chunk = []
+        with db.method("get_%s_cursor", obj_class)() as cursor:
+            for _handle, data in cursor:
+                chunk.append(data)
+                if len(chunk) == CHUNKSIZE:
+                    yield obj_class, chunk
+                    chunk = []
+        if chunk:
+            yield obj_class, chunk
+
+
+def iter_references(db, max_workers=None):
+    """
+    Return an iterator over the (obj_class, handle, references) tuples of
+    every primary object of a database, where references is the set of the
+    (ref_class, ref_handle) tuples of the objects it refers to.
+
+    :param db: Database to read.
+    :type db: :class:`.DbGeneric`
+    :param max_workers: Maximum number of worker processes.  The objects
+                        are unpacked in this process if it is 1, or if
+                        worker processes can't be forked.
+    :type max_workers: int
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if (
+        db.get_total() < PARALLEL_THRESHOLD
+        or max_workers == 1
+        or "fork" not in multiprocessing.get_all_start_methods()
+    ):
+        results = (
+            (obj_class, get_references(db.serializer, obj_class, chunk))
+            for obj_class, chunk in _chunks(db)
+        )
+    else:
+        results = _parallel_references(db, max_workers)
+    for obj_class, references in results:
+        for handle, refs in references:
+            yield obj_class, handle, refs
+
+
+def _parallel_references(db, max_workers):
+    """
+    Unpack chunks of objects in worker processes, in the order they are
+    read.  The chunks are unpacked in this process if the workers can't be
+    used.
+    """
+    chunks = _chunks(db)
+    pending = deque()
+    futures = deque()
+    # Forked workers inherit the serializer.  Spawned workers would run the
+    # main script again, which starts Gramps.
+    context = multiprocessing.get_context("fork")
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(db.serializer,),
+        ) as executor:
+            for obj_class, chunk in chunks:
+                pending.append((obj_class, chunk))
+                futures.append(executor.submit(_get_references, obj_class, chunk))
+                # Keep the workers busy without holding all objects in memory
+                while len(futures) >= 2 * max_workers:
+                    references = futures[0].result()
+                    futures.popleft()
+                    yield pending.popleft()[0], references
+            while futures:
+                references = futures[0].result()
+                futures.popleft()
+                yield pending.popleft()[0], references
+    except (OSError, BrokenProcessPool) as err:
+        LOG.warning("Reading the references in worker processes failed: %s", err)
+        for obj_class, chunk in chain(pending, chunks):
+            yield obj_class, get_references(db.serializer, obj_class, chunk)
+
+
+def find_backlink_problems(db, max_workers=None, step=None):
+    """
+    Compare the references of every object of a database with its reference
+    map.  Return a :class:`BacklinkProblems` tuple, or None if the database
+    cannot list its reference map.
+
+    Backlinks to objects which are not in the database are not checked.
+
+    :param db: Database to check.
+    :type db: :class:`.DbGeneric`
+    :param max_workers: Maximum number of worker processes.
+    :type max_workers: int
+    :param step: Function called after each object.
+    :type step: callable
+    """
+    reference_map = db.iter_reference_map()
+    if reference_map is None or not hasattr(db, "serializer"):
+        return None
+
+    objects = set()
+    references = set()
+    for obj_class, handle, refs in iter_references(db, max_workers):
+        objects.add((obj_class, handle))
+        references.update(
+            (obj_class, handle, ref_class, ref_handle) for ref_class, ref_handle in refs
+        )
+        if step:
+            step()
+
+    missing_target = []
+    missing_backlink = []
+    missing_object = []
+    missing_reference = []
+    stored = set()
+    for row in reference_map:
+        if row in stored:
+            continue
+        stored.add(row)
+        if row in references or (row[2], row[3]) not in objects:
+            continue
+        if (row[0], row[1]) not in objects:
+            missing_object.append(row)
+        else:
+            missing_reference.append(row)
+    for row in references:
+        if (row[2], row[3]) not in objects:
+            missing_target.append(row)
+        if row not in stored:
+            missing_backlink.append(row)
+    return BacklinkProblems(
+        missing_target, missing_backlink, missing_object, missing_reference
+    )
+
+
+# -------------------------------------------------------------------------
+#
+# Worker process functions
+#
+# -------------------------------------------------------------------------
+_SERIALIZER = None
+
+
+def _init_worker(serializer):
+    global _SERIALIZER
+    _SERIALIZER = serializer
+
+
+def _get_references(obj_class, chunk):
+    return get_references(_SERIALIZER, obj_class, chunk)
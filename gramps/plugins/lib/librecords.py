@@ -40,6 +40,7 @@ from gramps.gen.lib import (
     Date,
     Span,
     Name,
+    Person,
     StyledText,
     StyledTextTag,
     StyledTextTagType,
@@ -170,33 +171,43 @@ def find_records(
     if filter:
         person_handle_list = filter.apply(db, person_handle_list, user=user)
 
+    snapshot = db.get_person_snapshot()
+
+    def get_date(event):
+        return snapshot.get_event_date(event) if event != -1 else None
+
+    def get_death_date(person):
+        if snapshot.death[person] != -1:
+            return get_date(snapshot.death[person])
+        return get_date(snapshot.death_fallback[person])
+
     for person_handle in person_handle_list:
-        person = db.get_person_from_handle(person_handle)
-        unfil_person = get_unfiltered_person_from_handle(person_handle)
-        if person is None:
+        index = snapshot.index.get(person_handle)
+        if index is None:
             continue
 
         # FIXME this should check for a "fallback" birth also/instead
-        birth_ref = person.get_birth_ref()
+        birth = snapshot.birth[index]
 
-        if not birth_ref:
+        if birth == -1:
             # No birth event, so we can't calculate any age.
             continue
 
-        birth = db.get_event_from_handle(birth_ref.ref)
-        birth_date = birth.get_date_object()
-
-        death_date = _find_death_date(db, person)
+        birth_date = get_date(birth)
 
         if not _good_date(birth_date):
             # Birth date unknown or incomplete, so we can't calculate any age.
             continue
 
+        death_date = get_death_date(index)
+
+        person = db.get_person_from_handle(person_handle)
         name = _get_styled_primary_name(
             person, callname, trans_text=trans_text, name_format=name_format
         )
 
         if death_date is None:
+            unfil_person = get_unfiltered_person_from_handle(person_handle)
             if probably_alive(unfil_person, db):
                 # Still living, look for age records
                 _record(
@@ -220,23 +231,19 @@ def find_records(
                 top_size,
             )
 
-        for family_handle in person.get_family_handle_list():
-            family = db.get_family_from_handle(family_handle)
-
-            marriage_date = None
-            divorce_date = None
-            for event_ref in family.get_event_ref_list():
-                event = db.get_event_from_handle(event_ref.ref)
-                if event.get_type().is_marriage() and (
-                    event_ref.get_role().is_family()
-                    or event_ref.get_role().is_primary()
-                ):
-                    marriage_date = event.get_date_object()
-                elif event.get_type().is_divorce() and (
-                    event_ref.get_role().is_family()
-                    or event_ref.get_role().is_primary()
-                ):
-                    divorce_date = event.get_date_object()
+        gender = snapshot.gender[index]
+        if gender == Person.MALE:
+            birth_children = snapshot.father_birth_children
+        elif gender == Person.FEMALE:
+            birth_children = snapshot.mother_birth_children
+        else:
+            birth_children = None
+
+        for family in snapshot.families[index]:
+            marriages = snapshot.marriages[family]
+            divorces = snapshot.divorces[family]
+            marriage_date = get_date(marriages[-1]) if marriages else None
+            divorce_date = get_date(divorces[-1]) if divorces else None
 
             if _good_date(marriage_date):
                 _record(
@@ -260,30 +267,21 @@ def find_records(
                     top_size,
                 )
 
-            for child_ref in family.get_child_ref_list():
-                if person.get_gender() == person.MALE:
-                    relation = child_ref.get_father_relation()
-                elif person.get_gender() == person.FEMALE:
-                    relation = child_ref.get_mother_relation()
-                else:
-                    continue
-                if relation != ChildRefType.BIRTH:
-                    continue
-
-                child = db.get_person_from_handle(child_ref.ref)
+            if birth_children is None:
+                continue
 
+            for child in birth_children[family]:
                 # FIXME this should check for a "fallback" birth also/instead
-                child_birth_ref = child.get_birth_ref()
-                if not child_birth_ref:
+                child_birth = snapshot.birth[child]
+                if child_birth == -1:
                     continue
 
-                child_birth = db.get_event_from_handle(child_birth_ref.ref)
-                child_birth_date = child_birth.get_date_object()
+                child_birth_date = get_date(child_birth)
 
                 if not _good_date(child_birth_date):
                     continue
 
-                if person.get_gender() == person.MALE:
+                if gender == Person.MALE:
                     _record(
                         person_youngestfather,
                         person_oldestfather,
@@ -293,7 +291,7 @@ def find_records(
                         person_handle,
                         top_size,
                     )
-                elif person.get_gender() == person.FEMALE:
+                else:
                     _record(
                         person_youngestmother,
                         person_oldestmother,
@@ -306,59 +304,47 @@ def find_records(
 
     for person_handle in person_handle_list:
         # this "person loop" doesn't care about a person's birth or death
-        person = db.get_person_from_handle(person_handle)
-        if person is None:
+        index = snapshot.index.get(person_handle)
+        if index is None:
+            continue
+        gender = snapshot.gender[index]
+        if gender == Person.MALE:
+            kids_records = person_mostkidsfather
+            grandkids_records = person_mostgrandkidsfather
+        elif gender == Person.FEMALE:
+            kids_records = person_mostkidsmother
+            grandkids_records = person_mostgrandkidsmother
+        else:
             continue
 
+        person = db.get_person_from_handle(person_handle)
         name = _get_styled_primary_name(
             person, callname, trans_text=trans_text, name_format=name_format
         )
 
-        person_child_list = get_birth_children(db, person)
-        if person.get_gender() == person.MALE:
-            _record(
-                None,
-                person_mostkidsfather,
-                len(person_child_list),
-                name,
-                "Person",
-                person_handle,
-                top_size,
-            )
-        elif person.get_gender() == person.FEMALE:
-            _record(
-                None,
-                person_mostkidsmother,
-                len(person_child_list),
-                name,
-                "Person",
-                person_handle,
-                top_size,
-            )
+        person_child_list = snapshot.get_birth_children(index)
+        _record(
+            None,
+            kids_records,
+            len(person_child_list),
+            name,
+            "Person",
+            person_handle,
+            top_size,
+        )
 
-        person_grandchild_list = []
+        grandchildren = 0
         for child in person_child_list:
-            person_grandchild_list += get_birth_children(db, child)
-        if person.get_gender() == person.MALE:
-            _record(
-                None,
-                person_mostgrandkidsfather,
-                len(person_grandchild_list),
-                name,
-                "Person",
-                person_handle,
-                top_size,
-            )
-        elif person.get_gender() == person.FEMALE:
-            _record(
-                None,
-                person_mostgrandkidsmother,
-                len(person_grandchild_list),
-                name,
-                "Person",
-                person_handle,
-                top_size,
-            )
+            grandchildren += len(snapshot.get_birth_children(child))
+        _record(
+            None,
+            grandkids_records,
+            grandchildren,
+            name,
+            "Person",
+            person_handle,
+            top_size,
+        )
 
     # Family records
     family_mostchildren = []
@@ -369,18 +355,15 @@ def find_records(
     family_smallestagediff = []
     family_biggestagediff = []
 
-    for family in db.iter_families():
-        # family = db.get_family_from_handle(family_handle)
-        if living_mode != LivingProxyDb.MODE_INCLUDE_ALL:
-            # FIXME no iter_families method in LivingProxyDb so do it this way
-            family = db.get_family_from_handle(family.get_handle())
-
-        father_handle = family.get_father_handle()
-        if not father_handle:
+    for family, family_handle in enumerate(snapshot.family_handles):
+        father = snapshot.father[family]
+        if father == -1:
             continue
-        mother_handle = family.get_mother_handle()
-        if not mother_handle:
+        mother = snapshot.mother[family]
+        if mother == -1:
             continue
+        father_handle = snapshot.handles[father]
+        mother_handle = snapshot.handles[mother]
 
         # Test if either father or mother are in filter
         if filter:
@@ -388,20 +371,20 @@ def find_records(
             if not filter.apply(db, [father_handle, mother_handle]):
                 continue
 
-        father = db.get_person_from_handle(father_handle)
         unfil_father = get_unfiltered_person_from_handle(father_handle)
-        if father is None:
-            continue
-        mother = db.get_person_from_handle(mother_handle)
         unfil_mother = get_unfiltered_person_from_handle(mother_handle)
-        if mother is None:
-            continue
 
         father_name = _get_styled_primary_name(
-            father, callname, trans_text=trans_text, name_format=name_format
+            db.get_person_from_handle(father_handle),
+            callname,
+            trans_text=trans_text,
+            name_format=name_format,
         )
         mother_name = _get_styled_primary_name(
-            mother, callname, trans_text=trans_text, name_format=name_format
+            db.get_person_from_handle(mother_handle),
+            callname,
+            trans_text=trans_text,
+            name_format=name_format,
         )
 
         name = StyledText(trans_text("%(father)s and %(mother)s"))
@@ -415,28 +398,15 @@ def find_records(
             _record(
                 None,
                 family_mostchildren,
-                len(family.get_child_ref_list()),
+                len(snapshot.children[family]),
                 name,
                 "Family",
-                family.handle,
+                family_handle,
                 top_size,
             )
 
-        father_birth_ref = father.get_birth_ref()
-        if father_birth_ref:
-            father_birth_date = db.get_event_from_handle(
-                father_birth_ref.ref
-            ).get_date_object()
-        else:
-            father_birth_date = None
-
-        mother_birth_ref = mother.get_birth_ref()
-        if mother_birth_ref:
-            mother_birth_date = db.get_event_from_handle(
-                mother_birth_ref.ref
-            ).get_date_object()
-        else:
-            mother_birth_date = None
+        father_birth_date = get_date(snapshot.birth[father])
+        mother_birth_date = get_date(snapshot.birth[mother])
 
         if _good_date(father_birth_date) and _good_date(mother_birth_date):
             if father_birth_date >> mother_birth_date:
@@ -446,7 +416,7 @@ def find_records(
                     father_birth_date - mother_birth_date,
                     name,
                     "Family",
-                    family.handle,
+                    family_handle,
                     top_size,
                 )
             elif mother_birth_date >> father_birth_date:
@@ -456,38 +426,23 @@ def find_records(
                     mother_birth_date - father_birth_date,
                     name,
                     "Family",
-                    family.handle,
+                    family_handle,
                     top_size,
                 )
 
-        marriage_date = None
-        divorce = None
-        divorce_date = None
-        for event_ref in family.get_event_ref_list():
-            event = db.get_event_from_handle(event_ref.ref)
-            if event.get_type().is_marriage() and (
-                event_ref.get_role().is_family() or event_ref.get_role().is_primary()
-            ):
-                marriage_date = event.get_date_object()
-            if (
-                event
-                and event.get_type().is_divorce()
-                and (
-                    event_ref.get_role().is_family()
-                    or event_ref.get_role().is_primary()
-                )
-            ):
-                divorce = event
-                divorce_date = event.get_date_object()
+        marriages = snapshot.marriages[family]
+        divorces = snapshot.divorces[family]
+        marriage_date = get_date(marriages[-1]) if marriages else None
+        divorce_date = get_date(divorces[-1]) if divorces else None
 
-        father_death_date = _find_death_date(db, father)
-        mother_death_date = _find_death_date(db, mother)
+        father_death_date = get_death_date(father)
+        mother_death_date = get_death_date(mother)
 
         if not _good_date(marriage_date):
             # Not married or marriage date unknown
             continue
 
-        if divorce is not None and not _good_date(divorce_date):
+        if divorces and not _good_date(divorce_date):
             # Divorced but date unknown or inexact
             continue
 
@@ -512,7 +467,7 @@ def find_records(
                     today_date - marriage_date,
                     name,
                     "Family",
-                    family.handle,
+                    family_handle,
                     top_size,
                 )
         elif (
@@ -540,7 +495,7 @@ def find_records(
                 duration,
                 name,
                 "Family",
-                family.handle,
+                family_handle,
                 top_size,
             )
     # python 3 workaround: assign locals to tmp so we work with runtime version
@@ -0,0 +1,147 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Unittest for the detection of potential duplicate people"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import unittest
+from unittest import mock
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import (
+    ChildRef,
+    Date,
+    Event,
+    EventRef,
+    EventType,
+    Family,
+    Person,
+    Surname,
+)
+from gramps.plugins.lib import libduplicates
+from gramps.plugins.lib.libduplicates import DuplicateFinder
+
+
+# -------------------------------------------------------------------------
+#
+# DuplicateFinderTest class
+#
+# -------------------------------------------------------------------------
+class DuplicateFinderTest(unittest.TestCase):
+    """
+    Tests for the duplicate people finder.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add people", self.db) as self.trans:
+            self.father = self.add_person("John", "Smith", Person.MALE)
+            self.son = self.add_person("John", "Smith", Person.MALE, 1870)
+            self.dup = self.add_person("Jon", "Smyth", Person.MALE, 1870)
+            self.other = self.add_person("John", "Smith", Person.MALE, 1901)
+            self.daughter = self.add_person("Mary", "Smith", Person.FEMALE)
+            self.middle = self.add_person("Henry John", "Smith", Person.MALE)
+            family = Family()
+            family.set_father_handle(self.father)
+            child_ref = ChildRef()
+            child_ref.set_reference_handle(self.son)
+            family.add_child_ref(child_ref)
+            self.db.add_family(family, self.trans)
+            son = self.db.get_person_from_handle(self.son)
+            son.add_parent_family_handle(family.handle)
+            self.db.commit_person(son, self.trans)
+            father = self.db.get_person_from_handle(self.father)
+            father.add_family_handle(family.handle)
+            self.db.commit_person(father, self.trans)
+
+        self.finder = DuplicateFinder()
+        self.finder.load(self.db)
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_person(self, first_name, surname, gender, year=None):
+        person = Person()
+        name = person.get_primary_name()
+        name.set_first_name(first_name)
+        name.add_surname(Surname())
+        name.get_primary_surname().set_surname(surname)
+        person.set_gender(gender)
+        if year:
+            event = Event()
+            event.set_type(EventType.BIRTH)
+            event.set_date_object(Date(year))
+            self.db.add_event(event, self.trans)
+            event_ref = EventRef()
+            event_ref.set_reference_handle(event.handle)
+            person.set_birth_ref(event_ref)
+            person.add_event_ref(event_ref)
+        return self.db.add_person(person, self.trans)
+
+    def find(self, **kwargs):
+        graph = self.db.get_graph_index()
+
+        def is_ancestor(handle1, handle2):
+            return handle1 in graph.get_ancestors([handle2])
+
+        return {
+            frozenset((handle1, handle2)): chance
+            for matches in self.finder.find_matches(0.25, is_ancestor, **kwargs)
+            for handle1, handle2, chance in matches
+        }
+
+    def test_candidate_pairs(self):
+        pairs = list(self.finder.candidate_pairs())
+        self.assertEqual(len(pairs), len(set(map(frozenset, pairs))))
+        # Women are not compared with men
+        self.assertFalse(any(self.daughter in pair for pair in pairs))
+        # The given names share the initial of one of the names
+        self.assertIn(frozenset((self.middle, self.son)), map(frozenset, pairs))
+
+    def test_find_matches(self):
+        matches = self.find()
+        self.assertEqual(matches[frozenset((self.son, self.dup))], 3.25)
+        # A father and son can't be the same person
+        self.assertNotIn(frozenset((self.father, self.son)), matches)
+        # Birth dates in different years
+        self.assertNotIn(frozenset((self.son, self.other)), matches)
+
+    def test_no_soundex(self):
+        self.finder = DuplicateFinder(use_soundex=False)
+        self.finder.load(self.db)
+        self.assertNotIn(frozenset((self.son, self.dup)), self.find())
+
+    def test_parallel(self):
+        with mock.patch.multiple(libduplicates, CHUNKSIZE=1, PARALLEL_THRESHOLD=2):
+            self.assertEqual(self.find(max_workers=2), self.find(max_workers=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
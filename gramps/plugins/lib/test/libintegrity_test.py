@@ -0,0 +1,115 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Unittest for the set-based integrity checks"""
+
+# -------------------------------------------------------------------------
+#
+# Standard python modules
+#
+# -------------------------------------------------------------------------
+import unittest
+from unittest import mock
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Note, Person
+from gramps.plugins.lib import libintegrity
+from gramps.plugins.lib.libintegrity import BacklinkProblems, find_backlink_problems
+
+
+# -------------------------------------------------------------------------
+#
+# IntegrityTest class
+#
+# -------------------------------------------------------------------------
+class IntegrityTest(unittest.TestCase):
+    """
+    Tests for the integrity queries of the database and the comparison of
+    the reference map with the objects.
+    """
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn("Add", self.db) as trans:
+            note = Note()
+            note.set_handle("N1")
+            self.db.add_note(note, trans)
+            for handle, gramps_id, note_handle in (
+                ("P1", "I1", "N1"),
+                ("P2", "I1", "N2"),
+                ("P3", "I3", None),
+                ("P4", "I1", None),
+            ):
+                person = Person()
+                person.set_handle(handle)
+                person.set_gramps_id(gramps_id)
+                if note_handle:
+                    person.add_note(note_handle)
+                self.db.add_person(person, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_find_missing_references(self):
+        self.assertEqual(
+            self.db.find_missing_references(), [("Person", "P2", "Note", "N2")]
+        )
+        self.assertEqual(self.db.find_missing_references("Citation"), [])
+
+    def test_find_duplicated_gramps_ids(self):
+        groups = self.db.find_duplicated_gramps_ids("Person")
+        self.assertEqual([sorted(handles) for handles in groups], [["P1", "P2", "P4"]])
+        self.assertEqual(self.db.find_duplicated_gramps_ids("Note"), [])
+
+    def test_backlinks(self):
+        self.assertEqual(
+            find_backlink_problems(self.db, max_workers=1),
+            BacklinkProblems([("Person", "P2", "Note", "N2")], [], [], []),
+        )
+
+    def test_bad_backlinks(self):
+        self.db.dbapi.execute("DELETE FROM reference WHERE obj_handle = 'P1'")
+        self.db.dbapi.executemany(
+            "INSERT INTO reference (obj_handle, obj_class, ref_handle, ref_class) "
+            "VALUES (?, ?, ?, ?)",
+            [("P3", "Person", "N1", "Note"), ("P9", "Person", "N1", "Note")],
+        )
+        self.db.dbapi.commit()
+        with mock.patch.multiple(libintegrity, CHUNKSIZE=1, PARALLEL_THRESHOLD=2):
+            problems = find_backlink_problems(self.db, max_workers=2)
+        self.assertEqual(
+            problems,
+            BacklinkProblems(
+                [("Person", "P2", "Note", "N2")],
+                [("Person", "P1", "Note", "N1")],
+                [("Person", "P9", "Note", "N1")],
+                [("Person", "P3", "Note", "N1")],
+            ),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -294,6 +294,8 @@ class BirthdayReport(Report):
 
         ngettext = self._locale.translation.ngettext  # to see "nearby" comments
         rel_calc = get_relationship_calculator(reinit=True, clocale=self._locale)
+        # the database doesn't change while the report is written
+        rel_calc.storemap = True
 
         with self._user.progress(
             _("Birthday and Anniversary Report"), _("Reading database..."), len(people)
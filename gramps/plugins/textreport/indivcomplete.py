@@ -185,6 +185,8 @@ class IndivCompleteReport(Report):
             self.rel_calc = get_relationship_calculator(
                 reinit=True, clocale=self._locale
             )
+            # the database doesn't change while the report is written
+            self.rel_calc.storemap = True
 
         self.bibli = None
         self.family_notes_list = []
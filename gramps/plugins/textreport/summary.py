@@ -53,7 +53,6 @@ from gramps.gen.plug.docgen import (
     PARA_ALIGN_CENTER,
 )
 from gramps.gen.utils.file import media_path_full
-from gramps.gen.datehandler import get_date
 from gramps.gen.proxy import CacheProxyDb
 
 
@@ -113,74 +112,18 @@ class SummaryReport(Report):
         """
         Write a summary of all the people in the database.
         """
-        with_media = 0
-        incomp_names = 0
-        disconnected = 0
-        missing_bday = 0
-        males = 0
-        females = 0
-        others = 0
-        unknowns = 0
-        namelist = []
-
         self.doc.start_paragraph("SR-Heading")
         self.doc.write_text(self._("Individuals"))
         self.doc.end_paragraph()
 
-        num_people = 0
-        for person in self.__db.iter_people():
-            num_people += 1
-            primary_names = [person.get_primary_name()]
-
-            # Count people with media.
-            length = len(person.get_media_list())
-            if length > 0:
-                with_media += 1
-
-            # Count people with incomplete names.
-            for name in primary_names + person.get_alternate_names():
-                if name.get_first_name().strip() == "":
-                    incomp_names += 1
-                else:
-                    if name.get_surname_list():
-                        for surname in name.get_surname_list():
-                            if surname.get_surname().strip() == "":
-                                incomp_names += 1
-                    else:
-                        incomp_names += 1
-
-            # Count people without families.
-            if not person.get_main_parents_family_handle() and not len(
-                person.get_family_handle_list()
-            ):
-                disconnected += 1
-
-            # Count missing birthdays.
-            birth_ref = person.get_birth_ref()
-            if birth_ref:
-                birth = self.__db.get_event_from_handle(birth_ref.ref)
-                if not get_date(birth):
-                    missing_bday += 1
-            else:
-                missing_bday += 1
-
-            # Count genders.
-            if person.get_gender() == Person.FEMALE:
-                females += 1
-            elif person.get_gender() == Person.MALE:
-                males += 1
-            elif person.get_gender() == Person.OTHER:
-                others += 1
-            else:
-                unknowns += 1
-
-            # Count unique surnames
-            for name in primary_names + person.get_alternate_names():
-                if (
-                    not name.get_surname().strip() in namelist
-                    and not name.get_surname().strip() == ""
-                ):
-                    namelist.append(name.get_surname().strip())
+        stats = self.__db.get_statistics()
+        num_people = stats.get_number_of_people()
+        genders = stats.get_gender_counts()
+        males = genders.get(Person.MALE, 0)
+        females = genders.get(Person.FEMALE, 0)
+        others = genders.get(Person.OTHER, 0)
+        unknowns = num_people - males - females - others
+        counts = stats.get_person_counts()
 
         self.doc.start_paragraph("SR-Normal")
         self.doc.write_text(self._("Number of individuals: %d") % num_people)
@@ -203,25 +146,31 @@ class SummaryReport(Report):
         self.doc.end_paragraph()
 
         self.doc.start_paragraph("SR-Normal")
-        self.doc.write_text(self._("Incomplete names: %d") % incomp_names)
+        self.doc.write_text(self._("Incomplete names: %d") % counts.incomplete_names)
         self.doc.end_paragraph()
 
         self.doc.start_paragraph("SR-Normal")
         self.doc.write_text(
-            self._("Individuals missing birth dates: %d") % missing_bday
+            self._("Individuals missing birth dates: %d") % counts.missing_birth
         )
         self.doc.end_paragraph()
 
         self.doc.start_paragraph("SR-Normal")
-        self.doc.write_text(self._("Disconnected individuals: %d") % disconnected)
+        self.doc.write_text(
+            self._("Disconnected individuals: %d") % counts.disconnected
+        )
         self.doc.end_paragraph()
 
         self.doc.start_paragraph("SR-Normal")
-        self.doc.write_text(self._("Unique surnames: %d") % len(namelist))
+        self.doc.write_text(
+            self._("Unique surnames: %d") % stats.get_number_of_surnames()
+        )
         self.doc.end_paragraph()
 
         self.doc.start_paragraph("SR-Normal")
-        self.doc.write_text(self._("Individuals with media objects: %d") % with_media)
+        self.doc.write_text(
+            self._("Individuals with media objects: %d") % counts.with_media
+        )
         self.doc.end_paragraph()
 
     def summarize_families(self):
@@ -92,6 +92,7 @@ from gramps.gui.dialog import OkDialog, MissingMediaDialog
 from gramps.gen.display.name import displayer as _nd
 from gramps.gui.glade import Glade
 from gramps.gen.errors import HandleError
+from gramps.plugins.lib.libintegrity import find_backlink_problems
 
 # table for handling control chars in notes.
 # All except 09, 0A, 0D are replaced with space.
@@ -311,6 +312,7 @@ class CheckIntegrity:
         self.place_errors = 0
         self.duplicated_gramps_ids = 0
         self.bad_backlinks = 0
+        self.reference_map_ok = None
         self.bad_note_links = 0
         self.duplicated_event_role_names = 0
         self.duplicated_event_role_references = 0
@@ -1362,6 +1364,11 @@ class CheckIntegrity:
         )
         logging.info("Looking for backlink reference problems")
 
+        problems = find_backlink_problems(self.db, step=self.progress.step)
+        if problems is not None:
+            self.log_backlink_problems(problems)
+            return
+
         # dict of object handles indexed by forward link created here
         my_blinks = defaultdict(list)
         my_items = 0  # count of my backlinks for progress meter
@@ -1455,9 +1462,85 @@ class CheckIntegrity:
                         },
                     )
 
+    def log_backlink_problems(self, problems):
+        """
+        Count and log the problems found by comparing the references of the
+        objects with the reference map.
+        """
+        for obj_class, obj_handle, ref_class, ref_handle in problems.missing_target:
+            # should have been found in previous checks
+            logging.warning(
+                "    Fail: reference to an object %(obj)s not in the db by %(ref)s!",
+                {"obj": (ref_class, ref_handle), "ref": (obj_class, obj_handle)},
+            )
+        for message, rows in (
+            (
+                '    FAIL: the "%(cls)s" [%(gid)s] '
+                'has a "%(cls2)s" reference'
+                " with no corresponding backlink.",
+                problems.missing_backlink,
+            ),
+            (
+                '    FAIL: the "%(cls)s" [%(gid)s] '
+                "has a backlink to a missing"
+                ' "%(cls2)s" object.',
+                problems.missing_object,
+            ),
+            (
+                '    FAIL: the "%(cls)s" [%(gid)s] '
+                'has a backlink to a "%(cls2)s"'
+                " with no corresponding reference.",
+                problems.missing_reference,
+            ),
+        ):
+            for obj_class, obj_handle, ref_class, ref_handle in rows:
+                self.bad_backlinks += 1
+                pri_obj = self.db.method("get_%s_from_handle", ref_class)(ref_handle)
+                logging.warning(
+                    message,
+                    {
+                        "gid": getattr(pri_obj, "gramps_id", ref_handle),
+                        "cls": ref_class,
+                        "cls2": obj_class,
+                    },
+                )
+
     def callback(self, *args):
         self.progress.step()
 
+    def get_handles_to_check(self, ref_class, obj_classes):
+        """
+        Return the handles of the objects of each class whose references to
+        ref_class objects are checked, keyed by class name.
+
+        If the reference map matches the references of the objects, only
+        the objects that the map shows to refer to missing or empty handles
+        are checked.  Otherwise every object is checked.
+        """
+        if self.reference_map_ok is None:
+            self.progress.set_pass(
+                _("Looking for backlink reference problems"), self.db.get_total()
+            )
+            problems = find_backlink_problems(self.db, step=self.progress.step)
+            self.reference_map_ok = problems is not None and not (
+                problems.missing_backlink
+                or problems.missing_object
+                or problems.missing_reference
+            )
+        missing = None
+        if self.reference_map_ok:
+            missing = self.db.find_missing_references(ref_class)
+        if missing is None:
+            return {
+                obj_class: self.db.method("get_%s_handles", obj_class)()
+                for obj_class in obj_classes
+            }
+        to_check = {obj_class: set() for obj_class in obj_classes}
+        for obj_class, obj_handle, dummy, dummy in missing:
+            if obj_class in to_check:
+                to_check[obj_class].add(obj_handle)
+        return to_check
+
     def check_person_references(self):
         """Looking for person reference problems"""
         plist = self.db.get_person_handles()
@@ -1688,23 +1771,18 @@ class CheckIntegrity:
 
     def check_citation_references(self):
         """Looking for citation reference problems"""
-        known_handles = self.db.get_citation_handles()
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_repositories()
+        known_handles = set(self.db.get_citation_handles())
+
+        to_check = self.get_handles_to_check(
+            "Citation",
+            ("Person", "Family", "Place", "Citation", "Repository", "Media", "Event"),
         )
+        total = sum(len(handles) for handles in to_check.values())
 
         self.progress.set_pass(_("Looking for citation reference problems"), total)
         logging.info("Looking for citation reference problems")
 
-        for handle in self.db.get_person_handles():
+        for handle in to_check["Person"]:
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
             handle_list = person.get_referenced_handles_recursively()
@@ -1718,7 +1796,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_family_handles():
+        for handle in to_check["Family"]:
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
             handle_list = family.get_referenced_handles_recursively()
@@ -1732,7 +1810,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
+        for handle in to_check["Place"]:
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
             handle_list = place.get_referenced_handles_recursively()
@@ -1746,7 +1824,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_citation_handles():
+        for handle in to_check["Citation"]:
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
             handle_list = citation.get_referenced_handles_recursively()
@@ -1760,7 +1838,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_repository_handles():
+        for handle in to_check["Repository"]:
             self.progress.step()
             repository = self.db.get_repository_from_handle(handle)
             handle_list = repository.get_referenced_handles_recursively()
@@ -1774,7 +1852,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
+        for handle in to_check["Media"]:
             self.progress.step()
             obj = self.db.get_media_from_handle(handle)
             handle_list = obj.get_referenced_handles_recursively()
@@ -1788,7 +1866,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_event_handles():
+        for handle in to_check["Event"]:
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
             handle_list = event.get_referenced_handles_recursively()
@@ -1856,23 +1934,19 @@ class CheckIntegrity:
 
     def check_media_references(self):
         """Looking for media object reference problems"""
-        known_handles = self.db.get_media_handles(False)
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
+        known_handles = set(self.db.get_media_handles(False))
+
+        to_check = self.get_handles_to_check(
+            "Media", ("Person", "Family", "Place", "Event", "Citation", "Source")
         )
+        total = sum(len(handles) for handles in to_check.values())
 
         self.progress.set_pass(
             _("Looking for media object reference " "problems"), total
         )
         logging.info("Looking for media object reference problems")
 
-        for handle in self.db.get_person_handles():
+        for handle in to_check["Person"]:
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
             handle_list = person.get_referenced_handles_recursively()
@@ -1886,7 +1960,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_family_handles():
+        for handle in to_check["Family"]:
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
             handle_list = family.get_referenced_handles_recursively()
@@ -1900,7 +1974,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
+        for handle in to_check["Place"]:
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
             handle_list = place.get_referenced_handles_recursively()
@@ -1914,7 +1988,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_event_handles():
+        for handle in to_check["Event"]:
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
             handle_list = event.get_referenced_handles_recursively()
@@ -1928,7 +2002,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_citation_handles():
+        for handle in to_check["Citation"]:
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
             handle_list = citation.get_referenced_handles_recursively()
@@ -1942,7 +2016,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
+        for handle in to_check["Source"]:
             self.progress.step()
             source = self.db.get_source_from_handle(handle)
             handle_list = source.get_referenced_handles_recursively()
@@ -1986,23 +2060,27 @@ class CheckIntegrity:
         if missing_references:
             self.db.add_note(self.explanation, self.trans, set_gid=True)
 
-        known_handles = self.db.get_note_handles()
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_repositories()
+        known_handles = set(self.db.get_note_handles())
+
+        to_check = self.get_handles_to_check(
+            "Note",
+            (
+                "Person",
+                "Family",
+                "Place",
+                "Citation",
+                "Source",
+                "Media",
+                "Event",
+                "Repository",
+            ),
         )
+        total = sum(len(handles) for handles in to_check.values())
 
         self.progress.set_pass(_("Looking for note reference problems"), total)
         logging.info("Looking for note reference problems")
 
-        for handle in self.db.get_person_handles():
+        for handle in to_check["Person"]:
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
             handle_list = person.get_referenced_handles_recursively()
@@ -2016,7 +2094,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_family_handles():
+        for handle in to_check["Family"]:
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
             handle_list = family.get_referenced_handles_recursively()
@@ -2030,7 +2108,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
+        for handle in to_check["Place"]:
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
             handle_list = place.get_referenced_handles_recursively()
@@ -2044,7 +2122,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_citation_handles():
+        for handle in to_check["Citation"]:
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
             handle_list = citation.get_referenced_handles_recursively()
@@ -2058,7 +2136,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
+        for handle in to_check["Source"]:
             self.progress.step()
             source = self.db.get_source_from_handle(handle)
             handle_list = source.get_referenced_handles_recursively()
@@ -2072,7 +2150,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
+        for handle in to_check["Media"]:
             self.progress.step()
             obj = self.db.get_media_from_handle(handle)
             handle_list = obj.get_referenced_handles_recursively()
@@ -2086,7 +2164,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_event_handles():
+        for handle in to_check["Event"]:
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
             handle_list = event.get_referenced_handles_recursively()
@@ -2100,7 +2178,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_repository_handles():
+        for handle in to_check["Repository"]:
             self.progress.step()
             repo = self.db.get_repository_from_handle(handle)
             handle_list = repo.get_referenced_handles_recursively()
@@ -2146,24 +2224,28 @@ class CheckIntegrity:
 
     def check_tag_references(self):
         """Looking for tag reference problems"""
-        known_handles = self.db.get_tag_handles()
-
-        total = (
-            self.db.get_number_of_people()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_notes()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_citations()
-            + self.db.get_number_of_sources()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_repositories()
+        known_handles = set(self.db.get_tag_handles())
+
+        to_check = self.get_handles_to_check(
+            "Tag",
+            (
+                "Person",
+                "Family",
+                "Media",
+                "Note",
+                "Event",
+                "Citation",
+                "Source",
+                "Place",
+                "Repository",
+            ),
         )
+        total = sum(len(handles) for handles in to_check.values())
 
         self.progress.set_pass(_("Looking for tag reference problems"), total)
         logging.info("Looking for tag reference problems")
 
-        for handle in self.db.get_person_handles():
+        for handle in to_check["Person"]:
             self.progress.step()
             person = self.db.get_person_from_handle(handle)
             handle_list = person.get_referenced_handles_recursively()
@@ -2177,7 +2259,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_family_handles():
+        for handle in to_check["Family"]:
             self.progress.step()
             family = self.db.get_family_from_handle(handle)
             handle_list = family.get_referenced_handles_recursively()
@@ -2191,7 +2273,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
+        for handle in to_check["Media"]:
             self.progress.step()
             obj = self.db.get_media_from_handle(handle)
             handle_list = obj.get_referenced_handles_recursively()
@@ -2205,7 +2287,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_note_handles():
+        for handle in to_check["Note"]:
             self.progress.step()
             note = self.db.get_note_from_handle(handle)
             handle_list = note.get_referenced_handles_recursively()
@@ -2219,7 +2301,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_event_handles():
+        for handle in to_check["Event"]:
             self.progress.step()
             event = self.db.get_event_from_handle(handle)
             handle_list = event.get_referenced_handles_recursively()
@@ -2233,7 +2315,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_citation_handles():
+        for handle in to_check["Citation"]:
             self.progress.step()
             citation = self.db.get_citation_from_handle(handle)
             handle_list = citation.get_referenced_handles_recursively()
@@ -2247,7 +2329,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
+        for handle in to_check["Source"]:
             self.progress.step()
             source = self.db.get_source_from_handle(handle)
             handle_list = source.get_referenced_handles_recursively()
@@ -2261,7 +2343,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
+        for handle in to_check["Place"]:
             self.progress.step()
             place = self.db.get_place_from_handle(handle)
             handle_list = place.get_referenced_handles_recursively()
@@ -2275,7 +2357,7 @@ class CheckIntegrity:
                     elif item[1] not in known_handles:
                         self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_repository_handles():
+        for handle in to_check["Repository"]:
             self.progress.step()
             repository = self.db.get_repository_from_handle(handle)
             handle_list = repository.get_referenced_handles_recursively()
@@ -2362,164 +2444,52 @@ class CheckIntegrity:
         classes.  It does not check across classes.  If duplicates are
         found, a new Gramps ID is assigned.
         """
-        total = (
-            self.db.get_number_of_citations()
-            + self.db.get_number_of_events()
-            + self.db.get_number_of_families()
-            + self.db.get_number_of_media()
-            + self.db.get_number_of_notes()
-            + self.db.get_number_of_people()
-            + self.db.get_number_of_places()
-            + self.db.get_number_of_repositories()
-            + self.db.get_number_of_sources()
+        obj_classes = (
+            "Citation",
+            "Event",
+            "Family",
+            "Media",
+            "Note",
+            "Person",
+            "Place",
+            "Repository",
+            "Source",
+        )
+        self.progress.set_pass(
+            _("Looking for Duplicated Gramps ID " "problems"), len(obj_classes)
         )
-
-        self.progress.set_pass(_("Looking for Duplicated Gramps ID " "problems"), total)
         logging.info("Looking for Duplicated Gramps ID problems")
-        gid_list = []
-        for citation in self.db.iter_citations():
-            self.progress.step()
-            ogid = gid = citation.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_citation_gramps_id()
-                citation.set_gramps_id(gid)
-                self.db.commit_citation(citation, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for event in self.db.iter_events():
-            self.progress.step()
-            ogid = gid = event.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_event_gramps_id()
-                event.set_gramps_id(gid)
-                self.db.commit_event(event, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for family in self.db.iter_families():
-            self.progress.step()
-            ogid = gid = family.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_family_gramps_id()
-                family.set_gramps_id(gid)
-                self.db.commit_family(family, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for media in self.db.iter_media():
+        for obj_class in obj_classes:
             self.progress.step()
-            ogid = gid = media.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_media_gramps_id()
-                media.set_gramps_id(gid)
-                self.db.commit_media(media, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for note in self.db.iter_notes():
-            self.progress.step()
-            ogid = gid = note.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_note_gramps_id()
-                note.set_gramps_id(gid)
-                self.db.commit_note(note, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for person in self.db.iter_people():
-            self.progress.step()
-            ogid = gid = person.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_person_gramps_id()
-                person.set_gramps_id(gid)
-                self.db.commit_person(person, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for place in self.db.iter_places():
-            self.progress.step()
-            ogid = gid = place.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_place_gramps_id()
-                place.set_gramps_id(gid)
-                self.db.commit_place(place, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for repository in self.db.iter_repositories():
-            self.progress.step()
-            ogid = gid = repository.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_repository_gramps_id()
-                repository.set_gramps_id(gid)
-                self.db.commit_repository(repository, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
-        gid_list = []
-        for source in self.db.iter_sources():
-            self.progress.step()
-            ogid = gid = source.get_gramps_id()
-            if gid in gid_list:
-                gid = self.db.find_next_source_gramps_id()
-                source.set_gramps_id(gid)
-                self.db.commit_source(source, self.trans)
-                logging.warning(
-                    "    FAIL: Duplicated Gramps ID found, "
-                    'Original: "%s" changed to: "%s"',
-                    ogid,
-                    gid,
-                )
-                self.duplicated_gramps_ids += 1
-            gid_list.append(gid)
+            groups = self.db.find_duplicated_gramps_ids(obj_class)
+            if groups is None:
+                groups = self.group_by_gramps_id(obj_class)
+            # the first object of each group keeps its Gramps ID
+            for handles in groups:
+                for handle in handles[1:]:
+                    obj = self.db.method("get_%s_from_handle", obj_class)(handle)
+                    ogid = obj.get_gramps_id()
+                    gid = self.db.method("find_next_%s_gramps_id", obj_class)()
+                    obj.set_gramps_id(gid)
+                    self.db.method("commit_%s", obj_class)(obj, self.trans)
+                    logging.warning(
+                        "    FAIL: Duplicated Gramps ID found, "
+                        'Original: "%s" changed to: "%s"',
+                        ogid,
+                        gid,
+                    )
+                    self.duplicated_gramps_ids += 1
+
+    def group_by_gramps_id(self, obj_class):
+        """
+        Return the lists of the handles of the objects of a class which have
+        the same Gramps ID, by loading every object.
+        """
+        groups = defaultdict(list)
+        for handle in self.db.method("get_%s_handles", obj_class)():
+            obj = self.db.method("get_%s_from_handle", obj_class)(handle)
+            groups[obj.get_gramps_id()].append(handle)
+        return [handles for handles in groups.values() if len(handles) > 1]
 
     def check_note_links(self):
         """
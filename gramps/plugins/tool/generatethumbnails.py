@@ -0,0 +1,101 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tools/Utilities/Generate Thumbnails"""
+
+# -------------------------------------------------------------------------
+#
+# python modules
+#
+# -------------------------------------------------------------------------
+import os
+
+# -------------------------------------------------------------------------
+#
+# Gramps modules
+#
+# -------------------------------------------------------------------------
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+from gramps.gen.utils.thumbcache import get_thumbnail_jobs
+from gramps.gen.utils.thumbnails import generate_thumbnails
+from gramps.gui.plug import tool
+
+_ = glocale.translation.gettext
+
+
+# -------------------------------------------------------------------------
+#
+# GenerateThumbnails class
+#
+# -------------------------------------------------------------------------
+class GenerateThumbnails(tool.Tool):
+    """
+    Make the thumbnails of all of the media objects, and of the regions of
+    the media references, which are not in the thumbnail cache.
+    """
+
+    def __init__(self, dbstate, user, options_class, name, callback=None):
+        tool.Tool.__init__(self, dbstate, options_class, name)
+        processes = max(1, self.options.handler.options_dict["processes"])
+
+        with user.progress(
+            _("Generate Thumbnails"),
+            _("Finding media references"),
+            self.db.get_number_of_media(),
+        ) as step:
+            jobs = get_thumbnail_jobs(self.db, step=step)
+
+        with user.progress(
+            _("Generate Thumbnails"), _("Generating thumbnails"), len(jobs)
+        ) as step:
+            made, failed = generate_thumbnails(jobs, processes, step)
+
+        message = _("%(made)d thumbnails generated, %(current)d already current.") % {
+            "made": made,
+            "current": len(jobs) - made - failed,
+        }
+        if failed:
+            message += "\n" + _("%d thumbnails could not be generated.") % failed
+        user.info(_("Thumbnails generated"), message)
+
+
+# ------------------------------------------------------------------------
+#
+# GenerateThumbnailsOptions class
+#
+# ------------------------------------------------------------------------
+class GenerateThumbnailsOptions(tool.ToolOptions):
+    """
+    Defines options and provides handling interface.
+    """
+
+    def __init__(self, name, person_id=None):
+        tool.ToolOptions.__init__(self, name, person_id)
+
+        # Options specific for this report
+        self.options_dict = {
+            "processes": os.cpu_count() or 1,
+        }
+        self.options_help = {
+            "processes": (
+                "=num",
+                "Number of processes generating the thumbnails",
+                "Integer number",
+            ),
+        }
@@ -557,3 +557,30 @@ register(
     tool_modes=[TOOL_MODE_GUI],
     help_url=TOOLS_HELP,
 )
+
+# ------------------------------------------------------------------------
+#
+# Generate Thumbnails
+#
+# ------------------------------------------------------------------------
+
+register(
+    TOOL,
+    id="thumbnails",
+    name=_("Generate Thumbnails"),
+    description=_(
+        "Generates the thumbnails of all of the media objects "
+        "and of their regions used in the family tree"
+    ),
+    version="1.0",
+    gramps_target_version=MODULE_VERSION,
+    status=STABLE,
+    fname="generatethumbnails.py",
+    authors=["The Gramps project"],
+    authors_email=["https://gramps-project.org"],
+    category=TOOL_UTILS,
+    toolclass="GenerateThumbnails",
+    optionclass="GenerateThumbnailsOptions",
+    tool_modes=[TOOL_MODE_GUI, TOOL_MODE_CLI],
+    help_url=TOOLS_HELP,
+)
@@ -3137,7 +3137,7 @@ class BasePage:
         @param: handle -- The family handle
         @param: url    -- url to be linked
         """
-        self.report.fam_link[handle] = url
+        self.report.add_family_map_link(handle, url)
         return Html(
             "a",
             self._("Family Map"),
@@ -45,6 +45,7 @@ from operator import itemgetter
 from decimal import getcontext
 import unicodedata
 import logging
+from functools import partial
 
 # ------------------------------------------------
 # Gramps module
@@ -58,6 +59,7 @@ from gramps.plugins.lib.libhtml import Html
 # specific narrative web import
 # ------------------------------------------------
 from gramps.plugins.webreport.basepage import BasePage
+from gramps.plugins.webreport.parallel import render_pages
 from gramps.plugins.webreport.common import (
     _EVENTMAP,
     alphabet_navigation,
@@ -125,14 +127,21 @@ class EventPages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(event_handle_list) + 1
         ) as step:
-            index = 1
-            for event_handle in event_handle_list:
-                step()
-                index += 1
-                self.eventpage(self.report, the_lang, the_title, event_handle)
+            render_pages(
+                self.report,
+                partial(self.eventpage, self.report, the_lang, the_title),
+                event_handle_list,
+                step,
+            )
             step()
-        self.eventlistpage(
-            self.report, the_lang, the_title, event_types, event_handle_list
+        self.report.create_pages(
+            "events",
+            self.eventlistpage,
+            self.report,
+            the_lang,
+            the_title,
+            event_types,
+            event_handle_list,
         )
 
     def __output_event(
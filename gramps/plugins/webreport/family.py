@@ -44,6 +44,7 @@ from collections import defaultdict, OrderedDict
 from decimal import getcontext
 import unicodedata
 import logging
+from functools import partial
 
 # ------------------------------------------------
 # Gramps module
@@ -57,6 +58,7 @@ from gramps.plugins.lib.libhtml import Html
 # specific narrative web import
 # ------------------------------------------------
 from gramps.plugins.webreport.basepage import BasePage
+from gramps.plugins.webreport.parallel import render_pages
 from gramps.gen.display.name import displayer as _nd
 from gramps.plugins.webreport.common import (
     alphabet_navigation,
@@ -115,18 +117,24 @@ class FamilyPages(BasePage):
             LOG.debug("    %s", str(item))
 
         message = _("Creating family pages...")
-        index = 1
         progress_title = self.report.pgrs_title(the_lang)
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Family]) + 1
         ) as step:
-            for family_handle in self.report.obj_dict[Family]:
-                step()
-                index += 1
-                self.familypage(self.report, the_lang, the_title, family_handle)
+            render_pages(
+                self.report,
+                partial(self.familypage, self.report, the_lang, the_title),
+                self.report.obj_dict[Family],
+                step,
+            )
             step()
-            self.familylistpage(
-                self.report, the_lang, the_title, self.report.obj_dict[Family].keys()
+            self.report.create_pages(
+                "families",
+                self.familylistpage,
+                self.report,
+                the_lang,
+                the_title,
+                self.report.obj_dict[Family].keys(),
             )
 
     def __output_family(
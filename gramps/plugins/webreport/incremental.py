@@ -0,0 +1,593 @@
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Incremental update of the Narrated Web Site report.
+
+While a page is created, the objects it reads from the database and the
+entries it reads from the lists of objects of the report are recorded as
+its dependencies.  The manifest, stored in the output directory, keeps the
+files of each page with the list of its dependencies and a digest of their
+values.  On the next run, a page whose dependencies have the same digest
+is not created again.
+"""
+
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.proxy import CacheProxyDb
+from gramps.gen.proxy.proxybase import ProxyDbBase
+from gramps.version import VERSION
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+MANIFEST = ".narrated-web-manifest.json.gz"
+MANIFEST_VERSION = 1
+
+# Options that don't change the pages
+RUN_OPTIONS = ("processes", "incremental")
+
+TABLES = {
+    "person": "person",
+    "people": "person",
+    "family": "family",
+    "families": "family",
+    "event": "event",
+    "events": "event",
+    "place": "place",
+    "places": "place",
+    "source": "source",
+    "sources": "source",
+    "citation": "citation",
+    "citations": "citation",
+    "media": "media",
+    "repository": "repository",
+    "repositories": "repository",
+    "note": "note",
+    "notes": "note",
+    "tag": "tag",
+    "tags": "tag",
+}
+
+# Methods of the database whose results depend on a single object, on an
+# object found by its Gramps ID, or on all objects of a table
+_OBJECT_METHOD = re.compile(r"get_(?:raw_)?(\w+?)_(?:from_handle|data)$")
+_GRAMPS_ID_METHOD = re.compile(r"get_(\w+)_from_gramps_id$")
+_TABLE_METHOD = re.compile(
+    r"(?:(?:get|iter)_(\w+)_(?:handles|gramps_ids)|get_number_of_(\w+)|iter_(\w+))$"
+)
+
+
+# ------------------------------------------------
+#
+# Recorder class
+#
+# ------------------------------------------------
+class Recorder:
+    """
+    Collect the dependencies of the page being created.  A dependency is a
+    tuple, whose first item gives its kind.
+    """
+
+    def __init__(self):
+        self.deps = None
+
+    def add(self, dep):
+        if self.deps is not None:
+            self.deps.add(dep)
+
+    def update(self, deps):
+        if self.deps is not None:
+            self.deps.update(deps)
+
+    @contextmanager
+    def record(self):
+        """
+        Collect the dependencies in a new set, which are also added to the
+        dependencies being collected, if any.
+        """
+        outer = self.deps
+        self.deps = deps = set()
+        try:
+            yield deps
+        finally:
+            self.deps = outer
+            if outer is not None:
+                outer.update(deps)
+
+
+# ------------------------------------------------
+#
+# RecordingDb class
+#
+# ------------------------------------------------
+class RecordingDb:
+    """
+    Database wrapper recording the objects read as dependencies.
+
+    The report reads through a wrapper above its cache, and the proxies of
+    the report read through a wrapper under them.  The wrapper above the
+    cache keeps the dependencies of the objects it has read the first time,
+    to record them again when the objects come from the cache.
+    """
+
+    def __init__(self, db, recorder, cache=False):
+        self.db = db
+        self.recorder = recorder
+        self.cache = cache
+        self.closures = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+        if self.cache:
+            match = _OBJECT_METHOD.match(name)
+            if match and name.endswith("_from_handle"):
+                wrapper = self._cached_method(name, TABLES.get(match.group(1)))
+            else:
+                return attr
+        else:
+            wrapper = self._method(name)
+            if wrapper is None:
+                return attr
+        # The methods of self.db are looked up by the wrappers, as the
+        # database may be replaced in a worker process
+        setattr(self, name, wrapper)
+        return wrapper
+
+    def _cached_method(self, name, table):
+        def wrapper(handle):
+            closure = self.closures.get((table, handle))
+            if closure is not None:
+                self.recorder.update(closure)
+                return getattr(self.db, name)(handle)
+            with self.recorder.record() as deps:
+                obj = getattr(self.db, name)(handle)
+            if len(deps) > 1:
+                self.closures[(table, handle)] = frozenset(deps)
+            else:
+                self.closures[(table, handle)] = (("change", table, handle),)
+            return obj
+
+        return wrapper
+
+    def _method(self, name):
+        match = _OBJECT_METHOD.match(name)
+        if match and match.group(1) in TABLES:
+            table = TABLES[match.group(1)]
+
+            def wrapper(handle, *args, **kwargs):
+                self.recorder.add(("change", table, handle))
+                return getattr(self.db, name)(handle, *args, **kwargs)
+
+            return wrapper
+
+        match = _GRAMPS_ID_METHOD.match(name)
+        if match and match.group(1) in TABLES:
+            table = TABLES[match.group(1)]
+
+            def wrapper(gramps_id):
+                self.recorder.add(("gramps_id", table, gramps_id))
+                return getattr(self.db, name)(gramps_id)
+
+            return wrapper
+
+        match = _TABLE_METHOD.match(name)
+        if match:
+            table = TABLES.get(next(group for group in match.groups() if group))
+            if table is None:
+                return None
+
+            def wrapper(*args, **kwargs):
+                self.recorder.add(("table", table))
+                return getattr(self.db, name)(*args, **kwargs)
+
+            return wrapper
+
+        if name == "find_backlink_handles":
+
+            def wrapper(handle, *args, **kwargs):
+                self.recorder.add(("backlinks", handle))
+                return getattr(self.db, name)(handle, *args, **kwargs)
+
+            return wrapper
+
+        if name == "get_default_handle":
+
+            def wrapper():
+                self.recorder.add(("default",))
+                return getattr(self.db, name)()
+
+            return wrapper
+
+        return None
+
+
+# ------------------------------------------------
+#
+# RecordingDict class
+#
+# ------------------------------------------------
+class RecordingDict(defaultdict):
+    """
+    Objects of a class in the report, recording the entries read as
+    dependencies.  Reading all of the entries records the list of objects as
+    a dependency.
+    """
+
+    def __init__(self, name, recorder, items):
+        super().__init__(set, items)
+        self.name = name
+        self.recorder = recorder
+        self.keys_digest = None
+
+    def __getitem__(self, key):
+        self.recorder.add((self.name, key))
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.recorder.add((self.name, key))
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        self.recorder.add((self.name, key))
+        return super().__contains__(key)
+
+    def __iter__(self):
+        self.recorder.add((self.name,))
+        return super().__iter__()
+
+    def __len__(self):
+        self.recorder.add((self.name,))
+        return super().__len__()
+
+    def keys(self):
+        return RecordingView(self, dict.keys(self))
+
+    def items(self):
+        return RecordingView(self, dict.items(self))
+
+    def values(self):
+        return RecordingView(self, dict.values(self))
+
+    def __setitem__(self, key, value):
+        if value or dict.get(self, key):
+            self.keys_digest = None
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.keys_digest = None
+        super().__delitem__(key)
+
+
+class RecordingView:
+    """
+    View of a :class:`RecordingDict`, recording the list of objects when it
+    is read.
+    """
+
+    def __init__(self, mapping, view):
+        self.mapping = mapping
+        self.view = view
+
+    def __iter__(self):
+        self.mapping.recorder.add((self.mapping.name,))
+        return iter(self.view)
+
+    def __len__(self):
+        self.mapping.recorder.add((self.mapping.name,))
+        return len(self.view)
+
+    def __contains__(self, item):
+        self.mapping.recorder.add((self.mapping.name,))
+        return item in self.view
+
+
+class RecordingObjects(dict):
+    """
+    Lists of objects of the report, by class.  The list of a class is added
+    when it is first used.
+    """
+
+    def __init__(self, name, dicts, recorder, objects):
+        super().__init__()
+        self.name = name
+        self.dicts = dicts
+        self.recorder = recorder
+        for obj_class, items in objects.items():
+            self._add(obj_class, items)
+
+    def __missing__(self, obj_class):
+        return self._add(obj_class, ())
+
+    def _add(self, obj_class, items):
+        name = "%s:%s" % (self.name, obj_class.__name__)
+        self[obj_class] = self.dicts[name] = RecordingDict(name, self.recorder, items)
+        return self[obj_class]
+
+
+# ------------------------------------------------
+#
+# Manifest class
+#
+# ------------------------------------------------
+class Manifest:
+    """
+    Pages created by the previous run of the report, and by this one.
+
+    A page is any unit of output with a key, like the page of an object or
+    the index pages of a class of objects, and it may have many files.
+    Each page is stored as a list of the files created, the list of its
+    dependencies, the digest of their values, and the family map links it
+    added.
+
+    @param: report -- The instance of the main report class
+    """
+
+    def __init__(self, report):
+        self.report = report
+        self.recorder = Recorder()
+        self.options = options_digest(report.options)
+        self.directory = None
+        self.reuse = False
+        self.pages = {}
+        self.new_pages = {}
+        self.signatures = {}
+        self.files = None
+        self.base = None
+        self.dicts = {}
+
+    def record_database(self, database):
+        """
+        Return the database of the report, wrapped to record the objects
+        read.  The family tree under the proxies is wrapped as well.
+        """
+        family_tree = database
+        while isinstance(family_tree, (CacheProxyDb, ProxyDbBase)):
+            family_tree = family_tree.db
+        self.base = RecordingDb(family_tree, self.recorder)
+        if family_tree is database:
+            database = self.base
+        proxy = database
+        while isinstance(proxy, (CacheProxyDb, ProxyDbBase)):
+            if proxy.db is family_tree:
+                proxy.db = self.base
+            if getattr(proxy, "basedb", None) is family_tree:
+                proxy.basedb = self.base
+            proxy = proxy.db
+        return RecordingDb(database, self.recorder, cache=True)
+
+    def record_objects(self, obj_dict, bkref_dict):
+        """
+        Return the lists of objects of the report, replaced by ones recording
+        the entries read.
+        """
+        self.dicts = {}
+        return (
+            RecordingObjects("obj_dict", self.dicts, self.recorder, obj_dict),
+            RecordingObjects("bkref_dict", self.dicts, self.recorder, bkref_dict),
+        )
+
+    def load(self, directory):
+        """
+        Read the manifest of the previous run from the output directory.
+        """
+        self.directory = directory
+        path = os.path.join(directory, MANIFEST)
+        if not os.path.exists(path):
+            return
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as manifest:
+                data = json.load(manifest)
+        except (OSError, ValueError) as err:
+            LOG.warning("Ignoring the manifest %s: %s", path, err)
+            return
+        if data.get("version") != MANIFEST_VERSION:
+            return
+        deps = [tuple(dep) for dep in data["deps"]]
+        for key, (files, indexes, digest, links) in data["pages"].items():
+            indexes = tuple(deps[index] for index in indexes)
+            self.pages[key] = (files, indexes, digest, links)
+        # The pages of other options are only used to remove their files
+        self.reuse = data.get("options") == self.options
+
+    def save(self):
+        """
+        Write the manifest of this run, and remove the files of the pages
+        that were not created again.
+        """
+        files = {name for page in self.new_pages.values() for name in page[0]}
+        for page in self.pages.values():
+            for name in page[0]:
+                if name not in files:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+        deps = {}
+        pages = {}
+        for key, (page_files, page_deps, digest, links) in self.new_pages.items():
+            indexes = [deps.setdefault(dep, len(deps)) for dep in page_deps]
+            pages[key] = [page_files, indexes, digest, links]
+        data = {
+            "version": MANIFEST_VERSION,
+            "options": self.options,
+            "deps": list(deps),
+            "pages": pages,
+        }
+        path = os.path.join(self.directory, MANIFEST)
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as manifest:
+            json.dump(data, manifest)
+        os.replace(path + ".tmp", path)
+
+    def is_current(self, key):
+        """
+        Return True if the page of the previous run is still current, in
+        which case it is kept, with the family map links it added.
+        """
+        page = self.pages.get(key)
+        if not self.reuse or page is None:
+            return False
+        files, deps, digest, links = page
+        for name in files:
+            if not os.path.isfile(os.path.join(self.directory, name)):
+                return False
+        if self.digest(deps) != digest:
+            return False
+        self.new_pages[key] = page
+        for handle, url in links.items():
+            self.report.add_family_map_link(handle, url)
+        return True
+
+    @contextmanager
+    def page(self, key):
+        """
+        Record the files, dependencies and family map links of a page
+        created.
+        """
+        outer = (self.files, self.report.new_fam_links)
+        self.files = files = []
+        self.report.new_fam_links = links = {}
+        try:
+            with self.recorder.record() as deps:
+                yield
+        finally:
+            self.files, self.report.new_fam_links = outer
+        if self.files is not None:
+            self.files.extend(files)
+        if self.report.new_fam_links is not None:
+            self.report.new_fam_links.update(links)
+        deps = tuple(sorted(deps, key=repr))
+        self.new_pages[key] = (files, deps, self.digest(deps), links)
+
+    def add_file(self, path):
+        """
+        Add a file to the page being created.
+        """
+        if self.files is not None:
+            self.files.append(os.path.relpath(path, self.directory))
+
+    def digest(self, deps):
+        """
+        Return the digest of the current values of dependencies.
+        """
+        values = json.dumps([self.signature(dep) for dep in deps], default=str)
+        return hashlib.sha1(values.encode("utf-8")).hexdigest()
+
+    def signature(self, dep):
+        """
+        Return the current value of a dependency.
+        """
+        if ":" in dep[0]:
+            return self._dict_signature(dep)
+        if dep not in self.signatures:
+            self.signatures[dep] = self._db_signature(dep)
+        return self.signatures[dep]
+
+    def _dict_signature(self, dep):
+        mapping = self.dicts.get(dep[0])
+        if mapping is None:
+            return None
+        if len(dep) == 1:
+            if mapping.keys_digest is None:
+                keys = sorted(repr(key) for key, value in dict.items(mapping) if value)
+                mapping.keys_digest = hashlib.sha1(
+                    json.dumps(keys).encode("utf-8")
+                ).hexdigest()
+            return mapping.keys_digest
+        value = dict.get(mapping, dep[1])
+        if not value:
+            return None
+        if isinstance(value, set):
+            return sorted(json.dumps(value_signature(item)) for item in value)
+        return value_signature(value)
+
+    def _db_signature(self, dep):
+        family_tree = self.base.db
+        kind = dep[0]
+        if kind == "change":
+            data = getattr(family_tree, "get_raw_%s_data" % dep[1])(dep[2])
+            return data["change"] if data else None
+        if kind == "gramps_id":
+            obj = getattr(family_tree, "get_%s_from_gramps_id" % dep[1])(dep[2])
+            return [obj.handle, obj.change] if obj else None
+        if kind == "backlinks":
+            return sorted(family_tree.find_backlink_handles(dep[1]))
+        if kind == "table":
+            get_data = getattr(family_tree, "get_raw_%s_data" % dep[1])
+            changes = sorted(
+                (handle, get_data(handle)["change"])
+                for handle in getattr(family_tree, "get_%s_handles" % dep[1])()
+            )
+            return hashlib.sha1(json.dumps(changes).encode("utf-8")).hexdigest()
+        if kind == "default":
+            return family_tree.get_default_handle()
+        return None
+
+
+def value_signature(value):
+    """
+    Return an entry of the lists of objects of the report, with the Gramps
+    objects replaced by their handle and change time.
+    """
+    if isinstance(value, (tuple, list)):
+        return [value_signature(item) for item in value]
+    if isinstance(value, type):
+        return value.__name__
+    if hasattr(value, "handle"):
+        return [value.__class__.__name__, value.handle, value.change]
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return repr(value)
+
+
+def options_digest(options):
+    """
+    Return the digest of the options of the report that change the pages.
+    """
+    values = {name: value for name, value in options.items() if name not in RUN_OPTIONS}
+    values["version"] = VERSION
+    return hashlib.sha1(
+        json.dumps(values, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def page_key(the_lang, name):
+    """
+    Return the key of a page in the manifest.
+
+    @param: the_lang -- The language of the page
+    @param: name     -- The name of the pages, or the item of an object page
+    """
+    return json.dumps([the_lang, name])
@@ -66,6 +66,7 @@ from gramps.plugins.lib.libhtml import Html
 # specific narrative web import
 # ------------------------------------------------
 from gramps.plugins.webreport.basepage import BasePage
+from gramps.plugins.webreport.parallel import render_pages
 from gramps.plugins.webreport.common import FULLCLEAR, _WRONGMEDIAPATH, html_escape
 
 _ = glocale.translation.sgettext
@@ -147,6 +148,8 @@ class MediaPages(BasePage):
                 self.report.obj_dict[Media].keys(),
                 key=lambda x: sort_by_desc_and_gid(self.r_db.get_media_from_handle(x)),
             )
+            # the pages to create, with their previous and next pages
+            pages = []
             prev = None
             total = len(sorted_media_handles)
             index = 1
@@ -159,15 +162,8 @@ class MediaPages(BasePage):
                     next_ = self.unused_media_handles[0]
                 else:
                     next_ = None
-                self.mediapage(
-                    self.report,
-                    the_lang,
-                    the_title,
-                    handle,
-                    (prev, next_, index, media_count),
-                )
+                pages.append((handle, (prev, next_, index, media_count)))
                 prev = handle
-                step()
                 index += 1
 
             total = len(self.unused_media_handles)
@@ -180,19 +176,25 @@ class MediaPages(BasePage):
                         next_ = None
                     else:
                         next_ = self.unused_media_handles[idx]
-                    self.mediapage(
-                        self.report,
-                        the_lang,
-                        the_title,
-                        media_handle,
-                        (prev, next_, index, media_count),
-                    )
+                    pages.append((media_handle, (prev, next_, index, media_count)))
                     prev = media_handle
-                    step()
                     index += 1
                     idx += 1
 
-        self.medialistpage(self.report, the_lang, the_title, sorted_media_handles)
+            def render(page):
+                handle, info = page
+                self.mediapage(self.report, the_lang, the_title, handle, info)
+
+            render_pages(self.report, render, pages, step)
+
+        self.report.create_pages(
+            "media",
+            self.medialistpage,
+            self.report,
+            the_lang,
+            the_title,
+            sorted_media_handles,
+        )
 
     def medialistpage(self, report, the_lang, the_title, sorted_media_handles):
         """
@@ -908,8 +910,7 @@ class MediaPages(BasePage):
                     self.report.archive.add(fullpath, str(newpath))
             else:
                 to_dir = os.path.join(self.html_dir, to_dir)
-                if not os.path.isdir(to_dir):
-                    os.makedirs(to_dir)
+                os.makedirs(to_dir, exist_ok=True)
                 new_file = os.path.join(self.html_dir, newpath)
                 if not os.path.exists(newpath):
                     shutil.copyfile(fullpath, new_file)
@@ -137,6 +137,8 @@ from gramps.plugins.webreport.multiselect import (
     MultiSelectTags,
     HeatmapTagsScrolled,
 )
+from gramps.plugins.webreport.incremental import Manifest, page_key
+from gramps.plugins.webreport.parallel import render_pages
 
 from gramps.plugins.webreport.common import (
     get_gendex_data,
@@ -322,12 +324,22 @@ class NavWebReport(Report):
         else:
             self.html_dir = self.target_path
         self.warn_dir = True  # Only give warning once.
+        # Pages whose objects did not change since the last run are kept.
+        # The pages of an archive are always created.
+        self.manifest = None
+        if self.options["incremental"] and not self.use_archive:
+            self.manifest = Manifest(self)
+            self.database = self.manifest.record_database(self.database)
+            self._db = self.database
         self.obj_dict = None
         self.visited = None
         self.bkref_dict = None
         self.rel_class = None
         self.tab = None
         self.fam_link = {}
+        # The family map links added by the pages being created, when they
+        # are collected for the manifest or the main process
+        self.new_fam_links = None
         if self.options["securesite"]:
             self.secure_mode = HTTPS
         else:
@@ -418,6 +430,8 @@ class NavWebReport(Report):
                     _("Could not create %s") % self.target_path, str(value)
                 )
                 return
+        if self.manifest:
+            self.manifest.load(self.html_dir)
         config.set(
             "paths.website-directory", os.path.dirname(self.target_path) + os.sep
         )
@@ -514,6 +528,11 @@ class NavWebReport(Report):
                 if media:
                     self._add_media(media.handle, Media, media.handle)
 
+        if self.manifest:
+            self.obj_dict, self.bkref_dict = self.manifest.record_objects(
+                self.obj_dict, self.bkref_dict
+            )
+
         #################################################
         #
         # Pass 2 Generate the web pages
@@ -536,7 +555,7 @@ class NavWebReport(Report):
 
         self.visited = []
         if len(self.languages) > 1:
-            IndexPage(self, self.languages)
+            self.create_pages("index", IndexPage, self, self.languages)
 
         for the_lang, the_title in self.languages:
             if len(self.languages) == 1:
@@ -546,12 +565,14 @@ class NavWebReport(Report):
                 the_lang = self.rlocale.language[0]
             self.the_lang = the_lang
             self.the_title = the_title
-            self.base_pages()
+            self.create_pages("base", self.base_pages)
 
             # build classes IndividualListPage and IndividualPage
             self.tab["Person"].display_pages(the_lang, the_title)
 
-            self.build_gendex(self.obj_dict[Person], the_lang)
+            self.create_pages(
+                "gendex", self.build_gendex, self.obj_dict[Person], the_lang
+            )
 
             # build classes SurnameListPage and SurnamePage
             self.surname_pages(self.obj_dict[Person], the_lang, the_title)
@@ -578,11 +599,13 @@ class NavWebReport(Report):
                     self.tab["Media"].display_pages(the_lang, the_title)
 
                 # build Thumbnail Preview Page...
-                self.thumbnail_preview_page()
+                self.create_pages("thumbnails", self.thumbnail_preview_page)
 
             # build classes AddressBookListPage and AddressBookPage
             if self.inc_addressbook:
-                self.addressbook_pages(self.obj_dict[Person])
+                self.create_pages(
+                    "addressbook", self.addressbook_pages, self.obj_dict[Person]
+                )
 
             # build classes SourceListPage and SourcePage
             if self.inc_sources:
@@ -595,7 +618,7 @@ class NavWebReport(Report):
 
             # build classes StatisticsPage
             if self.inc_stats:
-                self.statistics_preview_page()
+                self.create_pages("statistics", self.statistics_preview_page)
 
             # build classes Updates
             if self.inc_updates:
@@ -603,11 +626,17 @@ class NavWebReport(Report):
 
             # build Heatmaps
             if self.inc_heatmaps:
-                self.heatmap_pages(self.filter.get_name(self.rlocale))
+                self.create_pages(
+                    "heatmaps", self.heatmap_pages, self.filter.get_name(self.rlocale)
+                )
 
         # copy all of the necessary files
         self.copy_narrated_files()
 
+        # remove the pages of the last run which were not created again
+        if self.manifest:
+            self.manifest.save()
+
         # if an archive is being used, close it?
         if self.archive:
             self.archive.close()
@@ -1409,29 +1438,38 @@ class NavWebReport(Report):
         message = _("Creating surname pages")
         pgr_title = self.pgrs_title(the_lang)
         with self.user.progress(pgr_title, message, len(local_list)) as step:
-            SurnameListPage(
-                self,
-                the_lang,
-                the_title,
-                ind_list,
-                SurnameListPage.ORDER_BY_NAME,
-                self.surname_fname,
-            )
 
-            SurnameListPage(
-                self,
-                the_lang,
-                the_title,
-                ind_list,
-                SurnameListPage.ORDER_BY_COUNT,
-                "surnames_count",
-            )
+            def list_pages():
+                SurnameListPage(
+                    self,
+                    the_lang,
+                    the_title,
+                    ind_list,
+                    SurnameListPage.ORDER_BY_NAME,
+                    self.surname_fname,
+                )
 
-            index = 1
-            for surname, handle_list in local_list:
-                SurnamePage(self, the_lang, the_title, surname, sorted(handle_list))
-                step()
-                index += 1
+                SurnameListPage(
+                    self,
+                    the_lang,
+                    the_title,
+                    ind_list,
+                    SurnameListPage.ORDER_BY_COUNT,
+                    "surnames_count",
+                )
+
+            self.create_pages("surnames", list_pages)
+
+            def render(item):
+                surname, handle_list = item
+                SurnamePage(self, the_lang, the_title, surname, handle_list)
+
+            # The individuals are part of the item, as they are not read from
+            # the lists of objects by the page
+            items = [
+                (surname, sorted(handle_list)) for surname, handle_list in local_list
+            ]
+            render_pages(self, render, items, step)
 
     def thumbnail_preview_page(self):
         """
@@ -1792,6 +1830,24 @@ class NavWebReport(Report):
             subdirs = self.build_subdirs(subdir, fname, uplink, image)
         return "/".join(subdirs + [fname])
 
+    def create_pages(self, name, function, *args):
+        """
+        Create pages which are not the page of an object.  With the
+        incremental option, they are kept if their objects did not change
+        since the last run.
+
+        @param: name     -- The name of the pages in the manifest
+        @param: function -- The function that creates the pages
+        @param: args     -- The arguments of the function
+        """
+        if self.manifest is None:
+            function(*args)
+            return
+        key = page_key(self.the_lang, name)
+        if not self.manifest.is_current(key):
+            with self.manifest.page(key):
+                function(*args)
+
     def create_file(self, fname, subdir=None, ext=None):
         """
         will create filename given
@@ -1851,9 +1907,10 @@ class NavWebReport(Report):
                     fname = os.path.join(self.html_dir, self.the_lang, self.cur_fname)
             else:
                 fname = os.path.join(self.html_dir, self.cur_fname)
-            dir_name = os.path.dirname(fname)
-            if not os.path.isdir(dir_name):
-                os.makedirs(dir_name)
+            # The directory may be created by another worker process
+            os.makedirs(os.path.dirname(fname), exist_ok=True)
+            if self.manifest:
+                self.manifest.add_file(fname)
             output_file = open(
                 fname, "w", encoding=self.encoding, errors="xmlcharrefreplace"
             )
@@ -1941,9 +1998,9 @@ class NavWebReport(Report):
         else:
             dest = os.path.join(self.html_dir, to_dir, to_fname)
 
-            destdir = os.path.dirname(dest)
-            if not os.path.isdir(destdir):
-                os.makedirs(destdir)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            if self.manifest:
+                self.manifest.add_file(dest)
 
             if from_fname != dest:
                 if clobber or not os.path.exists(dest):
@@ -1990,6 +2047,17 @@ class NavWebReport(Report):
         else:
             return _("Narrative Website Report")
 
+    def add_family_map_link(self, handle, url):
+        """
+        Keep the link to the family map of an individual, for the family pages.
+
+        @param: handle -- The person handle
+        @param: url    -- The url of the family map
+        """
+        self.fam_link[handle] = url
+        if self.new_fam_links is not None:
+            self.new_fam_links[handle] = url
+
 
 #################################################
 #
@@ -2591,6 +2659,26 @@ class NavWebOptions(MenuReportOptions):
         )
         addopt("showhalfsiblings", showallsiblings)
 
+        processes = NumberOption(_("Number of processes"), 1, 1, 64)
+        processes.set_help(
+            _(
+                "The number of processes that create the pages of the "
+                "individuals, families, events, places, sources, media "
+                "and repositories"
+            )
+        )
+        addopt("processes", processes)
+
+        incremental = BooleanOption(_("Only update the changed pages"), False)
+        incremental.set_help(
+            _(
+                "Whether to only create the pages whose objects changed "
+                "since the web site was last created in the destination "
+                "folder. Not used for archives"
+            )
+        )
+        addopt("incremental", incremental)
+
     def __add_advanced_options_2(self, menu):
         """
         Continue options on the "Advanced" tab.
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Render the object pages of the Narrated Web Site report in worker processes.
+"""
+
+# ------------------------------------------------
+# python modules
+# ------------------------------------------------
+import logging
+import multiprocessing
+import os
+import tarfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from io import BytesIO
+
+# ------------------------------------------------
+# Gramps module
+# ------------------------------------------------
+from gramps.gen.db import DBMODE_R
+from gramps.gen.db.generic import DbGeneric
+from gramps.gen.proxy import CacheProxyDb
+from gramps.gen.proxy.proxybase import ProxyDbBase
+from gramps.gen.user import User
+
+# ------------------------------------------------
+# specific narrative web import
+# ------------------------------------------------
+from gramps.plugins.webreport import common
+from gramps.plugins.webreport.incremental import RecordingDb, page_key
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+# Number of pages rendered by a worker process at a time
+CHUNKSIZE = 50
+
+# Number of pages from which they are rendered in worker processes
+PARALLEL_THRESHOLD = 2 * CHUNKSIZE
+
+# The databases of the report, over the family tree
+PROXIES = (CacheProxyDb, ProxyDbBase, RecordingDb)
+
+
+def render_pages(report, render, items, step):
+    """
+    Render the page of each item, in worker processes if the report uses more
+    than one process.
+
+    The workers are forked, so they inherit the report and its lists of
+    objects.  Each worker opens the family tree again, read-only.  The pages
+    are written to the output directory by the workers, or sent back to be
+    added to the archive.  The pages are rendered in this process if there
+    are only a few of them, or if the workers can't be used.
+
+    With the incremental option, the pages which did not change since the
+    last run are skipped, and the others are recorded in the manifest.
+
+    @param: report -- The instance of the main report class
+    @param: render -- The function that renders the page of an item
+    @param: items  -- The items, e.g. the handles of the objects
+    @param: step   -- The function that steps the progress bar
+    """
+    items = list(items)
+    if report.manifest is not None:
+        pages = []
+        for item in items:
+            if report.manifest.is_current(page_key(report.the_lang, item)):
+                step()
+            else:
+                pages.append(item)
+        items = pages
+        render = partial(_record_page, report, render)
+    max_workers = report.options["processes"]
+    if (
+        len(items) < PARALLEL_THRESHOLD
+        or max_workers == 1
+        or "fork" not in multiprocessing.get_all_start_methods()
+        or _get_family_tree(report.database) is None
+    ):
+        for item in items:
+            step()
+            render(item)
+        return
+
+    chunks = [items[idx : idx + CHUNKSIZE] for idx in range(0, len(items), CHUNKSIZE)]
+    pending = {}
+    names = set(report.archive.getnames()) if report.archive else None
+    # Forked workers inherit the report.  Spawned workers would run the main
+    # script again, which starts Gramps.
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(report, render),
+    )
+    try:
+        for chunk in chunks:
+            pending[executor.submit(_render_chunk, chunk)] = chunk
+        for future in as_completed(pending):
+            members, wrong_media, links, pages = future.result()
+            if names is not None:
+                _add_members(report.archive, names, members)
+            common._WRONGMEDIAPATH.extend(wrong_media)
+            for handle, url in links.items():
+                report.add_family_map_link(handle, url)
+            if report.manifest is not None:
+                report.manifest.new_pages.update(pages)
+            for dummy_item in pending.pop(future):
+                step()
+    except (OSError, BrokenProcessPool) as err:
+        LOG.warning("Rendering pages in worker processes failed: %s", err)
+        for chunk in list(pending.values()):
+            for item in chunk:
+                step()
+                render(item)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _record_page(report, render, item):
+    """
+    Render the page of an item, recording it in the manifest.
+    """
+    with report.manifest.page(page_key(report.the_lang, item)):
+        render(item)
+
+
+def _get_family_tree(database):
+    """
+    Return the family tree under the proxies of the report, or None if it
+    can't be opened again by the worker processes.
+    """
+    while isinstance(database, PROXIES):
+        database = database.db
+    if not isinstance(database, DbGeneric):
+        return None
+    path = database.get_save_path()
+    if not path or not os.path.isdir(path):
+        return None
+    return database
+
+
+def _add_members(archive, names, members):
+    """
+    Add the files of a worker process to the archive of the report.
+    """
+    for tarinfo, data, path in members:
+        if tarinfo.name in names:
+            continue
+        names.add(tarinfo.name)
+        if path is None:
+            archive.addfile(tarinfo, BytesIO(data))
+        else:
+            archive.add(path, tarinfo.name, filter=partial(_set_mtime, tarinfo.mtime))
+
+
+def _set_mtime(mtime, tarinfo):
+    tarinfo.mtime = mtime
+    return tarinfo
+
+
+#################################################
+#
+#    archive of a worker process
+#
+#################################################
+class ArchiveMembers:
+    """
+    Used as the archive of the report by a worker process.  The files are
+    kept, to be added to the archive by the main process.  Copied files are
+    added from their path.
+    """
+
+    def __init__(self, names):
+        self.names = set(names)
+        self.members = []
+
+    def getnames(self):
+        return self.names
+
+    def addfile(self, tarinfo, fileobj):
+        self.names.add(tarinfo.name)
+        self.members.append((tarinfo, fileobj.read(), None))
+
+    def add(self, name, arcname, filter=None):
+        tarinfo = tarfile.TarInfo(arcname)
+        tarinfo.mtime = os.stat(name).st_mtime
+        if filter is not None:
+            tarinfo = filter(tarinfo)
+        self.names.add(arcname)
+        self.members.append((tarinfo, None, name))
+
+
+#################################################
+#
+#    worker processes
+#
+#################################################
+_REPORT = None
+_RENDER = None
+_ARCHIVE = None
+
+# The family tree and archive of the main process, kept so that they are not
+# closed by a worker process.
+_INHERITED = None
+
+
+def _init_worker(report, render):
+    global _REPORT, _RENDER, _ARCHIVE, _INHERITED
+    database = _get_family_tree(report.database)
+    family_tree = database.__class__()
+    family_tree.load(database.get_save_path(), mode=DBMODE_R, update=False)
+    proxy = report.database
+    while isinstance(proxy, PROXIES):
+        if proxy.db is database:
+            proxy.db = family_tree
+        if getattr(proxy, "basedb", None) is database:
+            proxy.basedb = family_tree
+        proxy = proxy.db
+    _INHERITED = (database, report.archive)
+    if report.archive:
+        _ARCHIVE = report.archive = ArchiveMembers(report.archive.getnames())
+    report.user = User()
+    if report.manifest is not None:
+        report.manifest.new_pages = {}
+    _REPORT = report
+    _RENDER = render
+
+
+def _render_chunk(chunk):
+    first_wrong_media = len(common._WRONGMEDIAPATH)
+    _REPORT.new_fam_links = links = {}
+    try:
+        for item in chunk:
+            _RENDER(item)
+    finally:
+        _REPORT.new_fam_links = None
+    members = []
+    if _ARCHIVE is not None:
+        members = _ARCHIVE.members
+        _ARCHIVE.members = []
+    pages = {}
+    if _REPORT.manifest is not None:
+        pages = _REPORT.manifest.new_pages
+        _REPORT.manifest.new_pages = {}
+    return members, common._WRONGMEDIAPATH[first_wrong_media:], links, pages
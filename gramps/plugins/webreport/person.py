@@ -78,6 +78,7 @@ from gramps.gen.relationship import get_relationship_calculator
 # specific narrative web import
 # ------------------------------------------------
 from gramps.plugins.webreport.basepage import BasePage
+from gramps.plugins.webreport.parallel import render_pages
 from gramps.plugins.webreport.common import (
     alphabet_navigation,
     partial_navigation,
@@ -171,15 +172,22 @@ class PersonPages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Person]) + 1
         ) as step:
-            index = 1
-            for person_handle in sorted(self.report.obj_dict[Person]):
-                step()
-                index += 1
+
+            def render(person_handle):
                 person = self.r_db.get_person_from_handle(person_handle)
                 self.individualpage(self.report, the_lang, the_title, person)
+
+            render_pages(
+                self.report, render, sorted(self.report.obj_dict[Person]), step
+            )
             step()
-            self.individuallistpage(
-                self.report, the_lang, the_title, self.report.obj_dict[Person].keys()
+            self.report.create_pages(
+                "individuals",
+                self.individuallistpage,
+                self.report,
+                the_lang,
+                the_title,
+                self.report.obj_dict[Person].keys(),
             )
 
     #################################################
@@ -61,6 +61,7 @@ from gramps.gen.display.place import displayer as _pd
 # specific narrative web import
 # ------------------------------------------------
 from gramps.plugins.webreport.basepage import BasePage
+from gramps.plugins.webreport.parallel import render_pages
 from gramps.plugins.webreport.common import (
     alphabet_navigation,
     partial_navigation,
@@ -173,16 +174,18 @@ class PlacePages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Place]) + 1
         ) as step:
-            index = 1
-            for place_name in self.report.obj_dict[PlaceName].keys():
+
+            def render(place_name):
                 pname = place_name.split(":")[0]
-                step()
                 p_handle = self.report.obj_dict[PlaceName][place_name]
-                index += 1
                 if isinstance(p_handle, tuple):
                     self.placepage(self.report, the_lang, the_title, p_handle[0], pname)
+
+            render_pages(self.report, render, self.report.obj_dict[PlaceName], step)
             step()
-        self.placelistpage(self.report, the_lang, the_title)
+        self.report.create_pages(
+            "places", self.placelistpage, self.report, the_lang, the_title
+        )
 
     def __output_place(
         self,
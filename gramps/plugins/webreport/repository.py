@@ -56,6 +56,7 @@ from gramps.plugins.lib.libhtml import Html
 # specific narrative web import
 # ------------------------------------------------
 from gramps.plugins.webreport.basepage import BasePage
+from gramps.plugins.webreport.parallel import render_pages
 from gramps.plugins.webreport.common import FULLCLEAR, html_escape
 
 _ = glocale.translation.sgettext
@@ -109,25 +110,32 @@ class RepositoryPages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Repository]) + 1
         ) as step:
-            # Sort the repositories
-            repos_dict = {}
-            for repo_handle in self.report.obj_dict[Repository]:
-                repository = self.r_db.get_repository_from_handle(repo_handle)
-                key = repository.get_name() + str(repository.get_gramps_id())
-                repos_dict[key] = (repository, repo_handle)
-
-            keys = sorted(repos_dict, key=self.rlocale.sort_key)
-
-            # RepositoryListPage Class
-            self.repositorylistpage(self.report, the_lang, the_title, repos_dict, keys)
-
-            idx = 1
-            for dummy_index, key in enumerate(keys):
-                repo, handle = repos_dict[key]
-                step()
-                idx += 1
+
+            def list_page():
+                # Sort the repositories
+                repos_dict = {}
+                for repo_handle in self.report.obj_dict[Repository]:
+                    repository = self.r_db.get_repository_from_handle(repo_handle)
+                    key = repository.get_name() + str(repository.get_gramps_id())
+                    repos_dict[key] = (repository, repo_handle)
+
+                keys = sorted(repos_dict, key=self.rlocale.sort_key)
+
+                # RepositoryListPage Class
+                self.repositorylistpage(
+                    self.report, the_lang, the_title, repos_dict, keys
+                )
+
+            self.report.create_pages("repositories", list_page)
+
+            def render(handle):
+                repo = self.r_db.get_repository_from_handle(handle)
                 self.repositorypage(self.report, the_lang, the_title, repo, handle)
 
+            render_pages(
+                self.report, render, sorted(self.report.obj_dict[Repository]), step
+            )
+
     def repositorylistpage(self, report, the_lang, the_title, repos_dict, keys):
         """
         Create Index for repositories
@@ -45,6 +45,7 @@ from collections import defaultdict
 from decimal import getcontext
 from unicodedata import normalize
 import logging
+from functools import partial
 
 # ------------------------------------------------
 # Gramps module
@@ -57,6 +58,7 @@ from gramps.plugins.lib.libhtml import Html
 # specific narrative web import
 # ------------------------------------------------
 from gramps.plugins.webreport.basepage import BasePage
+from gramps.plugins.webreport.parallel import render_pages
 from gramps.plugins.webreport.common import (
     FULLCLEAR,
     html_escape,
@@ -117,15 +119,21 @@ class SourcePages(BasePage):
         with self.r_user.progress(
             progress_title, message, len(self.report.obj_dict[Source]) + 1
         ) as step:
-            self.sourcelistpage(
-                self.report, the_lang, the_title, self.report.obj_dict[Source].keys()
+            self.report.create_pages(
+                "sources",
+                self.sourcelistpage,
+                self.report,
+                the_lang,
+                the_title,
+                self.report.obj_dict[Source].keys(),
             )
 
-            index = 1
-            for source_handle in self.report.obj_dict[Source]:
-                step()
-                index += 1
-                self.sourcepage(self.report, the_lang, the_title, source_handle)
+            render_pages(
+                self.report,
+                partial(self.sourcepage, self.report, the_lang, the_title),
+                self.report.obj_dict[Source],
+                step,
+            )
 
     def part_sourcelistpage(
         self,
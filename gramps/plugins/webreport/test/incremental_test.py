@@ -0,0 +1,159 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the incremental update of the web pages.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from collections import defaultdict
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person, Surname
+from gramps.gen.proxy import CacheProxyDb
+from gramps.plugins.webreport.incremental import Manifest, page_key
+from gramps.plugins.webreport.parallel import PARALLEL_THRESHOLD, render_pages
+
+
+class Report:
+    """
+    The parts of the report used by the manifest.
+    """
+
+    def __init__(self, db, processes, options):
+        self.options = dict(options, processes=processes, incremental=True)
+        self.archive = None
+        self.the_lang = None
+        self.fam_link = {}
+        self.new_fam_links = None
+        self.manifest = Manifest(self)
+        self.database = self.manifest.record_database(CacheProxyDb(db))
+
+    def add_family_map_link(self, handle, url):
+        self.fam_link[handle] = url
+        if self.new_fam_links is not None:
+            self.new_fam_links[handle] = url
+
+
+class IncrementalTest(unittest.TestCase):
+    """
+    Test that only the pages whose objects changed are rendered again.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.outdir = tempfile.mkdtemp()
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir)
+        with DbTxn("Add", self.db) as trans:
+            for dummy in range(PARALLEL_THRESHOLD):
+                self.db.add_person(Person(), trans)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmpdir)
+        shutil.rmtree(self.outdir)
+
+    def render_person(self, report, handle):
+        person = report.database.get_person_from_handle(handle)
+        path = os.path.join(self.outdir, handle)
+        report.manifest.add_file(path)
+        with open(path, "w") as page_file:
+            page_file.write(person.get_primary_name().get_surname())
+        report.add_family_map_link(handle, handle + ".html")
+        return os.getpid()
+
+    def render_index(self, report):
+        path = os.path.join(self.outdir, "index")
+        report.manifest.add_file(path)
+        with open(path, "w") as page_file:
+            page_file.write("\n".join(sorted(report.obj_dict[Person])))
+
+    def run_report(self, processes=1, options=None):
+        """
+        Run a report, returning the pages rendered.
+        """
+        report = Report(self.db, processes, options or {})
+        report.manifest.load(self.outdir)
+        obj_dict = defaultdict(lambda: defaultdict(set))
+        for handle in report.database.get_person_handles():
+            obj_dict[Person][handle] = handle
+        report.obj_dict, dummy_bkref_dict = report.manifest.record_objects(
+            obj_dict, defaultdict(lambda: defaultdict(set))
+        )
+        rendered = []
+
+        def render(handle):
+            rendered.append(handle)
+            self.render_person(report, handle)
+
+        render_pages(report, render, sorted(report.obj_dict[Person]), lambda: None)
+        key = page_key(None, "index")
+        if not report.manifest.is_current(key):
+            with report.manifest.page(key):
+                rendered.append("index")
+                self.render_index(report)
+        report.manifest.save()
+        self.assertEqual(len(report.fam_link), len(obj_dict[Person]))
+        return rendered
+
+    def set_surname(self, handle, surname):
+        with DbTxn("Edit", self.db) as trans:
+            person = self.db.get_person_from_handle(handle)
+            person.get_primary_name().set_surname_list([Surname()])
+            person.get_primary_name().get_primary_surname().set_surname(surname)
+            # The change time is in seconds
+            self.db.commit_person(person, trans, person.change + 1)
+
+    def test_unchanged(self):
+        # The pages rendered by the worker processes are in the manifest
+        self.run_report(processes=2)
+        self.assertEqual(self.run_report(), [])
+        self.assertEqual(len(os.listdir(self.outdir)), PARALLEL_THRESHOLD + 2)
+
+    def test_changes(self):
+        self.run_report()
+        handles = sorted(self.db.get_person_handles())
+        self.set_surname(handles[0], "Garner")
+        self.assertEqual(self.run_report(), [handles[0]])
+        with open(os.path.join(self.outdir, handles[0])) as page_file:
+            self.assertEqual(page_file.read(), "Garner")
+
+        # A missing file is created again
+        os.remove(os.path.join(self.outdir, handles[1]))
+        self.assertEqual(self.run_report(), [handles[1]])
+
+        # The pages of a removed object are removed, and the index changes
+        with DbTxn("Remove", self.db) as trans:
+            self.db.remove_person(handles[2], trans)
+        self.assertEqual(self.run_report(), ["index"])
+        self.assertFalse(os.path.exists(os.path.join(self.outdir, handles[2])))
+
+    def test_options(self):
+        self.run_report()
+        self.assertEqual(len(self.run_report(options={"title": "Other"})), 101)
+        self.assertEqual(self.run_report(options={"title": "Other"}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
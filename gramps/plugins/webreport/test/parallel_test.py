@@ -0,0 +1,143 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2026       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, see <https://www.gnu.org/licenses/>.
+#
+
+"""
+Unittest for the rendering of web pages in worker processes.
+"""
+
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import unittest
+from io import BytesIO
+from types import SimpleNamespace
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person
+from gramps.gen.proxy import CacheProxyDb
+from gramps.plugins.webreport.parallel import PARALLEL_THRESHOLD, render_pages
+
+
+class Report(SimpleNamespace):
+    """
+    The parts of the report used by render_pages.
+    """
+
+    def add_family_map_link(self, handle, url):
+        self.fam_link[handle] = url
+        if self.new_fam_links is not None:
+            self.new_fam_links[handle] = url
+
+
+class RenderPagesTest(unittest.TestCase):
+    """
+    Test that the pages rendered by the worker processes are the ones
+    rendered by the main process.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.db = make_database("sqlite")
+        cls.db.load(cls.tmpdir)
+        with DbTxn("Add", cls.db) as trans:
+            for dummy in range(PARALLEL_THRESHOLD):
+                cls.db.add_person(Person(), trans)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.tmpdir)
+
+    def setUp(self):
+        self.outdir = tempfile.mkdtemp()
+        self.steps = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.outdir)
+
+    def step(self):
+        self.steps += 1
+
+    def render(self, report, handle):
+        page = report.database.get_person_from_handle(handle).gramps_id
+        report.add_family_map_link(handle, page + ".html")
+        if report.archive:
+            tarinfo = tarfile.TarInfo(handle)
+            tarinfo.size = len(page)
+            tarinfo.mtime = time.time()
+            report.archive.addfile(tarinfo, BytesIO(page.encode()))
+        else:
+            with open(os.path.join(self.outdir, handle), "w") as page_file:
+                page_file.write(page)
+
+    def expected(self):
+        return {
+            handle: self.db.get_person_from_handle(handle).gramps_id
+            for handle in self.db.get_person_handles()
+        }
+
+    def render_pages(self, processes, archive=None):
+        report = Report(
+            options={"processes": processes},
+            database=CacheProxyDb(self.db),
+            archive=archive,
+            user=None,
+            manifest=None,
+            fam_link={},
+            new_fam_links=None,
+        )
+        handles = self.db.get_person_handles()
+        render_pages(
+            report, lambda handle: self.render(report, handle), handles, self.step
+        )
+        self.assertEqual(self.steps, len(handles))
+        # The family map links of the individual pages are sent back to the
+        # report, for the family pages
+        self.assertEqual(
+            report.fam_link,
+            {handle: page + ".html" for handle, page in self.expected().items()},
+        )
+
+    def test_directory(self):
+        for processes in (1, 2):
+            self.steps = 0
+            self.render_pages(processes)
+            pages = {}
+            for handle in os.listdir(self.outdir):
+                with open(os.path.join(self.outdir, handle)) as page_file:
+                    pages[handle] = page_file.read()
+            self.assertEqual(pages, self.expected())
+
+    def test_archive(self):
+        path = os.path.join(self.outdir, "web.tar.gz")
+        with tarfile.open(path, "w:gz") as archive:
+            self.render_pages(2, archive)
+        pages = {}
+        with tarfile.open(path) as archive:
+            for member in archive.getmembers():
+                pages[member.name] = archive.extractfile(member).read().decode()
+        self.assertEqual(pages, self.expected())
+
+
+if __name__ == "__main__":
+    unittest.main()